@@ -26,7 +26,7 @@ sys.path.insert(0, str(api_root))
 from alembic.config import Config
 from alembic.script import ScriptDirectory
 
-EXPECTED_HEADS = {"coach_v2_truth_003"}
+EXPECTED_HEADS = {"activity_tss_001"}
 MAX_ROOTS = 2  # main chain root + phase chain root (readiness_score_001)
 
 
@@ -0,0 +1,57 @@
+"""Add columnar stream_blob storage to activity_stream
+
+Revision ID: activity_stream_002
+Revises: coach_v2_truth_003
+Create Date: 2026-10-16
+
+Columnar stream storage (services/stream_codec):
+- New column: activity_stream.stream_blob (BYTEA) — per-channel typed,
+  delta-encoded, compressed columns behind a channel directory
+- New column: activity_stream.stream_format_version (codec version)
+- activity_stream.stream_data (JSONB) becomes nullable: new and backfilled
+  rows store only stream_blob
+
+Existing rows are converted in place by tasks.backfill_stream_columnar,
+not by this migration (large table; batched outside the DDL transaction).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'activity_stream_002'
+down_revision: Union[str, None] = 'coach_v2_truth_003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('activity_stream', sa.Column('stream_blob', sa.LargeBinary(), nullable=True))
+    op.add_column('activity_stream', sa.Column('stream_format_version', sa.Integer(), nullable=True))
+    op.alter_column('activity_stream', 'stream_data', existing_type=JSONB, nullable=True)
+
+
+def downgrade() -> None:
+    # Restore JSONB for rows that only have the columnar encoding.
+    import json
+
+    from services.stream_codec import decode_stream
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT id, stream_blob FROM activity_stream "
+        "WHERE stream_data IS NULL AND stream_blob IS NOT NULL"
+    )).fetchall()
+    for row in rows:
+        conn.execute(
+            sa.text("UPDATE activity_stream SET stream_data = CAST(:data AS jsonb) WHERE id = :id"),
+            {"id": row.id, "data": json.dumps(decode_stream(row.stream_blob))},
+        )
+    conn.execute(sa.text("DELETE FROM activity_stream WHERE stream_data IS NULL"))
+
+    op.alter_column('activity_stream', 'stream_data', existing_type=JSONB, nullable=False)
+    op.drop_column('activity_stream', 'stream_format_version')
+    op.drop_column('activity_stream', 'stream_blob')
@@ -0,0 +1,49 @@
+"""Add persisted TSS columns to activity table
+
+Revision ID: activity_tss_001
+Revises: daily_load_001
+Create Date: 2026-10-16
+
+Stores TrainingLoadCalculator.calculate_workout_tss on the activity so
+load history, correlation inputs and Banister calibration read it back
+instead of recomputing every workout (services/activity_tss).
+tss_inputs_version records which threshold inputs the value was computed
+from; NULL means never computed or invalidated by an edit.
+
+Idempotent: every column is added with `IF NOT EXISTS`. No data backfill
+here -- tasks.backfill_daily_load fills the columns (each daily-load
+refresh recomputes stale TSS first), and until then readers fall back to
+computing TSS as before.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'activity_tss_001'
+down_revision: Union[str, None] = 'daily_load_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE activity
+            ADD COLUMN IF NOT EXISTS tss DOUBLE PRECISION,
+            ADD COLUMN IF NOT EXISTS tss_method TEXT,
+            ADD COLUMN IF NOT EXISTS tss_inputs_version TEXT;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE activity
+            DROP COLUMN IF EXISTS tss_inputs_version,
+            DROP COLUMN IF EXISTS tss_method,
+            DROP COLUMN IF EXISTS tss;
+        """
+    )
@@ -0,0 +1,61 @@
+"""Add athlete_daily_load and athlete_load_state tables
+
+Revision ID: daily_load_001
+Revises: pace_curve_001
+Create Date: 2026-10-16
+
+Materialized per-athlete daily training load (TSS, ATL, CTL, TSB) so
+TrainingLoadCalculator reads a window of rows instead of recomputing the
+EMA over the athlete's full activity history (services/daily_load).
+athlete_load_state records how far the rows are current and the earliest
+day dirtied by an activity change since.
+
+Idempotent: CREATE TABLE IF NOT EXISTS. Rows are filled by
+tasks.backfill_daily_load and kept current by tasks.refresh_daily_load;
+until then reads fall back to the full in-memory computation. Both tables
+cascade with their athlete, so account deletion needs no extra steps.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'daily_load_001'
+down_revision: Union[str, None] = 'pace_curve_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS athlete_daily_load (
+            athlete_id UUID NOT NULL REFERENCES athlete(id) ON DELETE CASCADE,
+            date DATE NOT NULL,
+            total_tss DOUBLE PRECISION NOT NULL DEFAULT 0,
+            workout_count INTEGER NOT NULL DEFAULT 0,
+            atl DOUBLE PRECISION NOT NULL,
+            ctl DOUBLE PRECISION NOT NULL,
+            tsb DOUBLE PRECISION NOT NULL,
+            PRIMARY KEY (athlete_id, date)
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS athlete_load_state (
+            athlete_id UUID PRIMARY KEY REFERENCES athlete(id) ON DELETE CASCADE,
+            first_date DATE,
+            computed_through DATE,
+            dirty_from DATE,
+            inputs_hash TEXT,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS athlete_load_state;")
+    op.execute("DROP TABLE IF EXISTS athlete_daily_load;")
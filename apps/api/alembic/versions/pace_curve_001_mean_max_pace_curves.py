@@ -0,0 +1,60 @@
+"""Add activity_pace_curve and athlete_pace_curve tables
+
+Revision ID: pace_curve_001
+Revises: rsi_cache_002
+Create Date: 2026-10-16
+
+Per-activity mean-max pace curves (services/pace_curve) and the athlete
+envelope merged from them over rolling windows (90d / 365d / all-time),
+so consumers read one row for "best sustained pace for duration D".
+
+Idempotent: CREATE TABLE IF NOT EXISTS. Rows are filled at ingest and by
+tasks.backfill_pace_curves. Both tables cascade with their activity and
+athlete, so account deletion and activity wipes need no extra steps.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'pace_curve_001'
+down_revision: Union[str, None] = 'rsi_cache_002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS activity_pace_curve (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            activity_id UUID NOT NULL UNIQUE REFERENCES activity(id) ON DELETE CASCADE,
+            athlete_id UUID NOT NULL REFERENCES athlete(id) ON DELETE CASCADE,
+            start_time TIMESTAMPTZ NOT NULL,
+            curve JSONB NOT NULL,
+            curve_version INTEGER NOT NULL DEFAULT 1,
+            computed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_activity_pace_curve_athlete_start "
+        "ON activity_pace_curve (athlete_id, start_time);"
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS athlete_pace_curve (
+            athlete_id UUID PRIMARY KEY REFERENCES athlete(id) ON DELETE CASCADE,
+            curves JSONB NOT NULL DEFAULT '{}'::jsonb,
+            curve_version INTEGER NOT NULL DEFAULT 1,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS athlete_pace_curve;")
+    op.execute("DROP INDEX IF EXISTS ix_activity_pace_curve_athlete_start;")
+    op.execute("DROP TABLE IF EXISTS activity_pace_curve;")
@@ -0,0 +1,30 @@
+"""Add stream_pyramid to cached_stream_analysis
+
+Revision ID: rsi_cache_002
+Revises: activity_stream_002
+Create Date: 2026-10-16
+
+Stores precomputed LTTB chart levels (services/stream_pyramid) next to the
+cached analysis so stream charts are served without downsampling the raw
+stream per request. NULL until built; existing rows fill lazily on read.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'rsi_cache_002'
+down_revision: Union[str, None] = 'activity_stream_002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('cached_stream_analysis', sa.Column('stream_pyramid', JSONB, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('cached_stream_analysis', 'stream_pyramid')
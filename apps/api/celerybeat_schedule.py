@@ -64,7 +64,8 @@ beat_schedule = {
     },
     # Daily correlation sweep — after morning intelligence.
     # Runs analyze_correlations() for all 9 output metrics for athletes
-    # with new data in the last 24h.
+    # with new data in the last 24h, fanned out per athlete on the
+    # ``correlation`` queue.
     "daily-correlation-sweep": {
         "task": "tasks.run_daily_correlation_sweep",
         "schedule": crontab(hour=8, minute=0),
@@ -98,6 +99,15 @@ beat_schedule = {
         "task": "tasks.backfill_athlete_timezones",
         "schedule": crontab(hour=3, minute=0),
     },
+    # Banister model recalibration — daily at 03:30 UTC.
+    # One set-based query finds athletes whose calibration inputs changed
+    # (or whose cached model expires before the next run); they are refitted
+    # in a process pool and written in bulk, so plan generation and race
+    # prediction read a warm model instead of calibrating in the request.
+    "model-recalibration-nightly": {
+        "task": "tasks.recalibrate_models_nightly",
+        "schedule": crontab(hour=3, minute=30),
+    },
     # Plan lifecycle cleanup — complete active plans once race date has passed.
     "complete-expired-plans": {
         "task": "tasks.complete_expired_plans",
@@ -117,6 +127,15 @@ beat_schedule = {
         "task": "tasks.sweep_unclassified_runs",
         "schedule": crontab(minute="*/30"),
     },
+    # Stream re-analysis backfill — every 15 minutes.
+    # After a CURRENT_ANALYSIS_VERSION bump, recomputes stale cached stream
+    # analyses (most recent activities, most active athletes first) in a
+    # process pool under a 10-minute budget, resuming from its Redis
+    # checkpoint each cycle. No-op once every row is current.
+    "stream-reanalysis-backfill": {
+        "task": "tasks.reanalyze_stale_streams",
+        "schedule": crontab(minute="*/15"),
+    },
     # Strength v1 — daily reconciliation sweep of Garmin-ingested strength
     # sessions that look incomplete (sparse / zero StrengthExerciseSet rows).
     # Read-only; observability for the home-card nudge surface. The card
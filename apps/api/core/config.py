@@ -140,6 +140,7 @@ class Settings(BaseSettings):
     CACHE_TTL_DEFAULT: int = Field(default=300)  # 5 minutes
     CACHE_TTL_ATHLETE: int = Field(default=600)  # 10 minutes
     CACHE_TTL_ACTIVITIES: int = Field(default=60)  # 1 minute
+    STREAM_CACHE_MAX_BYTES: int = Field(default=64 * 1024 * 1024)  # per-process decoded stream LRU
 
     # Environment
     ENVIRONMENT: str = Field(default="development")
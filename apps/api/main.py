@@ -29,6 +29,11 @@ from sqlalchemy import text
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Session flush listeners: stored TSS invalidation and daily-load dirty days
+from services import activity_tss, daily_load  # noqa: E402
+activity_tss.register_listeners()
+daily_load.register_listeners()
+
 try:
     import sentry_sdk
     if settings.SENTRY_DSN:
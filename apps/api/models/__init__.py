@@ -11,6 +11,7 @@ from .activity import (
     ActivityFeedback,
     ActivityReflection,
     CachedStreamAnalysis,
+    ActivityPaceCurve,
 )  # noqa: F401
 from .route import AthleteRoute  # noqa: F401
 from .training_block import TrainingBlock  # noqa: F401
@@ -22,6 +23,9 @@ from .athlete import (
     AthleteTrainingPaceProfile,
     AthleteGoal,
     AthleteCalibratedModel,
+    AthletePaceCurve,
+    AthleteDailyLoad,
+    AthleteLoadState,
     AthleteWorkoutResponse,
     AthleteOverride,
     AthleteLearning,
@@ -123,6 +127,7 @@ __all__ = [
     "ActivityFeedback",
     "ActivityReflection",
     "CachedStreamAnalysis",
+    "ActivityPaceCurve",
     "AthleteRoute",
     "TrainingBlock",
     "AthleteFacts",
@@ -133,6 +138,9 @@ __all__ = [
     "AthleteTrainingPaceProfile",
     "AthleteGoal",
     "AthleteCalibratedModel",
+    "AthletePaceCurve",
+    "AthleteDailyLoad",
+    "AthleteLoadState",
     "AthleteWorkoutResponse",
     "AthleteOverride",
     "AthleteLearning",
@@ -1,10 +1,10 @@
-from sqlalchemy import Column, Integer, BigInteger, Boolean, CheckConstraint, Float, Date, DateTime, ForeignKey, Numeric, Text, String, Index, UniqueConstraint, text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, Boolean, CheckConstraint, Float, Date, DateTime, ForeignKey, LargeBinary, Numeric, Text, String, Index, UniqueConstraint, text
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from core.database import Base
 import uuid
-from typing import Optional
+from typing import Any, Dict, Iterable, Optional
 from datetime import datetime, timezone
 
 class Activity(Base):
@@ -40,6 +40,11 @@ class Activity(Base):
     workout_zone = Column(Text, nullable=True)  # e.g., 'recovery', 'endurance', 'stamina', 'speed'
     workout_confidence = Column(Float, nullable=True)  # Classification confidence 0-1
     intensity_score = Column(Float, nullable=True)  # Calculated intensity 0-100
+
+    # --- PERSISTED TRAINING STRESS (services/activity_tss) ---
+    tss = Column(Float, nullable=True)  # TrainingLoadCalculator.calculate_workout_tss result
+    tss_method = Column(Text, nullable=True)  # e.g., 'hrTSS_n1', 'rTSS', 'estimated'
+    tss_inputs_version = Column(Text, nullable=True)  # '<group>:<threshold hash>'; NULL = not computed or stale
     
     # --- ENVIRONMENTAL CONTEXT ---
     temperature_f = Column(Float, nullable=True)  # Temperature at start
@@ -350,10 +355,16 @@ class ActivityStream(Base):
     """
     Per-second resolution stream data for an activity (ADR-063).
 
-    Stores raw time-series from Strava (or Garmin) as a single JSONB blob
-    containing all channels.  One row per activity.  The frontend reads the
-    entire blob for chart rendering; the coach tool reads it for stream
-    analysis.
+    Stores raw time-series from Strava (or Garmin), one row per activity.
+    Channels are stored in the columnar binary format from
+    services/stream_codec (``stream_blob``): each channel is an independently
+    compressed typed column, so readers that need only ``time`` and
+    ``heartrate`` decode only those two via ``get_channels()``.
+
+    ``stream_data`` is the full channel dict. Reading it decodes every
+    channel; assigning it encodes into ``stream_blob``. Rows written before
+    the columnar format keep their JSONB in the legacy ``stream_data`` column
+    until tasks.backfill_stream_columnar converts them in place.
 
     Example stream_data:
         {
@@ -372,10 +383,15 @@ class ActivityStream(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     activity_id = Column(UUID(as_uuid=True), ForeignKey("activity.id"), nullable=False)
 
-    # Dict of channel_name → array of values
-    stream_data = Column(JSONB, nullable=False)
+    # Legacy dict of channel_name → array of values (pre-columnar rows only).
+    # Deferred: loading a row never fetches the JSONB unless a legacy row is read.
+    stream_data_json = deferred(Column("stream_data", JSONB, nullable=True))
 
-    # Which channels are present (cheap filtering without parsing JSONB)
+    # Columnar encoding (services/stream_codec) and its format version
+    stream_blob = Column(LargeBinary, nullable=True)
+    stream_format_version = Column(Integer, nullable=True)
+
+    # Which channels are present (cheap filtering without decoding)
     channels_available = Column(JSONB, nullable=False, default=list)
 
     # Number of data points (length of time array)
@@ -394,6 +410,65 @@ class ActivityStream(Base):
         Index("ix_activity_stream_activity_id", "activity_id"),
     )
 
+    @property
+    def stream_data(self) -> Optional[Dict[str, Any]]:
+        """All channels as a dict (decodes every channel)."""
+        return self.get_channels()
+
+    @stream_data.setter
+    def stream_data(self, value: Optional[Dict[str, Any]]) -> None:
+        if value is None:
+            self.stream_blob = None
+            self.stream_format_version = None
+        else:
+            from services import stream_codec
+
+            self.stream_blob = stream_codec.encode_stream(value)
+            self.stream_format_version = stream_codec.FORMAT_VERSION
+        self.stream_data_json = None
+        # New payload, new decoded-stream cache key (services/stream_cache)
+        self.fetched_at = datetime.now(timezone.utc)
+
+    @property
+    def is_columnar(self) -> bool:
+        return self.stream_blob is not None
+
+    @property
+    def has_data(self) -> bool:
+        """True when the row holds any channels, without decoding them."""
+        if self.stream_blob is not None:
+            from services import stream_codec
+
+            return bool(stream_codec.channel_names(self.stream_blob))
+        return bool(self.stream_data_json)
+
+    def get_channels(self, channels: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """Decode the requested channels (all channels when None).
+
+        Channels not present in the stream are omitted. Returns None when
+        the row holds no stream data at all. Decoded channels are shared
+        per process through services/stream_cache, keyed by
+        (activity_id, fetched_at).
+        """
+        if self.activity_id is None or self.fetched_at is None:
+            return self._decode_channels(channels)
+        from services import stream_cache
+
+        return stream_cache.get_stream_cache().get_or_decode(
+            (self.activity_id, self.fetched_at), channels, self._decode_channels,
+        )
+
+    def _decode_channels(self, channels: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        if self.stream_blob is not None:
+            from services import stream_codec
+
+            return stream_codec.decode_stream(self.stream_blob, channels)
+        data = self.stream_data_json
+        if data is None or channels is None:
+            return data
+        wanted = set(channels)
+        return {name: values for name, values in data.items() if name in wanted}
+
 class PersonalBest(Base):
     """
     Personal Best (PB) records for an athlete across standard distances.
@@ -432,7 +507,7 @@ class PersonalBest(Base):
 
 class BestEffort(Base):
     """
-    Individual best effort records from Strava.
+    Individual best effort records.
     
     Strava calculates 'best efforts' for standard distances WITHIN any activity.
     For example, your fastest mile might be from within a 10k run.
@@ -442,6 +517,8 @@ class BestEffort(Base):
     
     Architecture:
     - Populated during Strava activity sync (extract best_efforts from API response)
+    - Non-Strava runs derive them from their stream at ingest
+      (services/stream_best_efforts.py); those rows have no strava_effort_id
     - PersonalBest table is regenerated by aggregating this table
     - Enables historical tracking, trends, age-grading, etc.
     """
@@ -556,6 +633,9 @@ class CachedStreamAnalysis(Base):
 
     The result_json column stores the full asdict(StreamAnalysisResult) so both
     /v1/home and /v1/activities/{id}/stream-analysis can serve without re-computing.
+    stream_pyramid stores the LTTB chart levels (services/stream_pyramid) computed
+    alongside it, so whole-run chart requests never re-read or re-downsample the
+    raw stream. It is deferred: reads that only need result_json do not load it.
     """
     __tablename__ = "cached_stream_analysis"
 
@@ -568,6 +648,9 @@ class CachedStreamAnalysis(Base):
     # Deterministic invalidation: bump when analysis logic changes
     analysis_version = Column(Integer, nullable=False, default=1)
 
+    # Precomputed multi-resolution chart levels (NULL until first built)
+    stream_pyramid = deferred(Column(JSONB, nullable=True))
+
     # Provenance
     computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
@@ -575,3 +658,30 @@ class CachedStreamAnalysis(Base):
         Index("ix_cached_stream_analysis_activity_id", "activity_id"),
     )
 
+
+class ActivityPaceCurve(Base):
+    """
+    Mean-max pace curve for one activity (services/pace_curve).
+
+    curve maps duration in seconds (grid in pace_curve.DURATION_GRID_S, as
+    string keys) to the best average speed in m/s sustained for that long
+    anywhere in the activity. Computed once from the stream at ingest and
+    merged into the athlete's AthletePaceCurve envelope; kept so rolling
+    windows can be rebuilt when their best points age out.
+    """
+    __tablename__ = "activity_pace_curve"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    activity_id = Column(UUID(as_uuid=True), ForeignKey("activity.id", ondelete="CASCADE"), nullable=False, unique=True)
+    athlete_id = Column(UUID(as_uuid=True), ForeignKey("athlete.id", ondelete="CASCADE"), nullable=False)
+    start_time = Column(DateTime(timezone=True), nullable=False)
+
+    curve = Column(JSONB, nullable=False)
+
+    # Deterministic invalidation: bump pace_curve.PACE_CURVE_VERSION when the derivation changes
+    curve_version = Column(Integer, nullable=False, default=1)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_activity_pace_curve_athlete_start", "athlete_id", "start_time"),
+    )
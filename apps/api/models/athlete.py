@@ -322,6 +322,69 @@ class AthleteCalibratedModel(Base):
     calibrated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     valid_until = Column(Date, nullable=True)  # Recalibrate after new race
 
+class AthletePaceCurve(Base):
+    """
+    Athlete pace-duration (mean-max) envelope, one row per athlete.
+
+    curves holds one envelope per rolling window ("90d", "365d", "all"),
+    each mapping duration (s) to the best point across the window's
+    activities: {"speed": m/s, "activity_id": ..., "date": "YYYY-MM-DD"}.
+    Merged incrementally as activities arrive; a window is rebuilt from
+    ActivityPaceCurve rows when one of its points ages out or its activity
+    is deleted or marked duplicate.
+
+    Read through services/pace_curve (get_pace_curve, best_sustained_speed).
+    """
+    __tablename__ = "athlete_pace_curve"
+
+    athlete_id = Column(UUID(as_uuid=True), ForeignKey("athlete.id", ondelete="CASCADE"), primary_key=True)
+
+    curves = Column(JSONB, nullable=False, default=dict)
+    curve_version = Column(Integer, nullable=False, default=1)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+class AthleteDailyLoad(Base):
+    """
+    Materialized daily training load (TSS sum, ATL, CTL, TSB), one row per
+    athlete per calendar day from the first activity onward, rest days
+    included.
+
+    atl/ctl are stored at full precision so the EMA can be resumed from
+    any day. Maintained by services/daily_load; AthleteLoadState says how
+    far the rows can be trusted.
+    """
+    __tablename__ = "athlete_daily_load"
+
+    athlete_id = Column(UUID(as_uuid=True), ForeignKey("athlete.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+
+    total_tss = Column(Float, nullable=False, default=0.0)
+    workout_count = Column(Integer, nullable=False, default=0)
+    atl = Column(Float, nullable=False)
+    ctl = Column(Float, nullable=False)
+    tsb = Column(Float, nullable=False)
+
+class AthleteLoadState(Base):
+    """
+    Freshness bookkeeping for AthleteDailyLoad, one row per athlete.
+
+    dirty_from is the earliest day touched by an activity insert, edit or
+    duplicate flag since the last refresh (set at flush time); rows from
+    that day on are stale. inputs_hash fingerprints the athlete thresholds
+    TSS was computed with — a mismatch invalidates the whole series.
+    """
+    __tablename__ = "athlete_load_state"
+
+    athlete_id = Column(UUID(as_uuid=True), ForeignKey("athlete.id", ondelete="CASCADE"), primary_key=True)
+
+    first_date = Column(Date, nullable=True)  # First activity day (None = no activities)
+    computed_through = Column(Date, nullable=True)
+    dirty_from = Column(Date, nullable=True)
+    inputs_hash = Column(Text, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
 class AthleteWorkoutResponse(Base):
     """
     Tracks how an athlete responds to different workout stimulus types.
@@ -717,7 +717,7 @@ def get_activity(
                 ActivityStream.activity_id == activity.id
             ).first()
             if stream and "latlng" in (stream.channels_available or []):
-                raw = stream.stream_data.get("latlng", [])
+                raw = (stream.get_channels(["latlng"]) or {}).get("latlng", [])
                 gps_track = [pt for pt in raw if pt is not None]
         else:
             sd = activity.session_detail or {}
@@ -907,7 +907,7 @@ def get_route_siblings(
             for stream in streams:
                 if "latlng" not in (stream.channels_available or []):
                     continue
-                raw = stream.stream_data.get("latlng", [])
+                raw = (stream.get_channels(["latlng"]) or {}).get("latlng", [])
                 pts = [pt for pt in raw if pt is not None]
                 if not pts:
                     continue
@@ -8,6 +8,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from uuid import UUID
 from datetime import datetime
+from core.cache import invalidate_correlation_cache
 from core.database import get_db
 from core.auth import get_current_user
 from models import Activity, ActivityFeedback, Athlete
@@ -107,6 +108,7 @@ def create_activity_feedback(
     db.add(db_feedback)
     db.commit()
     db.refresh(db_feedback)
+    invalidate_correlation_cache(str(current_user.id))
     
     # ADR-036: Update N=1 learning models with this feedback
     if feedback.perceived_effort is not None:
@@ -257,6 +259,7 @@ def update_activity_feedback(
     
     db.commit()
     db.refresh(feedback)
+    invalidate_correlation_cache(str(current_user.id))
     
     return feedback
 
@@ -287,5 +290,6 @@ def delete_activity_feedback(
     
     db.delete(feedback)
     db.commit()
+    invalidate_correlation_cache(str(current_user.id))
     
     return None
@@ -164,6 +164,11 @@ class PauseIngestionRequest(BaseModel):
     reason: Optional[str] = Field(default=None, description="Why ingestion was paused/unpaused (audited)")
 
 
+class PauseStreamReanalysisRequest(BaseModel):
+    paused: bool = Field(..., description="Whether the stream re-analysis backfill is paused")
+    reason: Optional[str] = Field(default=None, description="Why the backfill was paused/resumed (audited)")
+
+
 class AdminPermissionsUpdateRequest(BaseModel):
     permissions: List[str] = Field(default_factory=list, description="Explicit admin permission keys")
     reason: Optional[str] = Field(default=None, description="Why permissions were changed (audited)")
@@ -340,6 +345,88 @@ def set_ingestion_pause_status(
     return {"success": True, "paused": bool(request.paused)}
 
 
+@router.get("/ops/stream-reanalysis")
+def get_stream_reanalysis_progress(
+    current_user: Athlete = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Ops Visibility: stream re-analysis backfill progress.
+
+    Cached stream analyses by analysis_version, how many are still stale under
+    CURRENT_ANALYSIS_VERSION, and the backfill checkpoint / pause / running state.
+    """
+    from core.cache import get_redis_client
+    from services.stream_reanalysis import get_progress
+
+    return get_progress(db, get_redis_client())
+
+
+@router.post("/ops/stream-reanalysis/pause")
+def set_stream_reanalysis_pause(
+    request: PauseStreamReanalysisRequest,
+    http_request: Request,
+    _: None = Depends(deny_impersonation_mutation("system.stream_reanalysis.pause")),
+    current_user: Athlete = Depends(require_permission("system.stream_reanalysis.pause")),
+    db: Session = Depends(get_db),
+):
+    from core.cache import get_redis_client
+    from services.admin_audit import record_admin_audit_event
+    from services.stream_reanalysis import is_paused, set_paused
+
+    redis_client = get_redis_client()
+    if not redis_client:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Redis unavailable")
+
+    before = {"paused": is_paused(redis_client)}
+    set_paused(redis_client, bool(request.paused))
+    after = {"paused": bool(request.paused)}
+
+    record_admin_audit_event(
+        db,
+        request=http_request,
+        actor=current_user,
+        action="system.stream_reanalysis.pause" if request.paused else "system.stream_reanalysis.resume",
+        target_athlete_id=None,
+        reason=request.reason,
+        payload={"before": before, "after": after},
+    )
+    db.commit()
+    return {"success": True, "paused": bool(request.paused)}
+
+
+@router.get("/ops/stream-cache")
+def get_stream_cache_stats(
+    current_user: Athlete = Depends(require_admin),
+):
+    """
+    Ops Visibility: decoded-stream LRU for the API process serving this request.
+
+    Hit / miss / eviction counters and byte usage (services/stream_cache).
+    Counters are per process; each worker keeps its own cache.
+    """
+    from services.stream_cache import get_stream_cache
+
+    return get_stream_cache().stats()
+
+
+@router.get("/ops/investigation-timings")
+def get_investigation_timings(
+    limit: int = Query(default=20, ge=1, le=100),
+    current_user: Athlete = Depends(require_admin),
+):
+    """
+    Ops Visibility: slowest race-input investigations across the population.
+
+    p50 / p95 / max elapsed time over each investigation's recent runs, with
+    ok / error / timeout counts (services/investigation_executor).
+    """
+    from core.cache import get_redis_client
+    from services.investigation_executor import slowest_investigations
+
+    return slowest_investigations(get_redis_client(), limit=limit)
+
+
 @router.post("/users/{user_id}/permissions")
 def set_admin_permissions(
     user_id: UUID,
@@ -14,6 +14,7 @@ from typing import Optional
 from datetime import date
 from uuid import UUID
 
+from core.cache import invalidate_correlation_cache
 from core.database import get_db
 from core.auth import get_current_user
 from models import Athlete, DailyCheckin
@@ -108,6 +109,7 @@ async def create_or_update_checkin(
                 setattr(existing, field, value)
         db.commit()
         db.refresh(existing)
+        invalidate_correlation_cache(str(current_user.id))
         _trigger_briefing_refresh(str(current_user.id))
         return existing
     else:
@@ -119,6 +121,7 @@ async def create_or_update_checkin(
         db.add(db_checkin)
         db.commit()
         db.refresh(db_checkin)
+        invalidate_correlation_cache(str(current_user.id))
         _trigger_briefing_refresh(str(current_user.id))
         return db_checkin
 
@@ -3582,48 +3582,12 @@ def _lttb_1d(values: list, target: int) -> list:
     """Largest-Triangle-Three-Buckets downsampling for a 1D array.
 
     Treats index as x and value as y. Returns a list of length ``target``.
-    This is the same LTTB algorithm used in the stream-analysis router for
-    per-point data — applied here to the effort_intensity scalar array.
+    Same LTTB used to precompute the stream chart pyramids
+    (services/stream_pyramid).
     """
-    n = len(values)
-    if n <= target:
-        return values
-
-    sampled = [values[0]]
-    bucket_size = (n - 2) / (target - 2)
-
-    a_idx = 0
-    for i in range(1, target - 1):
-        bucket_start = int((i - 1) * bucket_size) + 1
-        bucket_end = min(int(i * bucket_size) + 1, n - 1)
-
-        next_start = int(i * bucket_size) + 1
-        next_end = min(int((i + 1) * bucket_size) + 1, n)
-
-        # Average of next bucket
-        avg_x = sum(range(next_start, next_end)) / max(1, next_end - next_start)
-        avg_y = sum(values[j] for j in range(next_start, next_end)) / max(1, next_end - next_start)
-
-        # Pick point with max triangle area
-        max_area = -1
-        best_idx = bucket_start
-        a_x = a_idx
-        a_y = values[a_idx]
-
-        for j in range(bucket_start, bucket_end):
-            area = abs(
-                (a_x - avg_x) * (values[j] - a_y)
-                - (a_x - j) * (avg_y - a_y)
-            )
-            if area > max_area:
-                max_area = area
-                best_idx = j
-
-        sampled.append(values[best_idx])
-        a_idx = best_idx
+    from services.stream_pyramid import lttb_1d
 
-    sampled.append(values[-1])
-    return sampled
+    return lttb_1d(values, target)
 
 
 def compute_last_run(
@@ -3721,9 +3685,13 @@ def compute_last_run(
                 .filter(ActivityStream.activity_id == latest.id)
                 .first()
             )
-            if stream_row and stream_row.stream_data:
+            if stream_row and stream_row.has_data:
                 from services.run_stream_analysis import AthleteContext
-                from services.stream_analysis_cache import get_or_compute_analysis
+                from services.stream_analysis_cache import (
+                    get_or_compute_analysis,
+                    get_or_compute_pyramid,
+                )
+                from services.stream_pyramid import series_at
 
                 athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
                 athlete_ctx = AthleteContext(
@@ -3741,35 +3709,29 @@ def compute_last_run(
                     athlete_ctx=athlete_ctx,
                     db=db,
                     planned_workout_dict=None,  # Home doesn't need plan comparison
+                    serve_stale=True,
                 )
 
-                # LTTB downsample effort_intensity to ~500 points
-                effort = result_dict.get("effort_intensity", [])
-                if len(effort) > 500:
-                    effort = _lttb_1d(effort, 500)
-
-                last_run.effort_intensity = [round(e, 4) for e in effort]
+                # Chart series (~500 points) from the precomputed LTTB pyramid
+                pyramid = get_or_compute_pyramid(
+                    activity_id=latest.id,
+                    stream_row=stream_row,
+                    result_dict=result_dict,
+                    db=db,
+                )
+                last_run.effort_intensity = series_at(pyramid, "effort", 500)
                 last_run.tier_used = result_dict.get("tier_used")
                 last_run.confidence = result_dict.get("confidence")
 
-                # Extract pace_stream from velocity_smooth (m/s → s/km)
-                raw_velocity = stream_row.stream_data.get("velocity_smooth", [])
-                if raw_velocity and len(raw_velocity) > 0:
-                    # Convert m/s to pace (s/km); clamp zero/near-zero velocity
-                    pace_raw = [
-                        round(1000.0 / max(v, 0.3), 1) if v and v > 0.3 else 1200.0
-                        for v in raw_velocity
-                    ]
-                    if len(pace_raw) > 500:
-                        pace_raw = _lttb_1d(pace_raw, 500)
-                    last_run.pace_stream = [round(p, 1) for p in pace_raw]
-
-                # Extract elevation_stream from altitude
-                raw_altitude = stream_row.stream_data.get("altitude", [])
-                if raw_altitude and len(raw_altitude) > 0:
-                    if len(raw_altitude) > 500:
-                        raw_altitude = _lttb_1d(raw_altitude, 500)
-                    last_run.elevation_stream = [round(a, 1) for a in raw_altitude]
+                # pace_stream: velocity_smooth as s/km (near-zero velocity clamped)
+                pace_stream = series_at(pyramid, "pace", 500)
+                if pace_stream:
+                    last_run.pace_stream = pace_stream
+
+                # elevation_stream: altitude
+                elevation_stream = series_at(pyramid, "elevation", 500)
+                if elevation_stream:
+                    last_run.elevation_stream = elevation_stream
 
                 segments_raw = result_dict.get("segments", [])
                 last_run.segments = [
@@ -17,220 +17,52 @@ Response shape (success):
 
 AC coverage: AC-1 (endpoint contract)
 """
-from typing import Any, Dict, List
+from typing import Optional
 from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from core.database import get_db
 from core.auth import get_current_user
-from models import Activity, ActivityStream, Athlete, PlannedWorkout
+from models import Activity, ActivityStream, Athlete
 from services.run_stream_analysis import (
     AthleteContext,
 )
-from services.stream_analysis_cache import get_or_compute_analysis
+from services.stream_analysis_cache import (
+    get_or_compute_analysis,
+    get_or_compute_pyramid,
+)
+from services.stream_pyramid import PYRAMID_LEVELS, points_at
+from services.stream_reanalysis import planned_workout_for
 
 router = APIRouter(prefix="/v1/activities", tags=["stream-analysis"])
 
-# Max points returned in the stream array (LTTB downsampled if needed)
+# Default points returned in the stream array (LTTB downsampled if needed)
 MAX_STREAM_POINTS = 500
 GARMIN_PENDING_STALE_MINUTES = 30
 
 
-def _compute_grade_from_altitude(
-    alt_arr: List, vel_arr: List, time_arr: List
-) -> List:
-    """Derive grade (%) from altitude and velocity when grade_smooth is absent.
-
-    Uses a 10-second smoothing window to avoid GPS noise spikes.
-    grade = (elevation_change / horizontal_distance) * 100
-    """
-    n = len(alt_arr)
-    raw_grade = [None] * n
-    for i in range(1, n):
-        a0 = alt_arr[i - 1]
-        a1 = alt_arr[i]
-        t0 = time_arr[i - 1] if i - 1 < len(time_arr) else None
-        t1 = time_arr[i] if i < len(time_arr) else None
-        v = vel_arr[i] if i < len(vel_arr) else None
-        if a0 is None or a1 is None or t0 is None or t1 is None or v is None:
-            continue
-        dt = t1 - t0
-        if dt <= 0 or v <= 0.3:
-            continue
-        horiz_dist = v * dt
-        if horiz_dist < 0.5:
-            continue
-        raw_grade[i] = ((a1 - a0) / horiz_dist) * 100
-
-    # Smooth with a 10-second sliding window
-    window = 10
-    smoothed = [None] * n
-    for i in range(n):
-        vals = []
-        half = window // 2
-        for j in range(max(0, i - half), min(n, i + half + 1)):
-            if raw_grade[j] is not None:
-                vals.append(raw_grade[j])
-        if vals:
-            smoothed[i] = sum(vals) / len(vals)
-
-    return smoothed
-
-
-def _prepare_stream_points(
-    stream_data: Dict[str, List],
-    effort_intensity: List[float],
-    max_points: int = MAX_STREAM_POINTS,
-) -> List[Dict[str, Any]]:
-    """Zip raw channel arrays into per-point dicts for canvas visualization.
-
-    Converts Strava channel names to canvas-friendly keys:
-        heartrate → hr, velocity_smooth → pace (s/km), grade_smooth → grade
-
-    Applies LTTB downsampling if point count exceeds max_points.
-    Includes effort from the analysis result and lat/lng for map linking.
-    """
-    time_arr = stream_data.get("time", [])
-    n = len(time_arr)
-    if n == 0:
-        return []
-
-    hr_arr = stream_data.get("heartrate")
-    vel_arr = stream_data.get("velocity_smooth")
-    alt_arr = stream_data.get("altitude")
-    cad_arr = stream_data.get("cadence")
-    grade_arr = stream_data.get("grade_smooth")
-    latlng_arr = stream_data.get("latlng")
-
-    # Compute grade from altitude + velocity when grade_smooth is missing
-    if not grade_arr and alt_arr and vel_arr and len(alt_arr) == n:
-        grade_arr = _compute_grade_from_altitude(alt_arr, vel_arr, time_arr)
-
-    points = []
-    for i in range(n):
-        pt: Dict[str, Any] = {"time": time_arr[i]}
-
-        # HR
-        if hr_arr and i < len(hr_arr) and hr_arr[i] is not None:
-            pt["hr"] = hr_arr[i]
-        else:
-            pt["hr"] = None
-
-        # Pace: convert velocity (m/s) to seconds per km
-        if vel_arr and i < len(vel_arr) and vel_arr[i] is not None and vel_arr[i] > 0:
-            pt["pace"] = round(1000.0 / vel_arr[i], 1)
-        else:
-            pt["pace"] = None
-
-        # Altitude
-        if alt_arr and i < len(alt_arr) and alt_arr[i] is not None:
-            pt["altitude"] = round(alt_arr[i], 1)
-        else:
-            pt["altitude"] = None
-
-        # Cadence (Strava gives half-strides; double for SPM)
-        if cad_arr and i < len(cad_arr) and cad_arr[i] is not None:
-            raw = cad_arr[i]
-            pt["cadence"] = round(raw * 2 if raw < 120 else raw)
-        else:
-            pt["cadence"] = None
-
-        # Grade
-        if grade_arr and i < len(grade_arr) and grade_arr[i] is not None:
-            pt["grade"] = round(grade_arr[i], 2)
-        else:
-            pt["grade"] = None
-
-        # Effort (from analysis)
-        if i < len(effort_intensity):
-            pt["effort"] = round(effort_intensity[i], 4)
-        else:
-            pt["effort"] = 0.0
-
-        # GPS coordinates for pace-colored map rendering
-        if latlng_arr and i < len(latlng_arr) and latlng_arr[i] is not None:
-            pt["lat"] = round(latlng_arr[i][0], 6)
-            pt["lng"] = round(latlng_arr[i][1], 6)
-        else:
-            pt["lat"] = None
-            pt["lng"] = None
-
-        points.append(pt)
-
-    # LTTB downsample if too many points (use HR as the reference channel)
-    if len(points) > max_points:
-        points = _lttb_downsample(points, max_points)
-
-    return points
-
-
-def _lttb_downsample(
-    points: List[Dict[str, Any]], target: int
-) -> List[Dict[str, Any]]:
-    """Largest-Triangle-Three-Buckets downsampling on time/hr."""
-    n = len(points)
-    if n <= target:
-        return points
-
-    sampled = [points[0]]
-    bucket_size = (n - 2) / (target - 2)
-
-    a_idx = 0
-    for i in range(1, target - 1):
-        bucket_start = int((i - 1) * bucket_size) + 1
-        bucket_end = int(i * bucket_size) + 1
-        bucket_end = min(bucket_end, n - 1)
-
-        next_start = int(i * bucket_size) + 1
-        next_end = int((i + 1) * bucket_size) + 1
-        next_end = min(next_end, n)
-
-        # Average of next bucket (for triangle area)
-        avg_time = sum(p["time"] for p in points[next_start:next_end]) / max(1, next_end - next_start)
-        avg_hr = 0.0
-        hr_count = 0
-        for p in points[next_start:next_end]:
-            if p.get("hr") is not None:
-                avg_hr += p["hr"]
-                hr_count += 1
-        if hr_count > 0:
-            avg_hr /= hr_count
-
-        # Pick point with max triangle area
-        max_area = -1
-        best_idx = bucket_start
-        a_time = points[a_idx]["time"]
-        a_hr = points[a_idx].get("hr") or 0
-
-        for j in range(bucket_start, bucket_end):
-            p_time = points[j]["time"]
-            p_hr = points[j].get("hr") or 0
-            area = abs(
-                (a_time - avg_time) * (p_hr - a_hr)
-                - (a_time - p_time) * (avg_hr - a_hr)
-            )
-            if area > max_area:
-                max_area = area
-                best_idx = j
-
-        sampled.append(points[best_idx])
-        a_idx = best_idx
-
-    sampled.append(points[-1])
-    return sampled
-
-
 @router.get("/{activity_id}/stream-analysis")
 def get_stream_analysis(
     activity_id: UUID,
+    max_points: int = Query(
+        MAX_STREAM_POINTS, ge=10, le=max(PYRAMID_LEVELS),
+        description="Resolution of the stream array",
+    ),
+    start_s: Optional[float] = Query(None, description="Zoom window start (elapsed s)"),
+    end_s: Optional[float] = Query(None, description="Zoom window end (elapsed s)"),
     current_user: Athlete = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Analyze per-second stream data for a completed run.
 
+    The stream array is served from the precomputed chart pyramid at
+    ``max_points`` resolution; ``start_s``/``end_s`` zoom into a time window,
+    served from the coarsest stored level (down to full resolution) that
+    still has ``max_points`` samples inside it.
+
     Returns:
         - Full StreamAnalysisResult when stream_fetch_status == 'success'
         - {"status": "pending"} when fetch is in progress
@@ -298,20 +130,7 @@ def get_stream_analysis(
     )
 
     # --- Resolve linked planned workout (additive) ---
-    planned_workout_dict = None
-    linked_plan = (
-        db.query(PlannedWorkout)
-        .filter(PlannedWorkout.completed_activity_id == activity_id)
-        .first()
-    )
-    if linked_plan is not None:
-        planned_workout_dict = {
-            "title": linked_plan.title,
-            "workout_type": linked_plan.workout_type,
-            "target_duration_minutes": linked_plan.target_duration_minutes,
-            "target_distance_km": getattr(linked_plan, "target_distance_km", None),
-            "segments": getattr(linked_plan, "segments", None),
-        }
+    planned_workout_dict = planned_workout_for(db, activity_id)
 
     # --- Get Gemini client for A3 moment narratives (best-effort) ---
     gemini_client = None
@@ -323,6 +142,7 @@ def get_stream_analysis(
 
     # --- Get analysis from cache or compute + cache ---
     # Spec decision: "Cache full StreamAnalysisResult in DB."
+    # After a version bump the previous result is served while it refreshes.
     response = get_or_compute_analysis(
         activity_id=activity_id,
         stream_row=stream_row,
@@ -330,15 +150,24 @@ def get_stream_analysis(
         db=db,
         planned_workout_dict=planned_workout_dict,
         gemini_client=gemini_client,
+        serve_stale=True,
     )
 
     # --- Append per-point stream data for canvas visualization ---
-    # Zips raw channels into [{time, hr, pace, altitude, grade, cadence, effort}],
-    # LTTB downsampled to ≤500 points server-side.
-    # Note: stream points are NOT cached (they're derived from raw data + effort_intensity).
-    response["stream"] = _prepare_stream_points(
-        stream_data=stream_row.stream_data,
-        effort_intensity=response.get("effort_intensity", []),
+    # [{time, hr, pace, altitude, grade, cadence, effort, lat, lng}] served from
+    # the precomputed LTTB pyramid stored with the cached analysis; zoom
+    # windows narrower than every level are cut from the decoded raw stream.
+    pyramid = get_or_compute_pyramid(
+        activity_id=activity_id,
+        stream_row=stream_row,
+        result_dict=response,
+        db=db,
+    )
+    response["stream"] = points_at(
+        pyramid, max_points, start_s=start_s, end_s=end_s,
+        load_stream=lambda: (
+            stream_row.get_channels(), response.get("effort_intensity") or [],
+        ),
     )
 
     return response
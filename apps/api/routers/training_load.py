@@ -158,11 +158,10 @@ async def get_load_history(
         ).all()
         sport_tss: dict[str, dict] = {}
         for act in recent:
-            stress = calculator.calculate_workout_tss(act, athlete)
             s = act.sport or "run"
             if s not in sport_tss:
                 sport_tss[s] = {"tss": 0.0, "count": 0}
-            sport_tss[s]["tss"] += stress.tss
+            sport_tss[s]["tss"] += calculator.workout_tss(act, athlete)
             sport_tss[s]["count"] += 1
         total = sum(v["tss"] for v in sport_tss.values())
         weekly_split = WeeklyTSSSplitResponse(
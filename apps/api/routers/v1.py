@@ -1048,6 +1048,8 @@ def create_checkin(
     db.add(db_checkin)
     db.commit()
     db.refresh(db_checkin)
+    from core.cache import invalidate_correlation_cache
+    invalidate_correlation_cache(str(current_user.id))
 
     # ADR-065: trigger home briefing refresh on check-in
     try:
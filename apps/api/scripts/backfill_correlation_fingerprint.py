@@ -204,10 +204,11 @@ def run_backfill(athlete_ids: List[str], dry_run: bool = False):
             logger.info("  Running investigation engine (full history)...")
             try:
                 from services.race_input_analysis import mine_race_inputs
+                from services.stream_reanalysis import default_workers
                 from services.finding_persistence import store_all_findings
                 from uuid import UUID
 
-                findings, gaps = mine_race_inputs(UUID(athlete_id), db)
+                findings, gaps = mine_race_inputs(UUID(athlete_id), db, workers=default_workers())
                 if findings:
                     stats = store_all_findings(UUID(athlete_id), findings, db)
                     db.commit()
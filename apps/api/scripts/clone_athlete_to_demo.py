@@ -219,6 +219,10 @@ SKIP_TABLES: Dict[str, str] = {
     "auto_discovery_change_log":   "internal R&D ledger; not surfaced in product",
     "auto_discovery_scan_coverage": "internal R&D scan coverage; not surfaced in product",
     "coach_action_proposals":      "transient agent proposals; regen on demand",
+    "activity_pace_curve":         "derived from streams; rebuilt by tasks.backfill_pace_curves",
+    "athlete_pace_curve":          "envelope over activity_pace_curve (holds source activity ids); rebuilt with it",
+    "athlete_daily_load":          "materialized TSS/ATL/CTL series; rebuilt from activities by tasks.refresh_daily_load",
+    "athlete_load_state":          "freshness bookkeeping for athlete_daily_load; rebuilt with it",
     "recommendation_outcome":      "feedback ledger on recommendations; not relevant for demo",
 }
 
@@ -372,6 +376,9 @@ def _wipe_demo_data(db: Session, demo_id: uuid.UUID) -> Dict[str, int]:
         ("personal_best",           f"activity_id IN ({activity_id_subq})"),
         ("best_effort",             f"activity_id IN ({activity_id_subq})"),
         ("performance_event",       f"activity_id IN ({activity_id_subq})"),
+        # Derived (SKIP_TABLES) but FK to activity: clear rows built on the demo
+        ("activity_pace_curve",     f"athlete_id = '{demo_id}'"),
+        ("athlete_pace_curve",      f"athlete_id = '{demo_id}'"),
 
         # Plan children
         ("planned_workout",             f"plan_id IN ({plan_id_subq})"),
@@ -407,6 +414,10 @@ def _wipe_demo_data(db: Session, demo_id: uuid.UUID) -> Dict[str, int]:
         ("athlete_facts_audit",          f"athlete_id = '{demo_id}'"),
         ("athlete_route",                f"athlete_id = '{demo_id}'"),
         ("training_block",               f"athlete_id = '{demo_id}'"),
+        # Cloned activities are inserted without an ORM flush, so the
+        # demo's materialized load would never be marked dirty
+        ("athlete_daily_load",           f"athlete_id = '{demo_id}'"),
+        ("athlete_load_state",           f"athlete_id = '{demo_id}'"),
 
         # Recovery
         ("daily_checkin",      f"athlete_id = '{demo_id}'"),
@@ -0,0 +1,253 @@
+"""
+Persisted per-activity TSS — Activity.tss / tss_method / tss_inputs_version.
+
+TrainingLoadCalculator.calculate_workout_tss branches through hrTSS,
+rTSS and name-based estimates and reads the athlete's thresholds each
+time. Load history, the correlation inputs and Banister calibration used
+to re-run it for every activity on every replay. The result is now
+stored on the activity and read back by TrainingLoadCalculator.workout_tss.
+
+An activity's TSS depends on a subset of the athlete's thresholds, decided
+by the activity itself (its group):
+
+    short     < 5 min                  no athlete inputs
+    xt_nohr   cross-training, no HR    no athlete inputs
+    xt_hr     cross-training with HR   max_hr, resting_hr
+    run_nohr  run, no HR               threshold_pace_per_km
+    run_hr    run with HR              effort tier + observed peak/resting
+                                       HR (RPI-derived), max_hr, resting_hr,
+                                       threshold_pace_per_km
+
+tss_inputs_version is "<group>:<hash of that group's inputs>". A stored
+value is current when its version is one of the athlete's current group
+versions. So a max HR change recomputes only activities with HR, and a
+threshold pace change leaves cross-training alone. Editing an activity's
+own TSS inputs clears its version at flush time, through a before_flush
+listener installed by register_listeners() at API and worker startup.
+
+Recomputation is a vectorized batch per athlete (recompute_athlete_tss),
+run at the start of every daily-load refresh (services/daily_load), so
+new activities and threshold changes are picked up by the same
+deduplicated task.
+
+Public API:
+    current_versions(calc, athlete) → {group: version} or None
+    compute_batch(calc, activities, athlete) → (tss list, method list)
+    recompute_athlete_tss(db, athlete_id, calc=None, commit=True) → summary dict
+    register_listeners()
+"""
+import hashlib
+import json
+import logging
+import math
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import event, inspect, or_
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Bump when calculate_workout_tss changes: every stored value goes stale
+TSS_VERSION = 1
+
+# Activity columns calculate_workout_tss reads
+TSS_COLUMNS = ("athlete_id", "sport", "duration_s", "distance_m", "avg_hr", "name")
+
+_THRESHOLD_TRIMP = 0.75 * math.exp(1.8 * 0.88)
+
+
+def tss_group(activity) -> str:
+    """Which athlete inputs this activity's TSS depends on (see module docstring)."""
+    if (activity.duration_s or 0) / 60 < 5:
+        return "short"
+    sport = getattr(activity, "sport", "run") or "run"
+    prefix = "run" if sport == "run" else "xt"
+    return f"{prefix}_hr" if activity.avg_hr else f"{prefix}_nohr"
+
+
+def current_versions(calc, athlete) -> Optional[Dict[str, str]]:
+    """Current tss_inputs_version per group, or None if thresholds are unavailable."""
+    try:
+        et = calc.effort_thresholds(athlete)
+    except Exception as exc:
+        logger.debug("activity_tss thresholds unavailable for %s: %s", getattr(athlete, "id", None), exc)
+        return None
+    hr = [athlete.max_hr, athlete.resting_hr]
+    pace = [athlete.threshold_pace_per_km]
+    inputs = {
+        "short": [],
+        "xt_nohr": [],
+        "xt_hr": hr,
+        "run_nohr": pace,
+        "run_hr": [et.get("tier"), et.get("observed_peak_hr"), et.get("resting_hr")] + hr + pace,
+    }
+    versions = {}
+    for group, values in inputs.items():
+        payload = json.dumps([TSS_VERSION, group, values], default=str)
+        versions[group] = f"{group}:{hashlib.sha256(payload.encode()).hexdigest()[:16]}"
+    return versions
+
+
+# ---------------------------------------------------------------------------
+# Invalidation (flush time)
+# ---------------------------------------------------------------------------
+
+def _clear_edited_tss(session: Session, flush_context, instances) -> None:
+    from models import Activity
+
+    for obj in session.dirty:
+        if not isinstance(obj, Activity):
+            continue
+        state = inspect(obj)
+        if state.dict.get("tss_inputs_version", True) is None:
+            continue
+        if any(state.attrs[c].history.has_changes() for c in TSS_COLUMNS):
+            obj.tss_inputs_version = None
+
+
+def register_listeners() -> None:
+    """Install the TSS-clearing before_flush listener on every Session (idempotent)."""
+    if not event.contains(Session, "before_flush", _clear_edited_tss):
+        event.listen(Session, "before_flush", _clear_edited_tss)
+
+
+# ---------------------------------------------------------------------------
+# Batch computation
+# ---------------------------------------------------------------------------
+
+def _hrr_intensity(avg_hr: np.ndarray, resting: float, peak: float) -> np.ndarray:
+    hr_reserve = np.clip((avg_hr - resting) / (peak - resting), 0, 1.1)
+    return 0.75 * np.exp(1.8 * hr_reserve) / _THRESHOLD_TRIMP
+
+
+def compute_batch(calc, activities: List[Any], athlete) -> Tuple[List[Optional[float]], List[Optional[str]]]:
+    """
+    calculate_workout_tss for many activities of one athlete at once.
+
+    Branch selection and formulas match the scalar path; each branch is one
+    NumPy expression over its activities. Entries are None where the scalar
+    path would raise (HR reserve of zero width) — those stay unstored and
+    keep going through calculate_workout_tss.
+    """
+    n = len(activities)
+    if n == 0:
+        return [], []
+
+    duration_s = np.array([a.duration_s or 0 for a in activities], dtype=float)
+    distance_m = np.array([a.distance_m or 0 for a in activities], dtype=float)
+    avg_hr = np.array([a.avg_hr or 0 for a in activities], dtype=float)
+    sports = [getattr(a, "sport", "run") or "run" for a in activities]
+    minutes = duration_s / 60
+
+    short = minutes < 5
+    run = np.array([s == "run" for s in sports]) & ~short
+    xt = ~run & ~short
+    has_hr = avg_hr != 0
+
+    et = calc.effort_thresholds(athlete)
+    peak, et_resting = et.get("observed_peak_hr"), et.get("resting_hr")
+    max_hr, resting_hr = athlete.max_hr, athlete.resting_hr
+    threshold_pace = athlete.threshold_pace_per_km
+    can_n1 = bool(peak and et_resting and et.get("tier") == "hrr")
+    can_hr = bool(max_hr and resting_hr)
+
+    intensity = np.zeros(n)
+    methods = np.full(n, "too_short", dtype=object)
+    failed = np.zeros(n, dtype=bool)
+
+    def apply_hrr(mask, resting, top, method):
+        if not mask.any():
+            return
+        if top == resting:
+            failed[mask] = True
+            return
+        intensity[mask] = _hrr_intensity(avg_hr[mask], resting, top)
+        methods[mask] = method
+
+    # Cross-training: hrTSS with athlete max/resting HR, else a per-sport IF
+    xt_hr = xt & has_hr & can_hr
+    apply_hrr(xt_hr, resting_hr, max_hr, "hrTSS")
+    for i in np.flatnonzero(xt & ~xt_hr):
+        intensity[i] = calc._CROSS_TRAINING_IF.get(sports[i], 0.60)
+        methods[i] = f"estimated_{sports[i]}"
+
+    # Running: hrTSS_n1 → hrTSS → rTSS → name estimate
+    n1 = run & has_hr & can_n1
+    apply_hrr(n1, et_resting, peak, "hrTSS_n1")
+    run_hr = run & has_hr & ~n1 & can_hr
+    apply_hrr(run_hr, resting_hr, max_hr, "hrTSS")
+    rest = run & ~n1 & ~run_hr
+    rtss = rest & (distance_m > 0) & (duration_s > 0) & bool(threshold_pace)
+    if rtss.any():
+        pace = duration_s[rtss] / (distance_m[rtss] / 1000)
+        ratio = np.divide(threshold_pace, pace, out=np.zeros_like(pace), where=pace > 0)
+        intensity[rtss] = np.clip(ratio, 0.5, 1.5)
+        methods[rtss] = "rTSS"
+    for i in np.flatnonzero(rest & ~rtss):
+        intensity[i] = calc._estimated_intensity(activities[i])
+        methods[i] = "estimated"
+
+    tss = (minutes * intensity ** 2) / 60 * 100
+    tss[short] = 0.0
+
+    tss_out: List[Optional[float]] = []
+    method_out: List[Optional[str]] = []
+    for value, method, bad in zip(tss.tolist(), methods.tolist(), failed.tolist()):
+        tss_out.append(None if bad else round(value, 1))
+        method_out.append(None if bad else method)
+    return tss_out, method_out
+
+
+# ---------------------------------------------------------------------------
+# Write path
+# ---------------------------------------------------------------------------
+
+def recompute_athlete_tss(db: Session, athlete_id: UUID, *, calc=None, commit: bool = True) -> Dict[str, Any]:
+    """
+    Store TSS on every activity of the athlete whose stored value is missing
+    or stale, leaving activities whose group inputs are unchanged untouched.
+    """
+    from models import Activity, Athlete
+    from services.training_load import TrainingLoadCalculator
+
+    athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
+    if not athlete:
+        return {"status": "skipped", "reason": "athlete_not_found"}
+
+    calc = calc or TrainingLoadCalculator(db)
+    versions = current_versions(calc, athlete)
+    if versions is None:
+        return {"status": "skipped", "reason": "thresholds_unavailable"}
+
+    stale = (
+        db.query(Activity)
+        .filter(
+            Activity.athlete_id == athlete_id,
+            or_(
+                Activity.tss_inputs_version.is_(None),
+                Activity.tss_inputs_version.notin_(list(versions.values())),
+            ),
+        )
+        .all()
+    )
+
+    tss_values, methods = compute_batch(calc, stale, athlete)
+    changed = 0
+    stored = 0
+    for act, tss, method in zip(stale, tss_values, methods):
+        if tss is None:
+            continue
+        if act.tss != tss or act.tss_method != method:
+            changed += 1
+        act.tss = tss
+        act.tss_method = method
+        act.tss_inputs_version = versions[tss_group(act)]
+        stored += 1
+
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return {"status": "ok", "recomputed": stored, "changed": changed, "skipped": len(stale) - stored}
@@ -4,8 +4,9 @@ Pairwise Interaction Loop — Phase 0B (founder-only, shadow mode).
 Turns the existing combination-correlation helper into a persisted,
 scored shadow discovery loop.
 
-Scope: pairwise only.  Three-way and higher-order interactions are
-explicitly out of scope for Phase 0B.
+Scope: the nightly loop runs pairwise only.  `_find_interactions()` also
+evaluates three-way combinations (order=3), but surfacing them is out of
+scope for Phase 0B.
 
 Output metrics supported: efficiency, pace_easy, pace_threshold, completion.
 
@@ -21,10 +22,10 @@ import logging
 import math
 import time
 from datetime import datetime, timedelta
-from statistics import mean, stdev
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
+import numpy as np
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -211,69 +212,92 @@ def _find_pairwise_interactions(
     min_effect: float,
     top_n: int,
 ) -> List[Dict[str, Any]]:
-    """Core median-split pairwise test loop."""
-    # Build binary splits.
-    splits: Dict[str, Dict] = {}
-    for input_name, data in all_inputs.items():
-        if len(data) < min_group * 2:
-            continue
-        values = [v for _, v in data]
-        median_val = sorted(values)[len(values) // 2]
-        splits[input_name] = {
-            "high": {d for d, v in data if v >= median_val},
-            "low": {d for d, v in data if v < median_val},
-            "median": median_val,
-        }
-
-    input_names = list(splits.keys())
-    results: List[Dict[str, Any]] = []
-    tested: List[tuple] = []
+    """Core median-split pairwise test (see _find_interactions)."""
+    return _find_interactions(
+        all_inputs, output_dict, output_metric, min_group, min_effect, top_n, order=2,
+    )
 
-    for i in range(len(input_names)):
-        for j in range(i + 1, len(input_names)):
-            n1, n2 = input_names[i], input_names[j]
-            s1, s2 = splits[n1], splits[n2]
 
-            both_high = s1["high"] & s2["high"]
-            both_low = s1["low"] & s2["low"]
+def _find_interactions(
+    all_inputs: Dict[str, Any],
+    output_dict: Dict[Any, float],
+    output_metric: str,
+    min_group: int,
+    min_effect: float,
+    top_n: int,
+    order: int = 2,
+) -> Dict[str, Any]:
+    """
+    Median-split interaction test over every combination of ``order`` inputs.
 
-            eff_high = [output_dict[d] for d in both_high if d in output_dict]
-            eff_low = [output_dict[d] for d in both_low if d in output_dict]
+    Each input is split at its median into high/low day-masks over the
+    output's days.  For a combination, the "all high" group is the days on
+    which every factor is high (likewise "all low"); the effect is Cohen's d
+    of the output between the two groups.  Group sizes, sums and sums of
+    squares for all combinations come out of masked matrix products, so
+    the scan is a few BLAS calls rather than a set intersection per pair.
 
-            if len(eff_high) < min_group or len(eff_low) < min_group:
-                continue
+    Combinations are reported in the nested-loop order (i < j < ...) and
+    ranked by |d| with a stable sort, so ties keep that order.
+    """
+    names, high, low, y = _split_masks(all_inputs, output_dict, min_group)
+    if len(names) < order or not len(y):
+        return {"top_interactions": [], "tested_pairs": []}
+
+    # Center the output: sums of squares stay well conditioned and the
+    # group difference is unchanged.
+    y_mean = float(y.mean())
+    yc = y - y_mean
+
+    combos, hi_rows, lo_rows = _extend_combos(high, low, order - 1)
+    a_idx, b_idx = np.nonzero(np.arange(len(names))[None, :] > combos[:, -1][:, None])
+
+    n_h, s_h, q_h = (m[a_idx, b_idx] for m in _group_moments(hi_rows, high, yc))
+    n_l, s_l, q_l = (m[a_idx, b_idx] for m in _group_moments(lo_rows, low, yc))
+
+    testable = (n_h >= min_group - 0.5) & (n_l >= min_group - 0.5)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m_h = s_h / n_h
+        m_l = s_l / n_l
+        var_h = _sample_variance(n_h, s_h, q_h)
+        var_l = _sample_variance(n_l, s_l, q_l)
+        pooled = np.where((n_h > 1.5) & (n_l > 1.5), np.sqrt((var_h + var_l) / 2), 1.0)
+        effect = np.where(pooled > 0, (m_h - m_l) / pooled, 0.0)
+
+    lower_is_better = "pace" in output_metric
+    condition = "both_high" if order == 2 else "all_high"
+    tested: List[tuple] = []
+    results: List[Dict[str, Any]] = []
 
-            tested.append((n1, n2))
+    for k in np.flatnonzero(testable):
+        factors = [names[c] for c in combos[a_idx[k]]] + [names[b_idx[k]]]
+        tested.append(tuple(factors))
 
-            m_high = mean(eff_high)
-            m_low = mean(eff_low)
-            if len(eff_high) > 1 and len(eff_low) > 1:
-                pooled = math.sqrt((stdev(eff_high) ** 2 + stdev(eff_low) ** 2) / 2)
-            else:
-                pooled = 1.0
-            effect = (m_high - m_low) / pooled if pooled > 0 else 0.0
+        d = float(effect[k])
+        if abs(d) < min_effect:
+            continue
 
-            if abs(effect) < min_effect:
-                continue
+        # Lower output = better for pace metrics; higher = better for completion/efficiency-style.
+        high_is_better = (d < 0) if lower_is_better else (d > 0)
+        if order == 2:
+            when = f"both {factors[0]} and {factors[1]} are high"
+        else:
+            when = f"{', '.join(factors[:-1])} and {factors[-1]} are all high"
 
-            # Lower output = better for pace metrics; higher = better for completion/efficiency-style.
-            lower_is_better = "pace" in output_metric
-            high_is_better = (effect < 0) if lower_is_better else (effect > 0)
-
-            results.append({
-                "factors": [n1, n2],
-                "output_metric": output_metric,
-                "condition": "both_high",
-                "effect_size": round(effect, 3),
-                "mean_high": round(m_high, 4),
-                "mean_low": round(m_low, 4),
-                "n_high": len(eff_high),
-                "n_low": len(eff_low),
-                "high_group_better": high_is_better,
-                "direction_label": (
-                    f"{'lower' if lower_is_better else 'higher'} {output_metric} when both {n1} and {n2} are high"
-                ),
-            })
+        results.append({
+            "factors": factors,
+            "output_metric": output_metric,
+            "condition": condition,
+            "effect_size": round(d, 3),
+            "mean_high": round(float(m_h[k]) + y_mean, 4),
+            "mean_low": round(float(m_l[k]) + y_mean, 4),
+            "n_high": int(round(n_h[k])),
+            "n_low": int(round(n_l[k])),
+            "high_group_better": high_is_better,
+            "direction_label": (
+                f"{'lower' if lower_is_better else 'higher'} {output_metric} when {when}"
+            ),
+        })
 
     results.sort(key=lambda x: abs(x["effect_size"]), reverse=True)
     return {
@@ -282,6 +306,71 @@ def _find_pairwise_interactions(
     }
 
 
+def _split_masks(
+    all_inputs: Dict[str, Any],
+    output_dict: Dict[Any, float],
+    min_group: int,
+):
+    """Median-split high/low masks (inputs × output days) and the output vector."""
+    day_index = {d: t for t, d in enumerate(output_dict)}
+    y = np.fromiter(output_dict.values(), dtype=float, count=len(output_dict))
+
+    names: List[str] = []
+    high_rows: List[np.ndarray] = []
+    low_rows: List[np.ndarray] = []
+    for input_name, data in all_inputs.items():
+        if len(data) < min_group * 2:
+            continue
+        values = [v for _, v in data]
+        median_val = sorted(values)[len(values) // 2]
+        high = np.zeros(len(y))
+        low = np.zeros(len(y))
+        for d, v in data:
+            t = day_index.get(d)
+            if t is None:
+                continue
+            if v >= median_val:
+                high[t] = 1.0
+            else:
+                low[t] = 1.0
+        names.append(input_name)
+        high_rows.append(high)
+        low_rows.append(low)
+
+    shape = (len(names), len(y))
+    high = np.array(high_rows).reshape(shape)
+    low = np.array(low_rows).reshape(shape)
+    return names, high, low, y
+
+
+def _extend_combos(high: np.ndarray, low: np.ndarray, size: int):
+    """
+    Every increasing index combination of ``size`` inputs, in loop order,
+    with the elementwise product of its members' high and low masks.
+    """
+    k = high.shape[0]
+    combos = np.arange(k)[:, None]
+    hi, lo = high, low
+    for _ in range(size - 1):
+        a_idx, b_idx = np.nonzero(np.arange(k)[None, :] > combos[:, -1][:, None])
+        combos = np.column_stack([combos[a_idx], b_idx])
+        hi = hi[a_idx] * high[b_idx]
+        lo = lo[a_idx] * low[b_idx]
+    return combos, hi, lo
+
+
+def _group_moments(rows: np.ndarray, masks: np.ndarray, y: np.ndarray):
+    """Count, Σy and Σy² over the days shared by each row and each mask."""
+    return rows @ masks.T, (rows * y) @ masks.T, (rows * y * y) @ masks.T
+
+
+def _sample_variance(n: np.ndarray, s: np.ndarray, q: np.ndarray) -> np.ndarray:
+    ss = q - s * s / n
+    # A constant group leaves only rounding residue; statistics.stdev gives 0.
+    ss = np.where(ss > 1e-12 * q, ss, 0.0)
+    return ss / (n - 1)
+
+
 def _score_interaction(candidate: Dict[str, Any]) -> Dict[str, Any]:
     """
     Compute a transparent founder-reviewable score for a pairwise candidate.
@@ -60,6 +60,7 @@ def run_pilot_tuning_loop(
     """
     from services.race_input_analysis import (
         INVESTIGATION_REGISTRY,
+        AthleteInvestigationSnapshot,
         InvestigationSpec,
     )
     from services.auto_discovery.fqs_adapters import AthleteFindingFQSAdapter
@@ -76,6 +77,13 @@ def run_pilot_tuning_loop(
 
     experiment_results: List[Dict[str, Any]] = []
 
+    # One data load shared by every baseline and candidate run.
+    try:
+        snapshot = AthleteInvestigationSnapshot.load(athlete_id, db)
+    except Exception as exc:
+        logger.warning("Tuning: snapshot load failed for %s: %s", athlete_id_str, exc)
+        snapshot = None
+
     for inv_name in PILOT_INVESTIGATIONS:
         spec = pilot_specs.get(inv_name)
         if spec is None:
@@ -92,6 +100,7 @@ def run_pilot_tuning_loop(
             params=baseline_config,
             athlete_id=athlete_id,
             db=db,
+            snapshot=snapshot,
         )
         baseline_score = adapter.score_finding_list(baseline_findings)
 
@@ -110,6 +119,7 @@ def run_pilot_tuning_loop(
                     params=candidate_params,
                     athlete_id=athlete_id,
                     db=db,
+                    snapshot=snapshot,
                 )
                 runtime_ms = int((time.monotonic() - t0) * 1000)
 
@@ -207,6 +217,7 @@ def _run_with_config(
     params: Dict[str, Any],
     athlete_id: UUID,
     db: Session,
+    snapshot=None,
 ) -> Tuple[list, Optional[str]]:
     """
     Run an investigation under shadow parameter overrides.
@@ -216,13 +227,15 @@ def _run_with_config(
     This keeps the change local to the pilot subset and does not rewrite
     the investigation functions themselves.
 
+    ``snapshot`` (AthleteInvestigationSnapshot) supplies zones, races and
+    the athlete's data when the caller already loaded it.
+
     Returns (findings_list, error_string_or_None).
     """
     from services.race_input_analysis import (
         INVESTIGATION_REGISTRY,
-        load_training_zones,
+        AthleteInvestigationSnapshot,
     )
-    from models import PerformanceEvent
 
     spec = next((s for s in INVESTIGATION_REGISTRY if s.name == inv_name), None)
     if spec is None:
@@ -230,14 +243,12 @@ def _run_with_config(
 
     # Load context required by pilot investigations.
     try:
-        zones = load_training_zones(athlete_id, db)
+        if snapshot is None:
+            snapshot = AthleteInvestigationSnapshot.load(athlete_id, db)
+        zones = snapshot.zones
         if not zones:
             return [], "no training zones available"
-
-        events = db.query(PerformanceEvent).filter(
-            PerformanceEvent.athlete_id == athlete_id,
-            PerformanceEvent.user_confirmed == True,  # noqa: E712
-        ).order_by(PerformanceEvent.event_date).all()
+        events = snapshot.races
     except Exception as exc:
         return [], f"context load error: {exc}"
 
@@ -250,7 +261,7 @@ def _run_with_config(
         if "min_data_weeks" in params:
             spec.min_data_weeks = int(params["min_data_weeks"])
 
-        result = spec.fn(athlete_id, db, zones, events)
+        result = spec.fn(athlete_id, db, zones, events, snapshot=snapshot)
     except Exception as exc:
         return [], str(exc)
     finally:
@@ -479,6 +490,32 @@ def get_active_param_overrides(
     return config.param_overrides if config else None
 
 
+def get_active_param_overrides_by_investigation(
+    athlete_id: UUID,
+    db: Session,
+) -> Dict[str, Dict[str, Any]]:
+    """Active param_overrides for every investigation of this athlete, in one query.
+
+    Same rule as get_active_param_overrides: the latest non-reverted
+    config per investigation. Investigations without one are absent.
+    """
+    from models import AthleteInvestigationConfig
+
+    configs = (
+        db.query(AthleteInvestigationConfig)
+        .filter(
+            AthleteInvestigationConfig.athlete_id == athlete_id,
+            AthleteInvestigationConfig.reverted == False,  # noqa: E712
+        )
+        .order_by(AthleteInvestigationConfig.applied_at.desc())
+        .all()
+    )
+    latest: Dict[str, Any] = {}
+    for config in configs:
+        latest.setdefault(config.investigation_name, config.param_overrides)
+    return {name: params for name, params in latest.items() if params}
+
+
 def count_consecutive_kept_runs(
     athlete_id: UUID,
     investigation_name: str,
@@ -509,17 +546,24 @@ def run_investigation_with_athlete_overrides(
     athlete_id: UUID,
     investigation_name: str,
     db: Session,
+    snapshot=None,
+    overrides_by_investigation: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> Tuple[list, Optional[str], Optional[dict]]:
     """Run an investigation using any active per-athlete param overrides.
 
     Used by the daily sweep and race input analysis to incorporate Phase 1 tuning.
+    ``overrides_by_investigation`` (from get_active_param_overrides_by_investigation)
+    replaces the per-investigation lookup, so the run itself issues no query.
     Returns (findings, error_str, applied_overrides_or_None).
     """
-    active_overrides = get_active_param_overrides(athlete_id, investigation_name, db)
+    if overrides_by_investigation is not None:
+        active_overrides = overrides_by_investigation.get(investigation_name)
+    else:
+        active_overrides = get_active_param_overrides(athlete_id, investigation_name, db)
     if active_overrides:
-        findings, err = _run_with_config(investigation_name, active_overrides, athlete_id, db)
+        findings, err = _run_with_config(investigation_name, active_overrides, athlete_id, db, snapshot)
         return findings, err, active_overrides
     else:
-        findings, err = _run_with_config(investigation_name, {}, athlete_id, db)
+        findings, err = _run_with_config(investigation_name, {}, athlete_id, db, snapshot)
         return findings, err, None
 
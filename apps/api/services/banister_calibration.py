@@ -0,0 +1,192 @@
+"""Banister calibration — closed-form, array-backed engine.
+
+Fits Performance(t) = p0 + k1*CTL(t) - k2*ATL(t), where CTL and ATL are
+the exponential filters
+
+    y(t) = y(t-1) * d + tss(t) * (1 - d),    d = exp(-1/tau),  y(-1) = 0
+
+used by IndividualPerformanceModel, to weighted performance markers.
+
+For fixed (tau1, tau2) the model is linear in (p0, k1, k2), so the
+weighted least-squares fit is closed form:
+
+    - p0 is eliminated by weighted centering: p0 = ȳ - k1*c̄ + k2*ā.
+    - (k1, k2) solve a 2x2 normal system. With k1/k2 boxed by their bounds
+      the problem is a convex QP in two variables, so the optimum is either
+      the unconstrained solution (if inside the box) or the best clamped
+      1-D solution along one of the four box edges.
+
+Only the filter values on marker days are needed. They are computed for
+a whole vector of taus at once as (1-d) * Σ d^(m-s) * tss(s), one array
+expression per tau grid. Calibration is then:
+
+    1. tau1 x tau2 grid over the bounds, gains solved for every pair.
+    2. Pattern search on the taus only, from the best grid pair, with the
+       gains re-solved in closed form at each candidate.
+
+Public API:
+    filter_at(tss, marker_idx, taus) → (len(taus), len(marker_idx)) array
+    solve_gains(ctl, atl, values, weights, k1_bounds, k2_bounds) → (k1, k2, p0, sse)
+    fit_banister(tss, marker_idx, values, weights, bounds...) → BanisterFit
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+
+TAU1_GRID_STEP = 1.0
+TAU2_GRID_STEP = 0.5
+REFINE_MIN_STEP = 0.005
+REFINE_MAX_ITERATIONS = 60
+
+
+@dataclass
+class BanisterFit:
+    tau1: float
+    tau2: float
+    k1: float
+    k2: float
+    p0: float
+    fit_error: float  # weighted sum of squared errors
+
+
+def filter_at(tss: np.ndarray, marker_idx: np.ndarray, taus: np.ndarray) -> np.ndarray:
+    """Exponential filter value on each marker day, for every tau."""
+    taus = np.asarray(taus, dtype=float)
+    n = int(marker_idx.max()) + 1 if len(marker_idx) else 0
+    lag = marker_idx[:, None] - np.arange(n)[None, :]            # (M, N)
+    live = lag >= 0
+    lag = np.where(live, lag, 0)
+    decay = np.exp(-1.0 / taus)                                   # (K,)
+    weights = np.exp(-lag[None, :, :] / taus[:, None, None]) * live  # d ** lag, (K, M, N)
+    return (1 - decay)[:, None] * (weights @ tss[:n])
+
+
+def solve_gains(
+    ctl: np.ndarray,
+    atl: np.ndarray,
+    values: np.ndarray,
+    weights: np.ndarray,
+    k1_bounds: Tuple[float, float],
+    k2_bounds: Tuple[float, float],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Box-constrained weighted least squares for (k1, k2, p0) on every
+    (tau1, tau2) pair.
+
+    ctl is (T1, M) — one row per tau1; atl is (T2, M) — one row per tau2.
+    Returns (k1, k2, p0, sse), each (T1, T2).
+    """
+    w = weights / weights.sum()
+    c_bar = ctl @ w                                  # (T1,)
+    a_bar = atl @ w                                  # (T2,)
+    y_bar = values @ w
+    u = ctl - c_bar[:, None]
+    v = atl - a_bar[:, None]
+    z = values - y_bar
+
+    s_uu = (u * u) @ w
+    s_vv = (v * v) @ w
+    s_uz = u @ (w * z)
+    s_vz = v @ (w * z)
+    s_zz = z @ (w * z)
+    s_uv = (u * w) @ v.T                             # (T1, T2)
+
+    s_uu, s_vv = s_uu[:, None], s_vv[None, :]
+    s_uz, s_vz = s_uz[:, None], s_vz[None, :]
+    shape = s_uv.shape
+
+    def sse(k1, k2):
+        return s_zz - 2 * k1 * s_uz + 2 * k2 * s_vz + k1 * k1 * s_uu - 2 * k1 * k2 * s_uv + k2 * k2 * s_vv
+
+    k1_lo, k1_hi = k1_bounds
+    k2_lo, k2_hi = k2_bounds
+    candidates = []
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Interior: unconstrained normal-equation solution, when it lies in the box
+        det = s_uu * s_vv - s_uv * s_uv
+        k1 = (s_uz * s_vv - s_uv * s_vz) / det
+        k2 = (s_uv * s_uz - s_uu * s_vz) / det
+        inside = (det > 0) & (k1 >= k1_lo) & (k1 <= k1_hi) & (k2 >= k2_lo) & (k2 <= k2_hi)
+        k1 = np.where(inside, k1, k1_lo)
+        k2 = np.where(inside, k2, k2_lo)
+        candidates.append((k1, k2, np.where(inside, sse(k1, k2), np.inf)))
+
+        # Edges: one gain pinned to a bound, the other its clamped 1-D optimum
+        for k1_edge in (k1_lo, k1_hi):
+            k1 = np.full(shape, k1_edge)
+            k2 = np.where(s_vv > 0, (k1 * s_uv - s_vz) / s_vv, k2_lo)
+            k2 = np.clip(np.nan_to_num(k2, nan=k2_lo), k2_lo, k2_hi)
+            candidates.append((k1, k2, sse(k1, k2)))
+        for k2_edge in (k2_lo, k2_hi):
+            k2 = np.full(shape, k2_edge)
+            k1 = np.where(s_uu > 0, (s_uz + k2 * s_uv) / s_uu, k1_lo)
+            k1 = np.clip(np.nan_to_num(k1, nan=k1_lo), k1_lo, k1_hi)
+            candidates.append((k1, k2, sse(k1, k2)))
+
+    k1_all = np.stack([c[0] for c in candidates])
+    k2_all = np.stack([c[1] for c in candidates])
+    sse_all = np.stack([c[2] for c in candidates])
+    best = np.argmin(sse_all, axis=0)[None]
+    k1 = np.take_along_axis(k1_all, best, axis=0)[0]
+    k2 = np.take_along_axis(k2_all, best, axis=0)[0]
+    err = np.take_along_axis(sse_all, best, axis=0)[0]
+    p0 = y_bar - k1 * c_bar[:, None] + k2 * a_bar[None, :]
+    # Gains were solved on normalized weights; report the caller's scale
+    return k1, k2, p0, err * weights.sum()
+
+
+def _best(tss, marker_idx, values, weights, tau1s, tau2s, k1_bounds, k2_bounds):
+    """Best (sse, tau1, tau2, k1, k2, p0) over the tau1 x tau2 grid."""
+    ctl = filter_at(tss, marker_idx, tau1s)
+    atl = filter_at(tss, marker_idx, tau2s)
+    k1, k2, p0, err = solve_gains(ctl, atl, values, weights, k1_bounds, k2_bounds)
+    # Fitness must decay slower than fatigue
+    err = np.where(tau1s[:, None] > tau2s[None, :], err, np.inf)
+    i, j = np.unravel_index(np.argmin(err), err.shape)
+    return err[i, j], tau1s[i], tau2s[j], k1[i, j], k2[i, j], p0[i, j]
+
+
+def fit_banister(
+    tss: Sequence[float],
+    marker_idx: Sequence[int],
+    values: Sequence[float],
+    weights: Sequence[float],
+    tau1_bounds: Tuple[float, float],
+    tau2_bounds: Tuple[float, float],
+    k1_bounds: Tuple[float, float],
+    k2_bounds: Tuple[float, float],
+) -> BanisterFit:
+    """
+    Weighted least-squares Banister fit within the given bounds.
+
+    tss is the daily series (rest days included, oldest first);
+    marker_idx are indices into it, with values and weights per marker.
+    """
+    tss = np.asarray(tss, dtype=float)
+    marker_idx = np.asarray(marker_idx, dtype=int)
+    values = np.asarray(values, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    gains = (k1_bounds, k2_bounds)
+
+    tau1s = np.arange(tau1_bounds[0], tau1_bounds[1] + 1e-9, TAU1_GRID_STEP)
+    tau2s = np.arange(tau2_bounds[0], tau2_bounds[1] + 1e-9, TAU2_GRID_STEP)
+    best = _best(tss, marker_idx, values, weights, tau1s, tau2s, *gains)
+
+    step1, step2 = TAU1_GRID_STEP / 2, TAU2_GRID_STEP / 2
+    for _ in range(REFINE_MAX_ITERATIONS):
+        if step1 < REFINE_MIN_STEP and step2 < REFINE_MIN_STEP:
+            break
+        _, tau1, tau2 = best[:3]
+        around1 = np.clip([tau1 - step1, tau1, tau1 + step1], *tau1_bounds)
+        around2 = np.clip([tau2 - step2, tau2, tau2 + step2], *tau2_bounds)
+        candidate = _best(tss, marker_idx, values, weights, around1, around2, *gains)
+        if candidate[0] < best[0]:
+            best = candidate
+        else:
+            step1, step2 = step1 / 2, step2 / 2
+
+    err, tau1, tau2, k1, k2, p0 = (float(x) for x in best)
+    return BanisterFit(tau1=tau1, tau2=tau2, k1=k1, k2=k2, p0=p0, fit_error=max(err, 0.0))
@@ -1,19 +1,21 @@
 """
 Best Effort Service
 
-Manages extraction, storage, and aggregation of best efforts from Strava.
+Manages extraction, storage, and aggregation of best efforts.
 Best efforts are the fastest times for standard distances WITHIN any activity
-(e.g., fastest mile within a 10k run).
+(e.g., fastest mile within a 10k run). Strava activities use the efforts
+Strava reports; other runs (Garmin, file imports) derive them from their
+stream (services/stream_best_efforts.py).
 
 Architecture:
 - BestEffort table: Stores ALL efforts (history, trends, age-grading)
 - PersonalBest table: Aggregation of fastest per distance (derived, regenerated)
 """
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from models import Activity, Athlete, BestEffort, PersonalBest
+from models import Activity, ActivityStream, Athlete, BestEffort, PersonalBest
 from services.performance_engine import calculate_age_at_date
 
 
@@ -147,6 +149,79 @@ def extract_best_efforts_from_activity(
     return stored
 
 
+def extract_best_efforts_from_stream(
+    activity: Activity,
+    athlete: Athlete,
+    db: Session,
+    stream_data: Optional[Dict] = None,
+) -> int:
+    """
+    Derive and store best efforts from a run's time/distance stream.
+
+    For non-Strava runs (Strava's own best_efforts stay authoritative for
+    Strava activities). Re-running replaces the activity's stream-derived
+    rows, so a re-ingested stream never leaves stale efforts behind. Marks
+    activity.best_efforts_extracted_at. Does not commit.
+
+    Args:
+        activity: Activity the stream belongs to
+        athlete: Athlete who performed the activity
+        db: Database session
+        stream_data: Decoded stream (time + distance suffice); loaded from
+            ActivityStream when omitted
+
+    Returns:
+        Number of best efforts stored
+    """
+    from services.personal_best import _is_plausible_effort
+    from services.stream_best_efforts import find_best_efforts
+
+    if activity.provider == 'strava' or (activity.sport or 'run') != 'run':
+        return 0
+
+    if stream_data is None:
+        stream_row = db.query(ActivityStream).filter(
+            ActivityStream.activity_id == activity.id
+        ).first()
+        if stream_row is None or not stream_row.has_data:
+            return 0
+        stream_data = stream_row.get_channels(['time', 'distance'])
+
+    efforts = find_best_efforts(stream_data)
+
+    db.query(BestEffort).filter(
+        BestEffort.activity_id == activity.id,
+        BestEffort.strava_effort_id.is_(None),
+    ).delete(synchronize_session=False)
+
+    stored = 0
+    for category, effort in efforts.items():
+        elapsed_time = int(round(effort.elapsed_s))
+        distance_meters = STANDARD_DISTANCES[category]
+
+        # Reject physically impossible efforts (GPS corruption)
+        if not _is_plausible_effort(distance_meters, elapsed_time, category):
+            continue
+
+        achieved_at = activity.start_time
+        if achieved_at is not None:
+            achieved_at = achieved_at + timedelta(seconds=effort.start_offset_s)
+
+        db.add(BestEffort(
+            athlete_id=athlete.id,
+            activity_id=activity.id,
+            distance_category=category,
+            distance_meters=distance_meters,
+            elapsed_time=elapsed_time,
+            achieved_at=achieved_at,
+            strava_effort_id=None,
+        ))
+        stored += 1
+
+    activity.best_efforts_extracted_at = datetime.now(timezone.utc)
+    return stored
+
+
 def regenerate_personal_bests(athlete: Athlete, db: Session) -> Dict[str, int]:
     """
     Regenerate PersonalBest records by MERGING BestEffort data with existing PBs.
@@ -219,11 +219,14 @@ def compute_cardiac_signature_for_activity(
     stream = db.query(ActivityStream).filter(
         ActivityStream.activity_id == activity_id
     ).first()
-    if not stream or not stream.stream_data:
+    if not stream:
+        return None
+    channels = stream.get_channels(["heartrate", "time"])
+    if not channels:
         return None
 
-    hr_data = stream.stream_data.get("heartrate", [])
-    time_data = stream.stream_data.get("time", [])
+    hr_data = channels.get("heartrate", [])
+    time_data = channels.get("time", [])
 
     if not hr_data or not time_data:
         return None
@@ -979,10 +979,13 @@ def get_mile_splits(
     split_meta: Dict[str, Any] = {}
     stream_warning: Optional[str] = None
 
-    if stream_row and isinstance(stream_row.stream_data, dict):
-        distances = _to_float_list(stream_row.stream_data.get("distance"))
-        times = _to_float_list(stream_row.stream_data.get("time"))
-        heartrate = _to_float_list(stream_row.stream_data.get("heartrate"))
+    split_channels = (
+        stream_row.get_channels(["distance", "time", "heartrate"]) if stream_row else None
+    )
+    if isinstance(split_channels, dict):
+        distances = _to_float_list(split_channels.get("distance"))
+        times = _to_float_list(split_channels.get("time"))
+        heartrate = _to_float_list(split_channels.get("heartrate"))
         if len(distances) >= 2 and len(times) >= 2:
             pair_count = min(len(distances), len(times))
             samples: List[Tuple[float, float]] = []
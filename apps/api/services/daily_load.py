@@ -0,0 +1,382 @@
+"""
+Materialized daily training load — AthleteDailyLoad / AthleteLoadState.
+
+TrainingLoadCalculator used to reload every activity since the athlete's
+first run and rerun TSS + the ATL/CTL EMA on every read. The series is
+now stored one row per day, and reads touch only the requested window:
+
+    stored rows  [first_date .. tail_from - 1]   read as-is
+    tail         [tail_from .. end]              EMA resumed in memory from
+                                                 the stored row at tail_from - 1
+
+tail_from is the day after computed_through, or the earliest dirty day
+if an activity was inserted, edited, deleted or flagged duplicate since
+the last refresh. Only the tail's activities are loaded and scored, so a
+read is O(window + tail), not O(history).
+
+Dirty days are recorded by a Session after_flush listener, in the same
+transaction as the activity change (inside a savepoint — a failure there
+never breaks ingestion). The listener is installed by register_listeners()
+at API and worker startup (main.py, tasks/__init__.py). Reads never write: a stale series is served
+from stored rows + tail and a refresh is enqueued (tasks.refresh_daily_load),
+which rewrites rows from the dirty day forward.
+
+The whole series is recomputed when the athlete's TSS inputs (HR and
+pace thresholds) change; inputs_hash detects that. Each refresh first
+brings the per-activity stored TSS up to date (services/activity_tss).
+
+Public API:
+    load_series(calc, athlete, start, end) → (first_date, [DailyLoad])
+    refresh_athlete(db, athlete_id, commit=True) → {"from": date, "days": int}
+    enqueue_refresh(athlete_id) → bool
+    register_listeners()
+"""
+import hashlib
+import json
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Columns whose change alters an activity's contribution to daily load
+LOAD_COLUMNS = (
+    "athlete_id", "start_time", "is_duplicate", "sport",
+    "duration_s", "distance_m", "avg_hr", "name", "workout_type",
+)
+
+REFRESH_DEDUP_S = 600
+
+
+def _refresh_key(athlete_id: Any) -> str:
+    return f"daily_load:refresh:{athlete_id}"
+
+
+# ---------------------------------------------------------------------------
+# Dirty tracking (flush time)
+# ---------------------------------------------------------------------------
+
+def _touched_days(session: Session) -> Dict[UUID, date]:
+    """Earliest affected day per athlete for Activity rows in this flush."""
+    from models import Activity
+
+    touched: Dict[UUID, date] = {}
+
+    def mark(athlete_id, start_time):
+        if athlete_id is None:
+            return
+        # start_time not loaded on the instance: the day is unknown, so
+        # the whole series is invalidated.
+        d = start_time.date() if start_time is not None else date.min
+        if athlete_id not in touched or d < touched[athlete_id]:
+            touched[athlete_id] = d
+
+    # Read loaded state only — a lazy load mid-flush is not safe
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, Activity):
+            values = inspect(obj).dict
+            mark(values.get("athlete_id"), values.get("start_time"))
+
+    for obj in session.dirty:
+        if not isinstance(obj, Activity):
+            continue
+        state = inspect(obj)
+        attrs = state.attrs
+        if not any(attrs[c].history.has_changes() for c in LOAD_COLUMNS):
+            continue
+        # Old and new values both count: moving a run from Tuesday to
+        # Monday changes Monday onward.
+        athlete_ids = attrs.athlete_id.history.sum() or [state.dict.get("athlete_id")]
+        start_times = attrs.start_time.history.sum() or [state.dict.get("start_time")]
+        for athlete_id in athlete_ids:
+            for start_time in start_times:
+                mark(athlete_id, start_time)
+
+    return touched
+
+
+def _mark_dirty_after_flush(session: Session, flush_context) -> None:
+    touched = _touched_days(session)
+    if not touched:
+        return
+    try:
+        conn = session.connection()
+        with conn.begin_nested():
+            # Sorted so concurrent flushes lock state rows in the same order
+            for athlete_id in sorted(touched, key=str):
+                conn.execute(
+                    text(
+                        "INSERT INTO athlete_load_state (athlete_id, dirty_from) "
+                        "VALUES (:athlete_id, :day) "
+                        "ON CONFLICT (athlete_id) DO UPDATE SET "
+                        "dirty_from = LEAST(athlete_load_state.dirty_from, EXCLUDED.dirty_from), "
+                        "updated_at = now()"
+                    ),
+                    {"athlete_id": athlete_id, "day": touched[athlete_id]},
+                )
+    except Exception as exc:
+        logger.warning("daily_load_mark_dirty_failed athletes=%d err=%s", len(touched), exc)
+
+
+def register_listeners() -> None:
+    """Install the dirty-marking after_flush listener on every Session (idempotent)."""
+    if not event.contains(Session, "after_flush", _mark_dirty_after_flush):
+        event.listen(Session, "after_flush", _mark_dirty_after_flush)
+
+
+# ---------------------------------------------------------------------------
+# Read path
+# ---------------------------------------------------------------------------
+
+def inputs_hash(calc, athlete) -> Optional[str]:
+    """Fingerprint of the athlete-level inputs calculate_workout_tss reads."""
+    from services.activity_tss import current_versions
+
+    versions = current_versions(calc, athlete)
+    if versions is None:
+        return None
+    payload = json.dumps(sorted(versions.values()))
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _row_to_day(row):
+    from services.training_load import DailyLoad
+
+    return DailyLoad(
+        date=row.date,
+        total_tss=row.total_tss,
+        workout_count=row.workout_count,
+        atl=row.atl,
+        ctl=row.ctl,
+        tsb=row.tsb,
+    )
+
+
+def _full_series(calc, athlete, start: Optional[date], end: date):
+    activities = calc._load_activities(athlete.id)
+    if not activities:
+        return None, []
+    first_date = activities[0].start_time.date()
+    daily_tss, daily_counts = calc._daily_stress(activities, athlete)
+    end = max(end, activities[-1].start_time.date())
+    days = calc._ema_series(first_date, end, daily_tss, daily_counts)
+    if start is not None and start > first_date:
+        days = days[(start - first_date).days:]
+    return first_date, days
+
+
+def _materialized_series(calc, athlete, state, start: Optional[date], end: date):
+    """(first_date, days, tail_len) from stored rows + in-memory tail, or None if unusable."""
+    from models import AthleteDailyLoad
+
+    first_date = state.first_date
+    if first_date is None:
+        # Refreshed with no activities; anything since would have set dirty_from
+        return (None, [], 0) if state.dirty_from is None else None
+
+    tail_from = state.computed_through + timedelta(days=1)
+    if state.dirty_from is not None:
+        tail_from = min(tail_from, state.dirty_from)
+    if tail_from <= first_date:
+        return None
+    stored_hi = tail_from - timedelta(days=1)
+
+    tail_acts = calc._load_activities(athlete.id, since=tail_from)
+    daily_tss, daily_counts = calc._daily_stress(tail_acts, athlete)
+    end = max(end, stored_hi)
+    if tail_acts:
+        end = max(end, tail_acts[-1].start_time.date())
+
+    lo = first_date if start is None else max(start, first_date)
+    read_lo = min(lo, stored_hi)
+    read_hi = min(end, stored_hi)
+    rows = (
+        calc.db.query(AthleteDailyLoad)
+        .filter(
+            AthleteDailyLoad.athlete_id == athlete.id,
+            AthleteDailyLoad.date >= read_lo,
+            AthleteDailyLoad.date <= read_hi,
+        )
+        .order_by(AthleteDailyLoad.date)
+        .all()
+    )
+    if len(rows) != (read_hi - read_lo).days + 1:
+        logger.warning(
+            "daily_load rows missing athlete=%s range=%s..%s got=%d",
+            athlete.id, read_lo, read_hi, len(rows),
+        )
+        return None
+
+    days = [_row_to_day(r) for r in rows if r.date >= lo]
+    tail = []
+    if end > stored_hi:
+        seed = rows[-1]
+        tail = calc._ema_series(tail_from, end, daily_tss, daily_counts, seed.atl, seed.ctl)
+        days.extend(d for d in tail if d.date >= lo)
+    return first_date, days, len(tail)
+
+
+def load_series(calc, athlete, start: Optional[date], end: date):
+    """
+    Unrounded daily load for [max(start, first activity day), end].
+
+    end is extended to the last activity day when that is later (matches
+    the full-history EMA). start=None means from the first activity.
+
+    Returns (first_date, [DailyLoad]); first_date is None when the athlete
+    has no load-bearing activities.
+    """
+    from models import AthleteLoadState
+
+    h = inputs_hash(calc, athlete)
+    state = None
+    if h is not None:
+        state = calc.db.query(AthleteLoadState).filter(AthleteLoadState.athlete_id == athlete.id).first()
+
+    if (
+        state is not None
+        and state.inputs_hash == h
+        and state.computed_through is not None
+    ):
+        result = _materialized_series(calc, athlete, state, start, end)
+        if result is not None:
+            first_date, days, tail_len = result
+            if state.dirty_from is not None or tail_len > 1:
+                enqueue_refresh(athlete.id)
+            return first_date, days
+
+    enqueue_refresh(athlete.id)
+    return _full_series(calc, athlete, start, end)
+
+
+# ---------------------------------------------------------------------------
+# Write path
+# ---------------------------------------------------------------------------
+
+def refresh_athlete(db: Session, athlete_id: UUID, *, commit: bool = True) -> Dict[str, Any]:
+    """
+    Bring AthleteDailyLoad up to date for one athlete.
+
+    Locks the athlete's state row, so concurrent activity flushes wait and
+    their dirty days land after this refresh. Rewrites rows from the
+    earliest dirty day (or the whole series when TSS inputs changed)
+    through max(today, last activity day).
+    """
+    from models import Athlete, AthleteDailyLoad, AthleteLoadState
+    from services.activity_tss import recompute_athlete_tss
+    from services.training_load import TrainingLoadCalculator
+
+    athlete = db.query(Athlete).filter(Athlete.id == athlete_id).first()
+    if not athlete:
+        return {"status": "skipped", "reason": "athlete_not_found"}
+
+    calc = TrainingLoadCalculator(db)
+    h = inputs_hash(calc, athlete)
+    # Stored per-activity TSS first, so the series below reads it back
+    recompute_athlete_tss(db, athlete_id, calc=calc, commit=False)
+
+    db.execute(
+        text(
+            "INSERT INTO athlete_load_state (athlete_id) VALUES (:athlete_id) "
+            "ON CONFLICT (athlete_id) DO NOTHING"
+        ),
+        {"athlete_id": athlete_id},
+    )
+    state = (
+        db.query(AthleteLoadState)
+        .filter(AthleteLoadState.athlete_id == athlete_id)
+        .with_for_update()
+        .populate_existing()
+        .one()
+    )
+
+    full = (
+        h is None
+        or state.inputs_hash != h
+        or state.computed_through is None
+        or state.first_date is None
+    )
+    atl = ctl = 0.0
+    if not full:
+        start = state.computed_through + timedelta(days=1)
+        if state.dirty_from is not None:
+            start = min(start, state.dirty_from)
+        seed = None
+        if start > state.first_date:
+            seed = (
+                db.query(AthleteDailyLoad)
+                .filter(
+                    AthleteDailyLoad.athlete_id == athlete_id,
+                    AthleteDailyLoad.date == start - timedelta(days=1),
+                )
+                .first()
+            )
+        if seed is None:
+            full = True
+        else:
+            atl, ctl = seed.atl, seed.ctl
+
+    if full:
+        activities = calc._load_activities(athlete_id)
+        first_date = activities[0].start_time.date() if activities else None
+        start = first_date
+    else:
+        activities = calc._load_activities(athlete_id, since=start)
+        first_date = state.first_date
+
+    delete_q = db.query(AthleteDailyLoad).filter(AthleteDailyLoad.athlete_id == athlete_id)
+    if not full:
+        delete_q = delete_q.filter(AthleteDailyLoad.date >= start)
+    delete_q.delete(synchronize_session=False)
+
+    days: List[Any] = []
+    end = date.today()
+    if first_date is not None:
+        # Rows before start stay as they are, even future-dated ones
+        end = max(end, start - timedelta(days=1))
+        daily_tss, daily_counts = calc._daily_stress(activities, athlete)
+        if activities:
+            end = max(end, activities[-1].start_time.date())
+        days = calc._ema_series(start, end, daily_tss, daily_counts, atl, ctl)
+        db.bulk_insert_mappings(AthleteDailyLoad, [
+            {
+                "athlete_id": athlete_id,
+                "date": d.date,
+                "total_tss": d.total_tss,
+                "workout_count": d.workout_count,
+                "atl": d.atl,
+                "ctl": d.ctl,
+                "tsb": d.tsb,
+            }
+            for d in days
+        ])
+
+    state.first_date = first_date
+    state.computed_through = end
+    state.dirty_from = None
+    state.inputs_hash = h
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return {"status": "ok", "full": full, "from": start.isoformat() if start else None, "days": len(days)}
+
+
+def enqueue_refresh(athlete_id: Any) -> bool:
+    """Fire-and-forget refresh, deduplicated per athlete for REFRESH_DEDUP_S."""
+    try:
+        from core.cache import get_redis_client
+        from tasks.daily_load_tasks import refresh_daily_load
+
+        r = get_redis_client()
+        if not r or not r.set(_refresh_key(athlete_id), "1", nx=True, ex=REFRESH_DEDUP_S):
+            return False
+        refresh_daily_load.delay(str(athlete_id))
+        return True
+    except Exception as e:
+        logger.warning("daily_load refresh enqueue failed for %s: %s", athlete_id, e)
+        return False
@@ -22,7 +22,7 @@ ADR-022: Individual Performance Model for Plan Generation
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, date, timezone
 from typing import List, Dict, Optional, Tuple
 from uuid import UUID
 from enum import Enum
@@ -274,6 +274,15 @@ class IndividualPerformanceModel:
         Returns:
             Calibrated BanisterModel
         """
+        training_days, performance_markers = self.calibration_inputs(athlete_id, lookback_days)
+        return self.calibrate_from_inputs(athlete_id, training_days, performance_markers)
+    
+    def calibration_inputs(
+        self,
+        athlete_id: UUID,
+        lookback_days: int = 365
+    ) -> Tuple[List[TrainingDay], List[PerformanceMarker]]:
+        """Daily TSS and performance markers for the lookback window (DB reads only)."""
         end_date = date.today()
         start_date = end_date - timedelta(days=lookback_days)
         
@@ -283,6 +292,18 @@ class IndividualPerformanceModel:
         # Collect performance markers
         performance_markers = self._get_performance_markers(athlete_id, start_date, end_date)
         
+        return training_days, performance_markers
+    
+    def calibrate_from_inputs(
+        self,
+        athlete_id: UUID,
+        training_days: List[TrainingDay],
+        performance_markers: List[PerformanceMarker]
+    ) -> BanisterModel:
+        """
+        Calibrate from already-loaded inputs. Pure computation — no DB
+        access, so it can run in a worker process.
+        """
         # Check data sufficiency
         if len(training_days) < MIN_TRAINING_DAYS:
             return self._create_default_model(
@@ -336,10 +357,10 @@ class IndividualPerformanceModel:
         for activity in activities:
             activity_date = activity.start_time.date()
             try:
-                stress = calculator.calculate_workout_tss(activity, athlete)
+                tss = calculator.workout_tss(activity, athlete)
                 if activity_date not in daily_tss:
                     daily_tss[activity_date] = 0
-                daily_tss[activity_date] += stress.tss
+                daily_tss[activity_date] += tss
             except Exception as e:
                 logger.warning(f"Failed to calculate TSS for activity {activity.id}: {e}")
                 continue
@@ -477,81 +498,56 @@ class IndividualPerformanceModel:
         performance_markers: List[PerformanceMarker]
     ) -> BanisterModel:
         """
-        Fit Banister model parameters using optimization.
-        
-        Uses Nelder-Mead simplex algorithm to minimize weighted squared error.
+        Fit Banister model parameters by weighted least squares.
+
+        k1, k2 and p0 are solved in closed form for every (τ1, τ2); only the
+        taus are searched (services/banister_calibration).
         """
-        # Convert to numpy-like structures for calculation
-        tss_by_date = {td.date: td.tss for td in training_days}
-        
-        def calculate_ctl_atl_series(tau1: float, tau2: float) -> Dict[date, Tuple[float, float]]:
-            """Calculate CTL and ATL for each date given tau parameters."""
-            result = {}
-            ctl = 0.0
-            atl = 0.0
-            
-            decay1 = math.exp(-1.0 / tau1)
-            decay2 = math.exp(-1.0 / tau2)
-            
-            for td in training_days:
-                tss = tss_by_date.get(td.date, 0)
-                ctl = ctl * decay1 + tss * (1 - decay1)
-                atl = atl * decay2 + tss * (1 - decay2)
-                result[td.date] = (ctl, atl)
-            
-            return result
-        
-        def objective(params: List[float]) -> float:
-            """Objective function: weighted sum of squared errors."""
-            tau1, tau2, k1, k2, p0 = params
-            
-            # Enforce bounds
-            if not (TAU1_BOUNDS[0] <= tau1 <= TAU1_BOUNDS[1]):
-                return 1e10
-            if not (TAU2_BOUNDS[0] <= tau2 <= TAU2_BOUNDS[1]):
-                return 1e10
-            if not (K1_BOUNDS[0] <= k1 <= K1_BOUNDS[1]):
-                return 1e10
-            if not (K2_BOUNDS[0] <= k2 <= K2_BOUNDS[1]):
-                return 1e10
-            
-            # Additional constraint: tau1 > tau2 (fitness decays slower than fatigue)
-            if tau1 <= tau2:
-                return 1e10
-            
-            # Calculate CTL/ATL series
-            ctl_atl = calculate_ctl_atl_series(tau1, tau2)
-            
-            # Calculate weighted squared error
-            total_error = 0.0
-            for pm in performance_markers:
-                if pm.date not in ctl_atl:
-                    continue
-                
-                ctl, atl = ctl_atl[pm.date]
-                predicted = p0 + k1 * ctl - k2 * atl
-                error = (predicted - pm.performance_value) ** 2
-                total_error += pm.weight * error
-            
-            return total_error
-        
-        # Use simple grid search + local refinement (no scipy dependency)
-        best_params = self._grid_search_optimize(objective, performance_markers)
-        
-        # Calculate fit quality
-        tau1, tau2, k1, k2, p0 = best_params
-        ctl_atl = calculate_ctl_atl_series(tau1, tau2)
-        
-        # Calculate R-squared
-        actuals = [pm.performance_value for pm in performance_markers if pm.date in ctl_atl]
+        from services.banister_calibration import fit_banister
+
+        index_by_date = {td.date: i for i, td in enumerate(training_days)}
+        fitted = [pm for pm in performance_markers if pm.date in index_by_date]
+        if not fitted:
+            return self._create_default_model(
+                athlete_id,
+                len(training_days),
+                len(performance_markers),
+                "No performance markers inside the training window"
+            )
+
+        fit = fit_banister(
+            tss=[td.tss for td in training_days],
+            marker_idx=[index_by_date[pm.date] for pm in fitted],
+            values=[pm.performance_value for pm in fitted],
+            weights=[pm.weight for pm in fitted],
+            tau1_bounds=TAU1_BOUNDS,
+            tau2_bounds=TAU2_BOUNDS,
+            k1_bounds=K1_BOUNDS,
+            k2_bounds=K2_BOUNDS,
+        )
+        tau1, tau2, k1, k2, p0 = fit.tau1, fit.tau2, fit.k1, fit.k2, fit.p0
+
+        # Fit quality on the same CTL/ATL series the projections use
+        ctl_atl = {}
+        ctl = atl = 0.0
+        decay1 = math.exp(-1.0 / tau1)
+        decay2 = math.exp(-1.0 / tau2)
+        for td in training_days:
+            ctl = ctl * decay1 + td.tss * (1 - decay1)
+            atl = atl * decay2 + td.tss * (1 - decay2)
+            ctl_atl[td.date] = (ctl, atl)
+
+        actuals = [pm.performance_value for pm in fitted]
         predictions = []
-        for pm in performance_markers:
-            if pm.date in ctl_atl:
-                ctl, atl = ctl_atl[pm.date]
-                predictions.append(p0 + k1 * ctl - k2 * atl)
-        
+        for pm in fitted:
+            ctl, atl = ctl_atl[pm.date]
+            predictions.append(p0 + k1 * ctl - k2 * atl)
+
         r_squared = self._calculate_r_squared(actuals, predictions)
-        fit_error = objective(best_params)
+        fit_error = sum(
+            pm.weight * (pred - pm.performance_value) ** 2
+            for pm, pred in zip(fitted, predictions)
+        )
         
         # Determine confidence
         confidence, notes = self._assess_confidence(
@@ -574,78 +570,6 @@ class IndividualPerformanceModel:
             confidence_notes=notes
         )
     
-    def _grid_search_optimize(
-        self,
-        objective: callable,
-        performance_markers: List[PerformanceMarker]
-    ) -> List[float]:
-        """
-        Grid search optimization with local refinement.
-        
-        No external optimizer dependency.
-        """
-        # Estimate p0 from performance markers
-        p0_estimate = statistics.mean([pm.performance_value for pm in performance_markers])
-        
-        # Grid search over tau1, tau2
-        best_error = float('inf')
-        best_params = [DEFAULT_TAU1, DEFAULT_TAU2, DEFAULT_K1, DEFAULT_K2, p0_estimate]
-        
-        for tau1 in [30, 35, 40, 45, 50, 55, 60]:
-            for tau2 in [5, 6, 7, 8, 9, 10, 12]:
-                if tau1 <= tau2:
-                    continue
-                
-                # Grid search over k1, k2
-                for k1 in [0.5, 0.8, 1.0, 1.2, 1.5]:
-                    for k2 in [1.0, 1.5, 2.0, 2.5, 3.0]:
-                        params = [tau1, tau2, k1, k2, p0_estimate]
-                        error = objective(params)
-                        
-                        if error < best_error:
-                            best_error = error
-                            best_params = params
-        
-        # Local refinement around best
-        refined_params = self._local_refine(objective, best_params)
-        
-        return refined_params
-    
-    def _local_refine(
-        self,
-        objective: callable,
-        initial: List[float],
-        iterations: int = 50
-    ) -> List[float]:
-        """Simple local refinement using coordinate descent."""
-        params = initial.copy()
-        step_sizes = [2.0, 0.5, 0.1, 0.2, 1.0]  # For tau1, tau2, k1, k2, p0
-        
-        for _ in range(iterations):
-            improved = False
-            for i in range(len(params)):
-                current_error = objective(params)
-                
-                # Try increasing
-                params[i] += step_sizes[i]
-                if objective(params) < current_error:
-                    improved = True
-                    continue
-                params[i] -= step_sizes[i]  # Revert
-                
-                # Try decreasing
-                params[i] -= step_sizes[i]
-                if objective(params) < current_error:
-                    improved = True
-                    continue
-                params[i] += step_sizes[i]  # Revert
-            
-            if not improved:
-                # Reduce step sizes
-                step_sizes = [s * 0.7 for s in step_sizes]
-        
-        return params
-    
     def _calculate_r_squared(
         self,
         actuals: List[float],
@@ -813,7 +737,7 @@ def get_or_calibrate_model(
     ADR-036: Persists calibrated model to AthleteCalibratedModel table.
     """
     from models import AthleteCalibratedModel
-    from datetime import datetime, date, timezone
+    from datetime import date
     
     # Check for existing cached model.
     # Production-safe fallback: if cache table is unavailable, continue with runtime calibration.
@@ -856,37 +780,10 @@ def get_or_calibrate_model(
         ).first()
         
         if existing:
-            existing.tau1 = model.tau1
-            existing.tau2 = model.tau2
-            existing.k1 = model.k1
-            existing.k2 = model.k2
-            existing.p0 = model.p0
-            existing.r_squared = model.r_squared
-            existing.fit_error = model.fit_error
-            existing.n_performance_markers = model.n_performance_markers
-            existing.n_training_days = model.n_training_days
-            existing.confidence = model.confidence.value
-            existing.data_tier = _determine_data_tier(model)
-            existing.calibrated_at = datetime.now(timezone.utc)
-            existing.valid_until = None  # Valid until new race invalidates
+            for key, value in _calibrated_model_values(model).items():
+                setattr(existing, key, value)
         else:
-            new_cached = AthleteCalibratedModel(
-                athlete_id=athlete_id,
-                tau1=model.tau1,
-                tau2=model.tau2,
-                k1=model.k1,
-                k2=model.k2,
-                p0=model.p0,
-                r_squared=model.r_squared,
-                fit_error=model.fit_error,
-                n_performance_markers=model.n_performance_markers,
-                n_training_days=model.n_training_days,
-                confidence=model.confidence.value,
-                data_tier=_determine_data_tier(model),
-                calibrated_at=datetime.now(timezone.utc),
-                valid_until=None
-            )
-            db.add(new_cached)
+            db.add(AthleteCalibratedModel(athlete_id=athlete_id, **_calibrated_model_values(model)))
         
         db.commit()
         logger.info(f"Persisted model for {athlete_id}: τ1={model.tau1:.1f}, τ2={model.tau2:.1f}")
@@ -897,6 +794,49 @@ def get_or_calibrate_model(
     return model
 
 
+def _calibrated_model_values(model: BanisterModel) -> Dict:
+    """AthleteCalibratedModel column values for a calibrated model."""
+    return {
+        "tau1": model.tau1,
+        "tau2": model.tau2,
+        "k1": model.k1,
+        "k2": model.k2,
+        "p0": model.p0,
+        "r_squared": model.r_squared,
+        "fit_error": model.fit_error,
+        "n_performance_markers": model.n_performance_markers,
+        "n_training_days": model.n_training_days,
+        "confidence": model.confidence.value,
+        "data_tier": _determine_data_tier(model),
+        "calibrated_at": datetime.now(timezone.utc),
+        "valid_until": None,  # Valid until new race invalidates
+    }
+
+
+def save_calibrated_models(db: Session, models: List[BanisterModel]) -> int:
+    """
+    Upsert many models into AthleteCalibratedModel in one statement.
+
+    Caller commits. Returns the number of rows written.
+    """
+    from sqlalchemy.dialects.postgresql import insert
+    from models import AthleteCalibratedModel
+
+    if not models:
+        return 0
+    rows = [
+        {"athlete_id": UUID(str(m.athlete_id)), **_calibrated_model_values(m)}
+        for m in models
+    ]
+    stmt = insert(AthleteCalibratedModel).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AthleteCalibratedModel.athlete_id],
+        set_={key: stmt.excluded[key] for key in rows[0] if key != "athlete_id"},
+    )
+    db.execute(stmt)
+    return len(rows)
+
+
 def _determine_data_tier(model: BanisterModel) -> str:
     """Determine data tier from model quality."""
     n_markers = model.n_performance_markers or 0
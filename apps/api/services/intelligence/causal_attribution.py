@@ -11,6 +11,8 @@ This engine implements:
 2. GRANGER CAUSALITY TEST:
    - Does X happening BEFORE Y help predict Y better than Y's own history?
    - If yes, X "Granger-causes" Y (statistically defensible leading indicator)
+   - Restricted and unrestricted lag models solved by least squares,
+     batched over every candidate input sharing the same effect series
 
 3. LAG DETECTION:
    - Discovers optimal lag for each input-output pair from THIS athlete's data
@@ -34,6 +36,9 @@ from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
 from enum import Enum
 import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from scipy.stats import t as t_dist
 
 from sqlalchemy import func
@@ -336,113 +341,87 @@ def pearson_correlation(x: List[float], y: List[float]) -> Tuple[float, float]:
     return r, p_value
 
 
+def _lag_matrix(series: np.ndarray, lag: int) -> np.ndarray:
+    """Rows t = lag..n-1, columns series[t-1], series[t-2], ..., series[t-lag]."""
+    return sliding_window_view(series[:-1], lag)[:, ::-1]
+
+
+def granger_causality_batch(
+    causes: Dict[str, List[float]],
+    effect: List[float],
+    lag: int,
+) -> Dict[str, Tuple[float, float, bool]]:
+    """
+    Granger causality of several candidate causes on one effect series.
+
+    Restricted model:   effect[t] ~ 1 + effect[t-1..t-lag]
+    Unrestricted model: restricted + cause[t-1..t-lag]
+
+    Both are solved by least squares. The restricted fit is shared by
+    every cause; each cause's lags are residualised against it
+    (Frisch–Waugh–Lovell), so all unrestricted fits are one batched
+    pseudo-inverse. Every cause must be aligned with ``effect``.
+
+    Returns {name: (F-statistic, p-value, is_significant)}.
+    """
+    empty = (0.0, 1.0, False)
+    y_all = np.asarray(effect, dtype=float)
+    n = len(y_all)
+    n_obs = n - lag
+    q = lag  # Additional parameters (cause lags)
+    df2 = n_obs - (2 * lag + 1)  # Unrestricted: intercept + 2 * lag
+
+    if not causes or lag < 1 or n < lag + 5 or df2 <= 0:
+        return {name: empty for name in causes}
+
+    y = y_all[lag:]
+    centred = y - y.mean()
+    tss = float(centred @ centred)
+    if tss == 0:
+        return {name: empty for name in causes}
+
+    # Orthonormal basis of the restricted design (rank-safe)
+    restricted = np.column_stack([np.ones(n_obs), _lag_matrix(y_all, lag)])
+    u, sv, _ = np.linalg.svd(restricted, full_matrices=False)
+    basis = u[:, sv > sv[0] * 1e-10]
+
+    resid = y - basis @ (basis.T @ y)
+    rss_restricted = float(resid @ resid)
+
+    names = list(causes)
+    lagged = np.stack([
+        _lag_matrix(np.asarray(causes[name], dtype=float), lag) for name in names
+    ])  # (causes, n_obs, lag)
+    lagged = lagged - basis @ (basis.T @ lagged)
+    beta = np.linalg.pinv(lagged, rcond=1e-10) @ resid  # (causes, lag)
+    residuals = resid - (lagged @ beta[..., None])[..., 0]
+    rss_unrestricted = np.einsum("ij,ij->i", residuals, residuals)
+
+    results = {}
+    for name, rss_u in zip(names, rss_unrestricted):
+        if rss_u <= tss * 1e-12:
+            results[name] = empty
+            continue
+        f_stat = max(0.0, ((rss_restricted - rss_u) / q) / (rss_u / df2))
+        p_value = _f_to_pvalue(f_stat, q, df2)
+        results[name] = (float(f_stat), p_value, p_value < 0.05)
+    return results
+
+
 def granger_causality_test(
     cause: List[float], 
     effect: List[float], 
     lag: int
 ) -> Tuple[float, float, bool]:
     """
-    Simplified Granger causality test.
+    Granger causality test (OLS, F-test on the added cause lags).
     
-    Tests if 'cause' at time t-lag helps predict 'effect' at time t,
+    Tests if 'cause' at times t-1..t-lag helps predict 'effect' at time t,
     beyond just using effect's own history.
     
     Returns (F-statistic, p-value, is_significant)
     """
-    n = len(effect)
-    if n < lag + 5:  # Need enough data points
-        return 0.0, 1.0, False
-    
-    # Create lagged series
-    # effect[t] predicted by: effect[t-1], effect[t-2], ..., effect[t-lag]
-    # and optionally: cause[t-1], cause[t-2], ..., cause[t-lag]
-    
-    # Restricted model: effect ~ effect_history
-    # Unrestricted model: effect ~ effect_history + cause_history
-    
-    y = effect[lag:]  # Target
-    n_obs = len(y)
-    
-    if n_obs < 5:
-        return 0.0, 1.0, False
-    
-    # Build lagged features
-    effect_lags = []
-    cause_lags = []
-    
-    for i in range(1, lag + 1):
-        effect_lags.append(effect[lag - i: n - i])
-        cause_lags.append(cause[lag - i: n - i])
-    
-    # Calculate RSS for restricted model (effect history only)
-    # Using simple linear regression approximation
-    rss_restricted = _calculate_rss(y, effect_lags)
-    
-    # Calculate RSS for unrestricted model (effect + cause history)
-    all_lags = effect_lags + cause_lags
-    rss_unrestricted = _calculate_rss(y, all_lags)
-    
-    # F-test
-    # F = ((RSS_r - RSS_u) / q) / (RSS_u / (n - k))
-    q = lag  # Number of additional parameters (cause lags)
-    k = 2 * lag + 1  # Total parameters in unrestricted model
-    
-    if rss_unrestricted == 0 or n_obs <= k:
-        return 0.0, 1.0, False
-    
-    f_stat = ((rss_restricted - rss_unrestricted) / q) / (rss_unrestricted / (n_obs - k))
-    
-    if f_stat < 0:
-        f_stat = 0
-    
-    # P-value from F-distribution
-    p_value = _f_to_pvalue(f_stat, q, n_obs - k)
-    
-    is_significant = p_value < 0.05
-    
-    return f_stat, p_value, is_significant
-
-
-def _calculate_rss(y: List[float], x_features: List[List[float]]) -> float:
-    """
-    Calculate Residual Sum of Squares for OLS regression.
-    Simple implementation for our needs.
-    """
-    if not x_features or not y:
-        return float('inf')
-    
-    n = len(y)
-    
-    # Simple approach: use mean as baseline prediction
-    # Then adjust based on correlation with each feature
-    
-    mean_y = sum(y) / n
-    
-    # Start with baseline prediction
-    predictions = [mean_y] * n
-    
-    # Add contribution from each feature (simple linear combination)
-    for feature in x_features:
-        if len(feature) != n:
-            continue
-        
-        mean_f = sum(feature) / n
-        var_f = sum((f - mean_f) ** 2 for f in feature)
-        
-        if var_f == 0:
-            continue
-        
-        cov = sum((f - mean_f) * (yi - mean_y) for f, yi in zip(feature, y))
-        beta = cov / var_f
-        
-        # Update predictions
-        for i in range(n):
-            predictions[i] += beta * (feature[i] - mean_f) / len(x_features)
-    
-    # Calculate RSS
-    rss = sum((yi - pred) ** 2 for yi, pred in zip(y, predictions))
-    
-    return rss
+    return granger_causality_batch({"cause": cause}, effect, lag)["cause"]
 
 
 def _f_to_pvalue(f_val: float, df1: int, df2: int) -> float:
@@ -658,40 +637,24 @@ class CausalAttributionEngine:
         """Analyze a single frequency loop (Readiness or Fitness)."""
         indicators = []
         
+        input_series_by_key = {}
         for input_key, config in input_config.items():
             # Get input time series
             input_series = self._get_input_series(
                 athlete_id, start_date, end_date, input_key
             )
-            
-            if len(input_series) < config["min_samples"]:
-                continue
-            
-            # Test Granger causality at different lags
-            min_lag, max_lag = config["lag_range"]
-            best_result = None
-            best_lag = min_lag
-            
-            for lag in range(min_lag, max_lag + 1, max(1, (max_lag - min_lag) // 7)):
-                # Align series with lag
-                x_aligned, y_aligned = input_series.align_with(output_series, lag)
-                
-                if len(x_aligned) < 5:
-                    continue
-                
-                # Test Granger causality
-                f_stat, p_value, is_sig = granger_causality_test(
-                    x_aligned, y_aligned, min(lag, 3)  # Use smaller AR order
-                )
-                
-                if best_result is None or p_value < best_result[1]:
-                    best_result = (f_stat, p_value, is_sig)
-                    best_lag = lag
-            
-            if best_result is None:
+            if len(input_series) >= config["min_samples"]:
+                input_series_by_key[input_key] = input_series
+        
+        best_by_key = self._best_granger_lags(
+            input_series_by_key, output_series, input_config
+        )
+        
+        for input_key, input_series in input_series_by_key.items():
+            if input_key not in best_by_key:
                 continue
-            
-            f_stat, p_value, is_significant = best_result
+            config = input_config[input_key]
+            (f_stat, p_value, is_significant), best_lag = best_by_key[input_key]
             
             # Also calculate correlation at best lag
             x_aligned, y_aligned = input_series.align_with(output_series, best_lag)
@@ -748,6 +711,46 @@ class CausalAttributionEngine:
         
         return indicators
     
+    @staticmethod
+    def _best_granger_lags(
+        input_series_by_key: Dict[str, TimeSeries],
+        output_series: TimeSeries,
+        input_config: Dict,
+    ) -> Dict[str, Tuple[Tuple[float, float, bool], int]]:
+        """
+        Granger-test every input at each lag in its configured range and
+        keep the lowest p-value per input: {key: ((F, p, sig), lag)}.
+
+        At each lag, inputs whose aligned effect series coincide share one
+        batched test.
+        """
+        lags_by_key = {}
+        for input_key in input_series_by_key:
+            min_lag, max_lag = input_config[input_key]["lag_range"]
+            lags_by_key[input_key] = range(min_lag, max_lag + 1, max(1, (max_lag - min_lag) // 7))
+        
+        best: Dict[str, Tuple[Tuple[float, float, bool], int]] = {}
+        for lag in sorted({lag for lags in lags_by_key.values() for lag in lags}):
+            # Align series with lag; group inputs by aligned effect series
+            groups: Dict[Tuple[float, ...], Dict[str, List[float]]] = {}
+            for input_key, input_series in input_series_by_key.items():
+                if lag not in lags_by_key[input_key]:
+                    continue
+                x_aligned, y_aligned = input_series.align_with(output_series, lag)
+                if len(x_aligned) < 5:
+                    continue
+                groups.setdefault(tuple(y_aligned), {})[input_key] = x_aligned
+            
+            for y_aligned, causes in groups.items():
+                results = granger_causality_batch(
+                    causes, list(y_aligned), min(lag, 3)  # Use smaller AR order
+                )
+                for input_key, result in results.items():
+                    if input_key not in best or result[1] < best[input_key][0][1]:
+                        best[input_key] = (result, lag)
+        
+        return best
+    
     def _get_input_series(
         self,
         athlete_id: UUID,
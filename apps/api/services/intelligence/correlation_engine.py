@@ -18,12 +18,13 @@ blocks intentionally query non-run sports separately (never mixed into running
 mileage totals).
 """
 
+from bisect import bisect_left
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func
 from statistics import mean, stdev
 import math
 from scipy.stats import t as t_dist
@@ -36,6 +37,13 @@ from models import (
 )
 from datetime import date as date_type
 from services.efficiency_calculation import calculate_activity_efficiency_with_decoupling
+from services.intelligence.lag_correlation import LagCorrelations, lag_correlations
+from services.intelligence.correlation_stats import (
+    CorrelationStats,
+    fresh_correlation_stats,
+    load_correlation_stats,
+    save_correlation_stats,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -442,382 +450,220 @@ def benjamini_hochberg_filter(
     return significant
 
 
-def aggregate_daily_inputs(
-    athlete_id: str,
-    start_date: datetime,
-    end_date: datetime,
-    db: Session
-) -> Dict[str, List[Tuple[datetime, float]]]:
-    """
-    Aggregate daily inputs into time-series data.
-    
-    Returns:
-        Dictionary mapping input names to list of (date, value) tuples
-    """
-    inputs = {}
-    
-    # Sleep hours
-    sleep_data = db.query(
-        DailyCheckin.date,
-        DailyCheckin.sleep_h
-    ).filter(
-        DailyCheckin.athlete_id == athlete_id,
-        DailyCheckin.date >= start_date.date(),
-        DailyCheckin.date <= end_date.date(),
-        DailyCheckin.sleep_h.isnot(None)
-    ).all()
-    
-    inputs["sleep_hours"] = [(row.date, float(row.sleep_h)) for row in sleep_data]
-
-    sleep_quality_data = db.query(
-        DailyCheckin.date,
-        DailyCheckin.sleep_quality_1_5
-    ).filter(
-        DailyCheckin.athlete_id == athlete_id,
-        DailyCheckin.date >= start_date.date(),
-        DailyCheckin.date <= end_date.date(),
-        DailyCheckin.sleep_quality_1_5.isnot(None)
-    ).all()
-
-    inputs["sleep_quality_1_5"] = [
-        (row.date, float(row.sleep_quality_1_5)) for row in sleep_quality_data
-    ]
-
-    # HRV (rMSSD)
-    hrv_data = db.query(
-        DailyCheckin.date,
-        DailyCheckin.hrv_rmssd
-    ).filter(
-        DailyCheckin.athlete_id == athlete_id,
-        DailyCheckin.date >= start_date.date(),
-        DailyCheckin.date <= end_date.date(),
-        DailyCheckin.hrv_rmssd.isnot(None)
-    ).all()
-    
-    inputs["hrv_rmssd"] = [(row.date, float(row.hrv_rmssd)) for row in hrv_data]
-    
-    # Resting HR
-    resting_hr_data = db.query(
-        DailyCheckin.date,
-        DailyCheckin.resting_hr
-    ).filter(
-        DailyCheckin.athlete_id == athlete_id,
-        DailyCheckin.date >= start_date.date(),
-        DailyCheckin.date <= end_date.date(),
-        DailyCheckin.resting_hr.isnot(None)
-    ).all()
-    
-    inputs["resting_hr"] = [(row.date, float(row.resting_hr)) for row in resting_hr_data]
-    
-    # Work stress
-    work_stress_data = db.query(
-        WorkPattern.date,
-        WorkPattern.stress_level
-    ).filter(
-        WorkPattern.athlete_id == athlete_id,
-        WorkPattern.date >= start_date.date(),
-        WorkPattern.date <= end_date.date(),
-        WorkPattern.stress_level.isnot(None)
-    ).all()
-    
-    inputs["work_stress"] = [(row.date, float(row.stress_level)) for row in work_stress_data]
-    
-    # Work hours
-    work_hours_data = db.query(
-        WorkPattern.date,
-        WorkPattern.hours_worked
-    ).filter(
-        WorkPattern.athlete_id == athlete_id,
-        WorkPattern.date >= start_date.date(),
-        WorkPattern.date <= end_date.date(),
-        WorkPattern.hours_worked.isnot(None)
-    ).all()
-    
-    inputs["work_hours"] = [(row.date, float(row.hours_worked)) for row in work_hours_data]
-    
-    # Daily protein intake (aggregate from NutritionEntry)
-    protein_data = db.query(
-        NutritionEntry.date,
-        func.sum(NutritionEntry.protein_g).label('total_protein')
-    ).filter(
-        NutritionEntry.athlete_id == athlete_id,
-        NutritionEntry.date >= start_date.date(),
-        NutritionEntry.date <= end_date.date(),
-        NutritionEntry.protein_g.isnot(None)
-    ).group_by(NutritionEntry.date).all()
-    
-    inputs["daily_protein_g"] = [(row.date, float(row.total_protein)) for row in protein_data]
-    
-    # Daily carbs intake
-    carbs_data = db.query(
-        NutritionEntry.date,
-        func.sum(NutritionEntry.carbs_g).label('total_carbs')
-    ).filter(
-        NutritionEntry.athlete_id == athlete_id,
-        NutritionEntry.date >= start_date.date(),
-        NutritionEntry.date <= end_date.date(),
-        NutritionEntry.carbs_g.isnot(None)
-    ).group_by(NutritionEntry.date).all()
-    
-    inputs["daily_carbs_g"] = [(row.date, float(row.total_carbs)) for row in carbs_data]
+# ---------------------------------------------------------------------------
+# Input scans — one grouped query per source table
+# ---------------------------------------------------------------------------
 
-    fat_data = db.query(
-        NutritionEntry.date,
-        func.sum(NutritionEntry.fat_g).label('total_fat')
-    ).filter(
-        NutritionEntry.athlete_id == athlete_id,
-        NutritionEntry.date >= start_date.date(),
-        NutritionEntry.date <= end_date.date(),
-        NutritionEntry.fat_g.isnot(None)
-    ).group_by(NutritionEntry.date).all()
+# (input name, column) per source table. Each table is read once for the
+# whole window and its rows are split into per-input series here.
+_CHECKIN_RECOVERY_SIGNALS = [
+    ("sleep_hours", "sleep_h"),
+    ("sleep_quality_1_5", "sleep_quality_1_5"),
+    ("hrv_rmssd", "hrv_rmssd"),
+    ("resting_hr", "resting_hr"),
+]
 
-    inputs["daily_fat_g"] = [
-        (row.date, float(row.total_fat)) for row in fat_data
-    ]
+_WORK_SIGNALS = [
+    ("work_stress", "stress_level"),
+    ("work_hours", "hours_worked"),
+]
 
-    fiber_data = db.query(
-        NutritionEntry.date,
-        func.sum(NutritionEntry.fiber_g).label('total_fiber')
-    ).filter(
-        NutritionEntry.athlete_id == athlete_id,
-        NutritionEntry.date >= start_date.date(),
-        NutritionEntry.date <= end_date.date(),
-        NutritionEntry.fiber_g.isnot(None)
-    ).group_by(NutritionEntry.date).all()
+# Summed per day over all of the day's entries
+_NUTRITION_SIGNALS = [
+    ("daily_protein_g", "protein_g"),
+    ("daily_carbs_g", "carbs_g"),
+    ("daily_fat_g", "fat_g"),
+    ("daily_fiber_g", "fiber_g"),
+    ("daily_calories", "calories"),
+    ("daily_caffeine_mg", "caffeine_mg"),
+]
 
-    inputs["daily_fiber_g"] = [
-        (row.date, float(row.total_fiber)) for row in fiber_data
-    ]
+_BODY_SIGNALS = [
+    ("weight_kg", "weight_kg"),
+    ("bmi", "bmi"),
+    ("body_fat_pct", "body_fat_pct"),
+    ("muscle_mass_kg", "muscle_mass_kg"),
+]
 
-    calorie_data = db.query(
-        NutritionEntry.date,
-        func.sum(NutritionEntry.calories).label('total_calories')
-    ).filter(
-        NutritionEntry.athlete_id == athlete_id,
-        NutritionEntry.date >= start_date.date(),
-        NutritionEntry.date <= end_date.date(),
-        NutritionEntry.calories.isnot(None)
-    ).group_by(NutritionEntry.date).all()
+_CHECKIN_SUBJECTIVE_SIGNALS = [
+    ("stress_1_5", "stress_1_5"),
+    ("soreness_1_5", "soreness_1_5"),
+    ("rpe_1_10", "rpe_1_10"),
+    ("enjoyment_1_5", "enjoyment_1_5"),
+    ("confidence_1_5", "confidence_1_5"),
+    ("readiness_1_5", "readiness_1_5"),
+    ("overnight_avg_hr", "overnight_avg_hr"),
+    ("hrv_sdnn", "hrv_sdnn"),
+]
 
-    inputs["daily_calories"] = [
-        (row.date, float(row.total_calories)) for row in calorie_data
-    ]
+_GARMIN_SIGNALS = [
+    ("garmin_sleep_score", "sleep_score"),
+    ("garmin_sleep_deep_s", "sleep_deep_s"),
+    ("garmin_sleep_rem_s", "sleep_rem_s"),
+    ("garmin_sleep_awake_s", "sleep_awake_s"),
+    ("garmin_steps", "steps"),
+    ("garmin_active_time_s", "active_time_s"),
+    ("garmin_moderate_intensity_s", "moderate_intensity_s"),
+    ("garmin_vigorous_intensity_s", "vigorous_intensity_s"),
+    ("garmin_hrv_5min_high", "hrv_5min_high"),
+    ("garmin_hrv_overnight_avg", "hrv_overnight_avg"),
+    ("garmin_min_hr", "min_hr"),
+    ("garmin_resting_hr", "resting_hr"),
+    ("garmin_vo2max", "vo2max"),
+    # Garmin Body Battery, average/max stress, and sleep-derived
+    # readiness scores are proprietary model outputs — not direct
+    # measurements. Per founder rule (real measured metrics only),
+    # they are not registered as correlation signals. The columns
+    # remain on GarminDay for backward compat but are no longer
+    # consumed by the engine.
+]
 
-    caffeine_data = db.query(
-        NutritionEntry.date,
-        func.sum(NutritionEntry.caffeine_mg).label("total_caffeine"),
-    ).filter(
-        NutritionEntry.athlete_id == athlete_id,
-        NutritionEntry.date >= start_date.date(),
-        NutritionEntry.date <= end_date.date(),
-        NutritionEntry.caffeine_mg.isnot(None),
-    ).group_by(NutritionEntry.date).all()
+# Activity signals discoverable by the correlation engine. Garmin's
+# proprietary scores (aerobic/anaerobic Training Effect, Body Battery
+# impact) are intentionally excluded — those are model outputs, not
+# measurements, and we do not feed them into correlations. Garmin
+# perceived effort is also excluded here; it is treated as a low-
+# confidence fallback by services/effort_resolver and gated behind
+# ActivityFeedback.perceived_effort when present.
+_ACTIVITY_SIGNALS = [
+    ("dew_point_f", "dew_point_f"),
+    ("heat_adjustment_pct", "heat_adjustment_pct"),
+    ("temperature_f", "temperature_f"),
+    ("humidity_pct", "humidity_pct"),
+    ("elevation_gain_m", "total_elevation_gain"),
+    ("total_descent_m", "total_descent_m"),
+    ("avg_cadence", "avg_cadence"),
+    ("avg_stride_length_m", "avg_stride_length_m"),
+    ("avg_ground_contact_ms", "avg_ground_contact_ms"),
+    ("avg_vertical_oscillation_cm", "avg_vertical_oscillation_cm"),
+    ("avg_vertical_ratio_pct", "avg_vertical_ratio_pct"),
+    ("avg_power_w", "avg_power_w"),
+    ("max_power_w", "max_power_w"),
+    ("activity_intensity_score", "intensity_score"),
+    ("active_kcal", "active_kcal"),
+    ("moving_time_s", "moving_time_s"),
+]
 
-    inputs["daily_caffeine_mg"] = [
-        (row.date, float(row.total_caffeine)) for row in caffeine_data
-    ]
+_FEEDBACK_SIGNALS = [
+    ("feedback_perceived_effort", "perceived_effort"),
+    ("feedback_energy_pre", "energy_pre"),
+    ("feedback_energy_post", "energy_post"),
+    ("feedback_leg_feel", "leg_feel"),
+]
 
-    # Body composition trends (weight, BMI)
-    weight_data = db.query(
-        BodyComposition.date,
-        BodyComposition.weight_kg
-    ).filter(
-        BodyComposition.athlete_id == athlete_id,
-        BodyComposition.date >= start_date.date(),
-        BodyComposition.date <= end_date.date(),
-        BodyComposition.weight_kg.isnot(None)
-    ).order_by(BodyComposition.date).all()
-    
-    inputs["weight_kg"] = [(row.date, float(row.weight_kg)) for row in weight_data]
-    
-    bmi_data = db.query(
-        BodyComposition.date,
-        BodyComposition.bmi
-    ).filter(
-        BodyComposition.athlete_id == athlete_id,
-        BodyComposition.date >= start_date.date(),
-        BodyComposition.date <= end_date.date(),
-        BodyComposition.bmi.isnot(None)
-    ).order_by(BodyComposition.date).all()
-    
-    inputs["bmi"] = [(row.date, float(row.bmi)) for row in bmi_data]
+_LEG_FEEL_ORDINAL = {
+    "fresh": 5, "normal": 4, "tired": 3,
+    "heavy": 2, "sore": 1, "injured": 0,
+}
 
-    body_fat_data = db.query(
-        BodyComposition.date,
-        BodyComposition.body_fat_pct
-    ).filter(
-        BodyComposition.athlete_id == athlete_id,
-        BodyComposition.date >= start_date.date(),
-        BodyComposition.date <= end_date.date(),
-        BodyComposition.body_fat_pct.isnot(None)
-    ).order_by(BodyComposition.date).all()
+_REFLECTION_ORDINAL = {"harder": -1, "expected": 0, "easier": 1}
 
-    inputs["body_fat_pct"] = [
-        (row.date, float(row.body_fat_pct)) for row in body_fat_data
-    ]
 
-    muscle_mass_data = db.query(
-        BodyComposition.date,
-        BodyComposition.muscle_mass_kg
-    ).filter(
-        BodyComposition.athlete_id == athlete_id,
-        BodyComposition.date >= start_date.date(),
-        BodyComposition.date <= end_date.date(),
-        BodyComposition.muscle_mass_kg.isnot(None)
-    ).order_by(BodyComposition.date).all()
+def _split_columns(
+    rows,
+    day,
+    signals: List[Tuple[str, str]],
+) -> Dict[str, List[Tuple[date_type, float]]]:
+    """
+    Split one scan's rows into per-input (date, value) series.
 
-    inputs["muscle_mass_kg"] = [
-        (row.date, float(row.muscle_mass_kg)) for row in muscle_mass_data
-    ]
+    ``day(row)`` gives the row's date (rows without one are skipped);
+    NULL values are left out of their series.
+    """
+    series: Dict[str, List[Tuple[date_type, float]]] = {key: [] for key, _ in signals}
+    for row in rows:
+        d = day(row)
+        if d is None:
+            continue
+        for key, attr in signals:
+            val = getattr(row, attr, None)
+            if val is not None:
+                series[key].append((d, float(val)))
+    return series
 
-    # Stress (1-5 scale)
-    stress_data = db.query(
-        DailyCheckin.date,
-        DailyCheckin.stress_1_5
-    ).filter(
-        DailyCheckin.athlete_id == athlete_id,
-        DailyCheckin.date >= start_date.date(),
-        DailyCheckin.date <= end_date.date(),
-        DailyCheckin.stress_1_5.isnot(None)
-    ).all()
 
-    inputs["stress_1_5"] = [(row.date, float(row.stress_1_5)) for row in stress_data]
+def _row_date(row):
+    return row.date
 
-    # Soreness (1-5 scale)
-    soreness_data = db.query(
-        DailyCheckin.date,
-        DailyCheckin.soreness_1_5
-    ).filter(
-        DailyCheckin.athlete_id == athlete_id,
-        DailyCheckin.date >= start_date.date(),
-        DailyCheckin.date <= end_date.date(),
-        DailyCheckin.soreness_1_5.isnot(None)
-    ).all()
 
-    inputs["soreness_1_5"] = [(row.date, float(row.soreness_1_5)) for row in soreness_data]
+def aggregate_daily_inputs(
+    athlete_id: str,
+    start_date: datetime,
+    end_date: datetime,
+    db: Session
+) -> Dict[str, List[Tuple[datetime, float]]]:
+    """
+    Aggregate daily inputs into time-series data.
 
-    # RPE (1-10 scale)
-    rpe_data = db.query(
-        DailyCheckin.date,
-        DailyCheckin.rpe_1_10
-    ).filter(
-        DailyCheckin.athlete_id == athlete_id,
-        DailyCheckin.date >= start_date.date(),
-        DailyCheckin.date <= end_date.date(),
-        DailyCheckin.rpe_1_10.isnot(None)
-    ).all()
+    One scan per source table (DailyCheckin, WorkPattern, NutritionEntry
+    grouped by day, BodyComposition, GarminDay) over the window.
 
-    inputs["rpe_1_10"] = [(row.date, float(row.rpe_1_10)) for row in rpe_data]
+    Returns:
+        Dictionary mapping input names to list of (date, value) tuples
+    """
+    start, end = start_date.date(), end_date.date()
 
-    # Enjoyment (1-5 scale)
-    enjoyment_data = db.query(
+    checkin_signals = _CHECKIN_RECOVERY_SIGNALS + _CHECKIN_SUBJECTIVE_SIGNALS
+    checkin_rows = db.query(
         DailyCheckin.date,
-        DailyCheckin.enjoyment_1_5
+        *(getattr(DailyCheckin, attr) for _, attr in checkin_signals),
     ).filter(
         DailyCheckin.athlete_id == athlete_id,
-        DailyCheckin.date >= start_date.date(),
-        DailyCheckin.date <= end_date.date(),
-        DailyCheckin.enjoyment_1_5.isnot(None)
-    ).all()
-
-    inputs["enjoyment_1_5"] = [(row.date, float(row.enjoyment_1_5)) for row in enjoyment_data]
+        DailyCheckin.date >= start,
+        DailyCheckin.date <= end,
+    ).order_by(DailyCheckin.date).all()
+    checkin = _split_columns(checkin_rows, _row_date, checkin_signals)
 
-    # Confidence (1-5 scale)
-    confidence_data = db.query(
-        DailyCheckin.date,
-        DailyCheckin.confidence_1_5
+    work_rows = db.query(
+        WorkPattern.date,
+        *(getattr(WorkPattern, attr) for _, attr in _WORK_SIGNALS),
     ).filter(
-        DailyCheckin.athlete_id == athlete_id,
-        DailyCheckin.date >= start_date.date(),
-        DailyCheckin.date <= end_date.date(),
-        DailyCheckin.confidence_1_5.isnot(None)
-    ).all()
-
-    inputs["confidence_1_5"] = [(row.date, float(row.confidence_1_5)) for row in confidence_data]
+        WorkPattern.athlete_id == athlete_id,
+        WorkPattern.date >= start,
+        WorkPattern.date <= end,
+    ).order_by(WorkPattern.date).all()
 
-    # Morning readiness (1-5 scale)
-    readiness_data = db.query(
-        DailyCheckin.date,
-        DailyCheckin.readiness_1_5
+    # SUM skips NULLs, and is NULL on a day where every entry is NULL
+    nutrition_rows = db.query(
+        NutritionEntry.date,
+        *(func.sum(getattr(NutritionEntry, attr)).label(attr) for _, attr in _NUTRITION_SIGNALS),
     ).filter(
-        DailyCheckin.athlete_id == athlete_id,
-        DailyCheckin.date >= start_date.date(),
-        DailyCheckin.date <= end_date.date(),
-        DailyCheckin.readiness_1_5.isnot(None)
-    ).all()
-
-    inputs["readiness_1_5"] = [(row.date, float(row.readiness_1_5)) for row in readiness_data]
+        NutritionEntry.athlete_id == athlete_id,
+        NutritionEntry.date >= start,
+        NutritionEntry.date <= end,
+    ).group_by(NutritionEntry.date).order_by(NutritionEntry.date).all()
 
-    # Overnight average HR
-    overnight_hr_data = db.query(
-        DailyCheckin.date,
-        DailyCheckin.overnight_avg_hr
+    body_rows = db.query(
+        BodyComposition.date,
+        *(getattr(BodyComposition, attr) for _, attr in _BODY_SIGNALS),
     ).filter(
-        DailyCheckin.athlete_id == athlete_id,
-        DailyCheckin.date >= start_date.date(),
-        DailyCheckin.date <= end_date.date(),
-        DailyCheckin.overnight_avg_hr.isnot(None)
-    ).all()
-
-    inputs["overnight_avg_hr"] = [(row.date, float(row.overnight_avg_hr)) for row in overnight_hr_data]
+        BodyComposition.athlete_id == athlete_id,
+        BodyComposition.date >= start,
+        BodyComposition.date <= end,
+    ).order_by(BodyComposition.date).all()
 
-    # HRV SDNN
-    hrv_sdnn_data = db.query(
-        DailyCheckin.date,
-        DailyCheckin.hrv_sdnn
+    garmin_rows = db.query(
+        GarminDay.calendar_date,
+        *(getattr(GarminDay, attr) for _, attr in _GARMIN_SIGNALS),
     ).filter(
-        DailyCheckin.athlete_id == athlete_id,
-        DailyCheckin.date >= start_date.date(),
-        DailyCheckin.date <= end_date.date(),
-        DailyCheckin.hrv_sdnn.isnot(None)
-    ).all()
-
-    inputs["hrv_sdnn"] = [(row.date, float(row.hrv_sdnn)) for row in hrv_sdnn_data]
-
-    # ── GarminDay wearable signals ──
-
-    _garmin_base = db.query(GarminDay).filter(
         GarminDay.athlete_id == athlete_id,
-        GarminDay.calendar_date >= start_date.date(),
-        GarminDay.calendar_date <= end_date.date(),
-    )
+        GarminDay.calendar_date >= start,
+        GarminDay.calendar_date <= end,
+    ).order_by(GarminDay.calendar_date).all()
 
-    _gd_rows = _garmin_base.all()
-
-    _GARMIN_SIGNALS = [
-        ("garmin_sleep_score", "sleep_score"),
-        ("garmin_sleep_deep_s", "sleep_deep_s"),
-        ("garmin_sleep_rem_s", "sleep_rem_s"),
-        ("garmin_sleep_awake_s", "sleep_awake_s"),
-        ("garmin_steps", "steps"),
-        ("garmin_active_time_s", "active_time_s"),
-        ("garmin_moderate_intensity_s", "moderate_intensity_s"),
-        ("garmin_vigorous_intensity_s", "vigorous_intensity_s"),
-        ("garmin_hrv_5min_high", "hrv_5min_high"),
-        ("garmin_hrv_overnight_avg", "hrv_overnight_avg"),
-        ("garmin_min_hr", "min_hr"),
-        ("garmin_resting_hr", "resting_hr"),
-        ("garmin_vo2max", "vo2max"),
-        # Garmin Body Battery, average/max stress, and sleep-derived
-        # readiness scores are proprietary model outputs — not direct
-        # measurements. Per founder rule (real measured metrics only),
-        # they are not registered as correlation signals. The columns
-        # remain on GarminDay for backward compat but are no longer
-        # consumed by the engine.
-    ]
+    inputs = {key: checkin[key] for key, _ in _CHECKIN_RECOVERY_SIGNALS}
+    inputs.update(_split_columns(work_rows, _row_date, _WORK_SIGNALS))
+    inputs.update(_split_columns(nutrition_rows, _row_date, _NUTRITION_SIGNALS))
+    inputs.update(_split_columns(body_rows, _row_date, _BODY_SIGNALS))
+    inputs.update({key: checkin[key] for key, _ in _CHECKIN_SUBJECTIVE_SIGNALS})
 
-    for input_key, attr in _GARMIN_SIGNALS:
-        series = []
-        for row in _gd_rows:
-            val = getattr(row, attr, None)
-            if val is not None:
-                series.append((row.calendar_date, float(val)))
-        inputs[input_key] = series
+    # ── GarminDay wearable signals ──
+    inputs.update(_split_columns(garmin_rows, lambda row: row.calendar_date, _GARMIN_SIGNALS))
 
     hrv_rhr_series = []
-    for row in _gd_rows:
-        hrv = getattr(row, "hrv_5min_high", None)
-        rhr = getattr(row, "min_hr", None)
+    for row in garmin_rows:
+        hrv = row.hrv_5min_high
+        rhr = row.min_hr
         if hrv is not None and rhr is not None and rhr > 0:
             hrv_rhr_series.append((row.calendar_date, float(hrv) / float(rhr)))
     inputs["hrv_rhr_ratio"] = hrv_rhr_series
@@ -855,43 +701,10 @@ def aggregate_activity_level_inputs(
         if d not in by_date or (a.distance_m or 0) > (by_date[d].distance_m or 0):
             by_date[d] = a
 
-    # Activity signals discoverable by the correlation engine. Garmin's
-    # proprietary scores (aerobic/anaerobic Training Effect, Body Battery
-    # impact) are intentionally excluded — those are model outputs, not
-    # measurements, and we do not feed them into correlations. Garmin
-    # perceived effort is also excluded here; it is treated as a low-
-    # confidence fallback by services/effort_resolver and gated behind
-    # ActivityFeedback.perceived_effort when present.
-    _ACTIVITY_SIGNALS = [
-        ("dew_point_f", "dew_point_f"),
-        ("heat_adjustment_pct", "heat_adjustment_pct"),
-        ("temperature_f", "temperature_f"),
-        ("humidity_pct", "humidity_pct"),
-        ("elevation_gain_m", "total_elevation_gain"),
-        ("total_descent_m", "total_descent_m"),
-        ("avg_cadence", "avg_cadence"),
-        ("avg_stride_length_m", "avg_stride_length_m"),
-        ("avg_ground_contact_ms", "avg_ground_contact_ms"),
-        ("avg_vertical_oscillation_cm", "avg_vertical_oscillation_cm"),
-        ("avg_vertical_ratio_pct", "avg_vertical_ratio_pct"),
-        ("avg_power_w", "avg_power_w"),
-        ("max_power_w", "max_power_w"),
-        ("activity_intensity_score", "intensity_score"),
-        ("active_kcal", "active_kcal"),
-        ("moving_time_s", "moving_time_s"),
-    ]
-
-    for signal_key, attr in _ACTIVITY_SIGNALS:
-        series = []
-        for d, a in sorted(by_date.items()):
-            val = getattr(a, attr, None)
-            if val is not None:
-                fval = float(val)
-                if signal_key == "heat_adjustment_pct" and fval <= 0:
-                    continue
-                series.append((d, fval))
-        if series:
-            inputs[signal_key] = series
+    day_runs = [a for _, a in sorted(by_date.items())]
+    series = _split_columns(day_runs, lambda a: a.start_time.date(), _ACTIVITY_SIGNALS)
+    series["heat_adjustment_pct"] = [(d, v) for d, v in series["heat_adjustment_pct"] if v > 0]
+    inputs.update({key: values for key, values in series.items() if values})
 
     tod_series = []
     for d, a in sorted(by_date.items()):
@@ -910,8 +723,44 @@ def _aggregate_fueling_inputs(
     by_date: dict,
     db: Session,
 ) -> Dict[str, List[Tuple[date_type, float]]]:
-    """Derive fueling signals per activity from NutritionEntry."""
+    """
+    Derive fueling signals per activity from NutritionEntry.
+
+    Two scans for all activities together: the pre/during entries linked
+    to them, and the timed entries on their days (for the meal gap).
+    """
     fueling: Dict[str, List[Tuple[date_type, float]]] = {}
+    if not by_date:
+        return fueling
+
+    entries_by_activity: Dict = {}
+    linked = db.query(
+        NutritionEntry.activity_id,
+        NutritionEntry.entry_type,
+        NutritionEntry.caffeine_mg,
+        NutritionEntry.carbs_g,
+        NutritionEntry.fluid_ml,
+    ).filter(
+        NutritionEntry.athlete_id == athlete_id,
+        NutritionEntry.activity_id.in_([a.id for a in by_date.values()]),
+        NutritionEntry.entry_type.in_(("pre_activity", "during_activity")),
+    ).all()
+    for e in linked:
+        entries_by_activity.setdefault(e.activity_id, []).append(e)
+
+    timings_by_date: Dict[date_type, list] = {}
+    timed = db.query(
+        NutritionEntry.date,
+        NutritionEntry.timing,
+    ).filter(
+        NutritionEntry.athlete_id == athlete_id,
+        NutritionEntry.timing.isnot(None),
+        NutritionEntry.date >= min(by_date),
+        NutritionEntry.date <= max(by_date),
+    ).order_by(NutritionEntry.timing).all()
+    for row in timed:
+        timings_by_date.setdefault(row.date, []).append(row.timing)
+
     pre_caffeine = []
     pre_carbs = []
     during_carbs = []
@@ -921,11 +770,7 @@ def _aggregate_fueling_inputs(
     meal_gap = []
 
     for d, a in sorted(by_date.items()):
-        entries = db.query(NutritionEntry).filter(
-            NutritionEntry.athlete_id == athlete_id,
-            NutritionEntry.activity_id == a.id,
-        ).all()
-
+        entries = entries_by_activity.get(a.id, [])
         pre = [e for e in entries if e.entry_type == "pre_activity"]
         during = [e for e in entries if e.entry_type == "during_activity"]
 
@@ -949,14 +794,11 @@ def _aggregate_fueling_inputs(
             during_fluid.append((d, fl_dur))
 
         if a.start_time:
-            last_meal = db.query(NutritionEntry).filter(
-                NutritionEntry.athlete_id == athlete_id,
-                NutritionEntry.timing.isnot(None),
-                NutritionEntry.timing < a.start_time,
-                NutritionEntry.date == d,
-            ).order_by(NutritionEntry.timing.desc()).first()
-            if last_meal and last_meal.timing:
-                gap_min = (a.start_time - last_meal.timing).total_seconds() / 60
+            # Last timed entry of the day before the run started
+            timings = timings_by_date.get(d, [])
+            i = bisect_left(timings, a.start_time)
+            if i > 0:
+                gap_min = (a.start_time - timings[i - 1]).total_seconds() / 60
                 if 0 < gap_min < 720:
                     meal_gap.append((d, gap_min))
 
@@ -986,72 +828,45 @@ def aggregate_feedback_inputs(
 ) -> Dict[str, List[Tuple[date_type, float]]]:
     """
     Aggregate post-run feedback and reflection signals.
+
+    One scan each of ActivityFeedback and ActivityReflection; leg feel and
+    reflection responses are mapped to ordinals in the query.
     """
     inputs: Dict[str, List[Tuple[date_type, float]]] = {}
 
-    _LEG_FEEL_ORDINAL = {
-        "fresh": 5, "normal": 4, "tired": 3,
-        "heavy": 2, "sore": 1, "injured": 0,
-    }
+    def submitted_day(row):
+        return row.submitted_at.date() if row.submitted_at else None
 
     feedback_rows = db.query(
         ActivityFeedback.submitted_at,
         ActivityFeedback.perceived_effort,
         ActivityFeedback.energy_pre,
         ActivityFeedback.energy_post,
-        ActivityFeedback.leg_feel,
+        case(_LEG_FEEL_ORDINAL, value=ActivityFeedback.leg_feel).label("leg_feel"),
     ).filter(
         ActivityFeedback.athlete_id == athlete_id,
         ActivityFeedback.submitted_at >= start_date,
         ActivityFeedback.submitted_at <= end_date,
     ).all()
 
-    perceived_effort = []
-    energy_pre = []
-    energy_post = []
-    leg_feel = []
+    series = _split_columns(feedback_rows, submitted_day, _FEEDBACK_SIGNALS)
+    inputs.update({key: values for key, values in series.items() if values})
 
-    for row in feedback_rows:
-        d = row.submitted_at.date() if row.submitted_at else None
-        if d is None:
-            continue
-        if row.perceived_effort is not None:
-            perceived_effort.append((d, float(row.perceived_effort)))
-        if row.energy_pre is not None:
-            energy_pre.append((d, float(row.energy_pre)))
-        if row.energy_post is not None:
-            energy_post.append((d, float(row.energy_post)))
-        if row.leg_feel and row.leg_feel in _LEG_FEEL_ORDINAL:
-            leg_feel.append((d, float(_LEG_FEEL_ORDINAL[row.leg_feel])))
-
-    if perceived_effort:
-        inputs["feedback_perceived_effort"] = perceived_effort
-    if energy_pre:
-        inputs["feedback_energy_pre"] = energy_pre
-    if energy_post:
-        inputs["feedback_energy_post"] = energy_post
-    if leg_feel:
-        inputs["feedback_leg_feel"] = leg_feel
-
-    _REFLECTION_ORDINAL = {"harder": -1, "expected": 0, "easier": 1}
+    def created_day(row):
+        return row.created_at.date() if row.created_at else None
 
     reflection_rows = db.query(
         ActivityReflection.created_at,
-        ActivityReflection.response,
+        case(_REFLECTION_ORDINAL, value=ActivityReflection.response).label("response"),
     ).filter(
         ActivityReflection.athlete_id == athlete_id,
         ActivityReflection.created_at >= start_date,
         ActivityReflection.created_at <= end_date,
     ).all()
 
-    reflection_series = []
-    for row in reflection_rows:
-        d = row.created_at.date() if row.created_at else None
-        if d is None:
-            continue
-        val = _REFLECTION_ORDINAL.get(row.response)
-        if val is not None:
-            reflection_series.append((d, float(val)))
+    reflection_series = _split_columns(
+        reflection_rows, created_day, [("reflection_vs_expected", "response")]
+    )["reflection_vs_expected"]
 
     if reflection_series:
         inputs["reflection_vs_expected"] = reflection_series
@@ -1853,6 +1668,9 @@ def find_time_shifted_correlations(
     This ensures the engine identifies the athlete's current frontier, not
     historical solved problems (see LIMITER_ENGINE_BRIEF.md).
 
+    Sweeps over many inputs and outputs should call lag_correlations once
+    and read results with _lagged_results instead of looping over this.
+
     Args:
         input_data: List of (date, value) tuples for input variable
         output_data: List of (date, value) tuples for output variable
@@ -1861,46 +1679,43 @@ def find_time_shifted_correlations(
         temporal_weighting: Apply recency weights (L30=4x, L31-90=2x, etc.)
         reference_date: Anchor for recency calculation (defaults to now)
     """
-    if reference_date is None:
-        reference_date = datetime.now()
-
-    results = []
+    lagged = lag_correlations(
+        {"input": input_data}, {"output": output_data},
+        max_lag_days=max_lag_days,
+        temporal_weighting=temporal_weighting,
+        reference_date=reference_date,
+    )
+    return _lagged_results(lagged, 0, 0, min_samples)
 
-    for lag_days in range(max_lag_days + 1):
-        shifted_input = [
-            (date + timedelta(days=lag_days), value)
-            for date, value in input_data
-        ]
 
-        aligned = _align_time_series_with_dates(shifted_input, output_data)
+def _lagged_results(
+    lagged: LagCorrelations,
+    input_idx: int,
+    output_idx: int,
+    min_samples: int = 3,
+) -> List[CorrelationResult]:
+    """CorrelationResults for one kernel pair: lags with enough samples and |r| ≥ threshold."""
+    r_lags = lagged.r[input_idx, output_idx]
+    p_lags = lagged.p[input_idx, output_idx]
+    n_lags = lagged.n[input_idx, output_idx]
 
-        if len(aligned) < min_samples:
+    results = []
+    for lag_days in range(len(r_lags)):
+        n = int(n_lags[lag_days])
+        r = float(r_lags[lag_days])
+        p_value = float(p_lags[lag_days])
+        if n < min_samples or abs(r) < MIN_CORRELATION_STRENGTH:
             continue
-
-        x_values = [row[1] for row in aligned]
-        y_values = [row[2] for row in aligned]
-
-        if temporal_weighting:
-            weights = [_recency_weight(row[0], reference_date) for row in aligned]
-            r, p_value = calculate_weighted_pearson_correlation(
-                x_values, y_values, weights,
-            )
-        else:
-            r, p_value = calculate_pearson_correlation(x_values, y_values)
-
-        if abs(r) >= MIN_CORRELATION_STRENGTH:
-            result = CorrelationResult(
-                input_name="",
-                correlation_coefficient=r,
-                p_value=p_value,
-                sample_size=len(aligned),
-                is_significant=p_value < SIGNIFICANCE_LEVEL,
-                direction="positive" if r > 0 else "negative",
-                strength=classify_correlation_strength(r),
-                time_lag_days=lag_days,
-            )
-            results.append(result)
-
+        results.append(CorrelationResult(
+            input_name=lagged.input_names[input_idx],
+            correlation_coefficient=r,
+            p_value=p_value,
+            sample_size=n,
+            is_significant=p_value < SIGNIFICANCE_LEVEL,
+            direction="positive" if r > 0 else "negative",
+            strength=classify_correlation_strength(r),
+            time_lag_days=lag_days,
+        ))
     return results
 
 
@@ -2187,8 +2002,7 @@ def aggregate_cross_training_inputs(
         ct_tss_cache: Dict = {}
         for ct_act in all_ct_activities:
             try:
-                stress = _tss_calc.calculate_workout_tss(ct_act, _athlete_obj)
-                ct_tss_cache[ct_act.id] = stress.tss
+                ct_tss_cache[ct_act.id] = _tss_calc.workout_tss(ct_act, _athlete_obj)
             except Exception:
                 ct_tss_cache[ct_act.id] = 0.0
 
@@ -2746,6 +2560,7 @@ def run_full_discovery(
     all_results: Dict[str, Dict] = {}
     total_findings = 0
 
+    outputs_by_metric: Dict[str, List[Tuple[date_type, float]]] = {}
     for output_metric in _V2_OUTPUT_METRICS:
         if output_metric == "efficiency":
             outputs = aggregate_efficiency_outputs(athlete_id, start_date, end_date, db)
@@ -2766,15 +2581,16 @@ def run_full_discovery(
                 "reason": f"Insufficient output data ({len(outputs)} < {MIN_SAMPLE_SIZE})",
             }
             continue
+        outputs_by_metric[output_metric] = outputs
+
+    # Every input × output metric × lag in one pass
+    lagged = lag_correlations(usable_inputs, outputs_by_metric, max_lag_days=7)
 
+    for output_idx, (output_metric, outputs) in enumerate(outputs_by_metric.items()):
         candidates = []
-        for input_name, input_data in usable_inputs.items():
-            lagged_results = find_time_shifted_correlations(
-                input_data, outputs, max_lag_days=7,
-            )
-            for r in lagged_results:
-                if abs(r.correlation_coefficient) >= MIN_CORRELATION_STRENGTH and r.sample_size >= MIN_SAMPLE_SIZE:
-                    r.input_name = input_name
+        for input_idx in range(len(lagged.input_names)):
+            for r in _lagged_results(lagged, input_idx, output_idx):
+                if r.sample_size >= MIN_SAMPLE_SIZE:
                     candidates.append(r)
 
         if not candidates:
@@ -2881,34 +2697,18 @@ def run_full_discovery(
     }
 
 
-def analyze_correlations(
+def _correlation_cache_key(athlete_id: str, days: int, output_metric: str) -> str:
+    return f"correlations:{athlete_id}:{days}:{output_metric}"
+
+
+def _aggregate_correlation_inputs(
     athlete_id: str,
-    days: int = 90,
-    db: Session = None,
+    start_date: datetime,
+    end_date: datetime,
+    db: Session,
     include_training_load: bool = True,
-    output_metric: str = "efficiency",
-    shadow_mode: bool = False,
-) -> Dict:
-    """
-    Main correlation analysis function.
-    
-    Analyzes all inputs vs efficiency outputs and returns discovered correlations.
-    Cached in Redis for 15 minutes (key includes days + output_metric).
-    Invalidated via invalidate_athlete_cache on activity write.
-    """
-    if not db:
-        raise ValueError("Database session required")
-    from core.cache import get_cache, set_cache
-    _cache_key = f"correlations:{athlete_id}:{days}:{output_metric}"
-    # Shadow mode bypasses production cache entirely to avoid read/write pollution.
-    if not shadow_mode:
-        _cached = get_cache(_cache_key)
-        if _cached is not None:
-            return _cached
-    
-    end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=days)
-    
+) -> Dict[str, List[Tuple[date_type, float]]]:
+    """Every input series analyze_correlations tests, for one window."""
     # Aggregate inputs
     inputs = aggregate_daily_inputs(athlete_id, start_date, end_date, db)
 
@@ -2941,54 +2741,77 @@ def analyze_correlations(
     inputs["daily_session_stress"] = aggregate_daily_session_stress(
         athlete_id, start_date, end_date, db,
     )
+    return inputs
 
-    # Get outputs based on metric
+
+def _aggregate_metric_outputs(
+    output_metric: str,
+    athlete_id: str,
+    start_date: datetime,
+    end_date: datetime,
+    db: Session,
+) -> List[Tuple[date_type, float]]:
+    """Output series for one metric (unknown metrics fall back to efficiency)."""
     if output_metric == "efficiency":
-        outputs = aggregate_efficiency_outputs(athlete_id, start_date, end_date, db)
+        return aggregate_efficiency_outputs(athlete_id, start_date, end_date, db)
     elif output_metric == "pace_easy":
-        outputs = aggregate_pace_at_effort(athlete_id, start_date, end_date, db, "easy")
+        return aggregate_pace_at_effort(athlete_id, start_date, end_date, db, "easy")
     elif output_metric == "pace_threshold":
-        outputs = aggregate_pace_at_effort(athlete_id, start_date, end_date, db, "threshold")
+        return aggregate_pace_at_effort(athlete_id, start_date, end_date, db, "threshold")
     elif output_metric == "completion":
-        outputs = aggregate_workout_completion(athlete_id, start_date, end_date, db)
+        return aggregate_workout_completion(athlete_id, start_date, end_date, db)
     elif output_metric == "efficiency_threshold":
-        outputs = aggregate_efficiency_by_effort_zone(athlete_id, start_date, end_date, db, "threshold")
+        return aggregate_efficiency_by_effort_zone(athlete_id, start_date, end_date, db, "threshold")
     elif output_metric == "efficiency_race":
-        outputs = aggregate_efficiency_by_effort_zone(athlete_id, start_date, end_date, db, "race")
+        return aggregate_efficiency_by_effort_zone(athlete_id, start_date, end_date, db, "race")
     elif output_metric == "efficiency_easy":
-        outputs = aggregate_efficiency_by_effort_zone(athlete_id, start_date, end_date, db, "easy")
+        return aggregate_efficiency_by_effort_zone(athlete_id, start_date, end_date, db, "easy")
     elif output_metric == "efficiency_trend":
-        outputs = aggregate_efficiency_trend(athlete_id, start_date, end_date, db, "threshold")
+        return aggregate_efficiency_trend(athlete_id, start_date, end_date, db, "threshold")
     elif output_metric == "pb_events":
-        outputs = aggregate_pb_events(athlete_id, start_date, end_date, db)
+        return aggregate_pb_events(athlete_id, start_date, end_date, db)
     elif output_metric == "race_pace":
-        outputs = aggregate_race_pace(athlete_id, start_date, end_date, db)
+        return aggregate_race_pace(athlete_id, start_date, end_date, db)
     else:
-        outputs = aggregate_efficiency_outputs(athlete_id, start_date, end_date, db)
-    
-    if len(outputs) < MIN_SAMPLE_SIZE:
-        return {
-            "error": "Insufficient data",
-            "sample_size": len(outputs),
-            "required": MIN_SAMPLE_SIZE
-        }
-    
-    # Analyze each input
+        return aggregate_efficiency_outputs(athlete_id, start_date, end_date, db)
+
+
+def _insufficient_outputs(outputs: List) -> Dict:
+    return {
+        "error": "Insufficient data",
+        "sample_size": len(outputs),
+        "required": MIN_SAMPLE_SIZE
+    }
+
+
+def _testable_inputs(inputs: Dict[str, List]) -> Dict[str, List]:
+    return {
+        name: data for name, data in inputs.items() if len(data) >= MIN_SAMPLE_SIZE
+    }
+
+
+def _metric_result(
+    athlete_id: str,
+    inputs: Dict[str, List],
+    outputs: List,
+    output_metric: str,
+    lagged: LagCorrelations,
+    output_idx: int,
+    start_date: datetime,
+    end_date: datetime,
+    days: int,
+    db: Session,
+) -> Dict:
+    """Correlations for one output metric from kernel results, persisted."""
     correlations = []
     
-    for input_name, input_data in inputs.items():
-        if len(input_data) < MIN_SAMPLE_SIZE:
-            continue
-        
-        # Find time-shifted correlations
-        lagged_results = find_time_shifted_correlations(input_data, outputs, max_lag_days=7)
-        
-        # Set input name and keep only significant correlations
-        significant = []
-        for r in lagged_results:
-            if r.is_significant:
-                r.input_name = input_name
-                significant.append(r)
+    for input_idx, input_name in enumerate(lagged.input_names):
+        input_data = inputs[input_name]
+
+        # Keep only significant correlations
+        significant = [
+            r for r in _lagged_results(lagged, input_idx, output_idx) if r.is_significant
+        ]
         
         if significant:
             # Keep the strongest correlation (by absolute value)
@@ -3070,6 +2893,70 @@ def analyze_correlations(
     except Exception as e:
         logger.warning(f"Correlation persistence failed for {athlete_id}: {e}")
 
+    return result
+
+
+def analyze_correlations(
+    athlete_id: str,
+    days: int = 90,
+    db: Session = None,
+    include_training_load: bool = True,
+    output_metric: str = "efficiency",
+    shadow_mode: bool = False,
+) -> Dict:
+    """
+    Main correlation analysis function.
+    
+    Analyzes all inputs vs efficiency outputs and returns discovered correlations.
+    Cached in Redis for 15 minutes (key includes days + output_metric).
+    Invalidated via invalidate_correlation_cache / invalidate_athlete_cache
+    on check-in, feedback, activity and health writes.
+
+    When the sweep refreshed the athlete's sufficient-statistics store
+    today (see _refresh_correlation_stats), the answer comes from the
+    store without re-reading the window; otherwise it is recomputed.
+    """
+    if not db:
+        raise ValueError("Database session required")
+    from core.cache import get_cache, set_cache
+    _cache_key = _correlation_cache_key(athlete_id, days, output_metric)
+    # Shadow mode bypasses production cache entirely to avoid read/write pollution.
+    if not shadow_mode:
+        _cached = get_cache(_cache_key)
+        if _cached is not None:
+            return _cached
+
+        if include_training_load:
+            result = _metric_result_from_stats(athlete_id, days, output_metric, db)
+            if result is not None:
+                try:
+                    set_cache(_cache_key, result, ttl=900)  # 15 min
+                except Exception:
+                    pass
+                return result
+    
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=days)
+    
+    inputs = _aggregate_correlation_inputs(
+        athlete_id, start_date, end_date, db, include_training_load,
+    )
+
+    # Get outputs based on metric
+    outputs = _aggregate_metric_outputs(output_metric, athlete_id, start_date, end_date, db)
+    
+    if len(outputs) < MIN_SAMPLE_SIZE:
+        return _insufficient_outputs(outputs)
+    
+    # All inputs × lags in one pass
+    lagged = lag_correlations(
+        _testable_inputs(inputs), {output_metric: outputs}, max_lag_days=7,
+    )
+    result = _metric_result(
+        athlete_id, inputs, outputs, output_metric, lagged, 0,
+        start_date, end_date, days, db,
+    )
+
     try:
         if not shadow_mode:
             set_cache(_cache_key, result, ttl=900)  # 15 min
@@ -3078,6 +2965,262 @@ def analyze_correlations(
     return result
 
 
+def analyze_correlations_for_metrics(
+    athlete_id: str,
+    output_metrics: List[str],
+    days: int = 90,
+    db: Session = None,
+    include_training_load: bool = True,
+    shadow_mode: bool = False,
+) -> Dict[str, Dict]:
+    """
+    analyze_correlations for several output metrics in one pass.
+
+    Inputs are aggregated once for the window, every output series is
+    built, and one kernel call evaluates all inputs × metrics × lags.
+    Each metric is persisted and cached exactly as analyze_correlations
+    would, so later single-metric reads hit the cache. Metrics already
+    cached are returned from the cache.
+
+    Returns {metric: analyze_correlations result}. A metric whose output
+    aggregation or evaluation raised is logged and left out.
+    """
+    if not db:
+        raise ValueError("Database session required")
+    from core.cache import get_cache, set_cache
+
+    results: Dict[str, Dict] = {}
+    if not shadow_mode:
+        for metric in output_metrics:
+            _cached = get_cache(_correlation_cache_key(athlete_id, days, metric))
+            if _cached is not None:
+                results[metric] = _cached
+    pending = [m for m in output_metrics if m not in results]
+    if not pending:
+        return results
+
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=days)
+    reference_date = datetime.now()
+
+    inputs = _aggregate_correlation_inputs(
+        athlete_id, start_date, end_date, db, include_training_load,
+    )
+
+    aggregated: Dict[str, List[Tuple[date_type, float]]] = {}
+    outputs_by_metric: Dict[str, List[Tuple[date_type, float]]] = {}
+    for metric in pending:
+        try:
+            outputs = _aggregate_metric_outputs(metric, athlete_id, start_date, end_date, db)
+        except Exception as exc:
+            logger.warning("Correlation outputs failed for %s/%s: %s", athlete_id, metric, exc)
+            continue
+        aggregated[metric] = outputs
+        if len(outputs) < MIN_SAMPLE_SIZE:
+            results[metric] = _insufficient_outputs(outputs)
+            continue
+        outputs_by_metric[metric] = outputs
+
+    # Every input × output metric × lag in one pass
+    lagged = lag_correlations(
+        _testable_inputs(inputs), outputs_by_metric, max_lag_days=7,
+        reference_date=reference_date,
+    )
+
+    # A full pass over every metric (the nightly sweep) keeps the
+    # sufficient-statistics store current and checks it against the kernel.
+    if not shadow_mode and include_training_load and len(pending) == len(output_metrics):
+        _refresh_correlation_stats(athlete_id, days, inputs, aggregated, lagged, reference_date)
+
+    for output_idx, (metric, outputs) in enumerate(outputs_by_metric.items()):
+        try:
+            result = _metric_result(
+                athlete_id, inputs, outputs, metric, lagged, output_idx,
+                start_date, end_date, days, db,
+            )
+        except Exception as exc:
+            logger.warning("Correlation analysis failed for %s/%s: %s", athlete_id, metric, exc)
+            continue
+        results[metric] = result
+        try:
+            if not shadow_mode:
+                set_cache(_correlation_cache_key(athlete_id, days, metric), result, ttl=900)
+        except Exception:
+            pass
+
+    return {m: results[m] for m in output_metrics if m in results}
+
+
+def _refresh_correlation_stats(
+    athlete_id: str,
+    days: int,
+    inputs: Dict[str, List],
+    outputs: Dict[str, List],
+    lagged: LagCorrelations,
+    reference_date: datetime,
+) -> None:
+    """
+    Apply the day's changes to the athlete's sufficient-statistics store.
+
+    The store is updated incrementally from the freshly aggregated series
+    and then checked against ``lagged``, the kernel's full recompute over
+    the same series; a store that disagrees (or whose series set changed)
+    is rebuilt from scratch. Failures are logged and never break the
+    analysis.
+    """
+    try:
+        stats = load_correlation_stats(athlete_id, days)
+        if stats is None or not stats.matches(inputs, outputs, max_lag_days=7):
+            stats = CorrelationStats.build(inputs, outputs, reference_date, max_lag_days=7)
+        else:
+            changed = stats.update(inputs, outputs, reference_date)
+            logger.debug("Correlation stats for %s: %d changed day-cells", athlete_id, changed)
+            if not stats.agrees_with(lagged):
+                logger.warning(
+                    "Correlation stats for %s drifted from full recompute; rebuilding",
+                    athlete_id,
+                )
+                stats = CorrelationStats.build(inputs, outputs, reference_date, max_lag_days=7)
+        save_correlation_stats(athlete_id, days, stats)
+    except Exception as e:
+        logger.warning(f"Correlation stats refresh failed for {athlete_id}: {e}")
+
+
+def _metric_result_from_stats(
+    athlete_id: str,
+    days: int,
+    output_metric: str,
+    db: Session,
+) -> Optional[Dict]:
+    """analyze_correlations answered from today's stats store, or None."""
+    try:
+        stats = fresh_correlation_stats(athlete_id, days, datetime.now())
+    except Exception as e:
+        logger.warning(f"Correlation stats load failed for {athlete_id}: {e}")
+        return None
+    if stats is None or output_metric not in stats.output_names:
+        return None
+
+    inputs, outputs_by_metric = stats.series()
+    outputs = outputs_by_metric[output_metric]
+    if len(outputs) < MIN_SAMPLE_SIZE:
+        return _insufficient_outputs(outputs)
+
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=days)
+    lagged = stats.lag_correlations(list(_testable_inputs(inputs)), [output_metric])
+    return _metric_result(
+        athlete_id, inputs, outputs, output_metric, lagged, 0,
+        start_date, end_date, days, db,
+    )
+
+
+class CorrelationHistory:
+    """Inputs and output series aggregated once over an athlete's deepest window."""
+
+    def __init__(
+        self,
+        athlete_id: str,
+        end_date: datetime,
+        inputs: Dict[str, List[Tuple[date_type, float]]],
+        outputs_by_metric: Dict[str, List[Tuple[date_type, float]]],
+    ):
+        self.athlete_id = athlete_id
+        self.end_date = end_date
+        self.inputs = inputs
+        self.outputs_by_metric = outputs_by_metric
+
+
+def load_correlation_history(
+    athlete_id: str,
+    output_metrics: List[str],
+    days: int,
+    db: Session,
+    include_training_load: bool = True,
+) -> CorrelationHistory:
+    """
+    Aggregate inputs and every metric's outputs once for the deepest window.
+
+    Shorter windows ending at the same date are date slices of this
+    history (see analyze_correlation_window), so multi-window scans pay
+    for the aggregation queries once. A metric whose output aggregation
+    raises is logged and left out.
+    """
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=days)
+
+    inputs = _aggregate_correlation_inputs(
+        athlete_id, start_date, end_date, db, include_training_load,
+    )
+    outputs_by_metric: Dict[str, List[Tuple[date_type, float]]] = {}
+    for metric in output_metrics:
+        try:
+            outputs_by_metric[metric] = _aggregate_metric_outputs(
+                metric, athlete_id, start_date, end_date, db,
+            )
+        except Exception as exc:
+            logger.warning("Correlation outputs failed for %s/%s: %s", athlete_id, metric, exc)
+    return CorrelationHistory(athlete_id, end_date, inputs, outputs_by_metric)
+
+
+def _series_since(
+    series: List[Tuple], cutoff: date_type,
+) -> List[Tuple]:
+    return [
+        (d, v) for d, v in series
+        if (d.date() if isinstance(d, datetime) else d) >= cutoff
+    ]
+
+
+def analyze_correlation_window(
+    history: CorrelationHistory,
+    days: int,
+    db: Session,
+) -> Dict[str, Dict]:
+    """
+    analyze_correlations for every metric in ``history``, over its last ``days``.
+
+    The window is a date slice of the preloaded series, not a re-query.
+    Rolling inputs (training load, patterns) near the window start
+    therefore keep their warm-up from earlier history instead of
+    restarting at the window edge. Findings are persisted like
+    analyze_correlations (the caller owns the transaction) and never
+    cached — this is the shadow-mode path.
+
+    Returns {metric: result}; failed metrics are logged and left out.
+    """
+    end_date = history.end_date
+    start_date = end_date - timedelta(days=days)
+    cutoff = start_date.date()
+    athlete_id = history.athlete_id
+
+    inputs = {
+        name: _series_since(data, cutoff) for name, data in history.inputs.items()
+    }
+
+    results: Dict[str, Dict] = {}
+    outputs_by_metric: Dict[str, List[Tuple[date_type, float]]] = {}
+    for metric, series in history.outputs_by_metric.items():
+        outputs = _series_since(series, cutoff)
+        if len(outputs) < MIN_SAMPLE_SIZE:
+            results[metric] = _insufficient_outputs(outputs)
+        else:
+            outputs_by_metric[metric] = outputs
+
+    lagged = lag_correlations(_testable_inputs(inputs), outputs_by_metric, max_lag_days=7)
+
+    for output_idx, (metric, outputs) in enumerate(outputs_by_metric.items()):
+        try:
+            results[metric] = _metric_result(
+                athlete_id, inputs, outputs, metric, lagged, output_idx,
+                start_date, end_date, days, db,
+            )
+        except Exception as exc:
+            logger.warning("Correlation analysis failed for %s/%s: %s", athlete_id, metric, exc)
+
+    return {m: results[m] for m in history.outputs_by_metric if m in results}
+
+
 def discover_combination_correlations(
     athlete_id: str,
     days: int = 90,
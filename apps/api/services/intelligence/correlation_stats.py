@@ -0,0 +1,362 @@
+"""
+Incremental sufficient statistics for athlete correlations.
+
+The lag-correlation kernel rebuilds every weighted moment sum from the
+full window on each sweep, although night to night only a few days
+change: a new day arrives, one falls out of the window, a late sync
+revises a value, and days cross a recency-weight boundary. The weights
+are bucketed (_recency_weight: ≤30, ≤90, ≤180 days, older), so the
+weighted sums split into plain per-bucket sums
+
+    n, Σx, Σy, Σx², Σy², Σxy    per input × output × lag × bucket
+
+and Σw·s = Σ_b w_b·s_b, Σw² = Σ_b w_b²·n_b. Each sum is bilinear in an
+input-day feature (mask, x, x²) and an output-day feature (mask, y, y²)
+restricted to one bucket, so the change between two snapshots is
+
+    F'·G' − F·G = ΔF·G' + F·ΔG
+
+which only touches the day columns that changed. Answering a query is
+then O(inputs × outputs × lags), independent of the window length.
+
+Values are stored shifted by each series' mean at build time, which
+keeps the sums well conditioned for large-valued inputs (steps, CTL).
+
+Public API:
+    CorrelationStats.build(inputs, outputs, reference_date, max_lag_days)
+    stats.update(inputs, outputs, reference_date) → changed day-cells
+    stats.lag_correlations(input_names, output_names) → LagCorrelations
+    stats.series() → (inputs, outputs) exactly as last given
+    load_correlation_stats / save_correlation_stats / fresh_correlation_stats
+"""
+from __future__ import annotations
+
+import base64
+import io
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.intelligence.lag_correlation import (
+    LagCorrelations,
+    _WEIGHT_EDGES,
+    _WEIGHT_VALUES,
+    _day,
+    _masked_mean,
+    _pearson_from_sums,
+    _to_grid,
+)
+
+# (input feature, output feature) behind each stored sum:
+# n, Σx, Σy, Σx², Σy², Σxy with features 0 = mask, 1 = value, 2 = value²
+_PRODUCTS = ((0, 0), (1, 0), (0, 1), (2, 0), (0, 2), (1, 1))
+_N_BUCKETS = len(_WEIGHT_VALUES)
+
+# Bumped when the payload layout changes; older payloads load as missing.
+STATS_VERSION = 2
+
+# Store outlives a missed nightly run; freshness is tracked separately.
+STATS_TTL_S = 3 * 24 * 3600
+FRESH_TTL_S = 24 * 3600
+
+
+class CorrelationStats:
+    """Per-bucket moment sums plus the day grids they were built from."""
+
+    def __init__(
+        self,
+        input_names: List[str],
+        output_names: List[str],
+        max_lag_days: int,
+        origin: int,
+        x: np.ndarray,
+        mx: np.ndarray,
+        y: np.ndarray,
+        my: np.ndarray,
+        points_x: List[List[Tuple[date, float]]],
+        points_y: List[List[Tuple[date, float]]],
+        kx: np.ndarray,
+        ky: np.ndarray,
+        ref: int,
+        sums: np.ndarray,
+    ):
+        self.input_names = input_names
+        self.output_names = output_names
+        self.max_lag_days = max_lag_days
+        self.origin = origin
+        self.x, self.mx, self.y, self.my = x, mx, y, my
+        # The aggregated series as given (a repeated day keeps every
+        # point); only each day's last value enters the grids and sums.
+        self.points_x, self.points_y = points_x, points_y
+        self.kx, self.ky = kx, ky
+        self.ref = ref
+        self.sums = sums
+
+    # ── Build / update ──────────────────────────────────────────────────
+
+    @classmethod
+    def build(
+        cls,
+        inputs: Dict[str, List[Tuple]],
+        outputs: Dict[str, List[Tuple]],
+        reference_date: datetime,
+        max_lag_days: int = 7,
+    ) -> "CorrelationStats":
+        """Full computation: an empty store updated with every day."""
+        origin, n_days = _extent(inputs, outputs, reference_date)
+        x, mx = _to_grid(list(inputs.values()), origin, n_days)
+        y, my = _to_grid(list(outputs.values()), origin, n_days)
+        n_in, n_out = len(inputs), len(outputs)
+        stats = cls(
+            list(inputs), list(outputs), max_lag_days, origin,
+            np.zeros_like(x), np.zeros_like(mx), np.zeros_like(y), np.zeros_like(my),
+            [], [],
+            _masked_mean(x, mx)[:, 0], _masked_mean(y, my)[:, 0],
+            _day(reference_date).toordinal(),
+            np.zeros((len(_PRODUCTS), n_in, n_out, max_lag_days + 1, _N_BUCKETS)),
+        )
+        stats.update(inputs, outputs, reference_date)
+        return stats
+
+    def matches(self, inputs: Dict, outputs: Dict, max_lag_days: int) -> bool:
+        """True when ``update`` can apply: same series names and lag range."""
+        return (
+            list(inputs) == self.input_names
+            and list(outputs) == self.output_names
+            and max_lag_days == self.max_lag_days
+        )
+
+    def update(
+        self,
+        inputs: Dict[str, List[Tuple]],
+        outputs: Dict[str, List[Tuple]],
+        reference_date: datetime,
+    ) -> int:
+        """
+        Bring the sums to a new snapshot of the same series.
+
+        Added, dropped and revised days and days crossing a weight bucket
+        are applied as deltas. Returns the number of (series, day) cells
+        that changed.
+        """
+        ref = _day(reference_date).toordinal()
+        new_origin, new_days = _extent(inputs, outputs, reference_date)
+        lo = min(self.origin, new_origin)
+        hi = max(self.origin + self.x.shape[1], new_origin + new_days)
+        span = hi - lo
+
+        x_old, mx_old = _place(self.x, self.origin - lo, span), _place(self.mx, self.origin - lo, span)
+        y_old, my_old = _place(self.y, self.origin - lo, span), _place(self.my, self.origin - lo, span)
+        x_new, mx_new = _to_grid(list(inputs.values()), lo, span)
+        y_new, my_new = _to_grid(list(outputs.values()), lo, span)
+
+        f_old = _features(x_old, mx_old, self.kx)
+        f_new = _features(x_new, mx_new, self.kx)
+        g_old = _bucketed(_features(y_old, my_old, self.ky), lo, self.ref)
+        g_new = _bucketed(_features(y_new, my_new, self.ky), lo, ref)
+
+        d_f = f_new - f_old
+        d_g = g_new - g_old
+        cols_x = np.flatnonzero(np.any(d_f != 0, axis=(0, 1)))
+        cols_y = np.flatnonzero(np.any(d_g != 0, axis=(0, 1, 2)))
+
+        for lag in range(self.max_lag_days + 1):
+            c = cols_x[cols_x + lag < span]
+            if c.size:
+                self._add(lag, d_f[:, :, c], g_new[..., c + lag])
+            c = cols_y[cols_y - lag >= 0]
+            if c.size:
+                self._add(lag, f_old[:, :, c - lag], d_g[..., c])
+
+        changed = int(
+            np.count_nonzero((mx_old != mx_new) | (x_old != x_new))
+            + np.count_nonzero((my_old != my_new) | (y_old != y_new))
+        )
+
+        keep = slice(new_origin - lo, new_origin - lo + new_days)
+        self.origin = new_origin
+        self.x, self.mx = x_new[:, keep], mx_new[:, keep]
+        self.y, self.my = y_new[:, keep], my_new[:, keep]
+        self.points_x = _points(inputs.values())
+        self.points_y = _points(outputs.values())
+        self.ref = ref
+        return changed
+
+    def _add(self, lag: int, f: np.ndarray, g: np.ndarray) -> None:
+        # f: (feature, input, day); g: (bucket, feature, output, day)
+        for k, (p, q) in enumerate(_PRODUCTS):
+            self.sums[k, :, :, lag, :] += (f[p] @ g[:, q].transpose(0, 2, 1)).transpose(1, 2, 0)
+
+    # ── Queries ─────────────────────────────────────────────────────────
+
+    def lag_correlations(
+        self,
+        input_names: Optional[Sequence[str]] = None,
+        output_names: Optional[Sequence[str]] = None,
+    ) -> LagCorrelations:
+        """Weighted r, p and n for the named series, as lag_correlations() would give."""
+        input_names = list(self.input_names if input_names is None else input_names)
+        output_names = list(self.output_names if output_names is None else output_names)
+        rows = [self.input_names.index(name) for name in input_names]
+        cols = [self.output_names.index(name) for name in output_names]
+        s = self.sums[:, rows][:, :, cols]
+
+        w = np.array(_WEIGHT_VALUES)
+        n = s[0].sum(axis=-1)
+        sw, sx, sy, sxx, syy, sxy = (s[k] @ w for k in (0, 1, 2, 3, 4, 5))
+        sw2 = s[0] @ (w * w)
+        r, p = _pearson_from_sums(n, sw, sx, sy, sxx, syy, sxy, sw2, True)
+        return LagCorrelations(input_names, output_names, r, p, np.rint(n).astype(np.int64))
+
+    def agrees_with(self, lagged: LagCorrelations, r_tol: float = 1e-6) -> bool:
+        """Consistency check against a full kernel run over the same series."""
+        mine = self.lag_correlations(lagged.input_names, lagged.output_names)
+        return (
+            np.array_equal(mine.n, lagged.n)
+            and np.allclose(mine.r, lagged.r, rtol=0, atol=r_tol)
+            and np.allclose(mine.p, lagged.p, rtol=1e-4, atol=1e-9)
+        )
+
+    def series(self) -> Tuple[Dict[str, List[Tuple[date, float]]], Dict[str, List[Tuple[date, float]]]]:
+        """The inputs and outputs the store was last updated with, point for point."""
+        return (
+            {name: list(points) for name, points in zip(self.input_names, self.points_x)},
+            {name: list(points) for name, points in zip(self.output_names, self.points_y)},
+        )
+
+    # ── Serialization ───────────────────────────────────────────────────
+
+    def to_payload(self) -> Dict:
+        buf = io.BytesIO()
+        np.savez_compressed(
+            buf, x=self.x, mx=self.mx, y=self.y, my=self.my,
+            kx=self.kx, ky=self.ky, sums=self.sums,
+            **_pack("px", self.points_x), **_pack("py", self.points_y),
+        )
+        return {
+            "version": STATS_VERSION,
+            "input_names": self.input_names,
+            "output_names": self.output_names,
+            "max_lag_days": self.max_lag_days,
+            "origin": self.origin,
+            "ref": self.ref,
+            "arrays": base64.b64encode(buf.getvalue()).decode("ascii"),
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict) -> "CorrelationStats":
+        arrays = np.load(io.BytesIO(base64.b64decode(payload["arrays"])))
+        return cls(
+            payload["input_names"], payload["output_names"], payload["max_lag_days"],
+            payload["origin"], arrays["x"], arrays["mx"], arrays["y"], arrays["my"],
+            _unpack("px", arrays), _unpack("py", arrays),
+            arrays["kx"], arrays["ky"], payload["ref"], arrays["sums"],
+        )
+
+
+def _extent(inputs: Dict, outputs: Dict, reference_date: datetime) -> Tuple[int, int]:
+    days = [
+        _day(d).toordinal()
+        for series in (*inputs.values(), *outputs.values())
+        for d, _ in series
+    ]
+    if not days:
+        return _day(reference_date).toordinal(), 1
+    return min(days), max(days) - min(days) + 1
+
+
+def _place(grid: np.ndarray, offset: int, span: int) -> np.ndarray:
+    out = np.zeros((grid.shape[0], span))
+    out[:, offset:offset + grid.shape[1]] = grid
+    return out
+
+
+def _features(values: np.ndarray, mask: np.ndarray, shift: np.ndarray) -> np.ndarray:
+    """(mask, shifted value, shifted value²) per series and day."""
+    v = (values - shift[:, None]) * mask
+    return np.stack([mask, v, v * v])
+
+
+def _bucketed(features: np.ndarray, origin: int, ref: int) -> np.ndarray:
+    """Output features split by the recency bucket of their day."""
+    days_ago = np.maximum(ref - (origin + np.arange(features.shape[-1])), 0)
+    bucket = np.searchsorted(_WEIGHT_EDGES, days_ago, side="left")
+    onehot = (bucket[None, :] == np.arange(_N_BUCKETS)[:, None]).astype(float)
+    return onehot[:, None, None, :] * features[None]
+
+
+def _points(series) -> List[List[Tuple[date, float]]]:
+    return [[(_day(d), float(v)) for d, v in points] for points in series]
+
+
+def _pack(prefix: str, points: List[List[Tuple[date, float]]]) -> Dict[str, np.ndarray]:
+    """Ragged series as flat day/value arrays plus per-series lengths."""
+    flat = [p for series in points for p in series]
+    return {
+        f"{prefix}_day": np.array([d.toordinal() for d, _ in flat], dtype=np.int64),
+        f"{prefix}_value": np.array([v for _, v in flat], dtype=float),
+        f"{prefix}_len": np.array([len(series) for series in points], dtype=np.int64),
+    }
+
+
+def _unpack(prefix: str, arrays) -> List[List[Tuple[date, float]]]:
+    days, values = arrays[f"{prefix}_day"], arrays[f"{prefix}_value"]
+    out, start = [], 0
+    for n in arrays[f"{prefix}_len"]:
+        end = start + int(n)
+        out.append([(date.fromordinal(int(d)), float(v)) for d, v in zip(days[start:end], values[start:end])])
+        start = end
+    return out
+
+
+# ── Redis persistence ──────────────────────────────────────────────────────
+
+def _stats_key(athlete_id: str, days: int) -> str:
+    return f"correlation_stats:{athlete_id}:{days}"
+
+
+def _fresh_key(athlete_id: str, days: int) -> str:
+    # Under the correlations: prefix so invalidate_correlation_cache (and
+    # invalidate_athlete_cache) clear it with the result cache on every
+    # check-in, feedback, activity and health write.
+    return f"correlations:{athlete_id}:{days}:stats_fresh"
+
+
+def load_correlation_stats(athlete_id: str, days: int) -> Optional[CorrelationStats]:
+    from core.cache import get_cache
+
+    payload = get_cache(_stats_key(athlete_id, days))
+    if not payload or payload.get("version") != STATS_VERSION:
+        return None
+    return CorrelationStats.from_payload(payload)
+
+
+def save_correlation_stats(athlete_id: str, days: int, stats: CorrelationStats) -> None:
+    """Store the sums and mark them fresh for their reference day."""
+    from core.cache import set_cache
+
+    if set_cache(_stats_key(athlete_id, days), stats.to_payload(), ttl=STATS_TTL_S):
+        set_cache(
+            _fresh_key(athlete_id, days),
+            date.fromordinal(stats.ref).isoformat(),
+            ttl=FRESH_TTL_S,
+        )
+
+
+def fresh_correlation_stats(
+    athlete_id: str, days: int, reference_date: datetime,
+) -> Optional[CorrelationStats]:
+    """
+    The stored sums, if they were refreshed on ``reference_date``'s day
+    and no athlete write has invalidated them since; otherwise None.
+    """
+    from core.cache import get_cache
+
+    today = _day(reference_date).isoformat()
+    if get_cache(_fresh_key(athlete_id, days)) != today:
+        return None
+    stats = load_correlation_stats(athlete_id, days)
+    if stats is None or date.fromordinal(stats.ref).isoformat() != today:
+        return None
+    return stats
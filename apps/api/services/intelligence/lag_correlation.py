@@ -0,0 +1,192 @@
+"""
+Lag-correlation kernel — all inputs × all outputs × all lags at once.
+
+find_time_shifted_correlations used to shift, dict-align and weight one
+(input, output) pair per lag in Python, and the discovery sweeps repeated
+that for every input and output metric. Here every series is placed once
+on a shared day axis as a value matrix plus a presence mask, and for each
+lag the weighted sums behind Pearson's r come out of a handful of matrix
+products:
+
+    n     = Mx · Myᵀ                 Σw    = Mx · (w·My)ᵀ
+    Σw x  = (X·Mx) · (w·My)ᵀ         Σw y  = Mx · (w·Y·My)ᵀ
+    Σw x² = (X²·Mx) · (w·My)ᵀ        Σw y² = Mx · (w·Y²·My)ᵀ
+    Σw xy = (X·Mx) · (w·Y·My)ᵀ       Σw²   = Mx · (w²·My)ᵀ
+
+with X/Mx restricted to days [0, D-lag) and Y/My/w to [lag, D), so input
+day d pairs with output day d+lag. The recency weight w is the output
+day's (the aligned date), exactly as the per-pair path weighted it.
+
+Semantics match calculate_weighted_pearson_correlation (effective sample
+size for the p-value) and calculate_pearson_correlation (unweighted):
+pairs with fewer than MIN_KERNEL_SAMPLES aligned days, or a constant side,
+report r = 0, p = 1.
+
+Public API:
+    lag_correlations(inputs, outputs, max_lag_days, ...) → LagCorrelations
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.stats import t as t_dist
+
+# calculate_*_pearson_correlation's own floor
+MIN_KERNEL_SAMPLES = 5
+
+# Recency weights by days before the reference date (TEMPORAL_WEIGHTS)
+_WEIGHT_EDGES = (30, 90, 180)
+_WEIGHT_VALUES = (4.0, 2.0, 1.0, 0.75)
+
+# A side is constant when its weighted variance is this small relative
+# to its (centered) second moment — rounding residue, not spread.
+_CONSTANT_RTOL = 1e-12
+
+
+@dataclass
+class LagCorrelations:
+    """r, p and aligned sample count, each (inputs, outputs, lags)."""
+
+    input_names: List[str]
+    output_names: List[str]
+    r: np.ndarray
+    p: np.ndarray
+    n: np.ndarray
+
+    def pair(self, input_name: str, output_name: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(r, p, n) per lag for one input/output pair."""
+        i = self.input_names.index(input_name)
+        o = self.output_names.index(output_name)
+        return self.r[i, o], self.p[i, o], self.n[i, o]
+
+
+def _day(d) -> date:
+    return d.date() if isinstance(d, datetime) else d
+
+
+def _to_grid(
+    series: Sequence[List[Tuple]], origin: int, n_days: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Value matrix and presence mask on the day axis; a repeated day keeps its last value."""
+    values = np.zeros((len(series), n_days))
+    mask = np.zeros((len(series), n_days))
+    for row, points in enumerate(series):
+        by_day = {_day(d).toordinal() - origin: v for d, v in points}
+        if by_day:
+            idx = np.fromiter(by_day.keys(), dtype=np.int64, count=len(by_day))
+            values[row, idx] = np.fromiter(by_day.values(), dtype=float, count=len(by_day))
+            mask[row, idx] = 1.0
+    return values, mask
+
+
+def recency_weights(days_ago: np.ndarray) -> np.ndarray:
+    """_recency_weight over an array of days-before-reference."""
+    days_ago = np.maximum(days_ago, 0)
+    return np.select(
+        [days_ago <= edge for edge in _WEIGHT_EDGES],
+        _WEIGHT_VALUES[:-1],
+        default=_WEIGHT_VALUES[-1],
+    )
+
+
+def lag_correlations(
+    inputs: Dict[str, List[Tuple]],
+    outputs: Dict[str, List[Tuple]],
+    max_lag_days: int = 14,
+    temporal_weighting: bool = True,
+    reference_date: Optional[datetime] = None,
+) -> LagCorrelations:
+    """
+    Weighted (or plain) Pearson r and p for every input × output × lag.
+
+    Series are (date, value) lists; lag k pairs input day d with output
+    day d + k, for k = 0..max_lag_days.
+    """
+    input_names = list(inputs)
+    output_names = list(outputs)
+    n_lags = max_lag_days + 1
+    shape = (len(input_names), len(output_names), n_lags)
+    r_out = np.zeros(shape)
+    p_out = np.ones(shape)
+    n_out = np.zeros(shape, dtype=np.int64)
+
+    days = [
+        _day(d).toordinal()
+        for series in (*inputs.values(), *outputs.values())
+        for d, _ in series
+    ]
+    if not input_names or not output_names or not days:
+        return LagCorrelations(input_names, output_names, r_out, p_out, n_out)
+
+    origin = min(days)
+    n_days = max(days) - origin + 1
+    x, mx = _to_grid(list(inputs.values()), origin, n_days)
+    y, my = _to_grid(list(outputs.values()), origin, n_days)
+
+    # Center on each series' own mean: r is shift-invariant, and the
+    # moment sums below stay well conditioned for large-valued inputs.
+    x = (x - _masked_mean(x, mx)) * mx
+    y = (y - _masked_mean(y, my)) * my
+
+    if temporal_weighting:
+        if reference_date is None:
+            reference_date = datetime.now()
+        ref = _day(reference_date).toordinal()
+        w = recency_weights(ref - (origin + np.arange(n_days)))
+    else:
+        w = np.ones(n_days)
+
+    for lag in range(min(n_lags, n_days)):
+        end = n_days - lag
+        xs, mxs = x[:, :end], mx[:, :end]
+        ys, mys, ws = y[:, lag:], my[:, lag:], w[lag:]
+
+        wy = mys * ws
+        n = mxs @ mys.T
+        sw = mxs @ wy.T
+        sx = xs @ wy.T
+        sxx = (xs * xs) @ wy.T
+        sy = mxs @ (ys * ws).T
+        syy = mxs @ (ys * ys * ws).T
+        sxy = xs @ (ys * ws).T
+        sw2 = mxs @ (wy * ws).T
+
+        r, p = _pearson_from_sums(n, sw, sx, sy, sxx, syy, sxy, sw2, temporal_weighting)
+        r_out[:, :, lag] = r
+        p_out[:, :, lag] = p
+        n_out[:, :, lag] = np.rint(n).astype(np.int64)
+
+    return LagCorrelations(input_names, output_names, r_out, p_out, n_out)
+
+
+def _masked_mean(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    count = mask.sum(axis=1, keepdims=True)
+    return np.divide(values.sum(axis=1, keepdims=True), count, out=np.zeros_like(count), where=count > 0)
+
+
+def _pearson_from_sums(n, sw, sx, sy, sxx, syy, sxy, sw2, weighted: bool):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var_x = sxx - sx * sx / sw
+        var_y = syy - sy * sy / sw
+        cov = sxy - sx * sy / sw
+        ok = (
+            (n >= MIN_KERNEL_SAMPLES - 0.5)
+            & (sw > 0)
+            & (var_x > _CONSTANT_RTOL * sxx)
+            & (var_y > _CONSTANT_RTOL * syy)
+        )
+        r = np.where(ok, cov / np.sqrt(var_x * var_y), 0.0)
+        r = np.clip(r, -1.0, 1.0)
+
+        n_eff = sw * sw / sw2 if weighted else n
+        perfect = ok & (np.abs(r) >= 1.0)
+        testable = ok & ~perfect & (n_eff > 2)
+        t_stat = np.where(testable, r * np.sqrt((n_eff - 2) / (1 - r * r)), 0.0)
+        df = np.maximum(1.0, n_eff - 2) if weighted else n_eff - 2
+        df = np.where(testable, df, 1.0)
+    p = np.where(testable, 2 * t_dist.sf(np.abs(t_stat), df), 1.0)
+    p = np.where(perfect, 0.0, p)
+    return r, p
@@ -0,0 +1,173 @@
+"""
+Data-version-keyed cache for race-input investigation results.
+
+mine_race_inputs_report recomputes only the investigations whose inputs
+changed. Each result is stored under a key derived from:
+
+    - the data version of every source table the investigation declares
+      (@investigation(sources=[...]); InvestigationSpec.sources)
+    - the athlete's training zones and the investigation's active param
+      overrides
+    - INVESTIGATION_CACHE_VERSION (bump when investigation logic changes)
+
+Data versions:
+    One query computes a version string per source table for the athlete.
+    performance_event carries updated_at, so its version is COUNT + MAX(updated_at).
+    activity, activity_split and daily_checkin have no updated_at column. Their
+    version is COUNT plus the sum of a 32-bit hash of the columns investigations
+    read (INVESTIGATED_COLUMNS), so edits to those columns (reclassification,
+    run_shape backfill, weather) change it as well as inserts and deletes, while
+    writes to any other column (sync bookkeeping, stored TSS, narratives) leave
+    cached results valid. activity_stream only feeds coverage, so a COUNT is
+    enough. Add a column to INVESTIGATED_COLUMNS when an investigation starts
+    reading it.
+
+    Versions are read before the snapshot, so a write landing in between can
+    only make a result newer than its key, and the next run recomputes it.
+
+Storage (Redis, best-effort; without Redis every run recomputes):
+    investigation_results:{athlete_id}   hash: investigation name → JSON
+                                         {"key": ..., "payload": ...}
+    One HGETALL per mining run reads every cached result; fresh results are
+    written back with one HSET.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+INVESTIGATION_CACHE_VERSION = 1
+KEY_PREFIX = "investigation_results"
+RESULT_TTL_S = 60 * 60 * 24 * 30
+
+# Columns the investigations read (services/race_input_analysis), per table
+INVESTIGATED_COLUMNS = {
+    "activity": (
+        "id", "start_time", "is_duplicate", "name", "workout_type", "distance_m",
+        "duration_s", "avg_hr", "total_elevation_gain", "temperature_f",
+        "humidity_pct", "heat_adjustment_pct", "run_shape",
+    ),
+    "activity_split": (
+        "id", "activity_id", "split_number", "distance", "elapsed_time",
+        "average_heartrate", "average_cadence", "gap_seconds_per_mile",
+    ),
+    "daily_checkin": ("id", "date", "hrv_rmssd", "rpe_1_10"),
+}
+
+
+def _row_hash(table: str, alias: str) -> str:
+    """SQL for a 32-bit hash of ``alias``'s investigated columns."""
+    row = ", ".join(f"{alias}.{column}" for column in INVESTIGATED_COLUMNS[table])
+    return f"('x' || LEFT(md5(ROW({row})::text), 8))::bit(32)::int::bigint"
+
+
+DATA_VERSION_SOURCES = (
+    "activity", "activity_split", "performance_event", "daily_checkin", "activity_stream",
+)
+
+DATA_VERSION_SQL = text(f"""
+    SELECT
+        (SELECT concat_ws('_', COUNT(*), SUM({_row_hash('activity', 'a')}))
+           FROM activity a
+          WHERE a.athlete_id = :aid) AS activity,
+        (SELECT concat_ws('_', COUNT(*), SUM({_row_hash('activity_split', 's')}))
+           FROM activity_split s
+           JOIN activity a ON a.id = s.activity_id
+          WHERE a.athlete_id = :aid AND a.is_duplicate = false) AS activity_split,
+        (SELECT concat_ws('_', COUNT(*), MAX(e.updated_at))
+           FROM performance_event e
+          WHERE e.athlete_id = :aid) AS performance_event,
+        (SELECT concat_ws('_', COUNT(*), SUM({_row_hash('daily_checkin', 'c')}))
+           FROM daily_checkin c
+          WHERE c.athlete_id = :aid) AS daily_checkin,
+        (SELECT COUNT(*)
+           FROM activity_stream st
+           JOIN activity a ON a.id = st.activity_id
+          WHERE a.athlete_id = :aid) AS activity_stream
+""")
+
+
+def load_data_versions(athlete_id: UUID, db: Session) -> Optional[Dict[str, str]]:
+    """Version string per source table for this athlete, or None if unavailable."""
+    try:
+        row = db.execute(DATA_VERSION_SQL, {"aid": str(athlete_id)}).first()
+    except Exception as e:  # noqa: BLE001 — no versions means no caching
+        db.rollback()
+        logger.warning("investigation data versions unavailable for %s: %s", athlete_id, e)
+        return None
+    if row is None:
+        return None
+    versions = {source: str(value) for source, value in zip(DATA_VERSION_SOURCES, row)}
+    return versions if len(versions) == len(DATA_VERSION_SOURCES) else None
+
+
+def result_key(versions: Dict[str, str], sources: Iterable[str], *parts: Any) -> str:
+    """Cache key for a result computed from ``sources`` plus any extra ``parts``."""
+    material = [INVESTIGATION_CACHE_VERSION, {s: versions[s] for s in sorted(sources)}, list(parts)]
+    return hashlib.md5(json.dumps(material, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _athlete_key(athlete_id: UUID) -> str:
+    return f"{KEY_PREFIX}:{athlete_id}"
+
+
+class InvestigationResultCache:
+    """An athlete's cached investigation results, read in one round trip."""
+
+    def __init__(self, redis_client, athlete_id: UUID, entries: Dict[str, str]):
+        self._redis = redis_client
+        self._athlete_id = athlete_id
+        self._entries = entries
+        self._pending: Dict[str, str] = {}
+
+    @classmethod
+    def load(cls, redis_client, athlete_id: UUID) -> Optional["InvestigationResultCache"]:
+        """Read every cached result for the athlete; None without Redis."""
+        if redis_client is None:
+            return None
+        try:
+            entries = redis_client.hgetall(_athlete_key(athlete_id)) or {}
+        except Exception as e:  # noqa: BLE001 — cache is best-effort
+            logger.warning("investigation result cache read failed for %s: %s", athlete_id, e)
+            return None
+        return cls(redis_client, athlete_id, entries)
+
+    def get(self, name: str, key: str) -> Optional[Any]:
+        """Cached payload for ``name`` if it was stored under ``key``."""
+        raw = self._entries.get(name)
+        if raw is None:
+            return None
+        try:
+            entry = json.loads(raw)
+        except (TypeError, ValueError):
+            return None
+        return entry.get("payload") if entry.get("key") == key else None
+
+    def put(self, name: str, key: str, payload: Any) -> None:
+        self._pending[name] = json.dumps({"key": key, "payload": payload}, default=str)
+
+    def save(self) -> int:
+        """Write pending results; returns how many were written."""
+        if not self._pending:
+            return 0
+        try:
+            pipe = self._redis.pipeline()
+            pipe.hset(_athlete_key(self._athlete_id), mapping=self._pending)
+            pipe.expire(_athlete_key(self._athlete_id), RESULT_TTL_S)
+            pipe.execute()
+        except Exception as e:  # noqa: BLE001 — cache is best-effort
+            logger.warning("investigation result cache write failed for %s: %s", self._athlete_id, e)
+            return 0
+        written = len(self._pending)
+        self._entries.update(self._pending)
+        self._pending = {}
+        return written
+
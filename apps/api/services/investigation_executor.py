@@ -0,0 +1,320 @@
+"""
+Parallel, time-budgeted execution of race-input investigations.
+
+mine_race_inputs decides which investigations an athlete qualifies for and
+hands the executor their names plus ``run_one(name)``, a callable bound to
+the athlete's AthleteInvestigationSnapshot that returns that
+investigation's findings. Investigations only read the snapshot, so they
+are independent CPU-bound jobs.
+
+Workers:
+    A fork-context process pool. ``run_one`` reaches the workers through
+    the pool initializer, so the snapshot is inherited rather than
+    pickled; only investigation names go out and InvestigationRun records
+    (with their findings) come back. The inherited DB session still holds
+    the coordinator's connection, so workers refuse every query:
+    check_db_access() raises InvestigationDbAccess in a worker (the
+    snapshot's lazily loaded accessors call it) and ORM execution on any
+    Session, lazy loads included, raises it too. When the pool cannot
+    start or breaks (no fork, daemonic parent) the remaining
+    investigations run in-process.
+
+Budgets:
+    Each investigation runs in the calling thread with a deadline of its
+    budget. On the main thread an ITIMER_REAL timer raises
+    InvestigationTimeout inside the investigation at expiry. Off the main
+    thread (request handlers, where signals cannot be armed) the deadline
+    is cooperative: check_deadline() raises InvestigationTimeout once it
+    has passed, and the snapshot accessors call it, so an investigation
+    stops at its next snapshot read. No helper thread is used, so nothing
+    touches the session after run_budgeted returns. InvestigationTimeout
+    is a BaseException so the ``except Exception`` guards inside
+    investigations do not swallow it.
+
+Population timing report (Redis, best-effort):
+    investigation_timing:names          set of investigation names seen
+    investigation_timing:{name}:ms      recent elapsed ms, newest first
+    investigation_timing:{name}:status  run counts by status
+    slowest_investigations() backs GET /v1/admin/ops/investigation-timings.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "investigation_timing"
+NAMES_KEY = f"{KEY_PREFIX}:names"
+SAMPLES_PER_INVESTIGATION = 2000
+TIMING_TTL_S = 60 * 60 * 24 * 30
+
+# Default budget by InvestigationSpec.runtime_cost_hint.
+TIME_BUDGET_S_BY_COST = {"low": 10.0, "medium": 20.0, "high": 45.0}
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+STATUS_CACHED = "cached"        # served from services/investigation_cache, not run
+
+
+class InvestigationTimeout(BaseException):
+    """Raised inside an investigation when its time budget expires."""
+
+
+class InvestigationDbAccess(RuntimeError):
+    """Raised when an investigation would query the DB from a pool worker."""
+
+
+@dataclass
+class InvestigationRun:
+    """Outcome of one investigation in one mining run."""
+    name: str
+    status: str                 # "ok" | "error" | "timeout" | "cached"
+    elapsed_ms: float
+    budget_s: Optional[float]
+    over_budget: bool = False
+    error: Optional[str] = None
+    findings: List[Any] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'status': self.status,
+            'elapsed_ms': round(self.elapsed_ms, 1),
+            'budget_s': self.budget_s,
+            'over_budget': self.over_budget,
+            'error': self.error,
+            'findings': len(self.findings),
+        }
+
+
+# Deadline (time.monotonic()) of the investigation running on this thread
+_budget = threading.local()
+
+
+def _raise_timeout(signum, frame):
+    raise InvestigationTimeout()
+
+
+def check_deadline() -> None:
+    """Raise InvestigationTimeout if the running investigation is past its budget."""
+    deadline = getattr(_budget, "deadline", None)
+    if deadline is not None and time.monotonic() > deadline:
+        raise InvestigationTimeout()
+
+
+def run_budgeted(
+    run_one: Callable[[str], List[Any]],
+    name: str,
+    budget_s: Optional[float],
+) -> InvestigationRun:
+    """Run one investigation under its budget and record how it went."""
+    armed = bool(budget_s) and threading.current_thread() is threading.main_thread()
+    previous = None
+    if armed:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, budget_s)
+
+    findings: List[Any] = []
+    error = None
+    started = time.perf_counter()
+    _budget.deadline = time.monotonic() + budget_s if budget_s else None
+    try:
+        findings = list(run_one(name) or [])
+        status = STATUS_OK
+    except InvestigationTimeout:
+        status, error = STATUS_TIMEOUT, f"exceeded {budget_s:g}s budget"
+    except Exception as e:  # noqa: BLE001 — recorded on the run
+        logger.exception("Investigation %s failed", name)
+        status, error = STATUS_ERROR, f"{type(e).__name__}: {e}"
+    finally:
+        _budget.deadline = None
+        if armed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+
+    return InvestigationRun(
+        name=name,
+        status=status,
+        elapsed_ms=elapsed_ms,
+        budget_s=budget_s,
+        over_budget=bool(budget_s) and elapsed_ms > budget_s * 1000.0,
+        error=error,
+        findings=findings if status == STATUS_OK else [],
+    )
+
+
+# ---------------------------------------------------------------------------
+# Worker side (runs in forked pool processes)
+# ---------------------------------------------------------------------------
+
+_worker_run_one: Optional[Callable[[str], List[Any]]] = None
+
+
+def check_db_access(what: str) -> None:
+    """Raise InvestigationDbAccess when ``what`` would query the DB in a pool worker."""
+    if _worker_run_one is not None:
+        raise InvestigationDbAccess(f"{what} would query the database from an investigation worker")
+
+
+def _refuse_orm_execute(orm_execute_state) -> None:
+    check_db_access("ORM execution")
+
+
+def _init_worker(run_one: Callable[[str], List[Any]]) -> None:
+    global _worker_run_one
+    _worker_run_one = run_one
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    # The inherited session's connection is the coordinator's socket.
+    event.listen(Session, "do_orm_execute", _refuse_orm_execute)
+    try:
+        # Forget the inherited pooled connections without closing them.
+        from core.database import engine
+        engine.dispose(close=False)
+    except Exception:  # noqa: BLE001 — workers never query
+        pass
+
+
+def _run_in_worker(name: str, budget_s: Optional[float]) -> InvestigationRun:
+    return run_budgeted(_worker_run_one, name, budget_s)
+
+
+def run_investigations(
+    names: List[str],
+    run_one: Callable[[str], List[Any]],
+    budgets: Dict[str, Optional[float]],
+    *,
+    workers: int = 0,
+) -> List[InvestigationRun]:
+    """Run every named investigation; one InvestigationRun per name, in order.
+
+    Args:
+        names: Investigations to run.
+        run_one: ``run_one(name) -> findings``; reads only in-memory data
+            (queries raise InvestigationDbAccess in pool workers).
+        budgets: Time budget in seconds per name (None = unbounded).
+        workers: Process pool size (0 = in-process).
+    """
+    runs: Dict[str, InvestigationRun] = {}
+    if workers > 0 and len(names) > 1:
+        try:
+            pool = ProcessPoolExecutor(
+                max_workers=min(workers, len(names)),
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+                initargs=(run_one,),
+            )
+        except (OSError, ValueError) as e:
+            logger.warning("investigation pool unavailable, running in-process: %s", e)
+            pool = None
+
+        if pool is not None:
+            try:
+                futures = [(name, pool.submit(_run_in_worker, name, budgets.get(name))) for name in names]
+                for name, fut in futures:
+                    try:
+                        runs[name] = fut.result()
+                    except (BrokenProcessPool, AssertionError):
+                        raise
+                    except (Exception, InvestigationTimeout) as e:  # noqa: BLE001 — recorded on the run
+                        runs[name] = InvestigationRun(
+                            name=name, status=STATUS_ERROR, elapsed_ms=0.0,
+                            budget_s=budgets.get(name), error=f"{type(e).__name__}: {e}",
+                        )
+            except (BrokenProcessPool, AssertionError) as e:
+                # e.g. daemonic worker processes may not fork children
+                logger.warning("investigation pool failed, running in-process: %s", e)
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = None
+            else:
+                pool.shutdown(wait=True)
+
+    for name in names:
+        if name not in runs:
+            runs[name] = run_budgeted(run_one, name, budgets.get(name))
+    return [runs[name] for name in names]
+
+
+# ---------------------------------------------------------------------------
+# Population timing report
+# ---------------------------------------------------------------------------
+
+def _samples_key(name: str) -> str:
+    return f"{KEY_PREFIX}:{name}:ms"
+
+
+def _status_key(name: str) -> str:
+    return f"{KEY_PREFIX}:{name}:status"
+
+
+def record_investigation_runs(redis_client, runs: List[InvestigationRun]) -> None:
+    """Add a mining run's timings to the population report (best-effort)."""
+    if redis_client is None or not runs:
+        return
+    try:
+        pipe = redis_client.pipeline()
+        for run in runs:
+            pipe.sadd(NAMES_KEY, run.name)
+            pipe.lpush(_samples_key(run.name), round(run.elapsed_ms, 1))
+            pipe.ltrim(_samples_key(run.name), 0, SAMPLES_PER_INVESTIGATION - 1)
+            pipe.hincrby(_status_key(run.name), run.status, 1)
+            if run.over_budget:
+                pipe.hincrby(_status_key(run.name), "over_budget", 1)
+            pipe.expire(_samples_key(run.name), TIMING_TTL_S)
+            pipe.expire(_status_key(run.name), TIMING_TTL_S)
+        pipe.expire(NAMES_KEY, TIMING_TTL_S)
+        pipe.execute()
+    except Exception as e:  # noqa: BLE001 — timing report is best-effort
+        logger.debug("investigation timing record failed: %s", e)
+
+
+def slowest_investigations(redis_client, limit: int = 20) -> Dict[str, Any]:
+    """Investigations ranked by p95 elapsed time across recent mining runs.
+
+    Returns ``{"available": bool, "investigations": [{"name", "runs",
+    "p50_ms", "p95_ms", "max_ms", "ok", "error", "timeout",
+    "over_budget"}, ...]}``; ``runs`` counts the retained samples.
+    """
+    if redis_client is None:
+        return {"available": False, "investigations": []}
+
+    names = sorted(redis_client.smembers(NAMES_KEY) or [])
+    pipe = redis_client.pipeline()
+    for name in names:
+        pipe.lrange(_samples_key(name), 0, -1)
+        pipe.hgetall(_status_key(name))
+    replies = pipe.execute() if names else []
+
+    rows = []
+    for i, name in enumerate(names):
+        samples = np.array([float(v) for v in replies[2 * i] or []], dtype=float)
+        status = {k: int(v) for k, v in (replies[2 * i + 1] or {}).items()}
+        if samples.size == 0:
+            continue
+        p50, p95 = np.percentile(samples, [50, 95])
+        rows.append({
+            "name": name,
+            "runs": int(samples.size),
+            "p50_ms": round(float(p50), 1),
+            "p95_ms": round(float(p95), 1),
+            "max_ms": round(float(samples.max()), 1),
+            STATUS_OK: status.get(STATUS_OK, 0),
+            STATUS_ERROR: status.get(STATUS_ERROR, 0),
+            STATUS_TIMEOUT: status.get(STATUS_TIMEOUT, 0),
+            "over_budget": status.get("over_budget", 0),
+        })
+    rows.sort(key=lambda r: r["p95_ms"], reverse=True)
+    return {"available": True, "investigations": rows[:limit]}
@@ -7,7 +7,9 @@ Features:
 - User-scoped caching
 - 7-day TTL with intelligent invalidation
 - Automatic recalibration on expiry
-- Invalidation hooks for activity sync
+- Recalibration hook for activity sync
+- Set-based change detection and bulk writes for the nightly
+  recalibration job (services/model_recalibration)
 
 Usage:
     cache = ModelCache(db)
@@ -17,7 +19,6 @@ Usage:
 from datetime import datetime, timedelta
 from typing import Optional
 from uuid import UUID
-import hashlib
 import json
 import logging
 
@@ -40,6 +41,76 @@ logger = logging.getLogger(__name__)
 CACHE_TTL_DAYS = 7
 ACTIVITY_THRESHOLD = 10  # Invalidate after this many new activities
 
+# Activities IndividualPerformanceModel reads race markers from
+RACE_SIGNAL_SQL = (
+    "(user_verified_race OR workout_type = 'race' "
+    "OR (is_race_candidate AND race_confidence >= 0.7))"
+)
+
+# Calibration input fingerprint per athlete: run count, last run date,
+# total distance/duration and race count over the lookback year. One
+# definition for the per-athlete check and the nightly set-based scan.
+INPUT_HASH_SQL = f"""
+    SELECT
+        athlete_id,
+        LEFT(md5(concat_ws('_',
+            COUNT(*),
+            MAX(DATE(start_time)),
+            COALESCE(SUM(distance_m), 0),
+            COALESCE(SUM(duration_s), 0),
+            COUNT(*) FILTER (WHERE {RACE_SIGNAL_SQL})
+        )), 12) AS input_hash,
+        MAX(DATE(start_time)) AS last_activity_date
+    FROM activity
+    WHERE sport = 'run'
+      AND start_time > NOW() - INTERVAL '1 year'
+      {{athlete_filter}}
+    GROUP BY athlete_id
+"""
+
+_UPSERT_SQL = text("""
+    INSERT INTO individual_model (
+        athlete_id, tau1, tau2, k1, k2, p0,
+        fit_error, r_squared, n_performance_markers, n_training_days,
+        confidence, confidence_notes,
+        input_data_hash, last_activity_date,
+        calibrated_at, expires_at, updated_at
+    ) VALUES (
+        :aid, :tau1, :tau2, :k1, :k2, :p0,
+        :fit_error, :r_squared, :n_perf, :n_days,
+        :confidence, :notes,
+        :hash, :last_act,
+        NOW(), :expires, NOW()
+    )
+    ON CONFLICT (athlete_id) DO UPDATE SET
+        tau1 = :tau1, tau2 = :tau2, k1 = :k1, k2 = :k2, p0 = :p0,
+        fit_error = :fit_error, r_squared = :r_squared,
+        n_performance_markers = :n_perf, n_training_days = :n_days,
+        confidence = :confidence, confidence_notes = :notes,
+        input_data_hash = :hash, last_activity_date = :last_act,
+        calibrated_at = NOW(), expires_at = :expires, updated_at = NOW()
+""")
+
+
+def _upsert_params(athlete_id, model: BanisterModel, input_hash, last_activity, expires_at) -> dict:
+    return {
+        "aid": str(athlete_id),
+        "tau1": model.tau1,
+        "tau2": model.tau2,
+        "k1": model.k1,
+        "k2": model.k2,
+        "p0": model.p0,
+        "fit_error": model.fit_error,
+        "r_squared": model.r_squared,
+        "n_perf": model.n_performance_markers,
+        "n_days": model.n_training_days,
+        "confidence": model.confidence.value,
+        "notes": json.dumps(model.confidence_notes),
+        "hash": input_hash,
+        "last_act": last_activity,
+        "expires": expires_at,
+    }
+
 
 # =============================================================================
 # DATABASE OPERATIONS
@@ -183,44 +254,10 @@ class ModelCache:
             input_hash = self._compute_input_hash(athlete_id)
             
             # Upsert
-            self.db.execute(text("""
-                INSERT INTO individual_model (
-                    athlete_id, tau1, tau2, k1, k2, p0,
-                    fit_error, r_squared, n_performance_markers, n_training_days,
-                    confidence, confidence_notes,
-                    input_data_hash, last_activity_date,
-                    calibrated_at, expires_at, updated_at
-                ) VALUES (
-                    :aid, :tau1, :tau2, :k1, :k2, :p0,
-                    :fit_error, :r_squared, :n_perf, :n_days,
-                    :confidence, :notes,
-                    :hash, :last_act,
-                    NOW(), :expires, NOW()
-                )
-                ON CONFLICT (athlete_id) DO UPDATE SET
-                    tau1 = :tau1, tau2 = :tau2, k1 = :k1, k2 = :k2, p0 = :p0,
-                    fit_error = :fit_error, r_squared = :r_squared,
-                    n_performance_markers = :n_perf, n_training_days = :n_days,
-                    confidence = :confidence, confidence_notes = :notes,
-                    input_data_hash = :hash, last_activity_date = :last_act,
-                    calibrated_at = NOW(), expires_at = :expires, updated_at = NOW()
-            """), {
-                "aid": str(athlete_id),
-                "tau1": model.tau1,
-                "tau2": model.tau2,
-                "k1": model.k1,
-                "k2": model.k2,
-                "p0": model.p0,
-                "fit_error": model.fit_error,
-                "r_squared": model.r_squared,
-                "n_perf": model.n_performance_markers,
-                "n_days": model.n_training_days,
-                "confidence": model.confidence.value,
-                "notes": json.dumps(model.confidence_notes),
-                "hash": input_hash,
-                "last_act": last_activity,
-                "expires": expires_at
-            })
+            self.db.execute(
+                _UPSERT_SQL,
+                _upsert_params(athlete_id, model, input_hash, last_activity, expires_at),
+            )
             
             self.db.commit()
             logger.info(f"Cached model for {athlete_id}, expires {expires_at}")
@@ -229,6 +266,42 @@ class ModelCache:
             logger.error(f"Cache set failed: {e}")
             self.db.rollback()
     
+    def set_many(self, entries) -> int:
+        """
+        Cache many calibrated models in one executemany upsert.
+        
+        entries: iterable of (athlete_id, model, input_hash, last_activity_date).
+        Caller commits. Returns the number of rows written.
+        """
+        expires_at = datetime.now() + timedelta(days=CACHE_TTL_DAYS)
+        params = [
+            _upsert_params(athlete_id, model, input_hash, last_activity, expires_at)
+            for athlete_id, model, input_hash, last_activity in entries
+        ]
+        if params:
+            self.db.execute(_UPSERT_SQL, params)
+        return len(params)
+    
+    def stale_athletes(self, expiring_within_hours: int = 24):
+        """
+        Athletes whose cached model is missing, expiring soon, or was
+        calibrated from different inputs — one set-based query.
+        
+        Returns [(athlete_id, input_hash, last_activity_date)], most
+        recently active first.
+        """
+        rows = self.db.execute(text(f"""
+            WITH inputs AS ({INPUT_HASH_SQL.format(athlete_filter="")})
+            SELECT i.athlete_id, i.input_hash, i.last_activity_date
+            FROM inputs i
+            LEFT JOIN individual_model m ON m.athlete_id = i.athlete_id
+            WHERE m.athlete_id IS NULL
+               OR m.input_data_hash IS DISTINCT FROM i.input_hash
+               OR m.expires_at <= NOW() + make_interval(hours => :hours)
+            ORDER BY i.last_activity_date DESC
+        """), {"hours": expiring_within_hours}).fetchall()
+        return [(r[0], r[1], r[2]) for r in rows]
+    
     def invalidate(self, athlete_id: UUID) -> None:
         """
         Invalidate cached model.
@@ -294,7 +367,7 @@ class ModelCache:
         - >10 new activities since last calibration
         """
         try:
-            result = self.db.execute(text("""
+            result = self.db.execute(text(f"""
                 SELECT 
                     last_activity_date,
                     (SELECT COUNT(*) FROM activity 
@@ -304,7 +377,7 @@ class ModelCache:
                     (SELECT COUNT(*) FROM activity 
                      WHERE athlete_id = :aid 
                        AND sport = 'run'
-                       AND is_race = TRUE
+                       AND {RACE_SIGNAL_SQL}
                        AND DATE(start_time) > im.last_activity_date) as new_races
                 FROM individual_model im
                 WHERE athlete_id = :aid
@@ -324,28 +397,20 @@ class ModelCache:
             return True
     
     def _compute_input_hash(self, athlete_id: UUID) -> str:
-        """Compute hash of input data for cache key."""
+        """Compute hash of input data for cache key (same as the nightly scan)."""
         try:
-            # Get activity summary as hash input
-            result = self.db.execute(text("""
-                SELECT 
-                    COUNT(*) as n_activities,
-                    MAX(DATE(start_time)) as last_date,
-                    SUM(distance_m) as total_distance,
-                    COUNT(*) FILTER (WHERE is_race = TRUE) as n_races
-                FROM activity
-                WHERE athlete_id = :aid
-                    AND sport = 'run'
-                    AND start_time > NOW() - INTERVAL '1 year'
-            """), {"aid": str(athlete_id)}).fetchone()
+            result = self.db.execute(
+                text(INPUT_HASH_SQL.format(athlete_filter="AND athlete_id = :aid")),
+                {"aid": str(athlete_id)},
+            ).fetchone()
             
             if not result:
                 return "empty"
             
-            hash_input = f"{result[0]}_{result[1]}_{result[2]:.0f}_{result[3]}"
-            return hashlib.md5(hash_input.encode()).hexdigest()[:12]
+            return result[1]
             
         except Exception:
+            self.db.rollback()
             return "unknown"
     
     def get_cache_stats(self) -> dict:
@@ -400,11 +465,13 @@ def invalidate_model_cache(athlete_id: UUID, db: Session) -> None:
 
 def on_activity_sync(athlete_id: UUID, db: Session) -> None:
     """
-    Hook called after activity sync.
+    Hook called after activity sync (tasks.post_sync_processing for Strava,
+    process_garmin_activity_detail_task for Garmin).
     
-    Checks if cache should be invalidated and does so if needed.
+    Recalibrates and re-caches the model. Calibration is closed-form
+    (services/banister_calibration) and takes milliseconds, so every sync
+    refreshes it rather than waiting for the TTL or an invalidation rule.
     """
     cache = ModelCache(db)
-    if cache.should_invalidate_on_sync(athlete_id):
-        cache.invalidate(athlete_id)
-        logger.info(f"Cache invalidated on sync for {athlete_id}")
+    cache.get_or_calibrate(athlete_id, force_recalibrate=True)
+    logger.info(f"Model recalibrated on sync for {athlete_id}")
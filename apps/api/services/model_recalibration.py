@@ -0,0 +1,202 @@
+"""
+Nightly population-wide Banister recalibration.
+
+Request paths (plan generation, race prediction, optimal load) read the
+calibrated model from the individual_model cache (ModelCache) or
+athlete_calibrated_model (get_or_calibrate_model). A miss calibrates
+inside the request: a year of daily TSS plus performance markers, then
+the fit. This job keeps both tables warm so requests never calibrate.
+
+Change detection:
+    ModelCache.stale_athletes() runs the same input fingerprint as
+    ModelCache._compute_input_hash for every athlete at once and joins it
+    to individual_model — one query returns the athletes with no model,
+    a model fitted on different inputs, or one expiring before the next
+    run. Athletes whose training did not change are not touched.
+
+Run:
+    Candidates are processed in batches. Inputs are loaded in the
+    coordinating process (DB reads only), the read snapshot is released,
+    and the fits — pure computation — run in a process pool. Each batch
+    is written with one executemany upsert into individual_model and one
+    multi-row upsert into athlete_calibrated_model, then committed.
+
+Public API:
+    run_recalibration(db, workers=None, batch_size=...) → stats dict
+"""
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from services.individual_performance_model import (
+    BanisterModel,
+    IndividualPerformanceModel,
+    ModelConfidence,
+    save_calibrated_models,
+)
+from services.model_cache import ModelCache, ensure_model_table_exists
+from services.stream_reanalysis import default_workers
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+EXPIRING_WITHIN_HOURS = 26  # refresh models that would expire before the next nightly run
+
+
+def calibrate_payload(payload: Dict[str, Any]) -> BanisterModel:
+    """Fit one athlete from loaded inputs (runs in a worker process)."""
+    return IndividualPerformanceModel(None).calibrate_from_inputs(
+        payload["athlete_id"], payload["training_days"], payload["markers"],
+    )
+
+
+def _fit_batch(
+    pool: Optional[ProcessPoolExecutor], payloads: List[Dict[str, Any]],
+) -> List[Tuple[Dict[str, Any], Any]]:
+    """Run calibrate_payload over a batch → [(payload, model | exception)]."""
+    if pool is None:
+        out = []
+        for p in payloads:
+            try:
+                out.append((p, calibrate_payload(p)))
+            except Exception as e:  # noqa: BLE001 — counted as failed
+                out.append((p, e))
+        return out
+
+    futures = [(p, pool.submit(calibrate_payload, p)) for p in payloads]
+    out = []
+    for p, fut in futures:
+        try:
+            out.append((p, fut.result()))
+        except BrokenProcessPool:
+            raise
+        except Exception as e:  # noqa: BLE001 — counted as failed
+            out.append((p, e))
+    return out
+
+
+def run_recalibration(
+    db: Session,
+    *,
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """Recalibrate every athlete whose calibration inputs changed.
+
+    Args:
+        db: SQLAlchemy session (coordinator reads/writes only).
+        workers: Process pool size (None = default_workers(), 0 = in-process).
+        batch_size: Athletes loaded, fitted and written per batch.
+
+    Returns:
+        ``{"status": "ok", "candidates": int, "calibrated": int,
+        "uncalibrated": int, "failed": int, "elapsed_s": float,
+        "timing_s": {"detect", "load", "fit", "write"}}``
+    """
+    started = time.monotonic()
+    timing = {"detect": 0.0, "load": 0.0, "fit": 0.0, "write": 0.0}
+    calibrated = uncalibrated = failed = 0
+
+    t = time.monotonic()
+    ensure_model_table_exists(db)
+    cache = ModelCache(db)
+    candidates = cache.stale_athletes(EXPIRING_WITHIN_HOURS)
+    db.rollback()
+    timing["detect"] = time.monotonic() - t
+
+    workers = default_workers() if workers is None else workers
+    pool = None
+    if workers > 0 and candidates:
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers)
+        except (OSError, ValueError) as e:
+            logger.warning("model_recalibration pool unavailable, running in-process: %s", e)
+
+    ipm = IndividualPerformanceModel(db)
+    try:
+        for start in range(0, len(candidates), batch_size):
+            batch = candidates[start:start + batch_size]
+
+            t = time.monotonic()
+            payloads = []
+            for athlete_id, input_hash, last_activity in batch:
+                try:
+                    training_days, markers = ipm.calibration_inputs(athlete_id)
+                except Exception as e:  # noqa: BLE001 — counted as failed
+                    db.rollback()
+                    failed += 1
+                    logger.warning("model_recalibration_load_failed athlete_id=%s err=%s", athlete_id, e)
+                    continue
+                payloads.append({
+                    "athlete_id": str(athlete_id),
+                    "training_days": training_days,
+                    "markers": markers,
+                    "input_hash": input_hash,
+                    "last_activity": last_activity,
+                })
+            db.rollback()  # release the read snapshot before long compute
+            timing["load"] += time.monotonic() - t
+
+            t = time.monotonic()
+            try:
+                results = _fit_batch(pool, payloads)
+            except (BrokenProcessPool, AssertionError) as e:
+                # e.g. daemonic worker processes may not fork children
+                logger.warning("model_recalibration pool failed, running in-process: %s", e)
+                if pool is not None:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                pool = None
+                results = _fit_batch(None, payloads)
+            timing["fit"] += time.monotonic() - t
+
+            t = time.monotonic()
+            entries = []
+            for payload, outcome in results:
+                if isinstance(outcome, Exception):
+                    failed += 1
+                    logger.warning(
+                        "model_recalibration_fit_failed athlete_id=%s err=%s",
+                        payload["athlete_id"], outcome,
+                    )
+                    continue
+                if outcome.confidence == ModelConfidence.UNCALIBRATED:
+                    uncalibrated += 1
+                else:
+                    calibrated += 1
+                entries.append((payload["athlete_id"], outcome, payload["input_hash"], payload["last_activity"]))
+            try:
+                cache.set_many(entries)
+                save_calibrated_models(db, [model for _, model, _, _ in entries])
+                db.commit()
+            except Exception as e:  # pragma: no cover — logged
+                db.rollback()
+                failed += len(entries)
+                logger.warning("model_recalibration_write_failed batch=%d err=%s", len(entries), e)
+            timing["write"] += time.monotonic() - t
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    elapsed = time.monotonic() - started
+    timing = {k: round(v, 3) for k, v in timing.items()}
+    logger.info(
+        "model_recalibration_run candidates=%d calibrated=%d uncalibrated=%d failed=%d "
+        "elapsed_s=%.1f detect_s=%.1f load_s=%.1f fit_s=%.1f write_s=%.1f",
+        len(candidates), calibrated, uncalibrated, failed, elapsed,
+        timing["detect"], timing["load"], timing["fit"], timing["write"],
+    )
+    return {
+        "status": "ok",
+        "candidates": len(candidates),
+        "calibrated": calibrated,
+        "uncalibrated": uncalibrated,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 3),
+        "timing_s": timing,
+    }
@@ -478,10 +478,10 @@ class OptimalLoadCalculator:
         for activity in all_activities:
             week_start = activity.start_time.date() - timedelta(days=activity.start_time.weekday())
             try:
-                stress = calculator.calculate_workout_tss(activity, athlete)
+                tss = calculator.workout_tss(activity, athlete)
                 if week_start not in weekly_tss:
                     weekly_tss[week_start] = 0
-                weekly_tss[week_start] += stress.tss
+                weekly_tss[week_start] += tss
             except Exception:
                 continue
 
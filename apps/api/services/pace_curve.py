@@ -0,0 +1,412 @@
+"""
+Mean-max pace curves — "best sustained pace for duration D".
+
+Per activity: for each duration D on a fixed grid, the best average speed
+held for D seconds anywhere in the run. The stream's cumulative distance
+is resampled to 1 Hz, so the best D-second window is a single vectorized
+max over dist[D:] - dist[:-D]: O(n) per grid duration, O(n·k) per
+activity, computed once at ingest (ActivityPaceCurve).
+
+Per athlete: the envelope (pointwise max) of the activity curves over
+rolling windows — last 90 days, last 365 days, all time — stored in one
+AthletePaceCurve row. New activities are merged in incrementally (a max
+never needs history). A window is rebuilt from ActivityPaceCurve rows only
+when one of its points has aged out of the window (detected from the
+point's date) or its activity is gone or marked duplicate. Duplicate
+activities never contribute.
+
+Reads never write: a reader that finds its window out of date evaluates it
+from the activity curves and enqueues tasks.rebuild_pace_curve, which
+stores the rebuilt envelope. Ingest rebuilds out-of-date windows as it
+merges.
+
+Envelope point layout (JSON):
+
+    {"600": {"speed": 4.21, "activity_id": "...", "date": "2026-09-30"}, ...}
+
+Public API:
+    compute_mean_max(stream_data) → {duration_s: speed_mps}
+    merge_curve(envelope, curve, activity_id, activity_date) → envelope
+    build_envelope(rows) → envelope
+    speed_at(envelope, duration_s) → speed_mps | None
+    update_for_activity(db, activity_id, commit=True) → curve | None
+    rebuild_athlete_curve(db, athlete_id, commit=True) → AthletePaceCurve | None
+    get_pace_curve(db, athlete_id, window="365d", as_of=None) → envelope
+    enqueue_rebuild(athlete_id) → bool
+    best_sustained_speed(db, athlete_id, duration_s, window="365d") → speed_mps | None
+"""
+import logging
+import math
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from services.stream_best_efforts import clean_time_distance
+
+logger = logging.getLogger(__name__)
+
+# Bump when the curve derivation changes; rows on older versions are
+# recomputed by tasks.backfill_pace_curves.
+PACE_CURVE_VERSION = 1
+
+# Durations (s): 10 s sprint .. 4 h
+DURATION_GRID_S = (
+    10, 30, 60, 120, 300, 600, 1200, 1800, 2700, 3600, 5400, 7200, 10800, 14400,
+)
+
+# Rolling windows: name → days (None = all time)
+WINDOWS: Dict[str, Optional[int]] = {"90d": 90, "365d": 365, "all": None}
+
+# One enqueued envelope rebuild per athlete per 10 minutes
+REBUILD_DEDUP_S = 600
+
+# Pauses longer than this are collapsed before resampling, so a café stop
+# does not stretch the time axis; shorter stops (lights, turnarounds) count.
+MAX_GAP_S = 30.0
+
+
+# ---------------------------------------------------------------------------
+# Pure computation
+# ---------------------------------------------------------------------------
+
+def compute_mean_max(
+    stream_data: Dict[str, Any],
+    durations: Iterable[int] = DURATION_GRID_S,
+) -> Dict[int, float]:
+    """Best average speed (m/s) for each duration the stream is long enough for."""
+    t, d = clean_time_distance(
+        stream_data.get("time") or [], stream_data.get("distance") or [],
+    )
+    if len(t) < 2:
+        return {}
+
+    # Collapse long recording gaps (auto-pause off, watch left running)
+    gaps = np.diff(t)
+    excess = np.where(gaps > MAX_GAP_S, gaps - MAX_GAP_S, 0.0)
+    t = t - np.concatenate(([0.0], np.cumsum(excess)))
+
+    grid = np.arange(t[0], t[-1] + 1.0)
+    dist = np.interp(grid, t, d)
+    n = len(dist)
+
+    curve: Dict[int, float] = {}
+    for duration in durations:
+        if duration >= n:
+            break
+        best = float(np.max(dist[duration:] - dist[:-duration]))
+        if best > 0:
+            curve[int(duration)] = round(best / duration, 4)
+    return curve
+
+
+def merge_curve(
+    envelope: Dict[str, Dict[str, Any]],
+    curve: Dict[Any, float],
+    activity_id: Any,
+    activity_date: date,
+) -> Dict[str, Dict[str, Any]]:
+    """Pointwise max of an envelope and one activity curve (new dict).
+
+    Ties keep the more recent activity, so window expiry keeps as many
+    points as possible.
+    """
+    merged = dict(envelope)
+    day = activity_date.isoformat()
+    for duration, speed in curve.items():
+        key = str(duration)
+        current = merged.get(key)
+        if current is None or speed > current["speed"] or (
+            speed == current["speed"] and day > current["date"]
+        ):
+            merged[key] = {"speed": speed, "activity_id": str(activity_id), "date": day}
+    return merged
+
+
+def build_envelope(rows: Iterable[Tuple[Any, date, Dict[Any, float]]]) -> Dict[str, Dict[str, Any]]:
+    """Envelope over (activity_id, activity_date, curve) rows."""
+    envelope: Dict[str, Dict[str, Any]] = {}
+    for activity_id, activity_date, curve in rows:
+        envelope = merge_curve(envelope, curve, activity_id, activity_date)
+    return envelope
+
+
+def _window_start(window: str, as_of: date) -> Optional[date]:
+    days = WINDOWS[window]
+    return None if days is None else as_of - timedelta(days=days)
+
+
+def _is_expired(envelope: Dict[str, Dict[str, Any]], start: Optional[date]) -> bool:
+    if start is None:
+        return False
+    cutoff = start.isoformat()
+    return any(point["date"] < cutoff for point in envelope.values())
+
+
+def speed_at(envelope: Dict[str, Dict[str, Any]], duration_s: float) -> Optional[float]:
+    """Best sustained speed for duration_s, interpolated on log-duration.
+
+    Durations outside the envelope's measured range return None (no
+    extrapolation).
+    """
+    if not envelope or duration_s <= 0:
+        return None
+    points = sorted((int(k), v["speed"]) for k, v in envelope.items())
+    durations = [p[0] for p in points]
+    if duration_s < durations[0] or duration_s > durations[-1]:
+        return None
+    return float(np.interp(
+        math.log(duration_s),
+        [math.log(x) for x in durations],
+        [p[1] for p in points],
+    ))
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+def _activity_date(start_time: datetime) -> date:
+    if start_time.tzinfo is not None:
+        start_time = start_time.astimezone(timezone.utc)
+    return start_time.date()
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def update_for_activity(
+    db: Session,
+    activity_id: UUID,
+    *,
+    commit: bool = True,
+) -> Optional[Dict[int, float]]:
+    """Compute an activity's curve from its stream and merge it into the athlete envelope.
+
+    Idempotent: re-running replaces the activity row and re-merges (a max
+    is unaffected by merging the same curve twice). A recomputed curve that
+    got slower (stream replaced) triggers a full envelope rebuild.
+    """
+    from models import Activity, ActivityPaceCurve, ActivityStream
+
+    activity = db.query(Activity).filter(Activity.id == activity_id).first()
+    if activity is None or activity.athlete_id is None:
+        return None
+    if (activity.sport or "run") != "run" or activity.is_duplicate:
+        return None
+
+    stream = (
+        db.query(ActivityStream)
+        .filter(ActivityStream.activity_id == activity_id)
+        .first()
+    )
+    if stream is None or not stream.has_data:
+        return None
+    curve = compute_mean_max(stream.get_channels(["time", "distance"]) or {})
+    if not curve:
+        return None
+
+    stored = {str(k): v for k, v in curve.items()}
+    row = (
+        db.query(ActivityPaceCurve)
+        .filter(ActivityPaceCurve.activity_id == activity_id)
+        .first()
+    )
+    replaced_slower = False
+    if row is None:
+        db.add(ActivityPaceCurve(
+            activity_id=activity.id,
+            athlete_id=activity.athlete_id,
+            start_time=activity.start_time,
+            curve=stored,
+            curve_version=PACE_CURVE_VERSION,
+        ))
+    else:
+        replaced_slower = any(
+            stored.get(k, 0.0) < v for k, v in (row.curve or {}).items()
+        )
+        row.curve = stored
+        row.start_time = activity.start_time
+        row.curve_version = PACE_CURVE_VERSION
+
+    if replaced_slower:
+        db.flush()
+        rebuild_athlete_curve(db, activity.athlete_id, commit=False)
+    else:
+        _merge_into_athlete(db, activity.athlete_id, activity.id, _activity_date(activity.start_time), curve)
+
+    if commit:
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    return curve
+
+
+def _merge_into_athlete(
+    db: Session,
+    athlete_id: UUID,
+    activity_id: UUID,
+    activity_date: date,
+    curve: Dict[int, float],
+) -> None:
+    from models import AthletePaceCurve
+
+    row = db.query(AthletePaceCurve).filter(AthletePaceCurve.athlete_id == athlete_id).first()
+    if row is None or row.curve_version != PACE_CURVE_VERSION:
+        db.flush()
+        rebuild_athlete_curve(db, athlete_id, commit=False)
+        return
+
+    today = _today()
+    if any(_is_expired(env or {}, _window_start(w, today)) for w, env in (row.curves or {}).items()):
+        # Ingest is a write path: bring aged-out windows current while here
+        db.flush()
+        rebuild_athlete_curve(db, athlete_id, commit=False)
+        return
+
+    curves = dict(row.curves or {})
+    for window in WINDOWS:
+        start = _window_start(window, today)
+        if start is not None and activity_date < start:
+            continue
+        curves[window] = merge_curve(curves.get(window) or {}, curve, activity_id, activity_date)
+    row.curves = curves
+
+
+def _window_rows(db: Session, athlete_id: UUID, start: Optional[date]):
+    from models import Activity, ActivityPaceCurve
+
+    q = db.query(
+        ActivityPaceCurve.activity_id,
+        ActivityPaceCurve.start_time,
+        ActivityPaceCurve.curve,
+    ).join(
+        Activity, Activity.id == ActivityPaceCurve.activity_id,
+    ).filter(
+        ActivityPaceCurve.athlete_id == athlete_id,
+        ActivityPaceCurve.curve_version == PACE_CURVE_VERSION,
+        Activity.is_duplicate.is_(False),
+    )
+    if start is not None:
+        q = q.filter(ActivityPaceCurve.start_time >= datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc))
+    for activity_id, start_time, curve in q.all():
+        yield activity_id, _activity_date(start_time), curve
+
+
+def rebuild_athlete_curve(db: Session, athlete_id: UUID, *, commit: bool = True):
+    """Recompute every window of an athlete's envelope from ActivityPaceCurve rows."""
+    from models import AthletePaceCurve
+
+    today = _today()
+    rows = list(_window_rows(db, athlete_id, None))
+    curves = {}
+    for window in WINDOWS:
+        start = _window_start(window, today)
+        curves[window] = build_envelope(
+            r for r in rows if start is None or r[1] >= start
+        )
+
+    row = db.query(AthletePaceCurve).filter(AthletePaceCurve.athlete_id == athlete_id).first()
+    if row is None:
+        row = AthletePaceCurve(athlete_id=athlete_id)
+        db.add(row)
+    row.curves = curves
+    row.curve_version = PACE_CURVE_VERSION
+
+    if commit:
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    return row
+
+
+def get_pace_curve(
+    db: Session,
+    athlete_id: UUID,
+    window: str = "365d",
+    as_of: Optional[date] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """The athlete's envelope for a rolling window ({} when none yet).
+
+    A primary-key read plus an id check of the envelope's source
+    activities. When a point has aged out of the window, or its activity
+    was deleted or marked duplicate, the window is evaluated from the
+    activity curves and a rebuild is enqueued; this function never writes
+    to the session. A past as_of is evaluated from the activity curves.
+    """
+    from models import AthletePaceCurve
+
+    if window not in WINDOWS:
+        raise ValueError(f"unknown pace curve window: {window}")
+
+    row = db.query(AthletePaceCurve).filter(AthletePaceCurve.athlete_id == athlete_id).first()
+    if row is None or row.curve_version != PACE_CURVE_VERSION:
+        return {}
+
+    today = _today()
+    if as_of is not None and as_of != today:
+        start = _window_start(window, as_of)
+        return build_envelope(
+            r for r in _window_rows(db, athlete_id, start) if r[1] <= as_of
+        )
+
+    envelope = (row.curves or {}).get(window) or {}
+    start = _window_start(window, today)
+    if not _is_expired(envelope, start) and _sources_current(db, envelope):
+        return envelope
+
+    enqueue_rebuild(athlete_id)
+    return build_envelope(_window_rows(db, athlete_id, start))
+
+
+def _sources_current(db: Session, envelope: Dict[str, Dict[str, Any]]) -> bool:
+    """True when every activity behind the envelope still exists and is not a duplicate."""
+    from sqlalchemy import func
+
+    from models import Activity
+
+    ids = {UUID(point["activity_id"]) for point in envelope.values()}
+    if not ids:
+        return True
+    live = (
+        db.query(func.count(Activity.id))
+        .filter(Activity.id.in_(ids), Activity.is_duplicate.is_(False))
+        .scalar()
+    )
+    return live == len(ids)
+
+
+def enqueue_rebuild(athlete_id: UUID) -> bool:
+    """Fire-and-forget rebuild of an athlete's stored envelope.
+
+    Deduplicated per athlete for REBUILD_DEDUP_S. Returns True if enqueued.
+    """
+    try:
+        from core.cache import get_redis_client
+        from tasks.pace_curve_tasks import rebuild_pace_curve
+
+        r = get_redis_client()
+        if not r or not r.set(f"pace_curve:rebuild:{athlete_id}", "1", nx=True, ex=REBUILD_DEDUP_S):
+            return False
+        rebuild_pace_curve.delay(str(athlete_id))
+        return True
+    except Exception as e:
+        logger.warning("pace_curve rebuild enqueue failed for %s: %s", athlete_id, e)
+        return False
+
+
+def best_sustained_speed(
+    db: Session,
+    athlete_id: UUID,
+    duration_s: float,
+    window: str = "365d",
+) -> Optional[float]:
+    """Best sustained speed (m/s) for duration_s in the window, or None."""
+    return speed_at(get_pace_curve(db, athlete_id, window), duration_s)
@@ -18,10 +18,11 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import statistics
-import math
-from scipy.stats import norm
+from bisect import bisect_left
+
+import numpy as np
+from scipy.stats import norm, rankdata
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
 
 class RaceCategory(str, Enum):
@@ -82,6 +83,7 @@ class FeatureAnalysis:
     is_significant: bool
     pattern_type: PatternType
     insight_text: str
+    q_value: Optional[float] = None  # p adjusted for the features tested together
 
 
 @dataclass
@@ -99,6 +101,103 @@ class ReadinessProfile:
     confidence_level: str  # "high", "moderate", "low", "insufficient"
 
 
+@dataclass
+class RankTestResult:
+    """Best-vs-worst comparison of one feature (see rank_test_features)."""
+    u_stat: float
+    z: float
+    p_value: float
+    q_value: float  # Benjamini-Hochberg adjusted across the batch
+    cohens_d: Optional[float]
+
+
+def rank_test_features(
+    samples: Dict[str, Tuple[List[float], List[float]]],
+) -> Dict[str, RankTestResult]:
+    """
+    Mann-Whitney U and Cohen's d for many features in one pass.
+
+    ``samples`` maps feature -> (x values, y values). All features are
+    padded into one matrix and ranked together (ties get average ranks,
+    and the variance of U is tie-corrected). U, z, p and d are array
+    operations. Benjamini-Hochberg q-values are computed over the features
+    that could be tested. Features with fewer than 2 values on either
+    side get U=0, p=1, q=1, d=None.
+    """
+    names = list(samples)
+    if not names:
+        return {}
+
+    n1 = np.array([len(samples[name][0]) for name in names], dtype=float)
+    n2 = np.array([len(samples[name][1]) for name in names], dtype=float)
+    w1 = int(max(n1.max(), 1))
+    w2 = int(max(n2.max(), 1))
+
+    data = np.full((len(names), w1 + w2), np.nan)
+    for i, name in enumerate(names):
+        x, y = samples[name]
+        data[i, :len(x)] = x
+        data[i, w1:w1 + len(y)] = y
+    present = ~np.isnan(data)
+
+    ranks = rankdata(data, axis=1, nan_policy="omit")
+    tie_size = (
+        rankdata(data, method="max", axis=1, nan_policy="omit")
+        - rankdata(data, method="min", axis=1, nan_policy="omit") + 1
+    )
+    tie_term = np.where(present, tie_size ** 2 - 1, 0).sum(axis=1)  # sum of t^3 - t over tie groups
+
+    valid = (n1 >= 2) & (n2 >= 2)
+    n = n1 + n2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # U statistic and normal approximation
+        rank_sum_x = np.where(present[:, :w1], ranks[:, :w1], 0).sum(axis=1)
+        u1 = rank_sum_x - n1 * (n1 + 1) / 2
+        u = np.minimum(u1, n1 * n2 - u1)
+        var_u = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+        testable = valid & (var_u > 0)
+        z = np.where(testable, (u - n1 * n2 / 2) / np.sqrt(np.where(testable, var_u, 1)), 0.0)
+        p = np.where(testable, np.clip(2 * norm.sf(np.abs(z)), 0.0, 1.0), 1.0)
+
+        # Cohen's d with pooled standard deviation
+        xs = np.where(present[:, :w1], data[:, :w1], 0)
+        ys = np.where(present[:, w1:], data[:, w1:], 0)
+        mean_x = xs.sum(axis=1) / n1
+        mean_y = ys.sum(axis=1) / n2
+        ss_x = (np.where(present[:, :w1], data[:, :w1] - mean_x[:, None], 0) ** 2).sum(axis=1)
+        ss_y = (np.where(present[:, w1:], data[:, w1:] - mean_y[:, None], 0) ** 2).sum(axis=1)
+        pooled_var = (ss_x + ss_y) / (n - 2)
+        pooled_std = np.where(pooled_var > 0, np.sqrt(np.where(pooled_var > 0, pooled_var, 1)), 0.001)
+        d = (mean_x - mean_y) / pooled_std
+
+    q = np.ones(len(names))
+    q[valid] = _benjamini_hochberg(p[valid])
+
+    return {
+        name: RankTestResult(
+            u_stat=float(u[i]) if valid[i] else 0.0,
+            z=float(z[i]),
+            p_value=float(p[i]),
+            q_value=float(q[i]),
+            cohens_d=float(d[i]) if valid[i] else None,
+        )
+        for i, name in enumerate(names)
+    }
+
+
+def _benjamini_hochberg(p_values: np.ndarray) -> np.ndarray:
+    """Benjamini-Hochberg adjusted p-values (step-up, capped at 1)."""
+    m = len(p_values)
+    if m == 0:
+        return p_values
+    order = np.argsort(p_values)
+    scaled = p_values[order] * m / np.arange(1, m + 1)
+    adjusted = np.minimum(np.minimum.accumulate(scaled[::-1])[::-1], 1.0)
+    q = np.empty(m)
+    q[order] = adjusted
+    return q
+
+
 def mann_whitney_u_test(x: List[float], y: List[float]) -> Tuple[float, float]:
     """
     Mann-Whitney U test for comparing two independent samples.
@@ -106,52 +205,10 @@ def mann_whitney_u_test(x: List[float], y: List[float]) -> Tuple[float, float]:
     
     Returns:
         u_stat: U statistic
-        p_value: Two-tailed p-value (approximated)
+        p_value: Two-tailed p-value (normal approximation, tie-corrected)
     """
-    n1, n2 = len(x), len(y)
-    
-    if n1 < 2 or n2 < 2:
-        return 0, 1.0
-    
-    # Combine and rank
-    combined = [(val, 'x') for val in x] + [(val, 'y') for val in y]
-    combined.sort(key=lambda item: item[0])
-    
-    # Assign ranks (handle ties by averaging)
-    ranks = {}
-    i = 0
-    while i < len(combined):
-        j = i
-        while j < len(combined) and combined[j][0] == combined[i][0]:
-            j += 1
-        avg_rank = (i + 1 + j) / 2
-        for k in range(i, j):
-            if combined[k] not in ranks:
-                ranks[combined[k]] = []
-            ranks[combined[k]].append(avg_rank)
-        i = j
-    
-    # Calculate rank sums
-    rank_sum_x = sum(i + 1 for i, (val, group) in enumerate(combined) if group == 'x')
-    
-    # Calculate U statistic
-    u1 = rank_sum_x - (n1 * (n1 + 1)) / 2
-    u2 = n1 * n2 - u1
-    u = min(u1, u2)
-    
-    # Normal approximation for p-value (valid for n1, n2 >= 8)
-    mean_u = n1 * n2 / 2
-    std_u = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
-    
-    if std_u == 0:
-        return u, 1.0
-    
-    z = (u - mean_u) / std_u
-    
-    # Exact two-tailed p-value from normal distribution (scipy)
-    p_value = float(2 * norm.sf(abs(z)))
-    
-    return u, min(1.0, max(0.0, p_value))
+    result = rank_test_features({"x": (x, y)})["x"]
+    return result.u_stat, result.p_value
 
 
 def calculate_cohens_d(x: List[float], y: List[float]) -> Optional[float]:
@@ -164,22 +221,7 @@ def calculate_cohens_d(x: List[float], y: List[float]) -> Optional[float]:
     - 0.5 <= |d| < 0.8: medium
     - |d| >= 0.8: large
     """
-    if len(x) < 2 or len(y) < 2:
-        return None
-    
-    mean_x = statistics.mean(x)
-    mean_y = statistics.mean(y)
-    
-    var_x = statistics.variance(x)
-    var_y = statistics.variance(y)
-    
-    n_x, n_y = len(x), len(y)
-    
-    # Pooled standard deviation
-    pooled_var = ((n_x - 1) * var_x + (n_y - 1) * var_y) / (n_x + n_y - 2)
-    pooled_std = math.sqrt(pooled_var) if pooled_var > 0 else 0.001
-    
-    return (mean_x - mean_y) / pooled_std
+    return rank_test_features({"x": (x, y)})["x"].cohens_d
 
 
 def extract_pre_race_state(
@@ -198,102 +240,125 @@ def extract_pre_race_state(
     Returns:
         PreRaceState or None if insufficient data
     """
+    return extract_pre_race_states([race], db, lookback_days)[0]
+
+
+def extract_pre_race_states(
+    races: List,  # Activity objects for one athlete
+    db: Session,
+    lookback_days: int = 2
+) -> List[Optional[PreRaceState]]:
+    """
+    extract_pre_race_state for many races of one athlete, in input order.
+
+    Check-ins (race-eve and 30-day baseline windows) and hard workouts are
+    loaded with one query each for the whole race list instead of four
+    queries per race.
+    """
     from models import Activity, DailyCheckin
     
-    race_date = race.start_time.date()
-    
-    # Performance percentage (age-graded)
-    performance_pct = None
-    if race.performance_percentage:
-        performance_pct = float(race.performance_percentage)
-    elif race.performance_percentage_national:
-        performance_pct = float(race.performance_percentage_national)
-    
-    if performance_pct is None:
-        return None  # Can't classify race without performance
+    states: List[Optional[PreRaceState]] = [None] * len(races)
+    if not races:
+        return states
     
-    # Get check-ins from days before race
-    check_in_dates = [race_date - timedelta(days=i) for i in range(1, lookback_days + 1)]
+    athlete_id = races[0].athlete_id
+    race_dates = [race.start_time.date() for race in races]
     
+    # Baseline window: 30 days before the week prior to each race
     checkins = db.query(DailyCheckin).filter(
-        DailyCheckin.athlete_id == race.athlete_id,
-        DailyCheckin.date.in_(check_in_dates)
+        DailyCheckin.athlete_id == athlete_id,
+        DailyCheckin.date >= min(race_dates) - timedelta(days=37),
+        DailyCheckin.date < max(race_dates),
     ).all()
+    checkins_by_date = {c.date: c for c in checkins}
+    checkin_dates = sorted(checkins_by_date)
     
-    if not checkins:
-        return PreRaceState(
+    # Hard workouts in start-time order, for "days since last hard workout"
+    hard_workout_types = ['tempo', 'threshold', 'interval', 'race', 'vo2max', 'speed']
+    hard_starts = [row.start_time for row in db.query(Activity.start_time).filter(
+        Activity.athlete_id == athlete_id,
+        Activity.sport == "run",
+        Activity.start_time < max(race.start_time for race in races),
+        Activity.workout_type.in_(hard_workout_types)
+    ).order_by(Activity.start_time).all()]
+    
+    for i, (race, race_date) in enumerate(zip(races, race_dates)):
+        # Performance percentage (age-graded)
+        performance_pct = None
+        if race.performance_percentage:
+            performance_pct = float(race.performance_percentage)
+        elif race.performance_percentage_national:
+            performance_pct = float(race.performance_percentage_national)
+        
+        if performance_pct is None:
+            continue  # Can't classify race without performance
+        
+        # Get the most recent pre-race check-in (race eve preferred)
+        primary_checkin = next(
+            (checkins_by_date[d] for d in (race_date - timedelta(days=k) for k in range(1, lookback_days + 1))
+             if d in checkins_by_date),
+            None,
+        )
+        
+        if primary_checkin is None:
+            states[i] = PreRaceState(
+                race_id=str(race.id),
+                race_date=race_date,
+                performance_pct=performance_pct
+            )
+            continue
+        
+        # Calculate HRV baseline (30-day average before the race)
+        baseline_start = race_date - timedelta(days=37)  # 30 days before the week prior
+        baseline_end = race_date - timedelta(days=7)     # Stop 7 days before race
+        baseline = [
+            checkins_by_date[d]
+            for d in checkin_dates[bisect_left(checkin_dates, baseline_start):bisect_left(checkin_dates, baseline_end + timedelta(days=1))]
+        ]
+        hrv_values = [float(c.hrv_rmssd) for c in baseline if c.hrv_rmssd is not None]
+        rhr_values = [float(c.resting_hr) for c in baseline if c.resting_hr is not None]
+        baseline_hrv = statistics.mean(hrv_values) if hrv_values else None
+        baseline_rhr = statistics.mean(rhr_values) if rhr_values else None
+        
+        # Calculate deviations
+        hrv_deviation_pct = None
+        if primary_checkin.hrv_rmssd and baseline_hrv:
+            hrv_val = float(primary_checkin.hrv_rmssd)
+            baseline_val = float(baseline_hrv)
+            if baseline_val > 0:
+                hrv_deviation_pct = ((hrv_val - baseline_val) / baseline_val) * 100
+        
+        rhr_deviation_pct = None
+        if primary_checkin.resting_hr and baseline_rhr:
+            rhr_val = primary_checkin.resting_hr
+            baseline_val = float(baseline_rhr)
+            if baseline_val > 0:
+                rhr_deviation_pct = ((rhr_val - baseline_val) / baseline_val) * 100
+        
+        # Find days since last hard workout
+        days_since_hard = None
+        idx = bisect_left(hard_starts, race.start_time)
+        if idx > 0:
+            days_diff = (race_date - hard_starts[idx - 1].date()).days
+            days_since_hard = max(0, days_diff)
+        
+        states[i] = PreRaceState(
             race_id=str(race.id),
             race_date=race_date,
-            performance_pct=performance_pct
+            performance_pct=performance_pct,
+            hrv_rmssd=float(primary_checkin.hrv_rmssd) if primary_checkin.hrv_rmssd else None,
+            hrv_deviation_pct=hrv_deviation_pct,
+            sleep_hours=float(primary_checkin.sleep_h) if primary_checkin.sleep_h else None,
+            resting_hr=primary_checkin.resting_hr,
+            resting_hr_deviation_pct=rhr_deviation_pct,
+            stress_level=primary_checkin.stress_1_5,
+            soreness_level=primary_checkin.soreness_1_5,
+            motivation=primary_checkin.readiness_1_5,
+            confidence=primary_checkin.confidence_1_5,
+            days_since_hard_workout=days_since_hard
         )
     
-    # Get the most recent pre-race check-in (race eve preferred)
-    checkins.sort(key=lambda c: c.date, reverse=True)
-    primary_checkin = checkins[0]
-    
-    # Calculate HRV baseline (30-day average before the race)
-    baseline_start = race_date - timedelta(days=37)  # 30 days before the week prior
-    baseline_end = race_date - timedelta(days=7)     # Stop 7 days before race
-    
-    baseline_hrv = db.query(func.avg(DailyCheckin.hrv_rmssd)).filter(
-        DailyCheckin.athlete_id == race.athlete_id,
-        DailyCheckin.date >= baseline_start,
-        DailyCheckin.date <= baseline_end,
-        DailyCheckin.hrv_rmssd.isnot(None)
-    ).scalar()
-    
-    baseline_rhr = db.query(func.avg(DailyCheckin.resting_hr)).filter(
-        DailyCheckin.athlete_id == race.athlete_id,
-        DailyCheckin.date >= baseline_start,
-        DailyCheckin.date <= baseline_end,
-        DailyCheckin.resting_hr.isnot(None)
-    ).scalar()
-    
-    # Calculate deviations
-    hrv_deviation_pct = None
-    if primary_checkin.hrv_rmssd and baseline_hrv:
-        hrv_val = float(primary_checkin.hrv_rmssd)
-        baseline_val = float(baseline_hrv)
-        if baseline_val > 0:
-            hrv_deviation_pct = ((hrv_val - baseline_val) / baseline_val) * 100
-    
-    rhr_deviation_pct = None
-    if primary_checkin.resting_hr and baseline_rhr:
-        rhr_val = primary_checkin.resting_hr
-        baseline_val = float(baseline_rhr)
-        if baseline_val > 0:
-            rhr_deviation_pct = ((rhr_val - baseline_val) / baseline_val) * 100
-    
-    # Find days since last hard workout
-    hard_workout_types = ['tempo', 'threshold', 'interval', 'race', 'vo2max', 'speed']
-    
-    last_hard = db.query(Activity).filter(
-        Activity.athlete_id == race.athlete_id,
-        Activity.sport == "run",
-        Activity.start_time < race.start_time,
-        Activity.workout_type.in_(hard_workout_types)
-    ).order_by(Activity.start_time.desc()).first()
-    
-    days_since_hard = None
-    if last_hard:
-        days_diff = (race_date - last_hard.start_time.date()).days
-        days_since_hard = max(0, days_diff)
-    
-    return PreRaceState(
-        race_id=str(race.id),
-        race_date=race_date,
-        performance_pct=performance_pct,
-        hrv_rmssd=float(primary_checkin.hrv_rmssd) if primary_checkin.hrv_rmssd else None,
-        hrv_deviation_pct=hrv_deviation_pct,
-        sleep_hours=float(primary_checkin.sleep_h) if primary_checkin.sleep_h else None,
-        resting_hr=primary_checkin.resting_hr,
-        resting_hr_deviation_pct=rhr_deviation_pct,
-        stress_level=primary_checkin.stress_1_5,
-        soreness_level=primary_checkin.soreness_1_5,
-        motivation=primary_checkin.readiness_1_5,
-        confidence=primary_checkin.confidence_1_5,
-        days_since_hard_workout=days_since_hard
-    )
+    return states
 
 
 def classify_races(pre_race_states: List[PreRaceState]) -> Dict[RaceCategory, List[PreRaceState]]:
@@ -335,6 +400,36 @@ def analyze_feature(
         worst_values: Values for worst race category
         conventional_better_direction: What conventional wisdom says is better
     """
+    return analyze_features([
+        (feature_name, best_values, worst_values, conventional_better_direction)
+    ])[0]
+
+
+def analyze_features(
+    feature_samples: List[Tuple[str, List[float], List[float], str]],
+) -> List[FeatureAnalysis]:
+    """
+    Analyze several features at once: one rank_test_features pass over
+    (feature_name, best_values, worst_values, conventional_better_direction)
+    tuples, then per-feature summaries in input order.
+    """
+    tests = rank_test_features({
+        name: (best_values, worst_values)
+        for name, best_values, worst_values, _ in feature_samples
+    })
+    return [
+        _feature_analysis(name, best_values, worst_values, direction, tests[name])
+        for name, best_values, worst_values, direction in feature_samples
+    ]
+
+
+def _feature_analysis(
+    feature_name: str,
+    best_values: List[float],
+    worst_values: List[float],
+    conventional_better_direction: str,
+    test: RankTestResult,
+) -> FeatureAnalysis:
     if len(best_values) < 2 or len(worst_values) < 2:
         return FeatureAnalysis(
             feature_name=feature_name,
@@ -357,9 +452,9 @@ def analyze_feature(
     
     difference = best_mean - worst_mean
     
-    # Statistical tests
-    _, p_value = mann_whitney_u_test(best_values, worst_values)
-    cohens_d = calculate_cohens_d(best_values, worst_values)
+    # Statistical tests (computed for the whole batch)
+    p_value = test.p_value
+    cohens_d = test.cohens_d
     
     # Determine significance (p < 0.05 and |d| > 0.5)
     is_significant = p_value < 0.05 and abs(cohens_d or 0) > 0.5
@@ -398,7 +493,8 @@ def analyze_feature(
         cohens_d=round(cohens_d, 2) if cohens_d else None,
         is_significant=is_significant,
         pattern_type=pattern_type,
-        insight_text=insight_text
+        insight_text=insight_text,
+        q_value=round(test.q_value, 4),
     )
 
 
@@ -479,11 +575,10 @@ def generate_readiness_profile(
         )
     
     # Extract pre-race states
-    pre_race_states = []
-    for race in races:
-        state = extract_pre_race_state(race, db)
-        if state and state.performance_pct:
-            pre_race_states.append(state)
+    pre_race_states = [
+        state for state in extract_pre_race_states(races, db)
+        if state and state.performance_pct
+    ]
     
     if len(pre_race_states) < min_races:
         return ReadinessProfile(
@@ -531,24 +626,26 @@ def generate_readiness_profile(
         ("days_since_hard_workout", "Days Since Hard Workout", "higher"),  # More rest = better (conventional)
     ]
     
-    features = []
-    optimal_ranges = {}
-    
+    feature_samples = []
     for attr_name, display_name, conventional_dir in feature_configs:
         # Extract values for best and worst races
         best_values = [getattr(r, attr_name) for r in best_races if getattr(r, attr_name) is not None]
         worst_values = [getattr(r, attr_name) for r in worst_races if getattr(r, attr_name) is not None]
         
         if best_values and worst_values:
-            analysis = analyze_feature(display_name, best_values, worst_values, conventional_dir)
-            features.append(analysis)
-            
-            # If significant, calculate optimal range
-            if analysis.is_significant and best_values:
-                optimal_ranges[display_name] = (
-                    min(best_values),
-                    max(best_values)
-                )
+            feature_samples.append((display_name, best_values, worst_values, conventional_dir))
+    
+    # All features ranked and tested in one pass
+    features = analyze_features(feature_samples)
+    
+    optimal_ranges = {}
+    for analysis, (display_name, best_values, _, _) in zip(features, feature_samples):
+        # If significant, calculate optimal range
+        if analysis.is_significant and best_values:
+            optimal_ranges[display_name] = (
+                min(best_values),
+                max(best_values)
+            )
     
     # Determine primary insight
     significant_features = [f for f in features if f.is_significant]
@@ -823,6 +920,7 @@ def to_dict(profile: ReadinessProfile) -> Dict:
                 "difference": f.difference,
                 "p_value": f.p_value,
                 "cohens_d": f.cohens_d,
+                "q_value": f.q_value,
                 "is_significant": f.is_significant,
                 "pattern_type": f.pattern_type.value,
                 "insight_text": f.insight_text
@@ -7,7 +7,7 @@ with receipts.
 
 Architecture:
   Each investigation is a self-contained question that:
-    1. Queries the specific data it needs
+    1. Selects the specific data it needs from the athlete snapshot
     2. Cross-references multiple activities (single-variable findings are suppressed)
     3. Checks its own confounds (environment, elevation, recency)
     4. Returns a finding only if it survives scrutiny — or None
@@ -20,15 +20,34 @@ Architecture:
 import logging
 import math
 from collections import Counter, OrderedDict, defaultdict
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import date, timedelta
 from typing import List, Optional, Dict, Tuple, Callable
 from uuid import UUID
 
+import numpy as np
 from sqlalchemy.orm import Session
 from sqlalchemy import func as sa_func
 
 from models import Activity, ActivitySplit, ActivityStream, Athlete, DailyCheckin, PerformanceEvent
+from services.investigation_cache import (
+    DATA_VERSION_SOURCES,
+    InvestigationResultCache,
+    load_data_versions,
+    result_key,
+)
+from services.investigation_executor import (
+    STATUS_CACHED,
+    STATUS_ERROR,
+    STATUS_OK,
+    STATUS_TIMEOUT,
+    TIME_BUDGET_S_BY_COST,
+    InvestigationRun,
+    check_db_access,
+    check_deadline,
+    record_investigation_runs,
+    run_investigations,
+)
 from services.rpi_calculator import calculate_training_paces
 
 logger = logging.getLogger(__name__)
@@ -57,6 +76,11 @@ class InvestigationParamSpec:
     search_enabled: bool = True
 
 
+# Everything an investigation can read from the snapshot: activities, their
+# splits and the confirmed races passed in as ``events``.
+DEFAULT_INVESTIGATION_SOURCES = ('activity', 'activity_split', 'performance_event')
+
+
 @dataclass
 class InvestigationSpec:
     """Metadata for a registered investigation.
@@ -64,6 +88,8 @@ class InvestigationSpec:
     Phase-0 shadow-tuning additions:
         tunable_params    — list of InvestigationParamSpec (pilot subset only)
         runtime_cost_hint — "low" | "medium" | "high"
+        time_budget_s     — per-run time budget; None = default for runtime_cost_hint
+        sources           — source tables whose data versions key the cached result
         actionability_class — "controllable" | "environmental" | "mixed"
         shadow_enabled    — True iff this investigation is in the Phase-0 pilot
     """
@@ -79,6 +105,8 @@ class InvestigationSpec:
     runtime_cost_hint: str = "medium"          # "low" | "medium" | "high"
     actionability_class: str = "mixed"         # "controllable" | "environmental" | "mixed"
     shadow_enabled: bool = False               # Only True for Phase-0 pilot subset
+    time_budget_s: Optional[float] = None
+    sources: List[str] = field(default_factory=lambda: list(DEFAULT_INVESTIGATION_SOURCES))
 
 
 INVESTIGATION_REGISTRY: List[InvestigationSpec] = []
@@ -90,8 +118,15 @@ def investigation(
     min_races: int = 0,
     min_data_weeks: int = 0,
     description: str = "",
+    time_budget_s: Optional[float] = None,
+    sources: Optional[List[str]] = None,
 ):
-    """Decorator that registers an investigation with its signal requirements."""
+    """Decorator that registers an investigation with its signal requirements.
+
+    ``sources`` lists the tables the investigation reads (default
+    DEFAULT_INVESTIGATION_SOURCES); its cached result is recomputed only
+    when one of them changes.
+    """
     def decorator(fn):
         INVESTIGATION_REGISTRY.append(InvestigationSpec(
             name=fn.__name__,
@@ -101,98 +136,252 @@ def investigation(
             min_races=min_races,
             min_data_weeks=min_data_weeks,
             description=description,
+            time_budget_s=time_budget_s,
+            sources=list(sources or DEFAULT_INVESTIGATION_SOURCES),
         ))
         return fn
     return decorator
 
 
-def get_athlete_signal_coverage(athlete_id: UUID, db: Session) -> Dict[str, bool]:
-    """Check which signal types have sufficient data for this athlete."""
-    act_count = db.query(sa_func.count(Activity.id)).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-    ).scalar() or 0
-
-    split_count = db.query(sa_func.count(ActivitySplit.id)).join(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-    ).scalar() or 0
-
-    stream_count = db.query(sa_func.count(ActivityStream.id)).join(Activity).filter(
-        Activity.athlete_id == athlete_id,
-    ).scalar() or 0
-
-    shape_count = db.query(sa_func.count(Activity.id)).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.run_shape.isnot(None),
-    ).scalar() or 0
-
-    env_count = db.query(sa_func.count(Activity.id)).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.temperature_f.isnot(None),
-    ).scalar() or 0
-
-    race_count = db.query(sa_func.count(PerformanceEvent.id)).filter(
-        PerformanceEvent.athlete_id == athlete_id,
-        PerformanceEvent.user_confirmed == True,  # noqa: E712
-    ).scalar() or 0
-
-    health_count = db.query(sa_func.count(DailyCheckin.id)).filter(
-        DailyCheckin.athlete_id == athlete_id,
-        DailyCheckin.hrv_rmssd.isnot(None),
-    ).scalar() or 0
-
-    subjective_count = db.query(sa_func.count(DailyCheckin.id)).filter(
-        DailyCheckin.athlete_id == athlete_id,
-        DailyCheckin.rpe_1_10.isnot(None),
-    ).scalar() or 0
+# ═══════════════════════════════════════════════════════
+#  Athlete data snapshot (loaded once per mining run)
+# ═══════════════════════════════════════════════════════
 
-    return {
-        'activity_summary': act_count > 0,
-        'activity_splits': split_count > 0,
-        'activity_stream': stream_count > 0,
-        'run_shape': shape_count > 0,
-        'environment': env_count > 0,
-        'race_result': race_count > 0,
-        'daily_health': health_count > 0,
-        'subjective': subjective_count > 0,
-    }
+_ACTIVITY_COLUMNS = ('distance_m', 'avg_hr', 'duration_s', 'temperature_f', 'heat_adjustment_pct')
 
 
-def meets_minimums(spec: InvestigationSpec, athlete_id: UUID, db: Session) -> bool:
-    """Check if an athlete meets the minimum data thresholds for an investigation."""
-    if spec.min_activities > 0:
-        act_count = db.query(sa_func.count(Activity.id)).filter(
+class AthleteInvestigationSnapshot:
+    """Everything the investigations read for one athlete, loaded once.
+
+    Activities (duplicates included, flagged), splits of non-duplicate
+    activities grouped by activity, confirmed races, check-ins and
+    coverage counts come from a handful of queries. Numeric activity and
+    check-in columns are kept as arrays (NaN for NULL) so investigation
+    filters are masks instead of queries. Best efforts and GarminDay rows
+    are loaded on first access — no current investigation reads them — and
+    that first access raises InvestigationDbAccess in an executor pool
+    worker. Every accessor checks the running investigation's deadline
+    (services/investigation_executor.check_deadline).
+    """
+
+    def __init__(
+        self,
+        athlete_id: UUID,
+        db: Session,
+        zones: Optional['TrainingZones'],
+        activities: List[Activity],
+        splits: List[ActivitySplit],
+        races: List[PerformanceEvent],
+        checkins: List[DailyCheckin],
+        stream_count: int,
+    ):
+        self.athlete_id = athlete_id
+        self.zones = zones
+        self.races = races
+        self._db = db
+
+        self._activities = activities
+        self._columns = {
+            name: np.array(
+                [np.nan if getattr(a, name) is None else float(getattr(a, name)) for a in activities],
+                dtype=float,
+            )
+            for name in _ACTIVITY_COLUMNS
+        }
+        self._is_duplicate = np.array([bool(a.is_duplicate) for a in activities], dtype=bool)
+        self._has_run_shape = np.array([a.run_shape is not None for a in activities], dtype=bool)
+        self._start_date = np.array(
+            [a.start_time.date() for a in activities], dtype='datetime64[D]',
+        )
+
+        self._splits: Dict[object, List[ActivitySplit]] = defaultdict(list)
+        for s in splits:
+            self._splits[s.activity_id].append(s)
+
+        self.checkin_dates = np.array([c.date for c in checkins], dtype='datetime64[D]')
+        self.checkin_hrv = np.array(
+            [np.nan if c.hrv_rmssd is None else float(c.hrv_rmssd) for c in checkins], dtype=float,
+        )
+        self.checkin_rpe = np.array(
+            [np.nan if c.rpe_1_10 is None else float(c.rpe_1_10) for c in checkins], dtype=float,
+        )
+
+        kept = ~self._is_duplicate
+        kept_starts = [a.start_time for a, k in zip(activities, kept) if k]
+        self.counts: Dict[str, int] = {
+            'activities': int(kept.sum()),
+            'splits': len(splits),
+            'streams': stream_count,
+            'run_shape': int((self._has_run_shape & kept).sum()),
+            'environment': int((~np.isnan(self._columns['temperature_f']) & kept).sum()),
+            'races': len(races),
+            'daily_health': int((~np.isnan(self.checkin_hrv)).sum()),
+            'subjective': int((~np.isnan(self.checkin_rpe)).sum()),
+        }
+        self.first_start = min(kept_starts) if kept_starts else None
+        self.last_start = max(kept_starts) if kept_starts else None
+
+        self._best_efforts = None
+        self._garmin_days = None
+
+    @classmethod
+    def load(
+        cls,
+        athlete_id: UUID,
+        db: Session,
+        zones: Optional['TrainingZones'] = None,
+    ) -> 'AthleteInvestigationSnapshot':
+        """Load the snapshot; ``zones`` are loaded too unless already known."""
+        activities = db.query(Activity).filter(
+            Activity.athlete_id == athlete_id,
+        ).order_by(Activity.start_time).all()
+
+        splits = db.query(ActivitySplit).join(Activity).filter(
             Activity.athlete_id == athlete_id,
             Activity.is_duplicate == False,  # noqa: E712
-        ).scalar() or 0
-        if act_count < spec.min_activities:
-            return False
+        ).order_by(ActivitySplit.activity_id, ActivitySplit.split_number).all()
 
-    if spec.min_races > 0:
-        race_count = db.query(sa_func.count(PerformanceEvent.id)).filter(
+        races = db.query(PerformanceEvent).filter(
             PerformanceEvent.athlete_id == athlete_id,
             PerformanceEvent.user_confirmed == True,  # noqa: E712
+        ).order_by(PerformanceEvent.event_date).all()
+
+        checkins = db.query(DailyCheckin).filter(
+            DailyCheckin.athlete_id == athlete_id,
+        ).order_by(DailyCheckin.date).all()
+
+        stream_count = db.query(sa_func.count(ActivityStream.id)).join(Activity).filter(
+            Activity.athlete_id == athlete_id,
         ).scalar() or 0
-        if race_count < spec.min_races:
-            return False
+
+        return cls(
+            athlete_id, db, zones or load_training_zones(athlete_id, db),
+            activities, splits, races, checkins, stream_count,
+        )
+
+    def activities(
+        self,
+        min_distance_m: Optional[float] = None,
+        present: Tuple[str, ...] = (),
+        hr_range: Optional[Tuple[int, int]] = None,
+        min_duration_s: Optional[float] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        on_date: Optional[date] = None,
+        include_duplicates: bool = False,
+    ) -> List[Activity]:
+        """Activities in start-time order matching every given filter.
+
+        ``present`` names columns that must be non-NULL; distance and
+        duration minimums are exclusive, ``hr_range`` is inclusive, and
+        ``start``/``end`` bound the start date as [start, end).
+        """
+        mask = np.ones(len(self._activities), dtype=bool)
+        if not include_duplicates:
+            mask &= ~self._is_duplicate
+        for name in present:
+            mask &= self._has_run_shape if name == 'run_shape' else ~np.isnan(self._columns[name])
+        with np.errstate(invalid='ignore'):
+            if min_distance_m is not None:
+                mask &= self._columns['distance_m'] > min_distance_m
+            if min_duration_s is not None:
+                mask &= self._columns['duration_s'] > min_duration_s
+            if hr_range is not None:
+                hr = self._columns['avg_hr']
+                mask &= (hr >= hr_range[0]) & (hr <= hr_range[1])
+        if on_date is not None:
+            start, end = on_date, on_date + timedelta(days=1)
+        if start is not None:
+            mask &= self._start_date >= np.datetime64(start, 'D')
+        if end is not None:
+            mask &= self._start_date < np.datetime64(end, 'D')
+        check_deadline()
+        return [self._activities[i] for i in np.flatnonzero(mask)]
+
+    def splits(self, activity_id, present: Tuple[str, ...] = ()) -> List[ActivitySplit]:
+        """Splits of a non-duplicate activity by split number, with ``present`` columns non-NULL."""
+        check_deadline()
+        rows = self._splits.get(activity_id, [])
+        if present:
+            rows = [s for s in rows if all(getattr(s, name) is not None for name in present)]
+        return rows
+
+    @property
+    def best_efforts(self) -> Dict[str, np.ndarray]:
+        """Best efforts as columns: distance_category, distance_m, elapsed_s, achieved_at."""
+        check_deadline()
+        if self._best_efforts is None:
+            check_db_access("AthleteInvestigationSnapshot.best_efforts")
+            from models import BestEffort
+            rows = self._db.query(BestEffort).filter(
+                BestEffort.athlete_id == self.athlete_id,
+            ).order_by(BestEffort.achieved_at).all()
+            self._best_efforts = {
+                'distance_category': np.array([r.distance_category for r in rows], dtype=object),
+                'distance_m': np.array([r.distance_meters for r in rows], dtype=float),
+                'elapsed_s': np.array([r.elapsed_time for r in rows], dtype=float),
+                'achieved_at': np.array([r.achieved_at for r in rows], dtype=object),
+            }
+        return self._best_efforts
+
+    @property
+    def garmin_days(self) -> Dict[str, np.ndarray]:
+        """GarminDay rows as columns (NaN for NULL), keyed by calendar_date."""
+        check_deadline()
+        if self._garmin_days is None:
+            check_db_access("AthleteInvestigationSnapshot.garmin_days")
+            from models import GarminDay
+            rows = self._db.query(GarminDay).filter(
+                GarminDay.athlete_id == self.athlete_id,
+            ).order_by(GarminDay.calendar_date).all()
+            columns = ('resting_hr', 'avg_stress', 'steps', 'sleep_total_s', 'sleep_score',
+                       'hrv_overnight_avg', 'body_battery_end', 'vo2max')
+            self._garmin_days = {'calendar_date': np.array([r.calendar_date for r in rows], dtype='datetime64[D]')}
+            for name in columns:
+                self._garmin_days[name] = np.array(
+                    [np.nan if getattr(r, name) is None else float(getattr(r, name)) for r in rows], dtype=float,
+                )
+        return self._garmin_days
+
+
+def get_athlete_signal_coverage(
+    athlete_id: UUID,
+    db: Session,
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
+) -> Dict[str, bool]:
+    """Check which signal types have sufficient data for this athlete."""
+    counts = (snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)).counts
+    return {
+        'activity_summary': counts['activities'] > 0,
+        'activity_splits': counts['splits'] > 0,
+        'activity_stream': counts['streams'] > 0,
+        'run_shape': counts['run_shape'] > 0,
+        'environment': counts['environment'] > 0,
+        'race_result': counts['races'] > 0,
+        'daily_health': counts['daily_health'] > 0,
+        'subjective': counts['subjective'] > 0,
+    }
+
+
+def meets_minimums(
+    spec: InvestigationSpec,
+    athlete_id: UUID,
+    db: Session,
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
+) -> bool:
+    """Check if an athlete meets the minimum data thresholds for an investigation."""
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
+
+    if spec.min_activities > 0 and snapshot.counts['activities'] < spec.min_activities:
+        return False
+
+    if spec.min_races > 0 and snapshot.counts['races'] < spec.min_races:
+        return False
 
     if spec.min_data_weeks > 0:
-        earliest = db.query(sa_func.min(Activity.start_time)).filter(
-            Activity.athlete_id == athlete_id,
-            Activity.is_duplicate == False,  # noqa: E712
-        ).scalar()
-        if earliest is None:
-            return False
-        latest = db.query(sa_func.max(Activity.start_time)).filter(
-            Activity.athlete_id == athlete_id,
-            Activity.is_duplicate == False,  # noqa: E712
-        ).scalar()
-        if latest is None:
+        if snapshot.first_start is None:
             return False
-        weeks = (latest - earliest).days / 7
+        weeks = (snapshot.last_start - snapshot.first_start).days / 7
         if weeks < spec.min_data_weeks:
             return False
 
@@ -457,25 +646,21 @@ def find_quality_sessions(
     target_zone: str = 'threshold',
     min_zone_splits: int = 2,
     min_effort_hr: int = 140,
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> List[QualitySession]:
     """
     Find sessions containing work in a specific training zone by mining
     split data against the athlete's actual pace zones from their profile.
     """
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
     pace_low, pace_high = zones.zone_range_min_km(target_zone)
 
-    activities = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.distance_m > 1500,
-    ).order_by(Activity.start_time).all()
+    activities = snapshot.activities(min_distance_m=1500)
 
     sessions: List[QualitySession] = []
 
     for act in activities:
-        splits = db.query(ActivitySplit).filter(
-            ActivitySplit.activity_id == act.id,
-        ).order_by(ActivitySplit.split_number).all()
+        splits = snapshot.splits(act.id)
 
         if not splits:
             continue
@@ -563,20 +748,19 @@ def detect_weekly_patterns(
     athlete_id: UUID,
     db: Session,
     zones: TrainingZones,
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> List[WeeklyPattern]:
     """
     Find recurring weekly training structures by analyzing which
     zones appear on which days of the week.
     """
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
     interval_sessions = find_quality_sessions(
         athlete_id, db, zones, 'interval', min_zone_splits=2, min_effort_hr=140,
+        snapshot=snapshot,
     )
 
-    activities = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.distance_m > 15000,  # long runs > 15km
-    ).order_by(Activity.start_time).all()
+    activities = snapshot.activities(min_distance_m=15000)
 
     long_runs_by_date = {}
     for act in activities:
@@ -638,20 +822,14 @@ def compute_pace_at_hr(
     athlete_id: UUID,
     db: Session,
     hr_band: Tuple[int, int] = (130, 145),
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> List[PaceAtHRPoint]:
     """
     Track pace at a given HR band over time — the primary aerobic
     adaptation signal. Computed across all run types.
     """
-    activities = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.avg_hr.isnot(None),
-        Activity.avg_hr >= hr_band[0],
-        Activity.avg_hr <= hr_band[1],
-        Activity.distance_m > 3000,
-        Activity.duration_s > 0,
-    ).order_by(Activity.start_time).all()
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
+    activities = snapshot.activities(min_distance_m=3000, present=('avg_hr',), hr_range=hr_band, min_duration_s=0)
 
     points: List[PaceAtHRPoint] = []
     for act in activities:
@@ -674,15 +852,18 @@ def detect_adaptation_curves(
     athlete_id: UUID,
     db: Session,
     zones: TrainingZones,
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> List[AdaptationCurve]:
     """
     Detect adaptation curves using the athlete's actual training zones.
     """
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
     curves: List[AdaptationCurve] = []
 
     # --- Threshold progression ---
     threshold_sessions = find_quality_sessions(
         athlete_id, db, zones, 'threshold', min_zone_splits=2, min_effort_hr=140,
+        snapshot=snapshot,
     )
     effort_sessions = [s for s in threshold_sessions if s.session_type != 'easy_paced']
     if len(effort_sessions) >= 4:
@@ -693,6 +874,7 @@ def detect_adaptation_curves(
     # --- VO2 / Interval progression ---
     interval_sessions = find_quality_sessions(
         athlete_id, db, zones, 'interval', min_zone_splits=2, min_effort_hr=140,
+        snapshot=snapshot,
     )
     effort_intervals = [s for s in interval_sessions if s.session_type != 'easy_paced']
     if len(effort_intervals) >= 4:
@@ -701,7 +883,7 @@ def detect_adaptation_curves(
             curves.append(curve)
 
     # --- Pace at HR ---
-    pace_hr_points = compute_pace_at_hr(athlete_id, db)
+    pace_hr_points = compute_pace_at_hr(athlete_id, db, snapshot=snapshot)
     if len(pace_hr_points) >= 6:
         curve = _build_pace_at_hr_curve(pace_hr_points)
         if curve:
@@ -1005,12 +1187,14 @@ def connect_adaptations_to_races(
     min_activities=20,
     min_races=3,
     description="Cardiovascular durability from back-to-back quality + long run days",
+    sources=['activity', 'activity_split', 'performance_event'],
 )
 def investigate_back_to_back_durability(
     athlete_id: UUID,
     db: Session,
     zones: TrainingZones,
     races: List[PerformanceEvent],
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> Optional[RaceInputFinding]:
     """
     QUESTION: Did consecutive-day quality + long run sessions build
@@ -1025,11 +1209,8 @@ def investigate_back_to_back_durability(
     long run. Only compare outdoor-to-outdoor or indoor-to-indoor.
     Require steady-effort runs (pace drift < 0.3 min/km).
     """
-    all_acts = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.avg_hr.isnot(None),
-    ).order_by(Activity.start_time).all()
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
+    all_acts = snapshot.activities(present=('avg_hr',))
 
     acts_by_date: Dict[date, List[Activity]] = {}
     for act in all_acts:
@@ -1040,9 +1221,7 @@ def investigate_back_to_back_durability(
     interval_dates = set()
     for d, day_acts in acts_by_date.items():
         for act in day_acts:
-            splits = db.query(ActivitySplit).filter(
-                ActivitySplit.activity_id == act.id,
-            ).all()
+            splits = snapshot.splits(act.id)
             interval_count = 0
             for s in splits:
                 if not s.distance or not s.elapsed_time:
@@ -1062,20 +1241,13 @@ def investigate_back_to_back_durability(
     after_quality = []
     without_quality = []
 
-    long_runs = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.distance_m > 20000,
-        Activity.avg_hr.isnot(None),
-    ).order_by(Activity.start_time).all()
+    long_runs = snapshot.activities(min_distance_m=20000, present=('avg_hr',))
 
     for lr in long_runs:
         d = lr.start_time.date()
         ctx = build_activity_context(lr)
 
-        splits = db.query(ActivitySplit).filter(
-            ActivitySplit.activity_id == lr.id,
-        ).order_by(ActivitySplit.split_number).all()
+        splits = snapshot.splits(lr.id)
 
         drift = compute_cardiac_drift(splits)
         if drift is None or not drift['is_steady_effort']:
@@ -1142,16 +1314,10 @@ def investigate_back_to_back_durability(
     for race in sorted(races, key=lambda r: r.event_date):
         if race.event_date > last_pair_date:
             race_time = _format_race_time(race)
-            race_splits = db.query(ActivitySplit).filter(
-                ActivitySplit.activity_id.in_(
-                    db.query(Activity.id).filter(
-                        Activity.athlete_id == athlete_id,
-                        Activity.is_duplicate == False,  # noqa: E712
-                        Activity.start_time >= str(race.event_date),
-                        Activity.start_time < str(race.event_date + timedelta(days=1)),
-                    )
-                )
-            ).order_by(ActivitySplit.split_number).all()
+            race_splits = sorted(
+                (s for act in snapshot.activities(on_date=race.event_date) for s in snapshot.splits(act.id)),
+                key=lambda s: s.split_number,
+            )
 
             race_drift = compute_cardiac_drift(race_splits)
             if race_drift:
@@ -1189,12 +1355,14 @@ def investigate_back_to_back_durability(
     requires=['activity_summary', 'activity_splits', 'race_result'],
     min_races=3,
     description="Race execution analysis — pacing, cardiac drift, GAP-adjusted splits",
+    sources=['activity', 'activity_split', 'performance_event'],
 )
 def investigate_race_execution(
     athlete_id: UUID,
     db: Session,
     zones: TrainingZones,
     races: List[PerformanceEvent],
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> List[RaceInputFinding]:
     """
     QUESTION: How did the athlete execute each race? Was pacing even?
@@ -1206,24 +1374,18 @@ def investigate_race_execution(
     CONFOUNDS: Raw pace on hilly courses creates false split patterns.
     GAP normalizes for grade. If no GAP data, disclose the limitation.
     """
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
     findings = []
 
     for race in races:
-        race_acts = db.query(Activity).filter(
-            Activity.athlete_id == athlete_id,
-            Activity.is_duplicate == False,  # noqa: E712
-            Activity.start_time >= str(race.event_date),
-            Activity.start_time < str(race.event_date + timedelta(days=1)),
-        ).all()
+        race_acts = snapshot.activities(on_date=race.event_date)
 
         for act in race_acts:
             dist_km = (act.distance_m or 0) * KM_PER_METER
             if dist_km < 3:
                 continue
 
-            splits = db.query(ActivitySplit).filter(
-                ActivitySplit.activity_id == act.id,
-            ).order_by(ActivitySplit.split_number).all()
+            splits = snapshot.splits(act.id)
 
             if len(splits) < 3:
                 continue
@@ -1328,12 +1490,14 @@ def investigate_race_execution(
     requires=['activity_summary', 'activity_splits'],
     min_activities=30,
     description="Recovery cost of different quality session types on next-day running",
+    sources=['activity', 'activity_split'],
 )
 def investigate_recovery_cost(
     athlete_id: UUID,
     db: Session,
     zones: TrainingZones,
     races: List[PerformanceEvent],
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> Optional[RaceInputFinding]:
     """
     QUESTION: How do different quality session types affect next-day running?
@@ -1346,12 +1510,8 @@ def investigate_recovery_cost(
     CONFOUNDS: Indoor/outdoor (treadmill paces are different), temperature.
     Only compare activities with same indoor/outdoor status.
     """
-    all_acts = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.avg_hr.isnot(None),
-        Activity.distance_m > 3000,
-    ).order_by(Activity.start_time).all()
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
+    all_acts = snapshot.activities(min_distance_m=3000, present=('avg_hr',))
 
     acts_by_date: Dict[date, List[Activity]] = {}
     for act in all_acts:
@@ -1375,9 +1535,7 @@ def investigate_recovery_cost(
             if act.distance_m and act.distance_m > 20000:
                 quality_type = 'after_long_run'
 
-            splits = db.query(ActivitySplit).filter(
-                ActivitySplit.activity_id == act.id,
-            ).all()
+            splits = snapshot.splits(act.id)
             for s in splits:
                 if not s.distance or not s.elapsed_time:
                     continue
@@ -1492,12 +1650,14 @@ def investigate_recovery_cost(
     min_activities=20,
     min_races=4,
     description="Training recipe comparison — what mix preceded best vs worst races",
+    sources=['activity', 'activity_split', 'performance_event'],
 )
 def investigate_training_recipe(
     athlete_id: UUID,
     db: Session,
     zones: TrainingZones,
     races: List[PerformanceEvent],
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> List[RaceInputFinding]:
     """
     QUESTION: What training mix preceded each race, and does it correlate
@@ -1511,6 +1671,7 @@ def investigate_training_recipe(
     Flag findings where all best races are from the most recent 6 months.
     Indoor vs outdoor training proportions.
     """
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
     if len(races) < 4:
         return []
 
@@ -1521,12 +1682,7 @@ def investigate_training_recipe(
         window_start = race.event_date - timedelta(weeks=6)
         window_end = race.event_date - timedelta(days=1)
 
-        acts = db.query(Activity).filter(
-            Activity.athlete_id == athlete_id,
-            Activity.is_duplicate == False,  # noqa: E712
-            Activity.start_time >= str(window_start),
-            Activity.start_time < str(window_end),
-        ).order_by(Activity.start_time).all()
+        acts = snapshot.activities(start=window_start, end=window_end)
 
         if not acts:
             continue
@@ -1539,9 +1695,7 @@ def investigate_training_recipe(
         zone_km = defaultdict(float)
         total_split_km = 0
         for act in acts:
-            splits = db.query(ActivitySplit).filter(
-                ActivitySplit.activity_id == act.id,
-            ).all()
+            splits = snapshot.splits(act.id)
             for s in splits:
                 if not s.distance or not s.elapsed_time:
                     continue
@@ -1737,6 +1891,7 @@ def investigate_pace_at_hr_adaptation(
     db: Session,
     zones: TrainingZones,
     events: List[PerformanceEvent],
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> Optional[List[RaceInputFinding]]:
     """
     Track pace at specific HR bands over time using heat-normalized pace.
@@ -1749,13 +1904,8 @@ def investigate_pace_at_hr_adaptation(
       - Easy effort (HR 130-140): aerobic floor
       - High effort (HR 150-160): aerobic ceiling
     """
-    acts = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.avg_hr.isnot(None),
-        Activity.distance_m > 3000,
-        Activity.duration_s > 0,
-    ).order_by(Activity.start_time).all()
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
+    acts = snapshot.activities(min_distance_m=3000, present=('avg_hr',), min_duration_s=0)
 
     if len(acts) < 20:
         return None
@@ -1774,10 +1924,7 @@ def investigate_pace_at_hr_adaptation(
             if elev < TREADMILL_ELEV_THRESHOLD_M and dist_km > 5:
                 continue
 
-            splits = db.query(ActivitySplit).filter(
-                ActivitySplit.activity_id == act.id,
-                ActivitySplit.average_heartrate.isnot(None),
-            ).order_by(ActivitySplit.split_number).all()
+            splits = snapshot.splits(act.id, present=('average_heartrate',))
 
             heat_adj = act.heat_adjustment_pct
 
@@ -1883,6 +2030,7 @@ def investigate_heat_tax(
     db: Session,
     zones: TrainingZones,
     events: List[PerformanceEvent],
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> Optional[RaceInputFinding]:
     """
     Compare athlete's ACTUAL heat response to the generic heat adjustment formula.
@@ -1895,14 +2043,8 @@ def investigate_heat_tax(
     Method: compare raw pace at same HR in hot vs cool, then compare the
     measured slowdown to the formula-predicted slowdown for those temperatures.
     """
-    acts = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.avg_hr.isnot(None),
-        Activity.temperature_f.isnot(None),
-        Activity.heat_adjustment_pct.isnot(None),
-        Activity.distance_m > 3000,
-    ).order_by(Activity.start_time).all()
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
+    acts = snapshot.activities(min_distance_m=3000, present=('avg_hr', 'temperature_f', 'heat_adjustment_pct'))
 
     hot_splits = []
     cool_splits = []
@@ -1913,10 +2055,7 @@ def investigate_heat_tax(
         if elev < TREADMILL_ELEV_THRESHOLD_M and dist_km > 5:
             continue
 
-        splits = db.query(ActivitySplit).filter(
-            ActivitySplit.activity_id == act.id,
-            ActivitySplit.average_heartrate.isnot(None),
-        ).all()
+        splits = snapshot.splits(act.id, present=('average_heartrate',))
 
         for sp in splits:
             if sp.average_heartrate is None or sp.distance is None or sp.elapsed_time is None:
@@ -1986,12 +2125,7 @@ def investigate_heat_tax(
 
     hot_races = []
     for ev in events:
-        race_act = db.query(Activity).filter(
-            Activity.athlete_id == athlete_id,
-            Activity.start_time >= ev.event_date,
-            Activity.start_time < ev.event_date + timedelta(days=1),
-            Activity.temperature_f.isnot(None),
-        ).first()
+        race_act = next(iter(snapshot.activities(present=('temperature_f',), on_date=ev.event_date, include_duplicates=True)), None)
         if race_act and race_act.temperature_f >= 80:
             personal_cost = actual_diff_pct * cool_pace
             hot_races.append({
@@ -2025,12 +2159,14 @@ def investigate_heat_tax(
     min_activities=20,
     min_data_weeks=16,
     description="Post-disruption fitness retention — did training survive the break",
+    sources=['activity'],
 )
 def investigate_post_injury_resilience(
     athlete_id: UUID,
     db: Session,
     zones: TrainingZones,
     events: List[PerformanceEvent],
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> Optional[RaceInputFinding]:
     """
     Check if aerobic fitness metrics post-injury are comparable to
@@ -2039,12 +2175,9 @@ def investigate_post_injury_resilience(
     If they are, the training campaign built fitness deep enough to survive
     the disruption — that's a meaningful finding about training durability.
     """
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
     # Use ALL activities for gap detection (not just those with weather)
-    all_acts = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.distance_m > 3000,
-    ).order_by(Activity.start_time).all()
+    all_acts = snapshot.activities(min_distance_m=3000)
 
     if len(all_acts) < 20:
         return None
@@ -2164,12 +2297,14 @@ def investigate_post_injury_resilience(
     min_activities=20,
     min_data_weeks=12,
     description="Stride economy — stride length at equivalent cadence over time",
+    sources=['activity', 'activity_split'],
 )
 def investigate_stride_economy(
     athlete_id: UUID,
     db: Session,
     zones: TrainingZones,
     events: List[PerformanceEvent],
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> Optional[RaceInputFinding]:
     """
     Track stride length at equivalent cadence over time, using
@@ -2181,12 +2316,8 @@ def investigate_stride_economy(
     If stride length increases at stable cadence, the runner is generating
     more force per stride — strength and economy improvement.
     """
-    acts = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.avg_hr.isnot(None),
-        Activity.distance_m > 5000,
-    ).order_by(Activity.start_time).all()
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
+    acts = snapshot.activities(min_distance_m=5000, present=('avg_hr',))
 
     if len(acts) < 20:
         return None
@@ -2199,10 +2330,7 @@ def investigate_stride_economy(
         if elev < TREADMILL_ELEV_THRESHOLD_M and dist_km > 5:
             continue
 
-        splits = db.query(ActivitySplit).filter(
-            ActivitySplit.activity_id == act.id,
-            ActivitySplit.average_cadence.isnot(None),
-        ).all()
+        splits = snapshot.splits(act.id, present=('average_cadence',))
 
         for sp in splits:
             if sp.distance is None or sp.elapsed_time is None:
@@ -2295,12 +2423,14 @@ def investigate_stride_economy(
     min_activities=15,
     min_data_weeks=8,
     description="Quality workout pace progression by zone over time (weather-normalized)",
+    sources=['activity', 'activity_split'],
 )
 def investigate_workout_progression(
     athlete_id: UUID,
     db: Session,
     zones: TrainingZones,
     events: List[PerformanceEvent],
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> Optional[List[RaceInputFinding]]:
     """
     Track quality workout progression over time by zone.
@@ -2309,18 +2439,13 @@ def investigate_workout_progression(
     All paces are heat-normalized so seasonal temperature changes don't
     create false adaptation signals.
     """
-    acts = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.avg_hr.isnot(None),
-    ).order_by(Activity.start_time).all()
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
+    acts = snapshot.activities(present=('avg_hr',))
 
     zone_sessions: Dict[str, List[Dict]] = defaultdict(list)
 
     for act in acts:
-        splits = db.query(ActivitySplit).filter(
-            ActivitySplit.activity_id == act.id,
-        ).order_by(ActivitySplit.split_number).all()
+        splits = snapshot.splits(act.id)
 
         heat_adj = act.heat_adjustment_pct
 
@@ -2434,12 +2559,14 @@ def investigate_workout_progression(
     requires=['activity_summary', 'activity_splits', 'environment'],
     min_activities=20,
     description="Long run muscular durability — cadence/stride decay in final quarter",
+    sources=['activity', 'activity_split'],
 )
 def investigate_long_run_durability(
     athlete_id: UUID,
     db: Session,
     zones: TrainingZones,
     events: List[PerformanceEvent],
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> Optional[RaceInputFinding]:
     """
     Track cadence and pace decay in the final quarter of long runs.
@@ -2450,13 +2577,8 @@ def investigate_long_run_durability(
 
     Controls for temperature.
     """
-    long_runs = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.distance_m > 20000,
-        Activity.avg_hr.isnot(None),
-        Activity.temperature_f.isnot(None),
-    ).order_by(Activity.start_time).all()
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
+    long_runs = snapshot.activities(min_distance_m=20000, present=('avg_hr', 'temperature_f'))
 
     if len(long_runs) < 6:
         return None
@@ -2469,13 +2591,7 @@ def investigate_long_run_durability(
         if elev < TREADMILL_ELEV_THRESHOLD_M and dist_km > 5:
             continue
 
-        splits = db.query(ActivitySplit).filter(
-            ActivitySplit.activity_id == lr.id,
-            ActivitySplit.average_cadence.isnot(None),
-            ActivitySplit.average_heartrate.isnot(None),
-            ActivitySplit.distance.isnot(None),
-            ActivitySplit.elapsed_time.isnot(None),
-        ).order_by(ActivitySplit.split_number).all()
+        splits = snapshot.splits(lr.id, present=('average_cadence', 'average_heartrate', 'distance', 'elapsed_time'))
 
         if len(splits) < 8:
             continue
@@ -2604,22 +2720,21 @@ def investigate_long_run_durability(
     min_activities=10,
     min_data_weeks=4,
     description="Stride frequency, quality, and progression over time",
+    sources=['activity'],
 )
 def investigate_stride_progression(
     athlete_id: UUID,
     db: Session,
     zones: TrainingZones,
     events: List[PerformanceEvent],
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> Optional[RaceInputFinding]:
     """
     Track stride (acceleration) frequency and quality over time
     using activity shapes.
     """
-    acts = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.run_shape.isnot(None),
-    ).order_by(Activity.start_time).all()
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
+    acts = snapshot.activities(present=('run_shape',))
 
     stride_runs = []
     for act in acts:
@@ -2689,21 +2804,20 @@ def investigate_stride_progression(
     min_activities=10,
     min_data_weeks=8,
     description="Threshold interval duration and pace improvement over sessions",
+    sources=['activity'],
 )
 def investigate_cruise_interval_quality(
     athlete_id: UUID,
     db: Session,
     zones: TrainingZones,
     events: List[PerformanceEvent],
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> Optional[RaceInputFinding]:
     """
     Track sustained threshold work quality across sessions using shapes.
     """
-    acts = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.run_shape.isnot(None),
-    ).order_by(Activity.start_time).all()
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
+    acts = snapshot.activities(present=('run_shape',))
 
     threshold_sessions = []
     for act in acts:
@@ -2782,12 +2896,14 @@ def investigate_cruise_interval_quality(
     min_activities=10,
     min_data_weeks=8,
     description="Recovery between interval reps — does inter-rep recovery improve",
+    sources=['activity'],
 )
 def investigate_interval_recovery_trend(
     athlete_id: UUID,
     db: Session,
     zones: TrainingZones,
     events: List[PerformanceEvent],
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> Optional[RaceInputFinding]:
     """
     Track cardiac recovery rate between interval reps over successive sessions.
@@ -2795,11 +2911,8 @@ def investigate_interval_recovery_trend(
     recovers after hard effort. Pace recovery time is also tracked but is
     secondary to cardiac response.
     """
-    acts = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.run_shape.isnot(None),
-    ).order_by(Activity.start_time).all()
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
+    acts = snapshot.activities(present=('run_shape',))
 
     sessions_with_recovery = []
     for act in acts:
@@ -2900,12 +3013,14 @@ def investigate_interval_recovery_trend(
     min_activities=20,
     min_data_weeks=8,
     description="Workout variety — does mixing workout types correlate with better race results",
+    sources=['activity', 'performance_event'],
 )
 def investigate_workout_variety_effect(
     athlete_id: UUID,
     db: Session,
     zones: TrainingZones,
     events: List[PerformanceEvent],
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> Optional[RaceInputFinding]:
     """
     Measure whether higher workout variety in training blocks correlates
@@ -2913,6 +3028,7 @@ def investigate_workout_variety_effect(
     compare across different race distances — raw pace comparison between
     a 5K and a half marathon is meaningless.
     """
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
     if len(events) < 4:
         return None
 
@@ -2923,13 +3039,7 @@ def investigate_workout_variety_effect(
             continue
 
         block_start = ev.event_date - timedelta(days=28)
-        block_acts = db.query(Activity).filter(
-            Activity.athlete_id == athlete_id,
-            Activity.is_duplicate == False,  # noqa: E712
-            Activity.run_shape.isnot(None),
-            Activity.start_time >= block_start,
-            Activity.start_time < ev.event_date,
-        ).all()
+        block_acts = snapshot.activities(present=('run_shape',), start=block_start, end=ev.event_date)
 
         if len(block_acts) < 5:
             continue
@@ -3004,23 +3114,22 @@ def investigate_workout_variety_effect(
     min_activities=10,
     min_data_weeks=4,
     description="Progressive run execution quality — pace control and finishing effort",
+    sources=['activity'],
 )
 def investigate_progressive_run_execution(
     athlete_id: UUID,
     db: Session,
     zones: TrainingZones,
     events: List[PerformanceEvent],
+    snapshot: Optional[AthleteInvestigationSnapshot] = None,
 ) -> Optional[RaceInputFinding]:
     """
     Analyze progressive runs (each phase faster than the last) to track
     execution quality over time. Progressive runs teach pace control and
     finishing speed — key race execution skills.
     """
-    acts = db.query(Activity).filter(
-        Activity.athlete_id == athlete_id,
-        Activity.is_duplicate == False,  # noqa: E712
-        Activity.run_shape.isnot(None),
-    ).order_by(Activity.start_time).all()
+    snapshot = snapshot or AthleteInvestigationSnapshot.load(athlete_id, db)
+    acts = snapshot.activities(present=('run_shape',))
 
     progressions = []
     for act in acts:
@@ -3109,33 +3218,214 @@ def investigate_progressive_run_execution(
 #  Main entry point
 # ═══════════════════════════════════════════════════════
 
+# Legacy investigations — not yet @investigation-decorated because they
+# return domain types (AdaptationCurve, WeeklyPattern) rather than
+# RaceInputFinding. They run through the executor alongside the registry;
+# failures appear in honest gaps rather than silently swallowed.
+_LEGACY_INVESTIGATIONS = {
+    'detect_adaptation_curves': "Adaptation curve detection",
+    'detect_weekly_patterns': "Weekly pattern detection",
+}
+
+
+@dataclass
+class RaceInputMiningReport:
+    """One mining run: findings, honest gaps and how each investigation ran."""
+    findings: List[RaceInputFinding]
+    honest_gaps: List[str]
+    runs: List[InvestigationRun] = field(default_factory=list)
+
+    def timing_summary(self) -> Dict:
+        return {
+            'investigations': [r.to_dict() for r in self.runs],
+            'total_ms': round(sum(r.elapsed_ms for r in self.runs), 1),
+            'timeouts': [r.name for r in self.runs if r.status == STATUS_TIMEOUT],
+            'errors': [r.name for r in self.runs if r.status == STATUS_ERROR],
+            'cached': [r.name for r in self.runs if r.status == STATUS_CACHED],
+        }
+
+
 def mine_race_inputs(
     athlete_id: UUID,
     db: Session,
+    *,
+    workers: int = 0,
+    time_budgets: Optional[Dict[str, float]] = None,
 ) -> Tuple[List[RaceInputFinding], List[str]]:
     """
     Run all registered investigations against the athlete's data.
 
+    Returns (findings, honest_gaps) where honest_gaps lists investigations
+    that were skipped and why — for honest reporting to the athlete.
+    See mine_race_inputs_report for the per-investigation timings.
+    """
+    report = mine_race_inputs_report(athlete_id, db, workers=workers, time_budgets=time_budgets)
+    return report.findings, report.honest_gaps
+
+
+def mine_race_inputs_report(
+    athlete_id: UUID,
+    db: Session,
+    *,
+    workers: int = 0,
+    time_budgets: Optional[Dict[str, float]] = None,
+    use_cache: bool = True,
+) -> RaceInputMiningReport:
+    """
+    Run all registered investigations and report how each one ran.
+
     Uses the investigation registry to check signal availability and
     minimum data thresholds before executing each investigation.
 
-    Returns (findings, honest_gaps) where honest_gaps lists investigations
-    that were skipped and why — for honest reporting to the athlete.
+    Results are cached by services/investigation_cache under the data
+    versions of each investigation's declared sources: only investigations
+    whose inputs changed are recomputed, and when nothing changed the
+    athlete's data is not loaded at all. Cached investigations come back
+    with status "cached".
+
+    Otherwise the athlete's data is loaded once into an
+    AthleteInvestigationSnapshot that coverage, minimum checks and every
+    investigation read from. Investigations run through
+    services/investigation_executor: ``workers`` > 0 runs them in that many
+    forked processes, and each gets its spec's time budget
+    (``time_budgets`` overrides by name). Timings, timeouts and errors come
+    back on ``runs`` and feed the population timing report.
     """
+    from core.cache import get_redis_client
+    from services.auto_discovery.tuning_loop import (
+        get_active_param_overrides_by_investigation,
+        run_investigation_with_athlete_overrides,
+    )
+
     findings: List[RaceInputFinding] = []
-    honest_gaps: List[str] = []
 
     zones = load_training_zones(athlete_id, db)
     if not zones:
         logger.warning("No RPI/zones for athlete %s — cannot mine inputs", athlete_id)
-        return findings, ["Training pace profile not available — need at least one race result"]
+        return RaceInputMiningReport(
+            findings, ["Training pace profile not available — need at least one race result"],
+        )
+
+    # Overrides are read here so the investigations themselves never query.
+    try:
+        overrides = get_active_param_overrides_by_investigation(athlete_id, db)
+    except Exception as exc:
+        logger.warning("Override lookup failed for %s, using registry defaults: %s", athlete_id, exc)
+        overrides = {}
+
+    versions = load_data_versions(athlete_id, db) if use_cache else None
+    cache = InvestigationResultCache.load(get_redis_client(), athlete_id) if versions else None
+    zone_key = asdict(zones) if cache is not None else None
+    specs = {spec.name: spec for spec in INVESTIGATION_REGISTRY}
+
+    plan_key = plan = None
+    if cache is not None:
+        plan_key = result_key(versions, DATA_VERSION_SOURCES, zone_key, [
+            (s.name, s.requires, s.min_activities, s.min_races, s.min_data_weeks, s.description)
+            for s in INVESTIGATION_REGISTRY
+        ])
+        plan = cache.get('_plan', plan_key)
+
+    snapshot: Optional[AthleteInvestigationSnapshot] = None
+    if plan is None:
+        snapshot = AthleteInvestigationSnapshot.load(athlete_id, db, zones=zones)
+        plan = _mining_plan(athlete_id, db, snapshot)
+        if cache is not None:
+            cache.put('_plan', plan_key, plan)
+    names: List[str] = plan['names']
+    honest_gaps: List[str] = list(plan['honest_gaps'])
+
+    budgets: Dict[str, Optional[float]] = {}
+    keys: Dict[str, str] = {}
+    cached: Dict[str, List[RaceInputFinding]] = {}
+    for name in names:
+        spec = specs.get(name)
+        if spec is None:
+            budgets[name] = TIME_BUDGET_S_BY_COST['medium']
+        else:
+            budgets[name] = spec.time_budget_s or TIME_BUDGET_S_BY_COST.get(
+                spec.runtime_cost_hint, TIME_BUDGET_S_BY_COST['medium'],
+            )
+        if cache is not None:
+            sources = spec.sources if spec is not None else DEFAULT_INVESTIGATION_SOURCES
+            keys[name] = result_key(versions, sources, zone_key, overrides.get(name))
+            payload = cache.get(name, keys[name])
+            if payload is not None:
+                cached[name] = [RaceInputFinding(**f) for f in payload]
+    budgets.update(time_budgets or {})
+
+    to_run = [name for name in names if name not in cached]
+    if to_run and snapshot is None:
+        snapshot = AthleteInvestigationSnapshot.load(athlete_id, db, zones=zones)
+    events = snapshot.races if snapshot is not None else []
+
+    def run_one(name: str) -> List[RaceInputFinding]:
+        if name == 'detect_adaptation_curves':
+            curves = detect_adaptation_curves(athlete_id, db, zones, snapshot=snapshot)
+            actionable_curves = [
+                c for c in curves
+                if c.inflection_date and (c.trend == 'improving' or c.inflection_description)
+            ]
+            return connect_adaptations_to_races(actionable_curves, events)
+        if name == 'detect_weekly_patterns':
+            patterns = detect_weekly_patterns(athlete_id, db, zones, snapshot=snapshot)
+            return [_pattern_to_finding(p, events) for p in patterns]
+
+        result, override_err, _applied = run_investigation_with_athlete_overrides(
+            athlete_id=athlete_id,
+            investigation_name=name,
+            db=db,
+            snapshot=snapshot,
+            overrides_by_investigation=overrides,
+        )
+        if override_err:
+            raise RuntimeError(f"override run failed: {override_err}")
+        if result is None:
+            return []
+        return result if isinstance(result, list) else [result]
+
+    computed = {run.name: run for run in run_investigations(to_run, run_one, budgets, workers=workers)}
+
+    runs: List[InvestigationRun] = []
+    for name in names:
+        if name in cached:
+            runs.append(InvestigationRun(
+                name=name, status=STATUS_CACHED, elapsed_ms=0.0,
+                budget_s=budgets.get(name), findings=cached[name],
+            ))
+            findings.extend(cached[name])
+            continue
+
+        run = computed[name]
+        runs.append(run)
+        findings.extend(run.findings)
+        if run.status == STATUS_OK:
+            if cache is not None:
+                cache.put(name, keys[name], [asdict(f) for f in run.findings])
+            continue
+        logger.warning(
+            "Investigation %s %s after %.0fms: %s", run.name, run.status, run.elapsed_ms, run.error,
+        )
+        if run.name in _LEGACY_INVESTIGATIONS:
+            outcome = "ran out of time" if run.status == STATUS_TIMEOUT else "encountered an error"
+            honest_gaps.append(f"{_LEGACY_INVESTIGATIONS[run.name]}: {outcome}")
+
+    if cache is not None:
+        cache.save()
+    record_investigation_runs(get_redis_client(), list(computed.values()))
+
+    return RaceInputMiningReport(findings, honest_gaps, runs)
 
-    coverage = get_athlete_signal_coverage(athlete_id, db)
 
-    events = db.query(PerformanceEvent).filter(
-        PerformanceEvent.athlete_id == athlete_id,
-        PerformanceEvent.user_confirmed == True,  # noqa: E712
-    ).order_by(PerformanceEvent.event_date).all()
+def _mining_plan(
+    athlete_id: UUID,
+    db: Session,
+    snapshot: AthleteInvestigationSnapshot,
+) -> Dict[str, List[str]]:
+    """Investigations this athlete qualifies for, and honest gaps for the rest."""
+    coverage = get_athlete_signal_coverage(athlete_id, db, snapshot=snapshot)
+    names: List[str] = []
+    honest_gaps: List[str] = []
 
     for spec in INVESTIGATION_REGISTRY:
         missing = [s for s in spec.requires if not coverage.get(s)]
@@ -3145,59 +3435,20 @@ def mine_race_inputs(
             )
             continue
 
-        if not meets_minimums(spec, athlete_id, db):
+        if not meets_minimums(spec, athlete_id, db, snapshot=snapshot):
             honest_gaps.append(
                 f"{spec.description}: not enough data yet"
             )
             continue
 
-        try:
-            from services.auto_discovery.tuning_loop import run_investigation_with_athlete_overrides
+        names.append(spec.name)
 
-            result, override_err, _applied = run_investigation_with_athlete_overrides(
-                athlete_id=athlete_id,
-                investigation_name=spec.name,
-                db=db,
-            )
-            if override_err:
-                logger.warning("Investigation %s override run failed: %s", spec.name, override_err)
-                continue
-            if result is None:
-                continue
-            if isinstance(result, list):
-                findings.extend(result)
-            else:
-                findings.append(result)
-        except Exception:
-            logger.exception("Investigation %s failed", spec.name)
-
-    # Legacy investigations — not yet @investigation-decorated because they
-    # return domain types (AdaptationCurve, WeeklyPattern) rather than
-    # RaceInputFinding. Wrapped with error handling and signal checks so
-    # failures appear in honest gaps rather than silently swallowed.
     if coverage.get('activity_summary'):
-        try:
-            curves = detect_adaptation_curves(athlete_id, db, zones)
-            actionable_curves = [
-                c for c in curves
-                if c.inflection_date and (c.trend == 'improving' or c.inflection_description)
-            ]
-            findings.extend(connect_adaptations_to_races(actionable_curves, events))
-        except Exception:
-            logger.exception("detect_adaptation_curves failed")
-            honest_gaps.append("Adaptation curve detection: encountered an error")
-
-        try:
-            patterns = detect_weekly_patterns(athlete_id, db, zones)
-            for p in patterns:
-                findings.append(_pattern_to_finding(p, events))
-        except Exception:
-            logger.exception("detect_weekly_patterns failed")
-            honest_gaps.append("Weekly pattern detection: encountered an error")
+        names.extend(_LEGACY_INVESTIGATIONS)
     else:
         honest_gaps.append("Adaptation curves and weekly patterns: needs activity_summary")
 
-    return findings, honest_gaps
+    return {'names': names, 'honest_gaps': honest_gaps}
 
 
 def _pattern_to_finding(
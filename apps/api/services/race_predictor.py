@@ -38,6 +38,9 @@ from services.race_signal_contract import authoritative_race_filter
 
 logger = logging.getLogger(__name__)
 
+# Mean-max durations scored as race equivalents when no race is on record
+PACE_CURVE_RPI_DURATIONS_S = (1200, 1800, 3600)
+
 
 # =============================================================================
 # DATA STRUCTURES
@@ -324,8 +327,36 @@ class RacePredictor:
         else:
             return rpis[0] * 0.5 + rpis[1] * 0.3 + statistics.mean(rpis[2:]) * 0.2
     
+    def _estimate_rpi_from_pace_curve(self, athlete_id: UUID) -> Optional[float]:
+        """Estimate RPI from the athlete's 90-day mean-max pace curve.
+
+        Each 20-60 min point is scored as if it were a race of that length
+        and the best score wins. Training efforts are rarely all-out, so this
+        is a floor on current fitness. One row read (services/pace_curve).
+        """
+        from services.pace_curve import get_pace_curve, speed_at
+
+        try:
+            envelope = get_pace_curve(self.db, athlete_id, window="90d")
+        except Exception:
+            logger.warning("Pace curve lookup failed for %s", athlete_id, exc_info=True)
+            return None
+
+        rpis = []
+        for duration_s in PACE_CURVE_RPI_DURATIONS_S:
+            speed = speed_at(envelope, duration_s)
+            if speed:
+                v = calculate_rpi_from_race_time(speed * duration_s, duration_s)
+                if v:
+                    rpis.append(v)
+        return max(rpis) if rpis else None
+
     def _estimate_rpi_from_training(self, athlete_id: UUID) -> Optional[float]:
         """Estimate RPI from training data when no race data available."""
+        curve_rpi = self._estimate_rpi_from_pace_curve(athlete_id)
+        if curve_rpi:
+            return curve_rpi
+
         # This is a rough estimate based on training paces
         # Get threshold workouts
         cutoff = datetime.now() - timedelta(days=90)
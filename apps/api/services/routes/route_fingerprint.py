@@ -322,7 +322,7 @@ def compute_for_activity(
     )
     if stream is None:
         return None
-    raw = (stream.stream_data or {}).get("latlng") or []
+    raw = (stream.get_channels(["latlng"]) or {}).get("latlng") or []
     fingerprint = compute_geohash_set(raw)
     if not fingerprint:
         # Sentinel: activity has a stream but no usable GPS (treadmill,
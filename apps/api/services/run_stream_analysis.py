@@ -22,9 +22,16 @@ Tiered classification:
 
 Public API:
     analyze_stream(stream_data, channels_available, planned_workout=None,
-                   athlete_context=None) → StreamAnalysisResult
+                   athlete_context=None, engine="vectorized")
+        → StreamAnalysisResult
 
-Internal functions:
+Engines:
+    "vectorized" (default): NumPy implementation in run_stream_vectorized.
+    "python": the pure-Python functions in this module — the reference
+        implementation the vectorized engine is parity-tested against.
+
+Internal functions (each takes engine=, default "python"; analyze_stream
+passes its own engine, so these are the seams callers and tests patch):
     detect_segments(time, velocity, heartrate, grade, config, athlete_context)
     compute_drift(time, heartrate, velocity, cadence, work_segments)
     detect_moments(time, heartrate, velocity, cadence, grade, segments)
@@ -45,6 +52,11 @@ logger = logging.getLogger(__name__)
 
 METERS_PER_MILE = 1609.34
 
+# Analysis engines selectable via analyze_stream(engine=...)
+ENGINE_PYTHON = "python"
+ENGINE_VECTORIZED = "vectorized"
+_VALID_ENGINES = frozenset({ENGINE_PYTHON, ENGINE_VECTORIZED})
+
 
 # ---------------------------------------------------------------------------
 # Enums (typed labels — no prose)
@@ -227,11 +239,111 @@ def compute_effort_intensity(
     return 0.0
 
 
+def _to_sec_per_km(value: Optional[float]) -> Optional[float]:
+    """Normalize a pace anchor to sec/km (None when absent or invalid)."""
+    if value is None:
+        return None
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        return None
+    if v <= 0:
+        return None
+    # Defensive normalization: tolerate minutes/km accidentally passed in.
+    if v < 30:
+        v *= 60.0
+    return v
+
+
+def _sec_per_km_from_sec_per_mile(value: Optional[float]) -> Optional[float]:
+    """Convert a sec/mile pace to sec/km (None when absent or invalid)."""
+    if value is None:
+        return None
+    try:
+        sec_mile = float(value)
+    except (TypeError, ValueError):
+        return None
+    if sec_mile <= 0:
+        return None
+    return sec_mile / 1.60934
+
+
+def _resolve_pace_anchors(ctx: AthleteContext) -> Optional[Dict[str, float]]:
+    """Resolve sec/km pace anchors (easy → repetition) from the athlete context.
+
+    Explicit anchors win; RPI-derived paces fill gaps; any remaining gaps
+    are extrapolated from threshold. Returns None when no anchor exists.
+    """
+    threshold = _to_sec_per_km(ctx.threshold_pace_per_km)
+    anchors = {
+        "easy": _to_sec_per_km(ctx.easy_pace_per_km),
+        "marathon": _to_sec_per_km(ctx.marathon_pace_per_km),
+        "threshold": threshold,
+        "interval": _to_sec_per_km(ctx.interval_pace_per_km),
+        "repetition": _to_sec_per_km(ctx.repetition_pace_per_km),
+    }
+
+    if ctx.rpi is not None and ctx.rpi > 0:
+        try:
+            paces = calculate_training_paces(float(ctx.rpi))
+        except Exception:
+            paces = {}
+        if paces:
+            # training_paces outputs canonical raw seconds as sec/mile values.
+            if anchors["easy"] is None:
+                anchors["easy"] = _sec_per_km_from_sec_per_mile(
+                    paces.get("easy_pace_high") or paces.get("easy_pace_low")
+                )
+            if anchors["marathon"] is None:
+                anchors["marathon"] = _sec_per_km_from_sec_per_mile(paces.get("marathon_pace"))
+            if anchors["threshold"] is None:
+                anchors["threshold"] = _sec_per_km_from_sec_per_mile(paces.get("threshold_pace"))
+            if anchors["interval"] is None:
+                anchors["interval"] = _sec_per_km_from_sec_per_mile(paces.get("interval_pace"))
+            if anchors["repetition"] is None:
+                anchors["repetition"] = _sec_per_km_from_sec_per_mile(paces.get("repetition_pace"))
+
+    threshold = anchors["threshold"]
+    if threshold is None:
+        if anchors["marathon"] is not None:
+            threshold = anchors["marathon"] / 1.07
+        elif anchors["interval"] is not None:
+            threshold = anchors["interval"] / 0.92
+        elif anchors["easy"] is not None:
+            threshold = anchors["easy"] / 1.22
+        elif anchors["repetition"] is not None:
+            threshold = anchors["repetition"] / 0.86
+        anchors["threshold"] = threshold
+
+    if threshold is None:
+        return None
+
+    if anchors["easy"] is None:
+        anchors["easy"] = threshold * 1.22
+    if anchors["marathon"] is None:
+        anchors["marathon"] = threshold * 1.07
+    if anchors["interval"] is None:
+        anchors["interval"] = threshold * 0.92
+    if anchors["repetition"] is None:
+        anchors["repetition"] = threshold * 0.86
+
+    # Enforce monotonic pace ordering (sec/km, slower -> faster).
+    anchors["easy"] = max(anchors["easy"], anchors["marathon"] + 5.0)
+    anchors["marathon"] = max(anchors["marathon"], anchors["threshold"] + 4.0)
+    anchors["interval"] = min(anchors["interval"], anchors["threshold"] - 4.0)
+    anchors["repetition"] = min(anchors["repetition"], anchors["interval"] - 3.0)
+
+    if anchors["repetition"] <= 0:
+        return None
+    return anchors
+
+
 def _compute_effort_array(
     stream_data: Dict[str, List],
     point_count: int,
     tier: str,
     ctx: Optional[AthleteContext],
+    engine: str = ENGINE_PYTHON,
 ) -> List[float]:
     """Compute effort intensity per point with N=1 pace-first semantics.
 
@@ -240,7 +352,13 @@ def _compute_effort_array(
         2) HR tier ladder
         3) Stream-relative HR percentile (tier 4)
         4) Zero fallback when channels are absent
+
+    engine="vectorized" delegates to run_stream_vectorized.compute_effort_array.
     """
+    if engine == ENGINE_VECTORIZED:
+        from services import run_stream_vectorized as impl
+        return impl.compute_effort_array(stream_data, point_count, tier, ctx)
+
     hr_series = stream_data.get("heartrate")
     velocity_series = stream_data.get("velocity_smooth")
     has_hr = hr_series is not None and len(hr_series) > 0
@@ -252,95 +370,6 @@ def _compute_effort_array(
     if ctx is None:
         ctx = AthleteContext()
 
-    def _to_sec_per_km(value: Optional[float]) -> Optional[float]:
-        if value is None:
-            return None
-        try:
-            v = float(value)
-        except (TypeError, ValueError):
-            return None
-        if v <= 0:
-            return None
-        # Defensive normalization: tolerate minutes/km accidentally passed in.
-        if v < 30:
-            v *= 60.0
-        return v
-
-    def _sec_per_km_from_sec_per_mile(value: Optional[float]) -> Optional[float]:
-        if value is None:
-            return None
-        try:
-            sec_mile = float(value)
-        except (TypeError, ValueError):
-            return None
-        if sec_mile <= 0:
-            return None
-        return sec_mile / 1.60934
-
-    def _resolve_pace_anchors() -> Optional[Dict[str, float]]:
-        threshold = _to_sec_per_km(ctx.threshold_pace_per_km)
-        anchors = {
-            "easy": _to_sec_per_km(ctx.easy_pace_per_km),
-            "marathon": _to_sec_per_km(ctx.marathon_pace_per_km),
-            "threshold": threshold,
-            "interval": _to_sec_per_km(ctx.interval_pace_per_km),
-            "repetition": _to_sec_per_km(ctx.repetition_pace_per_km),
-        }
-
-        if ctx.rpi is not None and ctx.rpi > 0:
-            try:
-                paces = calculate_training_paces(float(ctx.rpi))
-            except Exception:
-                paces = {}
-            if paces:
-                # training_paces outputs canonical raw seconds as sec/mile values.
-                if anchors["easy"] is None:
-                    anchors["easy"] = _sec_per_km_from_sec_per_mile(
-                        paces.get("easy_pace_high") or paces.get("easy_pace_low")
-                    )
-                if anchors["marathon"] is None:
-                    anchors["marathon"] = _sec_per_km_from_sec_per_mile(paces.get("marathon_pace"))
-                if anchors["threshold"] is None:
-                    anchors["threshold"] = _sec_per_km_from_sec_per_mile(paces.get("threshold_pace"))
-                if anchors["interval"] is None:
-                    anchors["interval"] = _sec_per_km_from_sec_per_mile(paces.get("interval_pace"))
-                if anchors["repetition"] is None:
-                    anchors["repetition"] = _sec_per_km_from_sec_per_mile(paces.get("repetition_pace"))
-
-        threshold = anchors["threshold"]
-        if threshold is None:
-            if anchors["marathon"] is not None:
-                threshold = anchors["marathon"] / 1.07
-            elif anchors["interval"] is not None:
-                threshold = anchors["interval"] / 0.92
-            elif anchors["easy"] is not None:
-                threshold = anchors["easy"] / 1.22
-            elif anchors["repetition"] is not None:
-                threshold = anchors["repetition"] / 0.86
-            anchors["threshold"] = threshold
-
-        if threshold is None:
-            return None
-
-        if anchors["easy"] is None:
-            anchors["easy"] = threshold * 1.22
-        if anchors["marathon"] is None:
-            anchors["marathon"] = threshold * 1.07
-        if anchors["interval"] is None:
-            anchors["interval"] = threshold * 0.92
-        if anchors["repetition"] is None:
-            anchors["repetition"] = threshold * 0.86
-
-        # Enforce monotonic pace ordering (sec/km, slower -> faster).
-        anchors["easy"] = max(anchors["easy"], anchors["marathon"] + 5.0)
-        anchors["marathon"] = max(anchors["marathon"], anchors["threshold"] + 4.0)
-        anchors["interval"] = min(anchors["interval"], anchors["threshold"] - 4.0)
-        anchors["repetition"] = min(anchors["repetition"], anchors["interval"] - 3.0)
-
-        if anchors["repetition"] <= 0:
-            return None
-        return anchors
-
     def _compute_hr_effort(hr_val: float) -> float:
         if tier == "tier1_threshold_hr":
             if t1_denom is not None:
@@ -394,7 +423,7 @@ def _compute_effort_array(
 
         return 1.0
 
-    pace_anchors = _resolve_pace_anchors()
+    pace_anchors = _resolve_pace_anchors(ctx)
 
     # --- Tier 4 optimisation: pre-sort + bisect for O(n log n) total ---
     sorted_hr: Optional[List[float]] = None
@@ -928,6 +957,7 @@ def detect_segments(
     config: Optional[SegmentConfig] = None,
     athlete_context: Optional[AthleteContext] = None,
     cadence: Optional[List[float]] = None,
+    engine: str = ENGINE_PYTHON,
 ) -> List[Segment]:
     """Detect run segments using tiered N=1 classification.
 
@@ -935,7 +965,13 @@ def detect_segments(
     athlete context available. All thresholds come from config.
 
     Returns segments covering the full time range with no gaps.
+
+    engine="vectorized" delegates to run_stream_vectorized.detect_segments.
     """
+    if engine == ENGINE_VECTORIZED:
+        from services import run_stream_vectorized as impl
+        return impl.detect_segments(time, velocity, heartrate, grade, config, athlete_context, cadence)
+
     if config is None:
         config = SegmentConfig()
 
@@ -1370,12 +1406,19 @@ def compute_drift(
     velocity: Optional[List[float]],
     cadence: Optional[List[float]],
     work_segments: List[Segment],
+    engine: str = ENGINE_PYTHON,
 ) -> DriftAnalysis:
     """Compute cardiac drift, pace drift, and cadence trend.
 
     Measured over work/steady segments only.
     Uses first-half vs second-half comparison.
+
+    engine="vectorized" delegates to run_stream_vectorized.compute_drift.
     """
+    if engine == ENGINE_VECTORIZED:
+        from services import run_stream_vectorized as impl
+        return impl.compute_drift(time, heartrate, velocity, cadence, work_segments)
+
     cardiac_pct = None
     pace_pct = None
     cadence_trend = None
@@ -1459,11 +1502,18 @@ def detect_moments(
     grade: Optional[List[float]],
     segments: List[Segment],
     config: Optional[MomentConfig] = None,
+    engine: str = ENGINE_PYTHON,
 ) -> List[Moment]:
     """Detect timestamped coachable moments.
 
     Moments are observations, not directives.
+
+    engine="vectorized" delegates to run_stream_vectorized.detect_moments.
     """
+    if engine == ENGINE_VECTORIZED:
+        from services import run_stream_vectorized as impl
+        return impl.detect_moments(time, heartrate, velocity, cadence, grade, segments, config)
+
     if config is None:
         config = MomentConfig()
 
@@ -1763,6 +1813,7 @@ def analyze_stream(
     planned_workout: Optional[Dict[str, Any]] = None,
     athlete_context: Optional[AthleteContext] = None,
     gemini_client: Any = None,
+    engine: str = ENGINE_VECTORIZED,
 ) -> StreamAnalysisResult:
     """Analyze a run's per-second stream data.
 
@@ -1775,7 +1826,18 @@ def analyze_stream(
         planned_workout: Optional plan metadata. None is normal.
         athlete_context: Optional athlete physiology. None → Tier 4.
         gemini_client: Optional Gemini client for A3 moment narratives.
+        engine: "vectorized" (default) or "python" (reference). Both
+            produce identical results.
+
+    Raises:
+        ValueError: if engine is not a known engine name.
     """
+    if engine not in _VALID_ENGINES:
+        raise ValueError(
+            f"Unknown analysis engine '{engine}'. "
+            f"Valid engines: {sorted(_VALID_ENGINES)}"
+        )
+
     tier, estimated_flags = _resolve_tier(athlete_context)
     cross_run_comparable = not tier.startswith("tier4")
 
@@ -1827,14 +1889,15 @@ def analyze_stream(
         time, velocity, analysis_heartrate, grade,
         athlete_context=athlete_context,
         cadence=cadence,
+        engine=engine,
     )
 
     work_steady = [s for s in segments if s.type in (
         SegmentType.work.value, SegmentType.steady.value)]
     # Pass original heartrate for drift calculation (drift is informational)
-    drift = compute_drift(time, heartrate, velocity, cadence, work_steady)
+    drift = compute_drift(time, heartrate, velocity, cadence, work_steady, engine=engine)
 
-    moments = detect_moments(time, heartrate, velocity, cadence, grade, segments)
+    moments = detect_moments(time, heartrate, velocity, cadence, grade, segments, engine=engine)
 
     # A3: Generate LLM coaching narratives for moments (best-effort enrichment)
     if moments and gemini_client is not None:
@@ -1876,6 +1939,7 @@ def analyze_stream(
         point_count=n,
         tier=tier,
         ctx=athlete_context,
+        engine=engine,
     )
 
     # Living Fingerprint: Activity Shape Extraction
@@ -0,0 +1,795 @@
+"""Run Stream Analysis — array-backed engine.
+
+NumPy implementation of the hot paths in services/run_stream_analysis.py:
+smoothing, sustained-grade detection, tiered point classification,
+hysteresis, drift and coachable-moment detection, and per-point effort.
+
+Selected via ``analyze_stream(..., engine="vectorized")``. The pure-Python
+functions in run_stream_analysis remain the reference implementation and
+this module must produce byte-identical StreamAnalysisResult output
+(enforced by tests/test_run_stream_analysis_vectorized_parity.py).
+
+Parity rules:
+    - Any value that reaches the output (or a threshold comparison) is
+      summed left-to-right, exactly like CPython 3.11's builtin sum().
+      Window sums use column accumulation, segment sums use np.cumsum
+      (a strict sequential accumulate) — never np.sum (pairwise).
+    - Elementwise arithmetic mirrors the reference expression order so
+      IEEE-754 results match bit for bit.
+    - Scalars that feed output values (moment values, segment averages)
+      are read from the caller's original lists, preserving int/float.
+
+Channels passed to these functions must already be aligned to
+``len(time)`` (or None) — analyze_stream guarantees this via _safe_list.
+Segment merging and minimum-duration enforcement operate on a handful of
+segments and are shared with the reference implementation.
+"""
+from __future__ import annotations
+
+import statistics
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from services.run_stream_analysis import (
+    AthleteContext,
+    DriftAnalysis,
+    MomentConfig,
+    Moment,
+    MomentType,
+    Segment,
+    SegmentConfig,
+    SegmentType,
+    _compute_segment_averages,
+    _enforce_minimum_duration,
+    _estimate_threshold_hr,
+    _percentile,
+    _resolve_pace_anchors,
+    _resolve_tier,
+    _to_sec_per_km,
+)
+
+# Label codes — index into _LABELS
+_WARMUP, _WORK, _RECOVERY, _COOLDOWN, _STEADY = 0, 1, 2, 3, 4
+_LABELS = (
+    SegmentType.warmup.value,
+    SegmentType.work.value,
+    SegmentType.recovery.value,
+    SegmentType.cooldown.value,
+    SegmentType.steady.value,
+)
+
+
+# ---------------------------------------------------------------------------
+# Exact-order summation primitives
+# ---------------------------------------------------------------------------
+
+def _as_array(values: List) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _seq_sum(arr: np.ndarray) -> float:
+    """Left-to-right sum matching builtin sum() (start=0) bit for bit."""
+    if arr.size == 0:
+        return 0.0
+    return float(np.cumsum(arr)[-1]) + 0.0
+
+
+def _window_sums(arr: np.ndarray, half: int) -> np.ndarray:
+    """Sum of arr[max(0, i-half) : min(n, i+half+1)] for every i.
+
+    Accumulates one window column at a time (left to right), which gives
+    the same rounding as summing each slice sequentially.
+    """
+    n = arr.size
+    acc = np.zeros(n, dtype=np.float64)
+    for offset in range(-half, half + 1):
+        lo = max(0, -offset)
+        hi = min(n, n - offset)
+        if lo >= hi:
+            continue
+        acc[lo:hi] += arr[lo + offset:hi + offset]
+    return acc
+
+
+def _window_counts(n: int, half: int) -> np.ndarray:
+    idx = np.arange(n)
+    lo = np.maximum(0, idx - half)
+    hi = np.minimum(n, idx + half + 1)
+    return hi - lo
+
+
+def sliding_avg(data: List[float], window: int) -> np.ndarray:
+    """Array equivalent of run_stream_analysis._sliding_avg."""
+    arr = _as_array(data)
+    if arr.size == 0:
+        return arr
+    half = window // 2
+    return _window_sums(arr, half) / _window_counts(arr.size, half)
+
+
+def grade_sustained_mask(
+    grade: np.ndarray, window_s: int, threshold_pct: float,
+) -> np.ndarray:
+    """Array equivalent of _is_grade_sustained evaluated at every index."""
+    n = grade.size
+    half = window_s // 2
+    above = (np.abs(grade) >= threshold_pct).astype(np.int64)
+    csum = np.concatenate(([0], np.cumsum(above)))
+    idx = np.arange(n)
+    lo = np.maximum(0, idx - half)
+    hi = np.minimum(n, idx + half + 1)
+    width = hi - lo
+    count_above = csum[hi] - csum[lo]
+    return (width >= max(1, window_s // 2)) & (count_above >= width * 0.7)
+
+
+def _clamp01(arr: np.ndarray) -> np.ndarray:
+    """Elementwise run_stream_analysis._clamp01 (preserves -0.0 like the scalar)."""
+    return np.where(arr < 0.0, 0.0, np.where(arr > 1.0, 1.0, arr))
+
+
+def _py_min(a, b):
+    """Elementwise builtin min(a, b): returns a unless b < a."""
+    return np.where(b < a, b, a)
+
+
+def _py_max(a, b):
+    """Elementwise builtin max(a, b): returns a unless b > a."""
+    return np.where(b > a, b, a)
+
+
+# ---------------------------------------------------------------------------
+# 1) SEGMENT DETECTION
+# ---------------------------------------------------------------------------
+
+def _single_steady(time: List[int], n: int) -> List[Segment]:
+    return [Segment(
+        type=SegmentType.steady.value,
+        start_index=0, end_index=n - 1,
+        start_time_s=time[0], end_time_s=time[-1],
+        duration_s=time[-1] - time[0],
+    )]
+
+
+def _velocity_only_codes(v_frac: np.ndarray, config: SegmentConfig) -> np.ndarray:
+    return np.select(
+        [v_frac > config.work_velocity_frac, v_frac < config.recovery_velocity_frac],
+        [_WORK, _RECOVERY],
+        default=_STEADY,
+    )
+
+
+def classify_points(
+    tier: str,
+    smooth_v: np.ndarray,
+    smooth_hr: Optional[np.ndarray],
+    grade: Optional[np.ndarray],
+    v_min: float,
+    v_range: float,
+    v_median: float,
+    hr_threshold: Optional[float],
+    tier3_recovery_hr: Optional[float],
+    tier3_steady_hr: Optional[float],
+    v_p25: Optional[float], v_p75: Optional[float],
+    hr_p25: Optional[float], hr_p75: Optional[float],
+    config: SegmentConfig,
+) -> np.ndarray:
+    """Label codes for every point — array form of _classify_point_tiered."""
+    n = smooth_v.size
+    frac_pos = np.arange(n) / n
+    is_early = frac_pos < config.warmup_position_fraction
+    is_late = frac_pos > config.cooldown_position_fraction
+    v_frac = (smooth_v - v_min) / v_range if v_range > 0 else np.full(n, 0.5)
+    v = smooth_v
+    hr = smooth_hr
+    recovery_v_gate = config.recovery_velocity_frac + 0.15
+
+    # Grade-explained work: sustained steep grade + high effort
+    grade_work = np.zeros(n, dtype=bool)
+    if grade is not None and hr is not None:
+        grade_active = (np.abs(grade) >= config.grade_threshold_pct) & grade_sustained_mask(
+            grade, config.grade_sustained_s, config.grade_threshold_pct)
+        if tier in ("tier1_threshold_hr", "tier2_estimated_hrr") and hr_threshold:
+            grade_work = grade_active & (hr >= hr_threshold - config.hysteresis_bpm)
+        elif tier == "tier3_max_hr" and tier3_steady_hr:
+            grade_work = grade_active & (hr >= tier3_steady_hr)
+        elif tier == "tier4_stream_relative" and hr_p75:
+            grade_work = grade_active & (hr >= hr_p75)
+
+    if tier in ("tier1_threshold_hr", "tier2_estimated_hrr"):
+        if hr is not None and hr_threshold > 0:
+            effort = np.select(
+                [hr >= hr_threshold,
+                 (hr < hr_threshold - config.hysteresis_bpm * 3) & (v_frac < recovery_v_gate)],
+                [_WORK, _RECOVERY],
+                default=_STEADY,
+            )
+        else:
+            effort = _velocity_only_codes(v_frac, config)
+    elif tier == "tier3_max_hr":
+        if hr is not None:
+            effort = np.select(
+                [hr >= tier3_steady_hr,
+                 (hr < tier3_recovery_hr) & (v_frac < recovery_v_gate)],
+                [_WORK, _RECOVERY],
+                default=_STEADY,
+            )
+        else:
+            effort = _velocity_only_codes(v_frac, config)
+    else:
+        work_v = v > v_p75 if v_p75 is not None else np.zeros(n, dtype=bool)
+        slow_v = v < v_p25 if v_p25 is not None else np.zeros(n, dtype=bool)
+        if hr is None or hr_p25 is None:
+            recovery = slow_v
+        else:
+            recovery = slow_v & (hr < hr_p75)
+        if hr is not None and hr_p75 is not None:
+            hr_work = hr >= hr_p75
+        else:
+            hr_work = np.zeros(n, dtype=bool)
+        effort = np.select([work_v, recovery, hr_work], [_WORK, _RECOVERY, _WORK],
+                           default=_STEADY)
+
+    slow_frac = v_frac < config.warmup_velocity_fraction
+    return np.select(
+        [is_early & slow_frac, is_late & slow_frac, grade_work],
+        [_WARMUP, _COOLDOWN, _WORK],
+        default=effort,
+    ).astype(np.int8)
+
+
+def apply_hysteresis(
+    codes: np.ndarray,
+    smooth_hr: np.ndarray,
+    hr_threshold: float,
+    config: SegmentConfig,
+) -> np.ndarray:
+    """Array form of _apply_hysteresis.
+
+    The reference state machine only changes state on two mutually
+    exclusive events (leave-work and enter-work), so the state before each
+    point is simply the most recent event, resolved with a running max.
+    """
+    n = codes.size
+    if n <= 1:
+        return codes.copy()
+    hyst = config.hysteresis_bpm
+    is_work = codes == _WORK
+    exit_evt = ~is_work & ~(smooth_hr > hr_threshold - hyst)
+    enter_evt = is_work & ~(smooth_hr < hr_threshold + hyst)
+    exit_evt[0] = enter_evt[0] = False
+
+    idx = np.arange(n)
+    last_exit = np.maximum.accumulate(np.where(exit_evt, idx, -1))
+    last_enter = np.maximum.accumulate(np.where(enter_evt, idx, -1))
+    state_after = np.where(
+        (last_exit < 0) & (last_enter < 0), bool(is_work[0]), last_enter > last_exit)
+    in_work_before = np.empty(n, dtype=bool)
+    in_work_before[0] = bool(is_work[0])
+    in_work_before[1:] = state_after[:-1]
+
+    result = codes.copy()
+    result[1:][(in_work_before & ~is_work & ~exit_evt)[1:]] = _WORK
+    result[1:][(~in_work_before & is_work & ~enter_evt)[1:]] = _STEADY
+    return result
+
+
+def merge_labels(codes: np.ndarray, time: List[int]) -> List[Segment]:
+    """Array form of _merge_labels."""
+    if codes.size == 0:
+        return []
+    starts = np.concatenate(([0], np.flatnonzero(codes[1:] != codes[:-1]) + 1))
+    ends = np.concatenate((starts[1:] - 1, [codes.size - 1]))
+    segments = []
+    for si, ei in zip(starts.tolist(), ends.tolist()):
+        segments.append(Segment(
+            type=_LABELS[codes[si]], start_index=si, end_index=ei,
+            start_time_s=time[si], end_time_s=time[ei],
+            duration_s=time[ei] - time[si],
+        ))
+    return segments
+
+
+def detect_segments(
+    time: List[int],
+    velocity: Optional[List[float]],
+    heartrate: Optional[List[float]],
+    grade: Optional[List[float]],
+    config: Optional[SegmentConfig] = None,
+    athlete_context: Optional[AthleteContext] = None,
+    cadence: Optional[List[float]] = None,
+) -> List[Segment]:
+    """Vectorized run_stream_analysis.detect_segments."""
+    if config is None:
+        config = SegmentConfig()
+
+    n = len(time)
+    if n < config.min_segment_duration:
+        return []
+
+    if velocity is None or len(velocity) != n:
+        return _single_steady(time, n) if n > 0 else []
+
+    tier, _ = _resolve_tier(athlete_context)
+
+    smooth_v = sliding_avg(velocity, config.window_size)
+    smooth_hr = None
+    if heartrate is not None and len(heartrate) == n:
+        smooth_hr = sliding_avg(heartrate, config.window_size)
+
+    valid_v = smooth_v[smooth_v > 0.5]
+    if valid_v.size == 0:
+        return _single_steady(time, n)
+
+    sorted_v = np.sort(valid_v).tolist()
+    v_median = statistics.median(sorted_v)
+    v_max = sorted_v[-1]
+    v_min = sorted_v[0]
+    v_range = v_max - v_min if v_max > v_min else 1.0
+
+    hr_threshold = None
+    if tier == "tier1_threshold_hr":
+        hr_threshold = float(athlete_context.threshold_hr)
+    elif tier == "tier2_estimated_hrr":
+        hr_threshold = _estimate_threshold_hr(athlete_context)
+
+    tier3_recovery_hr = tier3_steady_hr = None
+    if tier == "tier3_max_hr":
+        max_hr = float(athlete_context.max_hr)
+        tier3_recovery_hr = max_hr * config.tier3_recovery_ceil
+        tier3_steady_hr = max_hr * config.tier3_steady_ceil
+
+    hr_p25 = hr_p75 = v_p25 = v_p75 = None
+    if tier == "tier4_stream_relative":
+        v_p25 = _percentile(sorted_v, config.tier4_low_percentile)
+        v_p75 = _percentile(sorted_v, config.tier4_high_percentile)
+        if smooth_hr is not None:
+            valid_hr = np.sort(smooth_hr[smooth_hr > 0]).tolist()
+            if valid_hr:
+                hr_p25 = _percentile(valid_hr, config.tier4_low_percentile)
+                hr_p75 = _percentile(valid_hr, config.tier4_high_percentile)
+
+    grade_arr = _as_array(grade) if grade is not None else None
+
+    codes = classify_points(
+        tier, smooth_v, smooth_hr, grade_arr,
+        v_min, v_range, v_median,
+        hr_threshold, tier3_recovery_hr, tier3_steady_hr,
+        v_p25, v_p75, hr_p25, hr_p75,
+        config,
+    )
+
+    if smooth_hr is not None and hr_threshold is not None:
+        codes = apply_hysteresis(codes, smooth_hr, hr_threshold, config)
+
+    raw_segments = merge_labels(codes, time)
+    merged = _enforce_minimum_duration(raw_segments, config.min_segment_duration)
+    return _compute_segment_averages(merged, time, velocity, heartrate, grade, cadence)
+
+
+# ---------------------------------------------------------------------------
+# 2) DRIFT ANALYSIS
+# ---------------------------------------------------------------------------
+
+def _half_mean(arr: np.ndarray, idx: np.ndarray, floor: Optional[float] = None) -> Optional[float]:
+    vals = arr[idx]
+    if floor is not None:
+        vals = vals[vals > floor]
+    if vals.size == 0:
+        return None
+    return _seq_sum(vals) / vals.size
+
+
+def compute_drift(
+    time: List[int],
+    heartrate: Optional[List[float]],
+    velocity: Optional[List[float]],
+    cadence: Optional[List[float]],
+    work_segments: List[Segment],
+) -> DriftAnalysis:
+    """Vectorized run_stream_analysis.compute_drift."""
+    cardiac_pct = None
+    pace_pct = None
+    cadence_trend = None
+
+    if not work_segments:
+        return DriftAnalysis()
+
+    work_idx = np.concatenate([
+        np.arange(seg.start_index, seg.end_index + 1) for seg in work_segments
+    ])
+    if work_idx.size < 60:
+        return DriftAnalysis()
+
+    mid = work_idx.size // 2
+    first_idx = work_idx[:mid]
+    second_idx = work_idx[mid:]
+
+    if heartrate is not None:
+        hr = _as_array(heartrate)
+        avg_first = _half_mean(hr, first_idx)
+        avg_second = _half_mean(hr, second_idx)
+        if avg_first is not None and avg_second is not None and avg_first > 0:
+            cardiac_pct = round((avg_second - avg_first) / avg_first * 100, 2)
+
+    vel = _as_array(velocity) if velocity is not None else None
+    if vel is not None:
+        avg_first_v = _half_mean(vel, first_idx, floor=0.5)
+        avg_second_v = _half_mean(vel, second_idx, floor=0.5)
+        if avg_first_v is not None and avg_second_v is not None and avg_first_v > 0:
+            pace_pct = round((avg_second_v - avg_first_v) / avg_first_v * 100, 2)
+
+    if cadence is not None and vel is not None:
+        cum_distance = np.zeros(work_idx.size, dtype=np.float64)
+        if work_idx.size > 1:
+            cum_distance[1:] = np.cumsum(vel[work_idx[1:]])
+        buckets = (cum_distance / 1000).astype(np.int64)
+        cad = _as_array(cadence)[work_idx]
+
+        order = np.argsort(buckets, kind="stable")
+        sorted_buckets = buckets[order]
+        splits = np.flatnonzero(sorted_buckets[1:] != sorted_buckets[:-1]) + 1
+        groups = np.split(cad[order], splits)
+        keys = sorted_buckets[np.concatenate(([0], splits))].tolist()
+
+        if len(keys) >= 2:
+            km_avgs = [(km, _seq_sum(vals) / vals.size) for km, vals in zip(keys, groups)]
+            n_km = len(km_avgs)
+            x_mean = sum(k for k, _ in km_avgs) / n_km
+            y_mean = sum(c for _, c in km_avgs) / n_km
+            num = sum((k - x_mean) * (c - y_mean) for k, c in km_avgs)
+            den = sum((k - x_mean) ** 2 for k, _ in km_avgs)
+            if den > 0:
+                cadence_trend = round(num / den, 3)
+
+    return DriftAnalysis(
+        cardiac_pct=cardiac_pct, pace_pct=pace_pct,
+        cadence_trend_bpm_per_km=cadence_trend,
+    )
+
+
+# ---------------------------------------------------------------------------
+# 3) COACHABLE MOMENT DETECTION
+# ---------------------------------------------------------------------------
+
+def _run_emissions(mask: np.ndarray, min_duration: int) -> List[tuple]:
+    """(start, emit) offsets for the reference start/emit/reset state machine.
+
+    Inside a run of consecutive True values beginning at ``a``, the
+    reference emits with start ``a`` at ``a + d`` (d = max(min_duration, 1)),
+    resets, and restarts at the next point — so starts repeat every d + 1.
+    """
+    if not mask.any():
+        return []
+    step = max(min_duration, 1)
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    out = []
+    for a, b_excl in zip(edges[0::2].tolist(), edges[1::2].tolist()):
+        start = a
+        while start + step < b_excl:
+            out.append((start, start + step))
+            start += step + 1
+    return out
+
+
+def _detect_cardiac_drift_onset(
+    time: List[int], heartrate: List[float], hr: np.ndarray,
+    segments: List[Segment], config: MomentConfig,
+) -> Optional[Moment]:
+    """Vectorized _detect_cardiac_drift_onset.
+
+    Window averages are screened with prefix sums, then every candidate is
+    re-evaluated with the reference slice arithmetic so the first index
+    returned (and its value) is exactly the reference one.
+    """
+    work_steady = [s for s in segments if s.type in ("work", "steady")]
+    if not work_steady:
+        return None
+
+    first_seg = work_steady[0]
+    baseline_start = min(first_seg.start_index + config.drift_stabilize_s, first_seg.end_index)
+    baseline_end = min(baseline_start + config.drift_window_s, first_seg.end_index)
+    baseline_hr_vals = heartrate[baseline_start:baseline_end + 1]
+    if not baseline_hr_vals or len(baseline_hr_vals) < 60:
+        return None
+    baseline_hr = sum(baseline_hr_vals) / len(baseline_hr_vals)
+    if baseline_hr <= 0:
+        return None
+
+    half_w = config.drift_window_s // 2
+    scan_start = baseline_end + config.drift_window_s
+    threshold = config.drift_onset_hr_rise_pct
+    # Prefix-sum error is many orders of magnitude below this margin.
+    screen = threshold - 1e-6
+    csum = np.concatenate(([0.0], np.cumsum(hr)))
+
+    for seg in work_steady:
+        seg_scan_start = max(seg.start_index, scan_start)
+        if seg_scan_start > seg.end_index:
+            continue
+        idx = np.arange(seg_scan_start, seg.end_index + 1)
+        lo = np.maximum(seg.start_index, idx - half_w)
+        hi = np.minimum(seg.end_index, idx + half_w)
+        approx_avg = (csum[hi + 1] - csum[lo]) / (hi - lo + 1)
+        approx_rise = (approx_avg - baseline_hr) / baseline_hr * 100
+        for k in np.flatnonzero(approx_rise >= screen).tolist():
+            i = int(idx[k])
+            window_hr = heartrate[int(lo[k]):int(hi[k]) + 1]
+            avg_hr = sum(window_hr) / len(window_hr)
+            rise_pct = (avg_hr - baseline_hr) / baseline_hr * 100
+            if rise_pct >= threshold:
+                return Moment(
+                    type=MomentType.cardiac_drift_onset.value,
+                    index=i, time_s=time[i], value=round(rise_pct, 2),
+                )
+    return None
+
+
+def _detect_pace_anomalies(
+    time: List[int], velocity: List[float], vel: np.ndarray,
+    segments: List[Segment], config: MomentConfig,
+) -> List[Moment]:
+    moments = []
+    for seg in segments:
+        if seg.type in ("warmup", "cooldown") or seg.duration_s < 60:
+            continue
+        si, ei = seg.start_index, seg.end_index
+        v_slice = vel[si:ei + 1]
+        valid_v = v_slice[v_slice > 0.5]
+        if valid_v.size == 0:
+            continue
+        seg_avg_v = _seq_sum(valid_v) / valid_v.size
+        if seg_avg_v <= 0:
+            continue
+
+        surge_mask = v_slice > seg_avg_v * (1 + config.pace_surge_fraction)
+        fade_mask = (v_slice < seg_avg_v * (1 - config.pace_fade_fraction)) & (v_slice > 0.5)
+
+        events = []
+        for start, emit in _run_emissions(surge_mask, config.min_moment_duration):
+            v = velocity[si + emit]
+            events.append((emit, 0, Moment(
+                type=MomentType.pace_surge.value, index=si + start,
+                time_s=time[si + start],
+                value=round((v / seg_avg_v - 1) * 100, 1),
+            )))
+        for start, emit in _run_emissions(fade_mask, config.min_moment_duration):
+            v = velocity[si + emit]
+            events.append((emit, 1, Moment(
+                type=MomentType.pace_fade.value, index=si + start,
+                time_s=time[si + start],
+                value=round((1 - v / seg_avg_v) * 100, 1),
+            )))
+        events.sort(key=lambda e: (e[0], e[1]))
+        moments.extend(m for _, _, m in events)
+    return moments
+
+
+def _detect_cadence_anomalies(
+    time: List[int], cadence: List[float], cad: np.ndarray,
+    segments: List[Segment], config: MomentConfig,
+) -> List[Moment]:
+    moments = []
+    for seg in segments:
+        if seg.duration_s < 60:
+            continue
+        si, ei = seg.start_index, seg.end_index
+        cad_slice = cad[si:ei + 1]
+        valid_cad = cad_slice[cad_slice > 0]
+        if valid_cad.size == 0:
+            continue
+        seg_avg_cad = _seq_sum(valid_cad) / valid_cad.size
+
+        drop_mask = cad_slice < seg_avg_cad - config.cadence_drop_threshold
+        surge_mask = cad_slice > seg_avg_cad + config.cadence_surge_threshold
+
+        events = []
+        for start, emit in _run_emissions(drop_mask, config.min_moment_duration):
+            c = cadence[si + emit]
+            events.append((emit, 0, Moment(
+                type=MomentType.cadence_drop.value, index=si + start,
+                time_s=time[si + start],
+                value=round(seg_avg_cad - c, 1),
+            )))
+        for start, emit in _run_emissions(surge_mask, config.min_moment_duration):
+            c = cadence[si + emit]
+            events.append((emit, 1, Moment(
+                type=MomentType.cadence_surge.value, index=si + start,
+                time_s=time[si + start],
+                value=round(c - seg_avg_cad, 1),
+            )))
+        events.sort(key=lambda e: (e[0], e[1]))
+        moments.extend(m for _, _, m in events)
+    return moments
+
+
+def _detect_grade_anomalies(
+    time: List[int], heartrate: List[float], grade: List[float],
+    vel: np.ndarray, hr: np.ndarray, grd: np.ndarray,
+    segments: List[Segment], config: MomentConfig,
+) -> List[Moment]:
+    moments = []
+    for seg in segments:
+        if seg.duration_s < 60 or seg.type in ("warmup", "cooldown"):
+            continue
+        si, ei = seg.start_index, seg.end_index
+        v_slice = vel[si:ei + 1]
+        valid_v = v_slice[v_slice > 0.5]
+        if valid_v.size == 0:
+            continue
+        seg_avg_v = _seq_sum(valid_v) / valid_v.size
+        seg_max_hr = max(heartrate[si:ei + 1]) if heartrate else 0
+        if not seg_max_hr > 0:
+            continue
+
+        hit = ((np.abs(grd[si:ei + 1]) >= config.grade_threshold_pct)
+               & (v_slice < seg_avg_v * config.grade_pace_deviation)
+               & (hr[si:ei + 1] > config.grade_hr_fraction * seg_max_hr))
+        if hit.any():
+            idx = si + int(np.argmax(hit))
+            moments.append(Moment(
+                type=MomentType.grade_adjusted_anomaly.value,
+                index=idx, time_s=time[idx], value=round(grade[idx], 1),
+            ))
+    return moments
+
+
+def detect_moments(
+    time: List[int],
+    heartrate: Optional[List[float]],
+    velocity: Optional[List[float]],
+    cadence: Optional[List[float]],
+    grade: Optional[List[float]],
+    segments: List[Segment],
+    config: Optional[MomentConfig] = None,
+) -> List[Moment]:
+    """Vectorized run_stream_analysis.detect_moments."""
+    if config is None:
+        config = MomentConfig()
+
+    n = len(time)
+    if n < 60:
+        return []
+
+    hr = _as_array(heartrate) if heartrate is not None and len(heartrate) == n else None
+    vel = _as_array(velocity) if velocity is not None and len(velocity) == n else None
+    cad = _as_array(cadence) if cadence is not None and len(cadence) == n else None
+    grd = _as_array(grade) if grade is not None and len(grade) == n else None
+
+    moments: List[Moment] = []
+
+    if hr is not None:
+        drift_moment = _detect_cardiac_drift_onset(time, heartrate, hr, segments, config)
+        if drift_moment is not None:
+            moments.append(drift_moment)
+
+    if vel is not None:
+        moments.extend(_detect_pace_anomalies(time, velocity, vel, segments, config))
+
+    if cad is not None:
+        moments.extend(_detect_cadence_anomalies(time, cadence, cad, segments, config))
+
+    if vel is not None and grd is not None and hr is not None:
+        moments.extend(_detect_grade_anomalies(
+            time, heartrate, grade, vel, hr, grd, segments, config))
+
+    moments.sort(key=lambda m: m.time_s)
+    return moments
+
+
+# ---------------------------------------------------------------------------
+# 4) EFFORT INTENSITY
+# ---------------------------------------------------------------------------
+
+def _pace_effort(vel: np.ndarray, anchors: Dict[str, float]) -> np.ndarray:
+    """Array form of the piecewise pace → effort mapping."""
+    pace = 1000.0 / _py_max(vel, 0.3)
+    easy = anchors["easy"]
+    marathon = anchors["marathon"]
+    threshold = anchors["threshold"]
+    interval = anchors["interval"]
+    repetition = anchors["repetition"]
+    slow_end = easy * 1.18
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_easy = (slow_end - pace) / max(slow_end - easy, 1e-6)
+        t_mar = (easy - pace) / max(easy - marathon, 1e-6)
+        t_thr = (marathon - pace) / max(marathon - threshold, 1e-6)
+        t_int = (threshold - pace) / max(threshold - interval, 1e-6)
+        t_rep = (interval - pace) / max(interval - repetition, 1e-6)
+
+    return np.select(
+        [pace >= slow_end, pace >= easy, pace >= marathon,
+         pace >= threshold, pace >= interval, pace >= repetition],
+        [np.full(vel.size, 0.08),
+         _clamp01(0.08 + (0.20 - 0.08) * t_easy),
+         _clamp01(0.20 + (0.40 - 0.20) * t_mar),
+         _clamp01(0.40 + (0.70 - 0.40) * t_thr),
+         _clamp01(0.70 + (0.88 - 0.70) * t_int),
+         _clamp01(0.88 + (1.00 - 0.88) * t_rep)],
+        default=1.0,
+    )
+
+
+def _hr_effort(hr: np.ndarray, tier: str, ctx: AthleteContext,
+               hr_series: Optional[List]) -> np.ndarray:
+    """Array form of the HR tier ladder in _compute_effort_array."""
+    zeros = np.zeros(hr.size)
+    if tier == "tier1_threshold_hr":
+        if ctx.threshold_hr and ctx.threshold_hr > 0:
+            return _clamp01(hr / float(ctx.threshold_hr))
+        return zeros
+    if tier == "tier2_estimated_hrr":
+        if ctx.max_hr and ctx.max_hr > 0 and ctx.resting_hr and ctx.resting_hr > 0:
+            denom = _estimate_threshold_hr(ctx) - ctx.resting_hr
+            if denom > 0:
+                return _clamp01((hr - float(ctx.resting_hr)) / denom)
+        return zeros
+    if tier == "tier3_max_hr":
+        if ctx.max_hr and ctx.max_hr > 0:
+            return _clamp01(hr / float(ctx.max_hr))
+        return zeros
+    if tier == "tier4_stream_relative" and hr_series:
+        sorted_hr = np.sort(_as_array(hr_series))
+        rank = np.searchsorted(sorted_hr, hr, side="left")
+        return _clamp01(rank / sorted_hr.size)
+    return zeros
+
+
+def compute_effort_array(
+    stream_data: Dict[str, List],
+    point_count: int,
+    tier: str,
+    ctx: Optional[AthleteContext],
+) -> List[float]:
+    """Vectorized run_stream_analysis._compute_effort_array."""
+    if point_count == 0:
+        return []
+    if ctx is None:
+        ctx = AthleteContext()
+
+    hr_series = stream_data.get("heartrate")
+    velocity_series = stream_data.get("velocity_smooth")
+    n = point_count
+
+    def _channel(series) -> tuple:
+        values = np.zeros(n)
+        present = np.zeros(n, dtype=bool)
+        if series is not None and len(series) > 0:
+            m = min(n, len(series))
+            values[:m] = _as_array(series[:m])
+            present[:m] = True
+        return values, present
+
+    hr, has_hr = _channel(hr_series)
+    vel, has_vel = _channel(velocity_series)
+
+    effort = np.zeros(n)
+    pace_anchors = _resolve_pace_anchors(ctx)
+    hr_effort = _hr_effort(hr, tier, ctx, hr_series) if has_hr.any() else np.zeros(n)
+
+    pace_path = np.zeros(n, dtype=bool)
+    if pace_anchors is not None:
+        pace_path = has_vel
+        pace_effort = _pace_effort(vel, pace_anchors)
+        delta = (hr_effort - pace_effort) * 0.25
+        max_up = np.where(pace_effort < 0.45, 0.04, 0.08)
+        delta = _py_max(-0.06, _py_min(max_up, delta))
+        adjusted = _clamp01(pace_effort + delta)
+        adjusted = np.where(pace_effort <= 0.35, _py_min(adjusted, 0.55), adjusted)
+        modulated = np.where(has_hr, adjusted, pace_effort)
+        effort = np.where(pace_path, modulated, effort)
+
+    hr_path = ~pace_path & has_hr
+    effort = np.where(hr_path, hr_effort, effort)
+
+    threshold_sec_km = _to_sec_per_km(ctx.threshold_pace_per_km)
+    if threshold_sec_km is not None and threshold_sec_km > 0:
+        tv = 1000.0 / threshold_sec_km
+        if tv > 0:
+            vel_path = ~pace_path & ~has_hr & has_vel
+            effort = np.where(vel_path, _clamp01(vel / tv), effort)
+
+    return effort.tolist()
@@ -14,6 +14,10 @@ Design:
     stream-relative percentiles if unavailable)
   - Operates on the same raw stream data as the existing Segment
     detection, computed in parallel (not derived from Segments)
+  - Per-point work (smoothing, clamping, zone classification, the mode
+    filter, acceleration scans) runs on NumPy arrays; only block- and
+    event-level logic is Python. tests/test_shape_extractor_parity.py
+    pins the output to the reference per-point implementation.
 """
 from __future__ import annotations
 
@@ -22,6 +26,9 @@ import statistics
 from dataclasses import dataclass, field, asdict
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
 logger = logging.getLogger(__name__)
 
 METERS_PER_MILE = 1609.34
@@ -298,10 +305,7 @@ def extract_shape(
     phase_v = _rolling_mean(velocity, window=30)
     phase_v = _clamp_velocity(phase_v)
     phase_pace = _velocity_to_pace(phase_v)
-    zone_per_point = [
-        pace_profile.classify_pace(p) if p > 0 else 'stopped'
-        for p in phase_pace
-    ]
+    zone_per_point = _classify_paces(phase_pace, pace_profile)
     zone_per_point = _stabilize_zones(zone_per_point, window=61)
 
     # Light smoothing (7s) for acceleration detection — must preserve 8-20s strides
@@ -385,40 +389,66 @@ def _pad(lst: list, n: int) -> list:
     return lst + [None] * (n - len(lst))
 
 
+def _as_array(values: List) -> np.ndarray:
+    """Float array with None → NaN."""
+    return np.asarray(values if values is not None else [], dtype=float)
+
+
 def _rolling_mean(values: List, window: int = 15) -> List[float]:
-    result = []
+    """Centered mean over i ± window//2, ignoring None and negative values
+    (0.0 where a window has none)."""
+    arr = _as_array(values)
+    n = len(arr)
+    if n == 0:
+        return []
     half = window // 2
-    n = len(values)
-    for i in range(n):
-        lo = max(0, i - half)
-        hi = min(n, i + half + 1)
-        valid = [v for v in values[lo:hi] if v is not None and v >= 0]
-        result.append(sum(valid) / len(valid) if valid else 0.0)
-    return result
+    valid = arr >= 0  # False for NaN
+    pad = np.zeros(half)
+    sums = sliding_window_view(
+        np.concatenate((pad, np.where(valid, arr, 0.0), pad)), 2 * half + 1,
+    ).sum(axis=1)
+    csum = np.concatenate(([0], np.cumsum(valid)))
+    idx = np.arange(n)
+    counts = csum[np.minimum(idx + half + 1, n)] - csum[np.maximum(idx - half, 0)]
+    return np.divide(sums, counts, out=np.zeros(n), where=counts > 0).tolist()
 
 
 def _clamp_velocity(velocities: List[float]) -> List[float]:
-    result = []
-    prev_valid = 0.0
-    for v in velocities:
-        if v > MAX_VELOCITY_MPS:
-            result.append(prev_valid)
-        else:
-            result.append(v)
-            if v > 0:
-                prev_valid = v
-    return result
+    """Replace glitches above MAX_VELOCITY_MPS with the last positive
+    in-range value (0.0 before the first)."""
+    v = _as_array(velocities)
+    if len(v) == 0:
+        return []
+    over = v > MAX_VELOCITY_MPS
+    good = (v > 0) & ~over
+    last_good = np.maximum.accumulate(np.where(good, np.arange(len(v)), -1))
+    prev_valid = np.where(last_good >= 0, v[np.maximum(last_good, 0)], 0.0)
+    # A glitch takes the last good value strictly before it; good[i] is
+    # False at glitches, so last_good already excludes i itself.
+    return np.where(over, prev_valid, v).tolist()
 
 
 def _velocity_to_pace(velocities: List[float]) -> List[float]:
     """Convert m/s to sec/mile. Returns 0 for stopped."""
-    result = []
-    for v in velocities:
-        if v < STOPPED_VELOCITY_THRESHOLD:
-            result.append(0.0)
-        else:
-            result.append(METERS_PER_MILE / v)
-    return result
+    v = _as_array(velocities)
+    moving = v >= STOPPED_VELOCITY_THRESHOLD
+    return np.divide(METERS_PER_MILE, v, out=np.zeros(len(v)), where=moving).tolist()
+
+
+def _classify_paces(paces: List[float], pace_profile: PaceProfile) -> List[str]:
+    """PaceProfile.classify_pace over a whole stream ('stopped' for pace <= 0)."""
+    p = _as_array(paces)
+    names = ['gray', 'easy', 'walking', 'stopped']
+    codes = np.zeros(len(p), dtype=np.intp)
+    codes[p >= pace_profile._easy_ceiling()] = 1
+    # Lowest priority first: the first matching band wins in classify_pace
+    for band in reversed([b for b in pace_profile._bands if b.name != 'easy']):
+        names.append(band.name)
+        codes[(p >= band.floor) & (p <= band.ceiling)] = len(names) - 1
+    codes[p >= WALKING_THRESHOLD_SEC] = 2
+    codes[p <= 0] = 3
+    lookup = np.array(names, dtype=object)
+    return lookup[codes].tolist()
 
 
 def _compute_total_distance(
@@ -446,21 +476,39 @@ def _compute_total_distance(
 
 def _stabilize_zones(zones: List[str], window: int = 31) -> List[str]:
     """Mode filter: replace each point's zone with the most common zone in
-    a sliding window. Eliminates per-second oscillation at zone boundaries."""
+    a sliding window. Eliminates per-second oscillation at zone boundaries.
+
+    Ties go to the zone that appears first in the window. Counts come from
+    per-zone prefix sums and first appearances from per-zone occurrence
+    lists, so the cost is O(n · zones) rather than O(n · window).
+    """
     n = len(zones)
     if n < window:
         return zones
     half = window // 2
-    stable = []
-    for i in range(n):
-        lo = max(0, i - half)
-        hi = min(n, i + half + 1)
-        chunk = zones[lo:hi]
-        counts: Dict[str, int] = {}
-        for z in chunk:
-            counts[z] = counts.get(z, 0) + 1
-        stable.append(max(counts, key=counts.get))
-    return stable
+    names = list(dict.fromkeys(zones))
+    index = {z: k for k, z in enumerate(names)}
+    codes = np.fromiter((index[z] for z in zones), dtype=np.intp, count=n)
+
+    idx = np.arange(n)
+    lo = np.maximum(idx - half, 0)
+    hi = np.minimum(idx + half + 1, n)
+    best_code = np.zeros(n, dtype=np.intp)
+    best_count = np.zeros(n, dtype=np.intp)
+    best_first = np.full(n, n, dtype=np.intp)
+    for k in range(len(names)):
+        hit = codes == k
+        csum = np.concatenate(([0], np.cumsum(hit)))
+        count = csum[hi] - csum[lo]
+        positions = np.flatnonzero(hit)
+        nxt = np.searchsorted(positions, lo)
+        first = np.where(nxt < len(positions), positions[np.minimum(nxt, len(positions) - 1)], n)
+        better = (count > best_count) | ((count == best_count) & (first < best_first))
+        best_code[better] = k
+        best_count[better] = count[better]
+        best_first[better] = first[better]
+    lookup = np.array(names, dtype=object)
+    return lookup[best_code].tolist()
 
 
 def _detect_zone_transitions(
@@ -470,18 +518,10 @@ def _detect_zone_transitions(
     if not zones:
         return []
 
-    blocks = []
-    block_start = 0
-    current_zone = zones[0]
-
-    for i in range(1, len(zones)):
-        if zones[i] != current_zone:
-            blocks.append((block_start, i - 1, current_zone))
-            block_start = i
-            current_zone = zones[i]
-
-    blocks.append((block_start, len(zones) - 1, current_zone))
-    return blocks
+    z = np.array(zones, dtype=object)
+    starts = np.concatenate(([0], np.flatnonzero(z[1:] != z[:-1]) + 1)).tolist()
+    ends = starts[1:] + [len(zones)]
+    return [(s, e - 1, zones[s]) for s, e in zip(starts, ends)]
 
 
 # ═══════════════════════════════════════════════════════
@@ -503,6 +543,24 @@ def _consolidate_same_zone(
     return result
 
 
+def _block_pace_averager(pace_per_point: List[float]):
+    """avg(start, end) → mean positive pace over points start..end
+    inclusive (0 when none), O(1) per block via prefix sums."""
+    p = _as_array(pace_per_point)
+    n = len(p)
+    moving = p > 0
+    sums = np.concatenate(([0.0], np.cumsum(np.where(moving, p, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(moving)))
+
+    def avg(start: int, end: int) -> float:
+        hi = min(end + 1, n)
+        lo = min(start, hi)
+        c = counts[hi] - counts[lo]
+        return float((sums[hi] - sums[lo]) / c) if c else 0
+
+    return avg
+
+
 def _merge_micro_phases(
     blocks: List[Tuple[int, int, str]],
     min_duration_s: int,
@@ -566,9 +624,7 @@ def _merge_similar_pace_blocks(
     if len(blocks) <= 1:
         return blocks
 
-    def _avg_pace(start: int, end: int) -> float:
-        paces = [p for p in pace_per_point[start:end + 1] if p > 0]
-        return sum(paces) / len(paces) if paces else 0
+    _avg_pace = _block_pace_averager(pace_per_point)
 
     result = [blocks[0]]
     anchor_pace = _avg_pace(blocks[0][0], blocks[0][1])
@@ -610,9 +666,7 @@ def _merge_easy_gray_oscillation(
     proximity_threshold = max(25, int(pace_profile.easy_sec * 0.06))
     near_ceiling_margin = max(30, int(pace_profile.easy_sec * 0.06))
 
-    def _avg_pace_for_block(start: int, end: int) -> float:
-        paces = [p for p in pace_per_point[start:end + 1] if p > 0]
-        return sum(paces) / len(paces) if paces else 0
+    _avg_pace_for_block = _block_pace_averager(pace_per_point)
 
     def _block_duration(start: int, end: int) -> float:
         if start < len(time) and end < len(time):
@@ -726,13 +780,11 @@ def _build_phases(
         else:
             phase_dist = sum(v * 1.0 for v in vels)  # rough estimate
 
-        # Pace CV
+        # Pace CV (sample stdev; statistics.stdev's exact-fraction path
+        # was most of the per-phase cost on long runs)
         pace_cv = 0.0
         if len(paces) >= 3 and avg_pace > 0:
-            try:
-                pace_cv = statistics.stdev(paces) / avg_pace
-            except statistics.StatisticsError:
-                pace_cv = 0.0
+            pace_cv = float(np.std(paces, ddof=1)) / avg_pace
 
         # Heat-adjusted pace
         heat_adj_pace = None
@@ -849,37 +901,39 @@ def _detect_accelerations(
     if n < 30:
         return []
 
-    excluded_ranges = set()
-    for p in phases:
-        if p.phase_type in ('warmup', 'cooldown'):
-            for t in range(p.start_time_s, p.end_time_s + 1):
-                excluded_ranges.add(t)
+    t = _as_array(time)
+    v = _as_array(velocity)
 
-    easy_vels = []
+    # Points whose (whole-second) timestamp falls in a warmup or cooldown
+    excluded = np.zeros(n, dtype=bool)
+    whole_second = t == np.floor(t)
     for p in phases:
-        if p.phase_type in ('easy', 'steady', 'recovery_jog'):
-            for i in range(n):
-                if p.start_time_s <= time[i] <= p.end_time_s:
-                    if velocity[i] > STOPPED_VELOCITY_THRESHOLD:
-                        easy_vels.append(velocity[i])
+        if p.phase_type in ('warmup', 'cooldown'):
+            excluded |= (t >= p.start_time_s) & (t <= p.end_time_s) & whole_second
 
-    if not easy_vels:
-        easy_vels = [v for v in velocity if v > STOPPED_VELOCITY_THRESHOLD]
+    moving = v > STOPPED_VELOCITY_THRESHOLD
+    easy_vels = [
+        v[(t >= p.start_time_s) & (t <= p.end_time_s) & moving]
+        for p in phases if p.phase_type in ('easy', 'steady', 'recovery_jog')
+    ]
+    easy_vels = np.concatenate(easy_vels) if easy_vels else np.empty(0)
+    if len(easy_vels) == 0:
+        easy_vels = v[moving]
 
-    if not easy_vels:
+    if len(easy_vels) == 0:
         return []
 
-    baseline_v = statistics.median(easy_vels)
+    baseline_v = statistics.median(easy_vels.tolist())
 
     vel_accels = _detect_velocity_accelerations(
         time, velocity, pace, heartrate, cadence, grade, altitude,
-        baseline_v, excluded_ranges, pace_profile,
+        baseline_v, excluded, pace_profile,
         total_time, heat_adj_pct, n,
     )
 
     cad_accels = _detect_cadence_accelerations(
         time, velocity, pace, heartrate, cadence, grade, altitude,
-        baseline_v, excluded_ranges, pace_profile,
+        baseline_v, excluded, pace_profile,
         total_time, heat_adj_pct, n,
     )
 
@@ -893,11 +947,54 @@ def _detect_accelerations(
     return merged
 
 
+def _scan_bursts(
+    time: List, starts: np.ndarray, below: np.ndarray,
+) -> List[Tuple[int, int]]:
+    """(start_idx, end_idx) bursts from per-point start / below-end flags.
+
+    A burst opens at a start point and closes before the first run of 5
+    consecutive below-end points after it (or at the last point). Bursts
+    shorter than MIN_ACCELERATION_DURATION_S are dropped and scanning
+    resumes after the closing run; accepted bursts resume the scan at
+    end_idx + 1. Only burst boundaries are visited in Python — next-start
+    and run-of-5 positions come from sorted index arrays.
+    """
+    n = len(below)
+    start_idx = np.flatnonzero(starts)
+    csum = np.concatenate(([0], np.cumsum(below)))
+    # run_end[k]: below[k-4..k] all true
+    run_end = np.flatnonzero(csum[5:] - csum[:-5] == 5) + 4
+
+    bursts = []
+    i = 0
+    while True:
+        k = np.searchsorted(start_idx, i)
+        if k >= len(start_idx):
+            break
+        accel_start = int(start_idx[k])
+        r = np.searchsorted(run_end, accel_start + 5)
+        if r < len(run_end):
+            j = int(run_end[r])
+            accel_end = j - 5
+        else:
+            j = n
+            accel_end = n - 1
+        if accel_end <= accel_start:
+            i = j
+            continue
+        if time[accel_end] - time[accel_start] < MIN_ACCELERATION_DURATION_S:
+            i = j
+            continue
+        bursts.append((accel_start, accel_end))
+        i = accel_end + 1
+    return bursts
+
+
 def _detect_velocity_accelerations(
     time: List, velocity: List[float], pace: List[float],
     heartrate: List, cadence: List,
     grade: List, altitude: List,
-    baseline_v: float, excluded_ranges: set,
+    baseline_v: float, excluded: np.ndarray,
     pace_profile: PaceProfile,
     total_time: int, heat_adj_pct: Optional[float],
     n: int,
@@ -905,53 +1002,24 @@ def _detect_velocity_accelerations(
     """Channel 1: velocity-based acceleration detection."""
     accel_threshold = baseline_v * 1.15
     end_threshold = baseline_v * 1.10
-    accelerations = []
-    i = 0
-
-    while i < n:
-        if time[i] in excluded_ranges:
-            i += 1
-            continue
-
-        if velocity[i] >= accel_threshold and pace[i] > 0:
-            if not pace_profile.is_significant_acceleration(pace[i]):
-                i += 1
-                continue
-
-            accel_start = i
-            below_count = 0
-            j = i + 1
-            while j < n:
-                if velocity[j] < end_threshold:
-                    below_count += 1
-                    if below_count >= 5:
-                        break
-                else:
-                    below_count = 0
-                j += 1
+    v = _as_array(velocity)
+    p = _as_array(pace)
 
-            accel_end = j - below_count if below_count >= 5 else j - 1
-            if accel_end <= accel_start:
-                i = j
-                continue
-
-            duration = time[accel_end] - time[accel_start]
-            if duration < MIN_ACCELERATION_DURATION_S:
-                i = j
-                continue
-
-            accel = _build_acceleration(
-                time, velocity, pace, heartrate, cadence,
-                grade, altitude,
-                accel_start, accel_end, baseline_v, pace_profile,
-                total_time, heat_adj_pct, n,
-            )
-            if accel:
-                accelerations.append(accel)
-
-            i = accel_end + 1
-        else:
-            i += 1
+    # is_significant_acceleration: pace > 0 and < 85% of easy
+    starts = (
+        ~excluded & (v >= accel_threshold)
+        & (p > 0) & (p < pace_profile.easy_sec * 0.85)
+    )
+    accelerations = []
+    for accel_start, accel_end in _scan_bursts(time, starts, v < end_threshold):
+        accel = _build_acceleration(
+            time, velocity, pace, heartrate, cadence,
+            grade, altitude,
+            accel_start, accel_end, baseline_v, pace_profile,
+            total_time, heat_adj_pct, n,
+        )
+        if accel:
+            accelerations.append(accel)
 
     return accelerations
 
@@ -962,7 +1030,7 @@ def _detect_cadence_accelerations(
     time: List, velocity: List[float], pace: List[float],
     heartrate: List, cadence: List,
     grade: List, altitude: List,
-    baseline_v: float, excluded_ranges: set,
+    baseline_v: float, excluded: np.ndarray,
     pace_profile: PaceProfile,
     total_time: int, heat_adj_pct: Optional[float],
     n: int,
@@ -972,59 +1040,27 @@ def _detect_cadence_accelerations(
     Watch accelerometer measures cadence directly — not GPS-dependent.
     A stride always produces a cadence spike regardless of runner speed.
     """
-    valid_cads = [c for c in cadence if c is not None and c > 0]
+    cad = np.nan_to_num(_as_array(cadence), nan=0.0)
+    valid_cads = cad[cad > 0]
     if len(valid_cads) < 30:
         return []
 
-    baseline_cad = statistics.median(valid_cads)
+    baseline_cad = statistics.median(valid_cads.tolist())
     cad_threshold = baseline_cad + MIN_CADENCE_SPIKE_SPM
     cad_end_threshold = baseline_cad + (MIN_CADENCE_SPIKE_SPM * 0.6)
 
     accelerations = []
-    i = 0
-
-    while i < n:
-        if time[i] in excluded_ranges:
-            i += 1
-            continue
-
-        c = cadence[i] if cadence[i] is not None else 0
-        if c >= cad_threshold:
-            accel_start = i
-            below_count = 0
-            j = i + 1
-            while j < n:
-                cj = cadence[j] if cadence[j] is not None else 0
-                if cj < cad_end_threshold:
-                    below_count += 1
-                    if below_count >= 5:
-                        break
-                else:
-                    below_count = 0
-                j += 1
-
-            accel_end = j - below_count if below_count >= 5 else j - 1
-            if accel_end <= accel_start:
-                i = j
-                continue
-
-            duration = time[accel_end] - time[accel_start]
-            if duration < MIN_ACCELERATION_DURATION_S:
-                i = j
-                continue
-
-            accel = _build_acceleration(
-                time, velocity, pace, heartrate, cadence,
-                grade, altitude,
-                accel_start, accel_end, baseline_v, pace_profile,
-                total_time, heat_adj_pct, n,
-            )
-            if accel:
-                accelerations.append(accel)
-
-            i = accel_end + 1
-        else:
-            i += 1
+    for accel_start, accel_end in _scan_bursts(
+        time, ~excluded & (cad >= cad_threshold), cad < cad_end_threshold,
+    ):
+        accel = _build_acceleration(
+            time, velocity, pace, heartrate, cadence,
+            grade, altitude,
+            accel_start, accel_end, baseline_v, pace_profile,
+            total_time, heat_adj_pct, n,
+        )
+        if accel:
+            accelerations.append(accel)
 
     return accelerations
 
@@ -8,9 +8,26 @@ Spec decision (locked 2026-02-14):
 Both /v1/home and /v1/activities/{id}/stream-analysis use this service
 to avoid recomputing analyze_stream() on every read.
 
+Version bumps: request paths pass serve_stale=True, so a row cached under an
+older CURRENT_ANALYSIS_VERSION is served immediately while a background
+refresh recomputes it (services/stream_reanalysis also backfills all stale
+rows, most recent first). No request waits on a version bump.
+
+Moment narratives: a result computed without a Gemini client (the bulk
+backfill, Home cache misses) carries NARRATIVES_PENDING when it has moments
+without narratives. Such a row stays eligible for enrichment — a read that
+has a Gemini client serves it and enqueues a refresh that adds them.
+
+Chart pyramids (services/stream_pyramid) are built with the analysis and
+stored on the same row, so chart endpoints serve precomputed LTTB levels
+instead of downsampling the raw stream per request. A row whose pyramid is
+missing or from an older PYRAMID_VERSION is served a pyramid built in
+memory; the stored copy is written by a background task, never by the read.
+
 Usage:
     result_dict = get_or_compute_analysis(activity_id, stream_row, athlete_ctx, db)
     # result_dict is the full asdict(StreamAnalysisResult)
+    pyramid = get_or_compute_pyramid(activity_id, stream_row, result_dict, db)
 """
 import logging
 from dataclasses import asdict
@@ -25,6 +42,7 @@ from services.run_stream_analysis import (
     AthleteContext,
     analyze_stream,
 )
+from services.stream_pyramid import PYRAMID_VERSION, build_pyramid
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +55,30 @@ logger = logging.getLogger(__name__)
 # v5: Effort semantics recalibrated to pace-first N=1 mapping with bounded HR modulation
 CURRENT_ANALYSIS_VERSION = 5
 
+# result_json flag: moments still lack A3 narratives (computed without Gemini)
+NARRATIVES_PENDING = "narratives_pending"
+
+
+def carry_narratives(previous: Optional[Dict[str, Any]], result_dict: Dict[str, Any]) -> None:
+    """Copy A3 narratives from a previous result onto the same moments.
+
+    Moments match on (type, time_s). Sets or clears NARRATIVES_PENDING by
+    whether any moment is still missing its narrative.
+    """
+    narrated = {
+        (m.get("type"), m.get("time_s")): m["narrative"]
+        for m in (previous or {}).get("moments") or []
+        if m.get("narrative")
+    }
+    moments = result_dict.get("moments") or []
+    for m in moments:
+        if not m.get("narrative"):
+            m["narrative"] = narrated.get((m.get("type"), m.get("time_s")))
+    if any(not m.get("narrative") for m in moments):
+        result_dict[NARRATIVES_PENDING] = True
+    else:
+        result_dict.pop(NARRATIVES_PENDING, None)
+
 
 def get_or_compute_analysis(
     activity_id: UUID,
@@ -46,6 +88,7 @@ def get_or_compute_analysis(
     planned_workout_dict: Optional[Dict] = None,
     force_recompute: bool = False,
     gemini_client: Any = None,
+    serve_stale: bool = False,
 ) -> Dict[str, Any]:
     """Get cached analysis or compute + cache it.
 
@@ -59,29 +102,83 @@ def get_or_compute_analysis(
         planned_workout_dict: Optional plan data for plan comparison.
         force_recompute: If True, ignore cache and recompute.
         gemini_client: Optional Gemini client for A3 moment narratives.
+        serve_stale: If True, a row from an older analysis version is
+            returned as-is and a background refresh is enqueued instead of
+            recomputing inside the request.
     """
     if not force_recompute:
         cached = _get_cached(activity_id, db)
         if cached is not None:
+            if serve_stale and gemini_client is not None and cached.get(NARRATIVES_PENDING):
+                from services.stream_reanalysis import enqueue_refresh
+
+                enqueue_refresh(activity_id)
             return cached
+        if serve_stale:
+            stale = _get_stale(activity_id, db)
+            if stale is not None:
+                from services.stream_reanalysis import enqueue_refresh
+
+                enqueue_refresh(activity_id)
+                return stale
 
     # Cache miss or forced recompute — run analysis
+    stream_data = stream_row.stream_data
     result = analyze_stream(
-        stream_data=stream_row.stream_data,
-        channels_available=stream_row.channels_available or list(stream_row.stream_data.keys()),
+        stream_data=stream_data,
+        channels_available=stream_row.channels_available or list(stream_data.keys()),
         planned_workout=planned_workout_dict,
         athlete_context=athlete_ctx,
         gemini_client=gemini_client,
     )
 
     result_dict = asdict(result)
+    if gemini_client is None:
+        carry_narratives(None, result_dict)
+    pyramid = build_pyramid(stream_data, result_dict.get("effort_intensity") or [])
 
     # Store in cache
-    _store_cached(activity_id, result_dict, db)
+    _store_cached(activity_id, result_dict, db, pyramid=pyramid)
 
     return result_dict
 
 
+def get_or_compute_pyramid(
+    activity_id: UUID,
+    stream_row: ActivityStream,
+    result_dict: Dict[str, Any],
+    db: Session,
+) -> Dict[str, Any]:
+    """Get the stored chart pyramid, building it in memory if missing or stale.
+
+    Read-only: for rows cached before pyramids existed (or with an older
+    PYRAMID_VERSION) the pyramid is built for this response and a
+    background fill is enqueued to store it (services/stream_reanalysis).
+
+    Args:
+        activity_id: The activity UUID.
+        stream_row: The ActivityStream row (read only on a pyramid miss).
+        result_dict: The analysis from get_or_compute_analysis().
+        db: SQLAlchemy session.
+    """
+    row = (
+        db.query(CachedStreamAnalysis)
+        .filter(CachedStreamAnalysis.activity_id == activity_id)
+        .first()
+    )
+    pyramid = row.stream_pyramid if row is not None else None
+    if pyramid and pyramid.get("version") == PYRAMID_VERSION:
+        return pyramid
+
+    if row is not None:
+        from services.stream_reanalysis import enqueue_pyramid_fill
+
+        enqueue_pyramid_fill(activity_id)
+    return build_pyramid(
+        stream_row.stream_data or {}, result_dict.get("effort_intensity") or [],
+    )
+
+
 def invalidate_cache(activity_id: UUID, db: Session) -> None:
     """Invalidate cached analysis for an activity.
 
@@ -110,12 +207,28 @@ def _get_cached(activity_id: UUID, db: Session) -> Optional[Dict[str, Any]]:
     return None
 
 
+def _get_stale(activity_id: UUID, db: Session) -> Optional[Dict[str, Any]]:
+    """Fetch a cached result from an older analysis version, if any."""
+    row = (
+        db.query(CachedStreamAnalysis)
+        .filter(
+            CachedStreamAnalysis.activity_id == activity_id,
+            CachedStreamAnalysis.analysis_version < CURRENT_ANALYSIS_VERSION,
+        )
+        .first()
+    )
+    if row is not None:
+        return row.result_json
+    return None
+
+
 def _store_cached(
     activity_id: UUID,
     result_dict: Dict[str, Any],
     db: Session,
+    pyramid: Optional[Dict[str, Any]] = None,
 ) -> None:
-    """Store or update cached analysis result."""
+    """Store or update cached analysis result (and its chart pyramid)."""
     try:
         existing = (
             db.query(CachedStreamAnalysis)
@@ -124,12 +237,14 @@ def _store_cached(
         )
         if existing:
             existing.result_json = result_dict
+            existing.stream_pyramid = pyramid
             existing.analysis_version = CURRENT_ANALYSIS_VERSION
             existing.computed_at = datetime.now(timezone.utc)
         else:
             row = CachedStreamAnalysis(
                 activity_id=activity_id,
                 result_json=result_dict,
+                stream_pyramid=pyramid,
                 analysis_version=CURRENT_ANALYSIS_VERSION,
             )
             db.add(row)
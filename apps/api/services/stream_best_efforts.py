@@ -0,0 +1,161 @@
+"""
+Stream-derived best efforts.
+
+Strava reports best efforts (fastest 400m, mile, 5k, ... inside a run) with
+its activity details. Garmin and file-imported runs carry no such list, so
+their best efforts are derived here from the raw time/distance channels.
+
+For a target distance D the fastest window is the minimum over s of
+T(s + D) - T(s), where T(distance) → elapsed time is the stream linearly
+interpolated between samples. That function is piecewise linear in s with
+breakpoints where either window edge lands on a sample, so the minimum sits
+on a window that starts or ends exactly on a sample. Two sweeps cover both
+cases:
+
+    end-anchored:   window ends on sample j, start interpolated at d[j] - D
+    start-anchored: window starts on sample i, end interpolated at d[i] + D
+
+The matching edge for every anchor is found with np.searchsorted over the
+monotone distance channel (the vectorized form of a two-pointer sweep), so
+each distance costs O(n log n) array work with no Python loop.
+
+Pauses (time advancing while distance stands still) are excluded from the
+window: a start edge takes the last sample at its distance, an end edge the
+first.
+
+Public API:
+    STREAM_EFFORT_DISTANCES   category → exact distance (m)
+    StreamEffort              one best effort
+    clean_time_distance(time_s, distance_m) → (t, d) arrays
+    fastest_window(time_s, distance_m, target_m) → (elapsed_s, start_s) | None
+    find_best_efforts(stream_data, distances=None) → {category: StreamEffort}
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Categories derived from streams, in exact meters (the stored BestEffort
+# distance uses best_effort_service.STANDARD_DISTANCES).
+STREAM_EFFORT_DISTANCES: Dict[str, float] = {
+    '400m': 400.0,
+    '1k': 1000.0,
+    'mile': 1609.344,
+    '5k': 5000.0,
+    '10k': 10000.0,
+    'half_marathon': 21097.5,
+    'marathon': 42195.0,
+}
+
+
+@dataclass(frozen=True)
+class StreamEffort:
+    category: str
+    distance_m: float
+    elapsed_s: float
+    start_offset_s: float  # window start on the stream clock (s since activity start)
+
+
+def clean_time_distance(
+    time_s: List[Optional[float]],
+    distance_m: List[Optional[float]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Paired samples with strictly increasing time and monotone distance.
+
+    Samples missing either channel are dropped, as are samples whose
+    timestamp does not advance. Distance regressions (GPS/recording jitter)
+    are flattened with a running maximum.
+    """
+    n = min(len(time_s), len(distance_m))
+    pairs = [
+        (t, d) for t, d in zip(time_s[:n], distance_m[:n])
+        if t is not None and d is not None
+    ]
+    if len(pairs) < 2:
+        return np.empty(0), np.empty(0)
+
+    t = np.fromiter((p[0] for p in pairs), dtype=np.float64, count=len(pairs))
+    d = np.fromiter((p[1] for p in pairs), dtype=np.float64, count=len(pairs))
+
+    prev_max = np.concatenate(([-np.inf], np.maximum.accumulate(t)[:-1]))
+    keep = t > prev_max
+    t, d = t[keep], d[keep]
+    return t, np.maximum.accumulate(d)
+
+
+def _fastest_window(t: np.ndarray, d: np.ndarray, target: float) -> Optional[Tuple[float, float]]:
+    """fastest_window on cleaned arrays."""
+    n = len(d)
+    if n < 2 or target <= 0 or d[-1] - d[0] < target:
+        return None
+
+    best_elapsed = np.inf
+    best_start = 0.0
+
+    # End-anchored: window ends on sample j, starts inside (d[i], d[i+1]].
+    j = np.nonzero(d - d[0] >= target)[0]
+    s = d[j] - target
+    i = np.searchsorted(d, s, side='right') - 1
+    frac = (s - d[i]) / (d[i + 1] - d[i])
+    start_t = t[i] + frac * (t[i + 1] - t[i])
+    elapsed = t[j] - start_t
+    k = int(np.argmin(elapsed))
+    best_elapsed, best_start = float(elapsed[k]), float(start_t[k])
+
+    # Start-anchored: window starts on sample i, ends inside (d[k-1], d[k]].
+    i = np.nonzero(d[-1] - d >= target)[0]
+    e = d[i] + target
+    k_end = np.searchsorted(d, e, side='left')
+    frac = (e - d[k_end - 1]) / (d[k_end] - d[k_end - 1])
+    end_t = t[k_end - 1] + frac * (t[k_end] - t[k_end - 1])
+    elapsed = end_t - t[i]
+    k = int(np.argmin(elapsed))
+    if elapsed[k] < best_elapsed:
+        best_elapsed, best_start = float(elapsed[k]), float(t[i[k]])
+
+    return best_elapsed, best_start
+
+
+def fastest_window(
+    time_s: List[Optional[float]],
+    distance_m: List[Optional[float]],
+    target_m: float,
+) -> Optional[Tuple[float, float]]:
+    """Fastest window covering target_m, as (elapsed_s, start_s).
+
+    start_s is on the stream's own clock (same units as time_s). Returns
+    None when the stream covers less than target_m.
+    """
+    t, d = clean_time_distance(time_s, distance_m)
+    return _fastest_window(t, d, target_m)
+
+
+def find_best_efforts(
+    stream_data: Dict[str, List],
+    distances: Optional[Dict[str, float]] = None,
+) -> Dict[str, StreamEffort]:
+    """Best effort per category for a stream with time + distance channels.
+
+    Categories longer than the stream are omitted. Stream time is seconds
+    since activity start (Strava and the Garmin adapter both), so
+    activity.start_time + start_offset_s is the wall-clock start of the
+    effort.
+    """
+    distances = distances if distances is not None else STREAM_EFFORT_DISTANCES
+    t, d = clean_time_distance(stream_data.get('time') or [], stream_data.get('distance') or [])
+    if len(t) < 2:
+        return {}
+
+    efforts: Dict[str, StreamEffort] = {}
+    for category, target in distances.items():
+        window = _fastest_window(t, d, target)
+        if window is None:
+            continue
+        elapsed, start = window
+        efforts[category] = StreamEffort(
+            category=category,
+            distance_m=target,
+            elapsed_s=elapsed,
+            start_offset_s=start,
+        )
+    return efforts
@@ -0,0 +1,181 @@
+"""
+Process-level LRU of decoded activity stream channels.
+
+One request or coach turn often reads the same activity's stream several
+times (mile splits, stream analysis, shape extraction, the Home last-run
+card). Each read used to decode the columnar blob — or load the legacy
+JSONB — again. ActivityStream.get_channels() now goes through this cache,
+so a stream is decoded once per process until it is evicted or replaced.
+
+Keys are (activity_id, fetched_at). Assigning ActivityStream.stream_data
+bumps fetched_at, so a re-ingested stream gets a new key and the old entry
+simply ages out; nothing needs explicit invalidation.
+
+Entries hold the channels decoded so far. A request for channels not yet
+cached decodes only those (partial decode, services/stream_codec) and adds
+them to the entry. Eviction is least-recently-used under a byte budget
+(estimated size of the decoded Python lists), STREAM_CACHE_MAX_BYTES.
+
+Callers receive a fresh dict with copied channel lists, so mutating a
+result never corrupts the cache.
+
+Public API:
+    DecodedStreamCache(max_bytes)
+        .get_or_decode(key, channels, decode) → channels dict | None
+        .stats() → {"hits", "misses", "evictions", "entries", "bytes", "max_bytes"}
+        .clear()
+    get_stream_cache() → process-wide DecodedStreamCache
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+# Rough in-memory cost of decoded values: a list slot plus a boxed
+# int/float, and a [lat, lng] pair list with its two floats.
+_SCALAR_BYTES = 32
+_PAIR_BYTES = 120
+_CHANNEL_OVERHEAD_BYTES = 64
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def estimate_nbytes(channels: Dict[str, Any]) -> int:
+    """Approximate memory held by decoded channel lists."""
+    total = 0
+    for values in channels.values():
+        total += _CHANNEL_OVERHEAD_BYTES
+        if not isinstance(values, list):
+            continue
+        sample = next((v for v in values if v is not None), None)
+        per_item = _PAIR_BYTES if isinstance(sample, (list, tuple)) else _SCALAR_BYTES
+        total += per_item * len(values)
+    return total
+
+
+def _copy(channels: Dict[str, Any]) -> Dict[str, Any]:
+    return {name: list(v) if isinstance(v, list) else v for name, v in channels.items()}
+
+
+class _Entry:
+    __slots__ = ("channels", "absent", "complete", "nbytes")
+
+    def __init__(self) -> None:
+        self.channels: Dict[str, Any] = {}
+        self.absent: Set[str] = set()   # requested but not in the stream
+        self.complete = False           # every channel decoded
+        self.nbytes = 0
+
+
+class DecodedStreamCache:
+    """Thread-safe, byte-bounded LRU of decoded stream channels."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_decode(
+        self,
+        key: Hashable,
+        channels: Optional[Iterable[str]],
+        decode: Callable[[Optional[List[str]]], Optional[Dict[str, Any]]],
+    ) -> Optional[Dict[str, Any]]:
+        """Requested channels (all when None), decoding only what is missing.
+
+        decode(names) must return the named channels present in the stream
+        (all channels for None), or None when the stream holds no data.
+        """
+        wanted = None if channels is None else list(dict.fromkeys(channels))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if wanted is None:
+                    missing = None if not entry.complete else []
+                else:
+                    missing = [
+                        c for c in wanted
+                        if c not in entry.channels and c not in entry.absent and not entry.complete
+                    ]
+                if missing == []:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _copy(self._select(entry, wanted))
+            else:
+                missing = wanted
+            self.misses += 1
+
+        # Decode outside the lock; concurrent misses on one key both decode
+        # and the second store is a harmless overwrite.
+        decoded = decode(missing)
+        if decoded is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry()
+                self._entries[key] = entry
+            entry.channels.update(decoded)
+            if missing is None:
+                entry.complete = True
+            else:
+                entry.absent.update(c for c in missing if c not in decoded)
+            self._bytes -= entry.nbytes
+            entry.nbytes = estimate_nbytes(entry.channels)
+            self._bytes += entry.nbytes
+            self._entries.move_to_end(key)
+            result = _copy(self._select(entry, wanted))
+            self._evict()
+        return result
+
+    @staticmethod
+    def _select(entry: _Entry, wanted: Optional[List[str]]) -> Dict[str, Any]:
+        if wanted is None:
+            return entry.channels
+        return {c: entry.channels[c] for c in wanted if c in entry.channels}
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.nbytes
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_cache: Optional[DecodedStreamCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_stream_cache() -> DecodedStreamCache:
+    """Process-wide cache, sized from settings.STREAM_CACHE_MAX_BYTES."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    from core.config import settings
+                    max_bytes = settings.STREAM_CACHE_MAX_BYTES
+                except Exception:
+                    max_bytes = DEFAULT_MAX_BYTES
+                _cache = DecodedStreamCache(max_bytes)
+    return _cache
@@ -0,0 +1,344 @@
+"""Columnar binary encoding for ActivityStream channel data.
+
+ActivityStream.stream_data used to be one JSONB blob of Python-number
+lists. Every reader fetched and json-decoded every channel even when it
+needed only ``time`` and ``heartrate``. This codec stores each channel as
+an independently compressed, typed column behind a channel directory, so
+readers decode only what they ask for.
+
+Layout (little-endian, FORMAT_VERSION 1):
+
+    header     4s magic "SIQS" | B version | H channel_count
+    directory  per channel:
+                 B name_len | name (utf-8) | B kind | I length
+                 I payload_offset | I payload_nbytes
+    payloads   zlib-compressed, one per channel, in directory order
+
+Column kinds:
+    KIND_INT      ints (+ nulls): delta-encoded, packed to the narrowest
+                  signed width that fits the deltas.
+    KIND_DECIMAL  floats with ≤ 7 decimal places (+ nulls): scaled to ints,
+                  then delta-encoded like KIND_INT.
+    KIND_FLOAT    other floats (+ nulls): float64, byte-shuffled.
+    KIND_BOOL     booleans (Strava ``moving``): bit-packed.
+    KIND_PAIR     [a, b] pairs (+ null pairs), e.g. ``latlng``: two
+                  numeric sub-columns.
+    KIND_JSON     anything else: compressed JSON (always lossless).
+
+Encoding is lossless: decode(encode(d)) == d, including int vs float and
+None positions. A numeric encoding is only chosen after verifying the
+values round-trip exactly; otherwise the channel falls back to KIND_JSON.
+
+Public API:
+    encode_stream(stream_data) → bytes
+    decode_stream(blob, channels=None) → dict   (only requested channels)
+    channel_names(blob) → list
+    is_encoded(blob) → bool
+"""
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"SIQS"
+FORMAT_VERSION = 1
+
+KIND_JSON = 0
+KIND_INT = 1
+KIND_DECIMAL = 2
+KIND_FLOAT = 3
+KIND_BOOL = 4
+KIND_PAIR = 5
+
+_HEADER = struct.Struct("<4sBH")
+_ENTRY_TAIL = struct.Struct("<BIII")
+_COMPRESS_LEVEL = 6
+_MAX_DECIMALS = 7
+_MAX_EXACT_INT = 2 ** 53
+
+# Column flags (first payload byte of numeric columns)
+_FLAG_HAS_NULLS = 0x01
+
+
+class StreamCodecError(ValueError):
+    """Raised when a blob is not a valid encoded stream."""
+
+
+# ---------------------------------------------------------------------------
+# Numeric column primitives
+# ---------------------------------------------------------------------------
+
+def _pack_deltas(values: np.ndarray) -> bytes:
+    """Delta-encode an int64 array at the narrowest width that fits."""
+    deltas = np.diff(values, prepend=np.int64(0))
+    if deltas.size == 0:
+        return b"\x01"
+    lo, hi = int(deltas.min()), int(deltas.max())
+    for width, dtype in ((1, "<i1"), (2, "<i2"), (4, "<i4")):
+        info = np.iinfo(np.dtype(dtype))
+        if info.min <= lo and hi <= info.max:
+            return bytes([width]) + deltas.astype(dtype).tobytes()
+    return b"\x08" + deltas.astype("<i8").tobytes()
+
+
+def _unpack_deltas(buf: memoryview, count: int) -> np.ndarray:
+    width = buf[0]
+    dtype = {1: "<i1", 2: "<i2", 4: "<i4", 8: "<i8"}[width]
+    deltas = np.frombuffer(buf[1:1 + width * count], dtype=dtype, count=count)
+    return np.cumsum(deltas, dtype=np.int64)
+
+
+def _fill_nulls(values: np.ndarray, nulls: np.ndarray) -> np.ndarray:
+    """Carry the previous non-null value forward so nulls delta to zero."""
+    if not nulls.any():
+        return values
+    idx = np.where(~nulls, np.arange(values.size), 0)
+    np.maximum.accumulate(idx, out=idx)
+    # Leading nulls map to index 0, which holds the zero placeholder.
+    return values[idx]
+
+
+def _decimal_scale(values: np.ndarray) -> Optional[Tuple[int, np.ndarray]]:
+    """Smallest decimal scale at which every float round-trips exactly."""
+    if values.size == 0:
+        return 0, values.astype(np.int64)
+    if not np.isfinite(values).all() or np.signbit(values[values == 0]).any():
+        return None
+    for decimals in range(_MAX_DECIMALS + 1):
+        factor = 10.0 ** decimals
+        scaled = np.round(values * factor)
+        if np.abs(scaled).max() >= _MAX_EXACT_INT:
+            return None
+        if np.array_equal(scaled / factor, values):
+            return decimals, scaled.astype(np.int64)
+    return None
+
+
+def _encode_numeric(values: List[Any]) -> Optional[Tuple[int, bytes]]:
+    """Encode a list of ints or floats (with optional None) as a typed column.
+
+    Returns (kind, raw_payload) or None when the column is not homogeneous.
+    """
+    nulls = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+    present = [v for v in values if v is not None]
+    if present and all(type(v) is int for v in present):
+        if any(abs(v) >= 2 ** 62 for v in present):
+            return None
+        kind = KIND_INT
+        arr = np.zeros(len(values), dtype=np.int64)
+        arr[~nulls] = present
+        body = _pack_deltas(_fill_nulls(arr, nulls))
+        prefix = b""
+    elif present and all(type(v) is float for v in present):
+        arr = np.zeros(len(values), dtype=np.float64)
+        arr[~nulls] = present
+        decimal = _decimal_scale(arr[~nulls])
+        if decimal is not None:
+            kind = KIND_DECIMAL
+            decimals, scaled = decimal
+            ints = np.zeros(len(values), dtype=np.int64)
+            ints[~nulls] = scaled
+            body = _pack_deltas(_fill_nulls(ints, nulls))
+            prefix = bytes([decimals])
+        else:
+            kind = KIND_FLOAT
+            raw = arr.astype("<f8").tobytes()
+            # Byte-shuffle: group the n-th byte of every float together.
+            body = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 8).T.tobytes()
+            prefix = b""
+    else:
+        return None
+
+    flags = _FLAG_HAS_NULLS if nulls.any() else 0
+    null_bits = np.packbits(nulls).tobytes() if flags else b""
+    return kind, bytes([flags]) + null_bits + prefix + body
+
+
+def _decode_numeric(kind: int, buf: memoryview, count: int) -> List[Any]:
+    flags = buf[0]
+    pos = 1
+    nulls = None
+    if flags & _FLAG_HAS_NULLS:
+        nbytes = (count + 7) // 8
+        nulls = np.unpackbits(np.frombuffer(buf[pos:pos + nbytes], dtype=np.uint8),
+                              count=count).astype(bool)
+        pos += nbytes
+
+    if kind == KIND_INT:
+        out = _unpack_deltas(buf[pos:], count).tolist()
+    elif kind == KIND_DECIMAL:
+        factor = 10.0 ** buf[pos]
+        out = (_unpack_deltas(buf[pos + 1:], count) / factor).tolist()
+    elif kind == KIND_FLOAT:
+        shuffled = np.frombuffer(buf[pos:pos + 8 * count], dtype=np.uint8)
+        raw = shuffled.reshape(8, count).T.tobytes()
+        out = np.frombuffer(raw, dtype="<f8", count=count).tolist()
+    else:
+        raise StreamCodecError(f"Not a numeric column kind: {kind}")
+
+    if nulls is not None:
+        for i in np.flatnonzero(nulls).tolist():
+            out[i] = None
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Channel encoders
+# ---------------------------------------------------------------------------
+
+def _encode_channel(values: Any) -> Tuple[int, int, bytes]:
+    """Encode one channel → (kind, length, raw_payload)."""
+    if isinstance(values, list) and values:
+        if all(type(v) is bool for v in values):
+            bits = np.packbits(np.fromiter(values, dtype=bool, count=len(values)))
+            return KIND_BOOL, len(values), bits.tobytes()
+
+        numeric = _encode_numeric(values)
+        if numeric is not None:
+            kind, payload = numeric
+            return kind, len(values), payload
+
+        pair = _encode_pairs(values)
+        if pair is not None:
+            return KIND_PAIR, len(values), pair
+
+    length = len(values) if isinstance(values, list) else 0
+    return KIND_JSON, length, json.dumps(values, separators=(",", ":")).encode()
+
+
+def _encode_pairs(values: List[Any]) -> Optional[bytes]:
+    if not all(v is None or (isinstance(v, list) and len(v) == 2) for v in values):
+        return None
+    nulls = [v is None for v in values]
+    firsts = [None if v is None else v[0] for v in values]
+    seconds = [None if v is None else v[1] for v in values]
+    # Null pairs are carried by the pair bitmap, not the sub-columns.
+    if any(firsts[i] is None for i in range(len(values)) if not nulls[i]):
+        return None
+    if any(seconds[i] is None for i in range(len(values)) if not nulls[i]):
+        return None
+    a = _encode_numeric(firsts)
+    b = _encode_numeric(seconds)
+    if a is None or b is None:
+        return None
+    null_bits = np.packbits(np.array(nulls, dtype=bool)).tobytes()
+    head = struct.pack("<BIB", a[0], len(a[1]), b[0])
+    return head + null_bits + a[1] + b[1]
+
+
+def _decode_pairs(buf: memoryview, count: int) -> List[Any]:
+    kind_a, nbytes_a, kind_b = struct.unpack_from("<BIB", buf, 0)
+    pos = struct.calcsize("<BIB")
+    null_len = (count + 7) // 8
+    nulls = np.unpackbits(np.frombuffer(buf[pos:pos + null_len], dtype=np.uint8),
+                          count=count).astype(bool)
+    pos += null_len
+    firsts = _decode_numeric(kind_a, buf[pos:pos + nbytes_a], count)
+    seconds = _decode_numeric(kind_b, buf[pos + nbytes_a:], count)
+    return [None if nulls[i] else [firsts[i], seconds[i]] for i in range(count)]
+
+
+def _decode_channel(kind: int, length: int, raw: bytes) -> Any:
+    buf = memoryview(raw)
+    if kind == KIND_JSON:
+        return json.loads(raw)
+    if kind == KIND_BOOL:
+        bits = np.unpackbits(np.frombuffer(buf, dtype=np.uint8), count=length)
+        return bits.astype(bool).tolist()
+    if kind == KIND_PAIR:
+        return _decode_pairs(buf, length)
+    return _decode_numeric(kind, buf, length)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def encode_stream(stream_data: Dict[str, Any]) -> bytes:
+    """Encode a stream_data dict into the versioned columnar format."""
+    names: List[bytes] = []
+    entries: List[Tuple[int, int]] = []
+    payloads: List[bytes] = []
+    for name, values in stream_data.items():
+        encoded_name = str(name).encode("utf-8")
+        if len(encoded_name) > 255:
+            raise StreamCodecError(f"Channel name too long: {name!r}")
+        kind, length, raw = _encode_channel(values)
+        names.append(encoded_name)
+        entries.append((kind, length))
+        payloads.append(zlib.compress(raw, _COMPRESS_LEVEL))
+
+    directory = bytearray()
+    offset = 0
+    for encoded_name, (kind, length), payload in zip(names, entries, payloads):
+        directory += bytes([len(encoded_name)]) + encoded_name
+        directory += _ENTRY_TAIL.pack(kind, length, offset, len(payload))
+        offset += len(payload)
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(names))
+    return header + bytes(directory) + b"".join(payloads)
+
+
+def is_encoded(blob: Optional[bytes]) -> bool:
+    """True when blob starts with the columnar stream magic."""
+    return blob is not None and bytes(blob[:4]) == MAGIC
+
+
+def _read_directory(blob: bytes) -> Tuple[List[Tuple[str, int, int, int, int]], int]:
+    if len(blob) < _HEADER.size:
+        raise StreamCodecError("Blob too short for stream header")
+    magic, version, count = _HEADER.unpack_from(blob, 0)
+    if magic != MAGIC:
+        raise StreamCodecError("Not an encoded stream (bad magic)")
+    if version != FORMAT_VERSION:
+        raise StreamCodecError(f"Unsupported stream format version {version}")
+
+    pos = _HEADER.size
+    directory = []
+    for _ in range(count):
+        name_len = blob[pos]
+        name = bytes(blob[pos + 1:pos + 1 + name_len]).decode("utf-8")
+        pos += 1 + name_len
+        kind, length, offset, nbytes = _ENTRY_TAIL.unpack_from(blob, pos)
+        pos += _ENTRY_TAIL.size
+        directory.append((name, kind, length, offset, nbytes))
+    return directory, pos
+
+
+def channel_names(blob: bytes) -> List[str]:
+    """Channel names in an encoded blob, without decoding any payloads."""
+    directory, _ = _read_directory(blob)
+    return [entry[0] for entry in directory]
+
+
+def decode_stream(
+    blob: bytes, channels: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """Decode an encoded blob back into a stream_data dict.
+
+    Args:
+        blob: Bytes produced by encode_stream().
+        channels: Channel names to decode. None decodes every channel.
+            Requested channels absent from the blob are omitted.
+
+    Raises:
+        StreamCodecError: if the blob is malformed or a newer version.
+    """
+    blob = bytes(blob)
+    directory, base = _read_directory(blob)
+    wanted = None if channels is None else set(channels)
+    out: Dict[str, Any] = {}
+    for name, kind, length, offset, nbytes in directory:
+        if wanted is not None and name not in wanted:
+            continue
+        start = base + offset
+        try:
+            raw = zlib.decompress(blob[start:start + nbytes])
+        except zlib.error as exc:
+            raise StreamCodecError(f"Corrupt payload for channel {name!r}") from exc
+        out[name] = _decode_channel(kind, length, raw)
+    return out
@@ -0,0 +1,567 @@
+"""
+RSI — Background re-analysis after CURRENT_ANALYSIS_VERSION bumps.
+
+Bumping services/stream_analysis_cache.CURRENT_ANALYSIS_VERSION makes every
+CachedStreamAnalysis row stale at once. Without this module the first open
+of each historical activity recomputed synchronously inside the request.
+
+Serve-stale-while-recomputing:
+    Request paths call get_or_compute_analysis(serve_stale=True). A stale
+    row is returned immediately and a single-activity refresh is enqueued
+    (deduplicated per activity), so no user waits on a version bump.
+
+Backfill:
+    run_reanalysis() works through stale rows in priority order — newest
+    activity weeks first, and within a week the athletes with the most
+    activities in the last ACTIVE_WINDOW_DAYS first. The CPU-bound part
+    (analyze_stream + chart pyramid) runs in a process pool; DB reads and
+    writes stay in the coordinating process.
+
+    - Throttling: bounded batch size, a pause between batches, a per-run
+      time budget, and an operator pause switch.
+    - Checkpoint/resume: progress for the current version lives in Redis.
+      Finished rows leave the stale set, so a new run resumes where the
+      last one stopped; activities that failed are recorded and skipped.
+    - Progress: get_progress() backs GET /v1/admin/ops/stream-reanalysis.
+    - Narratives: the backfill runs without Gemini. Narratives already on
+      the stale row are carried onto the same moments; a row left with
+      un-narrated moments is flagged NARRATIVES_PENDING so the next viewed
+      refresh (which has a Gemini client) still enriches it.
+
+Redis keys (all best-effort; without Redis the backfill does not run):
+    stream_reanalysis:v{N}:state     JSON checkpoint for version N
+    stream_reanalysis:v{N}:failed    set of activity ids that failed
+    stream_reanalysis:lock           single-runner lock
+    stream_reanalysis:paused         operator pause switch
+    stream_reanalysis:refresh:{id}   serve-stale refresh dedup
+    stream_reanalysis:pyramid:{id}   chart pyramid fill dedup
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import Activity, ActivityStream, Athlete, CachedStreamAnalysis, PlannedWorkout
+from services.run_stream_analysis import AthleteContext, analyze_stream
+from services.stream_analysis_cache import (
+    CURRENT_ANALYSIS_VERSION,
+    NARRATIVES_PENDING,
+    carry_narratives,
+)
+from services.stream_pyramid import PYRAMID_VERSION, build_pyramid
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "stream_reanalysis"
+LOCK_KEY = f"{KEY_PREFIX}:lock"
+PAUSED_KEY = f"{KEY_PREFIX}:paused"
+
+DEFAULT_BATCH_SIZE = 40
+DEFAULT_THROTTLE_S = 1.0
+DEFAULT_MAX_RUN_S = 600            # one beat interval of work per run
+STATE_TTL_S = 60 * 60 * 24 * 30    # checkpoint outlives any rollout
+REFRESH_DEDUP_S = 600              # one serve-stale refresh per activity per 10 min
+ACTIVE_WINDOW_DAYS = 30
+
+ATHLETE_CONTEXT_FIELDS = ("max_hr", "resting_hr", "threshold_hr", "threshold_pace_per_km", "rpi")
+
+
+def _state_key(version: int) -> str:
+    return f"{KEY_PREFIX}:v{version}:state"
+
+
+def _failed_key(version: int) -> str:
+    return f"{KEY_PREFIX}:v{version}:failed"
+
+
+def _refresh_key(activity_id: Any) -> str:
+    return f"{KEY_PREFIX}:refresh:{activity_id}"
+
+
+def _pyramid_key(activity_id: Any) -> str:
+    return f"{KEY_PREFIX}:pyramid:{activity_id}"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def default_workers() -> int:
+    """Pool size: leave one core for the coordinator, cap at 4."""
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+# ---------------------------------------------------------------------------
+# Analysis inputs (shared with the request path)
+# ---------------------------------------------------------------------------
+
+def planned_workout_for(db: Session, activity_id: UUID) -> Optional[Dict[str, Any]]:
+    """Linked planned workout as the dict analyze_stream() expects, or None."""
+    linked_plan = (
+        db.query(PlannedWorkout)
+        .filter(PlannedWorkout.completed_activity_id == activity_id)
+        .first()
+    )
+    if linked_plan is None:
+        return None
+    return {
+        "title": linked_plan.title,
+        "workout_type": linked_plan.workout_type,
+        "target_duration_minutes": linked_plan.target_duration_minutes,
+        "target_distance_km": getattr(linked_plan, "target_distance_km", None),
+        "segments": getattr(linked_plan, "segments", None),
+    }
+
+
+def load_payload(db: Session, activity_id: UUID) -> Optional[Dict[str, Any]]:
+    """Everything compute_analysis() needs for one activity, as plain data.
+
+    Returns None when the activity or its stream is gone.
+    """
+    row = (
+        db.query(Activity, ActivityStream, Athlete)
+        .join(ActivityStream, ActivityStream.activity_id == Activity.id)
+        .join(Athlete, Athlete.id == Activity.athlete_id)
+        .filter(Activity.id == activity_id)
+        .first()
+    )
+    if row is None:
+        return None
+    _, stream_row, athlete = row
+    stream_data = stream_row.stream_data
+    if not stream_data:
+        return None
+    return {
+        "activity_id": str(activity_id),
+        "stream_data": stream_data,
+        "channels_available": stream_row.channels_available or list(stream_data.keys()),
+        "planned_workout": planned_workout_for(db, activity_id),
+        "athlete_context": {f: getattr(athlete, f, None) for f in ATHLETE_CONTEXT_FIELDS},
+    }
+
+
+def compute_analysis(
+    payload: Dict[str, Any], gemini_client: Any = None,
+) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+    """Pure CPU work for one activity: (activity_id, result_dict, pyramid).
+
+    Top-level and DB-free so it can run in a pool worker process. The bulk
+    backfill runs without a Gemini client (deterministic output only, moments
+    flagged NARRATIVES_PENDING); the serve-stale refresh of a viewed activity
+    passes one for A3 narratives.
+    """
+    result = analyze_stream(
+        stream_data=payload["stream_data"],
+        channels_available=payload["channels_available"],
+        planned_workout=payload["planned_workout"],
+        athlete_context=AthleteContext(**payload["athlete_context"]),
+        gemini_client=gemini_client,
+    )
+    result_dict = asdict(result)
+    if gemini_client is None:
+        carry_narratives(None, result_dict)
+    pyramid = build_pyramid(payload["stream_data"], result_dict.get("effort_intensity") or [])
+    return payload["activity_id"], result_dict, pyramid
+
+
+def store_if_stale(
+    db: Session,
+    activity_id: Any,
+    result_dict: Dict[str, Any],
+    pyramid: Dict[str, Any],
+) -> bool:
+    """Write a recomputed result only over a row that is still stale.
+
+    A row is stale under an older analysis version, or when it is waiting
+    for narratives the new result has. A row that was deleted (new stream
+    payload → invalidate_cache) or already recomputed by a request in the
+    meantime is left alone. Narratives on the old row carry over to the
+    same moments.
+    """
+    row = (
+        db.query(CachedStreamAnalysis)
+        .filter(CachedStreamAnalysis.activity_id == UUID(str(activity_id)))
+        .first()
+    )
+    if row is None:
+        return False
+    if row.analysis_version == CURRENT_ANALYSIS_VERSION and not (
+        (row.result_json or {}).get(NARRATIVES_PENDING) and not result_dict.get(NARRATIVES_PENDING)
+    ):
+        return False
+    carry_narratives(row.result_json, result_dict)
+    row.result_json = result_dict
+    row.stream_pyramid = pyramid
+    row.analysis_version = CURRENT_ANALYSIS_VERSION
+    row.computed_at = _utcnow()
+    db.commit()
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Stale set
+# ---------------------------------------------------------------------------
+
+def count_stale(db: Session) -> int:
+    return (
+        db.query(func.count(CachedStreamAnalysis.id))
+        .filter(CachedStreamAnalysis.analysis_version < CURRENT_ANALYSIS_VERSION)
+        .scalar()
+        or 0
+    )
+
+
+def next_stale_batch(db: Session, limit: int, exclude: Optional[set] = None) -> List[UUID]:
+    """Stale activity ids in priority order (recent weeks, active athletes)."""
+    active_since = _utcnow() - timedelta(days=ACTIVE_WINDOW_DAYS)
+    activity_level = (
+        db.query(Activity.athlete_id.label("athlete_id"), func.count(Activity.id).label("n"))
+        .filter(Activity.start_time >= active_since)
+        .group_by(Activity.athlete_id)
+        .subquery()
+    )
+    q = (
+        db.query(Activity.id)
+        .join(CachedStreamAnalysis, CachedStreamAnalysis.activity_id == Activity.id)
+        .join(ActivityStream, ActivityStream.activity_id == Activity.id)
+        .outerjoin(activity_level, activity_level.c.athlete_id == Activity.athlete_id)
+        .filter(CachedStreamAnalysis.analysis_version < CURRENT_ANALYSIS_VERSION)
+    )
+    if exclude:
+        q = q.filter(Activity.id.notin_([UUID(str(a)) for a in exclude]))
+    q = q.order_by(
+        func.date_trunc("week", Activity.start_time).desc(),
+        func.coalesce(activity_level.c.n, 0).desc(),
+        Activity.start_time.desc(),
+    )
+    return [r[0] for r in q.limit(limit).all()]
+
+
+# ---------------------------------------------------------------------------
+# Checkpoint / pause
+# ---------------------------------------------------------------------------
+
+def load_state(redis_client: Any, version: int = CURRENT_ANALYSIS_VERSION) -> Dict[str, Any]:
+    raw = redis_client.get(_state_key(version)) if redis_client else None
+    if not raw:
+        return {}
+    try:
+        return json.loads(raw)
+    except (TypeError, ValueError):
+        return {}
+
+
+def _save_state(redis_client: Any, state: Dict[str, Any]) -> None:
+    state["updated_at"] = _utcnow().isoformat()
+    redis_client.set(_state_key(state["version"]), json.dumps(state), ex=STATE_TTL_S)
+
+
+def failed_ids(redis_client: Any, version: int = CURRENT_ANALYSIS_VERSION) -> set:
+    if not redis_client:
+        return set()
+    return set(redis_client.smembers(_failed_key(version)) or ())
+
+
+def is_paused(redis_client: Any) -> bool:
+    return bool(redis_client and redis_client.get(PAUSED_KEY))
+
+
+def set_paused(redis_client: Any, paused: bool) -> None:
+    if paused:
+        redis_client.set(PAUSED_KEY, _utcnow().isoformat())
+    else:
+        redis_client.delete(PAUSED_KEY)
+
+
+# ---------------------------------------------------------------------------
+# Serve-stale refresh
+# ---------------------------------------------------------------------------
+
+def enqueue_refresh(activity_id: Any) -> bool:
+    """Fire-and-forget recompute of one stale activity.
+
+    Deduplicated per activity for REFRESH_DEDUP_S. Returns True if enqueued.
+    """
+    try:
+        from core.cache import get_redis_client
+        from tasks.stream_reanalysis_tasks import refresh_stream_analysis_task
+
+        r = get_redis_client()
+        if not r or not r.set(_refresh_key(activity_id), "1", nx=True, ex=REFRESH_DEDUP_S):
+            return False
+        refresh_stream_analysis_task.delay(str(activity_id))
+        return True
+    except Exception as e:
+        logger.warning("stream_reanalysis refresh enqueue failed for %s: %s", activity_id, e)
+        return False
+
+
+def refresh_one(db: Session, activity_id: Any, gemini_client: Any = None) -> bool:
+    """Recompute one activity in-process if its cached row is still stale.
+
+    With a Gemini client, a current row still waiting for narratives is
+    recomputed too.
+    """
+    row = (
+        db.query(CachedStreamAnalysis.analysis_version, CachedStreamAnalysis.result_json)
+        .filter(CachedStreamAnalysis.activity_id == UUID(str(activity_id)))
+        .first()
+    )
+    if row is None:
+        return False
+    pending = gemini_client is not None and bool((row[1] or {}).get(NARRATIVES_PENDING))
+    if row[0] == CURRENT_ANALYSIS_VERSION and not pending:
+        return False
+    payload = load_payload(db, UUID(str(activity_id)))
+    if payload is None:
+        return False
+    _, result_dict, pyramid = compute_analysis(payload, gemini_client=gemini_client)
+    return store_if_stale(db, activity_id, result_dict, pyramid)
+
+
+def enqueue_pyramid_fill(activity_id: Any) -> bool:
+    """Fire-and-forget store of a missing or outdated chart pyramid.
+
+    Deduplicated per activity for REFRESH_DEDUP_S. Returns True if enqueued.
+    """
+    try:
+        from core.cache import get_redis_client
+        from tasks.stream_reanalysis_tasks import fill_stream_pyramid_task
+
+        r = get_redis_client()
+        if not r or not r.set(_pyramid_key(activity_id), "1", nx=True, ex=REFRESH_DEDUP_S):
+            return False
+        fill_stream_pyramid_task.delay(str(activity_id))
+        return True
+    except Exception as e:
+        logger.warning("stream_reanalysis pyramid enqueue failed for %s: %s", activity_id, e)
+        return False
+
+
+def fill_pyramid(db: Session, activity_id: Any) -> bool:
+    """Build and store the chart pyramid for a cached row that lacks a current one."""
+    row = (
+        db.query(CachedStreamAnalysis)
+        .filter(CachedStreamAnalysis.activity_id == UUID(str(activity_id)))
+        .first()
+    )
+    if row is None or (row.stream_pyramid or {}).get("version") == PYRAMID_VERSION:
+        return False
+    stream_row = (
+        db.query(ActivityStream)
+        .filter(ActivityStream.activity_id == UUID(str(activity_id)))
+        .first()
+    )
+    if stream_row is None or not stream_row.has_data:
+        return False
+    row.stream_pyramid = build_pyramid(
+        stream_row.stream_data or {}, (row.result_json or {}).get("effort_intensity") or [],
+    )
+    db.commit()
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Backfill runner
+# ---------------------------------------------------------------------------
+
+def _compute_batch(
+    pool: Optional[ProcessPoolExecutor], payloads: List[Dict[str, Any]],
+) -> List[Tuple[str, Any]]:
+    """Run compute_analysis over a batch → [(activity_id, result | exception)]."""
+    if pool is None:
+        out = []
+        for p in payloads:
+            try:
+                out.append((p["activity_id"], compute_analysis(p)))
+            except Exception as e:  # noqa: BLE001 — recorded as failed
+                out.append((p["activity_id"], e))
+        return out
+
+    futures = [(p["activity_id"], pool.submit(compute_analysis, p)) for p in payloads]
+    out = []
+    for aid, fut in futures:
+        try:
+            out.append((aid, fut.result()))
+        except BrokenProcessPool:
+            raise
+        except Exception as e:  # noqa: BLE001 — recorded as failed
+            out.append((aid, e))
+    return out
+
+
+def run_reanalysis(
+    db: Session,
+    redis_client: Any,
+    *,
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    throttle_s: float = DEFAULT_THROTTLE_S,
+    max_run_s: float = DEFAULT_MAX_RUN_S,
+) -> Dict[str, Any]:
+    """Recompute stale cached analyses until done, paused, or out of time.
+
+    Args:
+        db: SQLAlchemy session (coordinator reads/writes only).
+        redis_client: Redis for lock, checkpoint and pause switch.
+        workers: Process pool size (0 = compute in-process).
+        batch_size: Activities loaded, computed and committed per batch.
+        throttle_s: Sleep between batches.
+        max_run_s: Stop starting new batches after this many seconds.
+
+    Returns:
+        ``{"status": ..., "version": N, "processed": int, "failed": int,
+        "remaining": int}``
+    """
+    version = CURRENT_ANALYSIS_VERSION
+    if not redis_client:
+        return {"status": "skipped", "reason": "redis_unavailable", "version": version}
+    if is_paused(redis_client):
+        return {"status": "paused", "version": version}
+    if not redis_client.set(LOCK_KEY, version, nx=True, ex=int(max_run_s) + 300):
+        return {"status": "skipped", "reason": "already_running", "version": version}
+
+    state = load_state(redis_client, version) or {
+        "version": version,
+        "started_at": _utcnow().isoformat(),
+        "stale_at_start": count_stale(db),
+        "processed": 0,
+        "failed": 0,
+        "runs": 0,
+    }
+    state["runs"] += 1
+    state["status"] = "running"
+    _save_state(redis_client, state)
+
+    workers = default_workers() if workers is None else workers
+    pool = None
+    if workers > 0:
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers)
+        except (OSError, ValueError) as e:
+            logger.warning("stream_reanalysis pool unavailable, running in-process: %s", e)
+
+    processed = failed = 0
+    stopped = "complete"
+    deadline = time.monotonic() + max_run_s
+    try:
+        while True:
+            if is_paused(redis_client):
+                stopped = "paused"
+                break
+            if time.monotonic() >= deadline:
+                stopped = "time_budget"
+                break
+
+            skip = failed_ids(redis_client, version)
+            ids = next_stale_batch(db, batch_size, exclude=skip)
+            if not ids:
+                break
+
+            batch_processed = batch_failed = 0
+            payloads = []
+            for aid in ids:
+                payload = load_payload(db, aid)
+                if payload is None:
+                    redis_client.sadd(_failed_key(version), str(aid))
+                    batch_failed += 1
+                    continue
+                payloads.append(payload)
+            db.rollback()  # release the read snapshot before long compute
+
+            try:
+                results = _compute_batch(pool, payloads)
+            except (BrokenProcessPool, AssertionError) as e:
+                # e.g. daemonic worker processes may not fork children
+                logger.warning("stream_reanalysis pool failed, running in-process: %s", e)
+                if pool is not None:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                pool = None
+                results = _compute_batch(None, payloads)
+
+            for aid, outcome in results:
+                if isinstance(outcome, Exception):
+                    logger.warning("stream_reanalysis_failed activity_id=%s err=%s", aid, outcome)
+                    redis_client.sadd(_failed_key(version), aid)
+                    batch_failed += 1
+                    continue
+                _, result_dict, pyramid = outcome
+                try:
+                    store_if_stale(db, aid, result_dict, pyramid)
+                    batch_processed += 1
+                except Exception as e:  # pragma: no cover — logged
+                    db.rollback()
+                    redis_client.sadd(_failed_key(version), aid)
+                    batch_failed += 1
+                    logger.warning("stream_reanalysis_store_failed activity_id=%s err=%s", aid, e)
+
+            processed += batch_processed
+            failed += batch_failed
+            state["processed"] += batch_processed
+            state["failed"] += batch_failed
+            state["last_activity_id"] = str(ids[-1])
+            _save_state(redis_client, state)
+
+            if throttle_s > 0:
+                time.sleep(throttle_s)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+        remaining = count_stale(db)
+        state["remaining"] = remaining
+        state["status"] = "complete" if stopped == "complete" else stopped
+        if stopped == "complete":
+            state["completed_at"] = _utcnow().isoformat()
+        _save_state(redis_client, state)
+        redis_client.delete(LOCK_KEY)
+
+    logger.info(
+        "stream_reanalysis_run version=%s stopped=%s processed=%d failed=%d remaining=%d",
+        version, stopped, processed, failed, remaining,
+    )
+    return {
+        "status": stopped,
+        "version": version,
+        "processed": processed,
+        "failed": failed,
+        "remaining": remaining,
+    }
+
+
+def get_progress(db: Session, redis_client: Any) -> Dict[str, Any]:
+    """Ops snapshot: version distribution, checkpoint, pause/lock state."""
+    by_version_rows = (
+        db.query(CachedStreamAnalysis.analysis_version, func.count(CachedStreamAnalysis.id))
+        .group_by(CachedStreamAnalysis.analysis_version)
+        .all()
+    )
+    by_version = {int(v): int(c) for (v, c) in (by_version_rows or [])}
+    total = sum(by_version.values())
+    current = by_version.get(CURRENT_ANALYSIS_VERSION, 0)
+    stale = sum(c for v, c in by_version.items() if v < CURRENT_ANALYSIS_VERSION)
+
+    checkpoint = load_state(redis_client) if redis_client else {}
+    return {
+        "current_version": CURRENT_ANALYSIS_VERSION,
+        "total_cached": total,
+        "current": current,
+        "stale": stale,
+        "percent_current": round(100.0 * current / total, 1) if total else 100.0,
+        "by_version": {str(v): c for v, c in sorted(by_version.items())},
+        "failed_count": len(failed_ids(redis_client)) if redis_client else 0,
+        "paused": is_paused(redis_client),
+        "running": bool(redis_client and redis_client.get(LOCK_KEY)),
+        "redis_available": bool(redis_client),
+        "checkpoint": checkpoint,
+    }
@@ -35,8 +35,9 @@ See docs/garmin-portal/HEALTH_API.md for official schema definitions
 from __future__ import annotations
 
 import logging
+from bisect import bisect_left
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from services.pace_normalization import calculate_ngp_from_split
 
@@ -414,8 +415,97 @@ def adapt_activity_detail_envelope(raw: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+class DetailSamples:
+    """
+    Columnar view of a ClientActivityDetail samples list, read in one pass.
+
+    Each Garmin sample field becomes one raw value list aligned to sample
+    index (None where absent). Timestamped samples are also ordered by
+    startTimeInSeconds, so a time window [start, end) is two binary
+    searches rather than a rescan of every sample — per-lap and per-mile
+    slicing used to be O(windows × samples), which on a multi-hour ultra
+    with hundreds of laps cost seconds of worker CPU.
+
+    window() returns sample indices in original sample order, so per-lap
+    first/last values and float sums match a filtered scan exactly.
+
+    Build it once per payload and pass it to adapt_activity_detail_samples()
+    and adapt_activity_detail_laps(); both also accept the raw list.
+    """
+
+    __slots__ = (
+        "ts", "heart_rate", "power", "lat", "lng", "elevation", "speed",
+        "cadence", "distance", "_order", "_keys", "_in_order", "_rounded",
+    )
+
+    def __init__(self, samples: list):
+        ts: list = []
+        heart_rate: list = []
+        power: list = []
+        lat: list = []
+        lng: list = []
+        elevation: list = []
+        speed: list = []
+        cadence: list = []
+        distance: list = []
+        for sample in samples:
+            get = sample.get
+            ts.append(get("startTimeInSeconds"))
+            heart_rate.append(get("heartRate"))
+            power.append(get("powerInWatts"))
+            lat.append(get("latitudeInDegree"))
+            lng.append(get("longitudeInDegree"))
+            elevation.append(get("elevationInMeters"))
+            speed.append(get("speedMetersPerSecond"))
+            cadence.append(get("stepsPerMinute"))
+            distance.append(get("totalDistanceInMeters"))
+        self.ts = ts
+        self.heart_rate = heart_rate
+        self.power = power
+        self.lat = lat
+        self.lng = lng
+        self.elevation = elevation
+        self.speed = speed
+        self.cadence = cadence
+        self.distance = distance
+
+        timed = [i for i, t in enumerate(ts) if t is not None]
+        self._order = sorted(timed, key=ts.__getitem__)  # stable
+        self._keys = [ts[i] for i in self._order]
+        self._in_order = self._order == timed
+        self._rounded: Optional[tuple] = None
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @staticmethod
+    def _slice(order: list, keys: list, in_order: bool, start: Any, end: Any) -> List[int]:
+        lo = bisect_left(keys, start)
+        hi = len(keys) if end is None else bisect_left(keys, end)
+        idx = order[lo:hi]
+        return idx if in_order else sorted(idx)
+
+    def window(self, start: Any, end: Any = None) -> List[int]:
+        """Indices of samples with start <= startTimeInSeconds < end (end None = open)."""
+        return self._slice(self._order, self._keys, self._in_order, start, end)
+
+    def window_whole_seconds(self, start: float, end: float) -> List[int]:
+        """Like window(), keyed on the timestamp rounded to whole seconds."""
+        if self._rounded is None:
+            rounded = [(_int_or_none(t), i) for i, t in enumerate(self.ts)]
+            timed = [i for r, i in rounded if r is not None]
+            order = sorted(timed, key=lambda i: rounded[i][0])
+            self._rounded = (order, [float(rounded[i][0]) for i in order], order == timed)
+        order, keys, in_order = self._rounded
+        return self._slice(order, keys, in_order, start, end)
+
+
+def _as_detail_samples(samples: Union[list, DetailSamples]) -> DetailSamples:
+    return samples if isinstance(samples, DetailSamples) else DetailSamples(samples or [])
+
+
 def adapt_activity_detail_samples(
-    samples: list,
+    samples: Union[list, DetailSamples],
     activity_start_unix: float = 0.0,
 ) -> Dict[str, Any]:
     """
@@ -441,7 +531,8 @@ def adapt_activity_detail_samples(
       - Running dynamics are FIT-file-only (see docs/garmin-portal/HEALTH_API.md §M2)
 
     Args:
-        samples: List of raw Garmin sample dicts from ClientActivityDetail.
+        samples: List of raw Garmin sample dicts from ClientActivityDetail,
+                 or a DetailSamples built from it.
         activity_start_unix: Unix timestamp (seconds) of the parent activity.
                              Used to compute relative time offsets.
 
@@ -453,34 +544,25 @@ def adapt_activity_detail_samples(
     """
     if not samples:
         return {}
-
-    time_vals: list = []
-    heartrate_vals: list = []
-    watts_vals: list = []
-    latlng_vals: list = []
-    altitude_vals: list = []
-    velocity_vals: list = []
-    cadence_vals: list = []
+    detail = _as_detail_samples(samples)
 
     activity_start_unix_int = int(activity_start_unix)
 
-    for sample in samples:
-        # Time — relative seconds from activity start
-        sample_ts = sample.get("startTimeInSeconds")
-        time_vals.append(
-            int(sample_ts) - activity_start_unix_int if sample_ts is not None else None
-        )
-
-        heartrate_vals.append(_int_or_none(sample.get("heartRate")))
-        watts_vals.append(_float_or_none(sample.get("powerInWatts")))
-
-        lat = _float_or_none(sample.get("latitudeInDegree"))
-        lng = _float_or_none(sample.get("longitudeInDegree"))
+    # Time — relative seconds from activity start
+    time_vals = [
+        int(t) - activity_start_unix_int if t is not None else None
+        for t in detail.ts
+    ]
+    heartrate_vals = [_int_or_none(v) for v in detail.heart_rate]
+    watts_vals = [_float_or_none(v) for v in detail.power]
+    latlng_vals = []
+    for raw_lat, raw_lng in zip(detail.lat, detail.lng):
+        lat = _float_or_none(raw_lat)
+        lng = _float_or_none(raw_lng)
         latlng_vals.append([lat, lng] if lat is not None and lng is not None else None)
-
-        altitude_vals.append(_float_or_none(sample.get("elevationInMeters")))
-        velocity_vals.append(_float_or_none(sample.get("speedMetersPerSecond")))
-        cadence_vals.append(_int_or_none(sample.get("stepsPerMinute")))
+    altitude_vals = [_float_or_none(v) for v in detail.elevation]
+    velocity_vals = [_float_or_none(v) for v in detail.speed]
+    cadence_vals = [_int_or_none(v) for v in detail.cadence]
 
     def _keep(vals: list) -> bool:
         return any(v is not None for v in vals)
@@ -504,6 +586,13 @@ def adapt_activity_detail_samples(
     return channels
 
 
+def _net_elevation_change(elevations: list) -> Optional[float]:
+    elevations = [e for e in elevations if e is not None]
+    if len(elevations) < 2:
+        return None
+    return round(elevations[-1] - elevations[0], 2)
+
+
 def _compute_elevation_gain(samples: list) -> Optional[float]:
     """
     Compute net elevation change from the first to last sample in a lap.
@@ -515,14 +604,7 @@ def _compute_elevation_gain(samples: list) -> Optional[float]:
 
     Positive → net uphill; negative → net downhill; None if < 2 samples.
     """
-    elevations = [
-        s["elevationInMeters"]
-        for s in samples
-        if s.get("elevationInMeters") is not None
-    ]
-    if len(elevations) < 2:
-        return None
-    return round(elevations[-1] - elevations[0], 2)
+    return _net_elevation_change([s.get("elevationInMeters") for s in samples])
 
 
 def _moving_time_from_samples(lap_samples: list, max_gap_s: int = 3) -> Optional[int]:
@@ -533,11 +615,14 @@ def _moving_time_from_samples(lap_samples: list, max_gap_s: int = 3) -> Optional
     """
     if len(lap_samples) < 2:
         return None
-    sorted_ts = sorted(
-        s["startTimeInSeconds"]
-        for s in lap_samples
-        if s.get("startTimeInSeconds") is not None
+    return _moving_time_from_timestamps(
+        [s["startTimeInSeconds"] for s in lap_samples if s.get("startTimeInSeconds") is not None],
+        max_gap_s,
     )
+
+
+def _moving_time_from_timestamps(timestamps: list, max_gap_s: int = 3) -> Optional[int]:
+    sorted_ts = sorted(timestamps)
     if len(sorted_ts) < 2:
         return None
     total = sum(
@@ -550,7 +635,7 @@ def _moving_time_from_samples(lap_samples: list, max_gap_s: int = 3) -> Optional
 
 def adapt_activity_detail_laps(
     raw_detail: Dict[str, Any],
-    samples: list,
+    samples: Union[list, DetailSamples],
 ) -> List[Dict[str, Any]]:
     """
     Extract per-lap split data from a raw Garmin ClientActivityDetail payload.
@@ -564,9 +649,11 @@ def adapt_activity_detail_laps(
 
     Args:
         raw_detail: Raw Garmin ClientActivityDetail dict (contains "laps" key).
-        samples:    List of raw Garmin sample dicts (same as envelope["samples"]).
-                    Used to compute per-lap HR/cadence when lap-level aggregates
-                    are absent from the payload.
+        samples:    List of raw Garmin sample dicts (same as envelope["samples"]),
+                    or a DetailSamples built from it. Used to compute per-lap
+                    HR/cadence when lap-level aggregates are absent from the
+                    payload. Lap windows are found by binary search over the
+                    sorted sample timestamps.
 
     Returns:
         List of dicts with internal ActivitySplit field names, one per lap,
@@ -605,6 +692,8 @@ def adapt_activity_detail_laps(
     if not laps_sorted:
         return []
 
+    detail = _as_detail_samples(samples)
+
     result: List[Dict[str, Any]] = []
     for i, lap in enumerate(laps_sorted):
         lap_start = lap["startTimeInSeconds"]
@@ -614,59 +703,51 @@ def adapt_activity_detail_laps(
             else None
         )
 
-        # Slice samples that fall within this lap's time window
-        lap_samples = [
-            s for s in samples
-            if s.get("startTimeInSeconds") is not None
-            and s["startTimeInSeconds"] >= lap_start
-            and (lap_end is None or s["startTimeInSeconds"] < lap_end)
-        ]
+        # Samples that fall within this lap's time window
+        lap_idx = detail.window(lap_start, lap_end)
 
         # --- Distance ---
         distance_m = _float_or_none(lap.get("totalDistanceInMeters"))
-        if distance_m is None and lap_samples:
-            dist_vals = [
-                s["totalDistanceInMeters"] for s in lap_samples
-                if s.get("totalDistanceInMeters") is not None
-            ]
+        if distance_m is None and lap_idx:
+            dist_vals = [detail.distance[k] for k in lap_idx if detail.distance[k] is not None]
             if len(dist_vals) >= 2:
                 distance_m = round(dist_vals[-1] - dist_vals[0], 2)
 
         # --- Duration ---
         elapsed_time = _int_or_none(lap.get("clockDurationInSeconds"))
         moving_time = _int_or_none(lap.get("timerDurationInSeconds"))
+        ts_vals = [detail.ts[k] for k in lap_idx]
         if elapsed_time is None and lap_end is not None:
             elapsed_time = lap_end - lap_start
-        elif elapsed_time is None and lap_samples:
-            ts_vals = [s["startTimeInSeconds"] for s in lap_samples if s.get("startTimeInSeconds") is not None]
+        elif elapsed_time is None and lap_idx:
             if len(ts_vals) >= 2:
                 elapsed_time = ts_vals[-1] - ts_vals[0]
         if moving_time is None:
             # Garmin does not always provide timerDurationInSeconds per lap.
             # Derive moving time from sample timestamps: sum only consecutive
             # intervals ≤ 3s (pauses create larger gaps and are excluded).
-            moving_time = _moving_time_from_samples(lap_samples) or elapsed_time
+            moving_time = _moving_time_from_timestamps(ts_vals) or elapsed_time
+
+        hr_vals = [detail.heart_rate[k] for k in lap_idx if detail.heart_rate[k] is not None]
 
         # --- Average heart rate ---
         avg_hr = _int_or_none(lap.get("averageHeartRateInBeatsPerMinute"))
         if avg_hr is None:
-            hr_vals = [s["heartRate"] for s in lap_samples if s.get("heartRate") is not None]
             avg_hr = round(sum(hr_vals) / len(hr_vals)) if hr_vals else None
 
         # --- Max heart rate ---
         max_hr = _int_or_none(lap.get("maxHeartRateInBeatsPerMinute"))
         if max_hr is None:
-            hr_all = [s["heartRate"] for s in lap_samples if s.get("heartRate") is not None]
-            max_hr = max(hr_all) if hr_all else None
+            max_hr = max(hr_vals) if hr_vals else None
 
         # --- Average cadence ---
         avg_cadence = _float_or_none(lap.get("averageRunCadenceInStepsPerMinute"))
         if avg_cadence is None:
-            cad_vals = [s["stepsPerMinute"] for s in lap_samples if s.get("stepsPerMinute") is not None]
+            cad_vals = [detail.cadence[k] for k in lap_idx if detail.cadence[k] is not None]
             avg_cadence = round(sum(cad_vals) / len(cad_vals), 1) if cad_vals else None
 
         # --- GAP (Grade Adjusted Pace) ---
-        elevation_gain_m = _compute_elevation_gain(lap_samples)
+        elevation_gain_m = _net_elevation_change([detail.elevation[k] for k in lap_idx])
         gap = None
         use_time = moving_time if moving_time else elapsed_time
         if distance_m and use_time and distance_m > 0 and use_time > 0:
@@ -690,7 +771,7 @@ def adapt_activity_detail_laps(
     return result
 
 
-def _derive_splits_from_samples(samples: list) -> List[Dict[str, Any]]:
+def _derive_splits_from_samples(samples: Union[list, DetailSamples]) -> List[Dict[str, Any]]:
     """
     Build synthetic splits from sample-level speed/time when lap metadata is absent.
 
@@ -704,38 +785,38 @@ def _derive_splits_from_samples(samples: list) -> List[Dict[str, Any]]:
     """
     if not samples:
         return []
+    detail = _as_detail_samples(samples)
 
     # Keep only samples with timestamp; sort ascending and de-duplicate timestamp.
-    by_ts: Dict[int, Dict[str, Any]] = {}
-    for s in samples:
-        ts = _int_or_none(s.get("startTimeInSeconds"))
+    by_ts: Dict[int, int] = {}
+    for k, raw_ts in enumerate(detail.ts):
+        ts = _int_or_none(raw_ts)
         if ts is not None:
-            by_ts[ts] = s
+            by_ts[ts] = k
     if len(by_ts) < 2:
         return []
 
-    ordered = [by_ts[k] for k in sorted(by_ts.keys())]
+    ordered_ts = sorted(by_ts.keys())
+    ordered = [by_ts[t] for t in ordered_ts]
     mile_m = 1609.344
     next_boundary_m = mile_m
     cumulative_m = 0.0
 
     split_number = 1
-    split_start_ts = float(_int_or_none(ordered[0].get("startTimeInSeconds")) or 0)
+    split_start_ts = float(ordered_ts[0] or 0)
     split_start_dist_m = 0.0
     result: List[Dict[str, Any]] = []
 
     for i in range(len(ordered) - 1):
         cur = ordered[i]
         nxt = ordered[i + 1]
-        cur_ts = _int_or_none(cur.get("startTimeInSeconds"))
-        nxt_ts = _int_or_none(nxt.get("startTimeInSeconds"))
-        if cur_ts is None or nxt_ts is None or nxt_ts <= cur_ts:
-            continue
+        cur_ts = ordered_ts[i]
+        nxt_ts = ordered_ts[i + 1]
 
         dt = float(nxt_ts - cur_ts)
-        speed = _float_or_none(cur.get("speedMetersPerSecond"))
+        speed = _float_or_none(detail.speed[cur])
         if speed is None or speed <= 0:
-            speed = _float_or_none(nxt.get("speedMetersPerSecond"))
+            speed = _float_or_none(detail.speed[nxt])
         if speed is None or speed <= 0:
             continue
 
@@ -751,8 +832,8 @@ def _derive_splits_from_samples(samples: list) -> List[Dict[str, Any]]:
 
             split_distance_m = next_boundary_m - split_start_dist_m
             elapsed_s = max(1, int(round(boundary_ts - split_start_ts)))
-            avg_hr, max_hr, avg_cad = _aggregate_split_window(samples, split_start_ts, boundary_ts)
-            elev_gain = _elevation_gain_for_window(samples, split_start_ts, boundary_ts)
+            avg_hr, max_hr, avg_cad = _aggregate_split_window(detail, split_start_ts, boundary_ts)
+            elev_gain = _elevation_gain_for_window(detail, split_start_ts, boundary_ts)
             gap = calculate_ngp_from_split(
                 distance_m=round(split_distance_m, 2),
                 moving_time_s=elapsed_s,
@@ -777,12 +858,12 @@ def _derive_splits_from_samples(samples: list) -> List[Dict[str, Any]]:
         cumulative_m = seg_end_m
 
     # Final partial split (e.g., last 0.4mi) — include if meaningful.
-    end_ts = float(_int_or_none(ordered[-1].get("startTimeInSeconds")) or split_start_ts)
+    end_ts = float(ordered_ts[-1] or split_start_ts)
     remainder_m = cumulative_m - split_start_dist_m
     if remainder_m >= 50.0 and end_ts > split_start_ts:
         elapsed_s = max(1, int(round(end_ts - split_start_ts)))
-        avg_hr, max_hr, avg_cad = _aggregate_split_window(samples, split_start_ts, end_ts)
-        elev_gain = _elevation_gain_for_window(samples, split_start_ts, end_ts)
+        avg_hr, max_hr, avg_cad = _aggregate_split_window(detail, split_start_ts, end_ts)
+        elev_gain = _elevation_gain_for_window(detail, split_start_ts, end_ts)
         gap = calculate_ngp_from_split(
             distance_m=round(remainder_m, 2),
             moving_time_s=elapsed_s,
@@ -803,7 +884,7 @@ def _derive_splits_from_samples(samples: list) -> List[Dict[str, Any]]:
 
 
 def _elevation_gain_for_window(
-    samples: list,
+    detail: DetailSamples,
     start_ts: float,
     end_ts: float,
 ) -> Optional[float]:
@@ -816,21 +897,11 @@ def _elevation_gain_for_window(
 
     Positive → net uphill; negative → net downhill; None if < 2 samples.
     """
-    elevations = [
-        s["elevationInMeters"]
-        for s in samples
-        if s.get("elevationInMeters") is not None
-        and s.get("startTimeInSeconds") is not None
-        and float(s["startTimeInSeconds"]) >= start_ts
-        and float(s["startTimeInSeconds"]) < end_ts
-    ]
-    if len(elevations) < 2:
-        return None
-    return round(elevations[-1] - elevations[0], 2)
+    return _net_elevation_change([detail.elevation[k] for k in detail.window(start_ts, end_ts)])
 
 
 def _aggregate_split_window(
-    samples: list,
+    detail: DetailSamples,
     start_ts: float,
     end_ts: float,
 ) -> tuple:
@@ -839,15 +910,9 @@ def _aggregate_split_window(
     """
     hr_vals: list = []
     cad_vals: list = []
-    for s in samples:
-        ts = _int_or_none(s.get("startTimeInSeconds"))
-        if ts is None:
-            continue
-        ts_f = float(ts)
-        if ts_f < start_ts or ts_f >= end_ts:
-            continue
-        hr = _int_or_none(s.get("heartRate"))
-        cad = _float_or_none(s.get("stepsPerMinute"))
+    for k in detail.window_whole_seconds(start_ts, end_ts):
+        hr = _int_or_none(detail.heart_rate[k])
+        cad = _float_or_none(detail.cadence[k])
         if hr is not None:
             hr_vals.append(hr)
         if cad is not None:
@@ -387,6 +387,23 @@ def repair_garmin_activity_from_strava(
             exc,
         )
 
+    # --- 9b. Stream-derived best efforts ----------------------------------
+    # The activity stays a Garmin activity, so its best efforts come from
+    # the repaired stream rather than Strava's best_efforts list.
+    try:
+        from services.best_effort_service import extract_best_efforts_from_stream
+
+        with db.begin_nested():
+            extract_best_efforts_from_stream(
+                activity, athlete, db, stream_data=stream_data,
+            )
+    except Exception as exc:
+        logger.warning(
+            "strava_fallback_best_efforts_failed activity_id=%s error=%s",
+            activity_id,
+            exc,
+        )
+
     # --- 10. Mark stream + fallback both successful -----------------------
     activity.stream_fetch_status = "success"
     if not activity.stream_fetch_error or activity.stream_fetch_error == GARMIN_STREAM_TIMEOUT_MARKER:
@@ -415,6 +432,19 @@ def repair_garmin_activity_from_strava(
     except Exception:
         pass
 
+    # --- PERSONAL BESTS from the stream-derived best efforts ---
+    try:
+        from services.best_effort_service import regenerate_personal_bests
+
+        regenerate_personal_bests(athlete, db)
+    except Exception as exc:  # pragma: no cover — defensive
+        logger.warning(
+            "strava_fallback_pb_regeneration_failed activity_id=%s err=%s",
+            activity_id,
+            exc,
+        )
+        db.rollback()
+
     # --- ROUTE FINGERPRINT (Phase 2 of comparison family) ---
     try:
         from services.routes.route_fingerprint import compute_for_activity
@@ -428,6 +458,19 @@ def repair_garmin_activity_from_strava(
         )
         db.rollback()
 
+    # --- PACE CURVE (mean-max envelope, services/pace_curve) ---
+    try:
+        from services.pace_curve import update_for_activity
+
+        update_for_activity(db, activity_id)
+    except Exception as exc:  # pragma: no cover — defensive
+        logger.warning(
+            "strava_fallback_pace_curve_failed activity_id=%s err=%s",
+            activity_id,
+            exc,
+        )
+        db.rollback()
+
     logger.info(
         "strava_fallback_succeeded activity_id=%s strava_id=%s points=%s splits=%s",
         activity_id,
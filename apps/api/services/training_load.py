@@ -279,9 +279,15 @@ class TrainingLoadCalculator:
     # Constants for exponential decay
     ATL_DECAY_DAYS = 7  # Acute (fatigue) - short term
     CTL_DECAY_DAYS = 42  # Chronic (fitness) - long term
+
+    # Sports that contribute to training load
+    LOAD_SPORTS = ["run", "cycling", "walking", "hiking", "strength", "flexibility"]
     
     def __init__(self, db: Session):
         self.db = db
+        # Per-athlete memo: thresholds are read once per calculator, not per workout
+        self._effort_thresholds: Dict[str, dict] = {}
+        self._tss_versions: Dict[str, Dict[str, str]] = {}
     
     # =========================================================================
     # TSS CALCULATION
@@ -324,8 +330,7 @@ class TrainingLoadCalculator:
             return self._calculate_cross_training_tss(activity, athlete, duration_minutes, sport)
 
         # Running path: try hrTSS first (most accurate)
-        from services.effort_classification import get_effort_thresholds
-        et = get_effort_thresholds(str(athlete.id), self.db)
+        et = self.effort_thresholds(athlete)
         peak = et.get("observed_peak_hr")
         resting = et.get("resting_hr")
         can_hr_tss = activity.avg_hr and peak and resting and et.get("tier") == "hrr"
@@ -342,6 +347,33 @@ class TrainingLoadCalculator:
         # Fall back to estimated TSS
         return self._estimate_tss(activity, athlete, duration_minutes)
 
+    def effort_thresholds(self, athlete: Athlete) -> dict:
+        """get_effort_thresholds for this athlete, memoized on the calculator."""
+        key = str(athlete.id)
+        if key not in self._effort_thresholds:
+            from services.effort_classification import get_effort_thresholds
+            self._effort_thresholds[key] = get_effort_thresholds(key, self.db)
+        return self._effort_thresholds[key]
+
+    def workout_tss(self, activity: Activity, athlete: Athlete) -> float:
+        """
+        TSS for one workout: the value persisted on the activity when its
+        inputs version is current (services/activity_tss), otherwise
+        calculate_workout_tss. Same value either way.
+        """
+        stored = getattr(activity, "tss", None)
+        version = getattr(activity, "tss_inputs_version", None)
+        if stored is not None and version is not None:
+            from services.activity_tss import current_versions, tss_group
+
+            key = str(athlete.id)
+            if key not in self._tss_versions:
+                self._tss_versions[key] = current_versions(self, athlete) or {}
+            versions = self._tss_versions[key]
+            if version in versions.values() and version == versions.get(tss_group(activity)):
+                return stored
+        return self.calculate_workout_tss(activity, athlete).tss
+
     def _calculate_cross_training_tss(
         self,
         activity: Activity,
@@ -485,28 +517,7 @@ class TrainingLoadCalculator:
         Estimate TSS when we lack HR or pace data.
         Uses duration and rough intensity heuristics.
         """
-        # Default intensity assumptions
-        # Easy run: IF ~0.7, Moderate: IF ~0.85, Hard: IF ~0.95
-        
-        # Use workout name or default to moderate
-        workout_type = getattr(activity, 'workout_type', '') or ""
-        name = getattr(activity, 'name', '') or ""
-        workout_type = workout_type.lower()
-        name = name.lower()
-        
-        if any(word in name for word in ["race", "competition", "pr", "pb"]):
-            intensity_factor = 1.0
-        elif any(word in name for word in ["tempo", "threshold", "hard"]):
-            intensity_factor = 0.9
-        elif any(word in name for word in ["interval", "speed", "track"]):
-            intensity_factor = 0.95
-        elif any(word in name for word in ["easy", "recovery", "jog"]):
-            intensity_factor = 0.65
-        elif any(word in name for word in ["long run", "long"]):
-            intensity_factor = 0.75
-        else:
-            # Default moderate
-            intensity_factor = 0.78
+        intensity_factor = self._estimated_intensity(activity)
         
         # TSS estimate
         tss = (duration_minutes * intensity_factor ** 2) / 60 * 100
@@ -520,117 +531,175 @@ class TrainingLoadCalculator:
             calculation_method="estimated"
         )
     
+    @staticmethod
+    def _estimated_intensity(activity: Activity) -> float:
+        """Intensity factor guessed from the workout name."""
+        # Default intensity assumptions
+        # Easy run: IF ~0.7, Moderate: IF ~0.85, Hard: IF ~0.95
+        
+        # Use workout name or default to moderate
+        name = getattr(activity, 'name', '') or ""
+        name = name.lower()
+        
+        if any(word in name for word in ["race", "competition", "pr", "pb"]):
+            return 1.0
+        elif any(word in name for word in ["tempo", "threshold", "hard"]):
+            return 0.9
+        elif any(word in name for word in ["interval", "speed", "track"]):
+            return 0.95
+        elif any(word in name for word in ["easy", "recovery", "jog"]):
+            return 0.65
+        elif any(word in name for word in ["long run", "long"]):
+            return 0.75
+        # Default moderate
+        return 0.78
+
     # =========================================================================
     # ATL / CTL / TSB CALCULATION — SINGLE-PASS EMA
     # =========================================================================
 
+    def _load_activities(self, athlete_id: UUID, since: Optional[date] = None) -> List[Activity]:
+        """Load-bearing activities (non-duplicate, LOAD_SPORTS) by start_time."""
+        filters = [
+            Activity.athlete_id == athlete_id,
+            Activity.is_duplicate == False,  # noqa: E712
+            Activity.sport.in_(self.LOAD_SPORTS),
+        ]
+        if since is not None:
+            filters.append(Activity.start_time >= datetime.combine(since, datetime.min.time()))
+        return self.db.query(Activity).filter(*filters).order_by(Activity.start_time).all()
+
+    def _daily_stress(self, activities: List[Activity], athlete: Athlete):
+        """(TSS sum, workout count) per day, from stored TSS where current."""
+        daily_tss: Dict[date, float] = {}
+        daily_counts: Dict[date, int] = {}
+        for act in activities:
+            d = act.start_time.date()
+            daily_tss[d] = daily_tss.get(d, 0) + self.workout_tss(act, athlete)
+            daily_counts[d] = daily_counts.get(d, 0) + 1
+        return daily_tss, daily_counts
+
+    def _ema_series(
+        self,
+        start: date,
+        end: date,
+        daily_tss: Dict[date, float],
+        daily_counts: Dict[date, int],
+        atl: float = 0.0,
+        ctl: float = 0.0,
+    ) -> List[DailyLoad]:
+        """
+        ATL/CTL EMA over every day in [start, end], rest days included,
+        resumed from the given values (0 = first activity day). Unrounded.
+        """
+        atl_alpha = 2 / (self.ATL_DECAY_DAYS + 1)
+        ctl_alpha = 2 / (self.CTL_DECAY_DAYS + 1)
+
+        days: List[DailyLoad] = []
+        for i in range((end - start).days + 1):
+            current_date = start + timedelta(days=i)
+            day_tss = daily_tss.get(current_date, 0)
+
+            atl = atl * (1 - atl_alpha) + day_tss * atl_alpha
+            ctl = ctl * (1 - ctl_alpha) + day_tss * ctl_alpha
+
+            days.append(DailyLoad(
+                date=current_date,
+                total_tss=day_tss,
+                workout_count=daily_counts.get(current_date, 0),
+                atl=atl,
+                ctl=ctl,
+                tsb=ctl - atl,
+            ))
+        return days
+
     def compute_training_state_history(
         self,
         athlete_id: UUID,
         target_dates: Optional[List[date]] = None,
     ) -> Dict[date, LoadSummary]:
         """
-        Single-pass EMA from athlete's first activity to last.
+        ATL/CTL/TSB state at each requested target_date.
 
-        Walks all activities chronologically, computes daily TSS,
-        applies ATL/CTL EMA on every day (including rest days).
-        Returns LoadSummary at each requested target_date.
+        Served from the materialized daily series (services/daily_load):
+        only the days from 13 before the earliest target (the trend
+        window) to the latest are read, plus an in-memory tail for days
+        not yet materialized. Values match a single-pass EMA from the
+        athlete's first activity, on every day including rest days.
 
         If target_dates is None, returns values at every day
         (useful for charting full history).
 
         Excludes duplicate activities (is_duplicate == True).
         """
+        from services.daily_load import load_series
 
         athlete = self.db.query(Athlete).filter(Athlete.id == athlete_id).first()
         if not athlete:
             raise ValueError(f"Athlete {athlete_id} not found")
 
-        activities = self.db.query(Activity).filter(
-            Activity.athlete_id == athlete_id,
-            Activity.is_duplicate == False,  # noqa: E712
-            Activity.sport.in_(["run", "cycling", "walking", "hiking", "strength", "flexibility"]),
-        ).order_by(Activity.start_time).all()
-
-        if not activities:
-            if target_dates:
-                return {d: self._empty_load_summary() for d in target_dates}
-            return {}
-
-        first_date = activities[0].start_time.date()
-        last_date = activities[-1].start_time.date()
-
         target_set = set(target_dates) if target_dates else None
         end_date = date.today()
+        start_date = None
         if target_set:
             end_date = max(end_date, max(target_set))
-        end_date = max(end_date, last_date)
+            start_date = min(target_set) - timedelta(days=13)
 
-        daily_tss: Dict[date, float] = {}
-        daily_counts: Dict[date, int] = {}
-        for act in activities:
-            stress = self.calculate_workout_tss(act, athlete)
-            d = stress.date
-            daily_tss[d] = daily_tss.get(d, 0) + stress.tss
-            daily_counts[d] = daily_counts.get(d, 0) + 1
+        first_date, days = load_series(self, athlete, start_date, end_date)
 
-        atl_alpha = 2 / (self.ATL_DECAY_DAYS + 1)
-        ctl_alpha = 2 / (self.CTL_DECAY_DAYS + 1)
+        if first_date is None:
+            if target_dates:
+                return {d: self._empty_load_summary() for d in target_dates}
+            return {}
 
-        current_atl = 0.0
-        current_ctl = 0.0
         results: Dict[date, LoadSummary] = {}
+        for i, day in enumerate(days):
+            current_date = day.date
+            if target_set is not None and current_date not in target_set:
+                continue
+
+            # Same slices as a history list from first_date: [-14:-7] and [-7:]
+            history_len = (current_date - first_date).days + 1
+            recent = days[max(0, i - 13):i + 1]
+            atl_history = [d.atl for d in recent]
+            ctl_history = [d.ctl for d in recent]
+            current_atl = day.atl
+            current_ctl = day.ctl
+            current_tsb = current_ctl - current_atl
 
-        atl_history: List[float] = []
-        ctl_history: List[float] = []
+            atl_trend = self._calculate_trend(
+                atl_history[-14:-7] if history_len >= 14 else [],
+                atl_history[-7:] if history_len >= 7 else [],
+            )
+            ctl_trend = self._calculate_trend(
+                ctl_history[-14:-7] if history_len >= 14 else [],
+                ctl_history[-7:] if history_len >= 7 else [],
+            )
 
-        total_days = (end_date - first_date).days + 1
-        for i in range(total_days):
-            current_date = first_date + timedelta(days=i)
-            day_tss = daily_tss.get(current_date, 0)
+            if atl_trend == "rising" and ctl_trend != "rising":
+                tsb_trend = "falling"
+            elif atl_trend == "falling" and ctl_trend != "falling":
+                tsb_trend = "rising"
+            else:
+                tsb_trend = "stable"
 
-            current_atl = current_atl * (1 - atl_alpha) + day_tss * atl_alpha
-            current_ctl = current_ctl * (1 - ctl_alpha) + day_tss * ctl_alpha
-
-            atl_history.append(current_atl)
-            ctl_history.append(current_ctl)
-
-            if target_set is None or current_date in target_set:
-                current_tsb = current_ctl - current_atl
-
-                atl_trend = self._calculate_trend(
-                    atl_history[-14:-7] if len(atl_history) >= 14 else [],
-                    atl_history[-7:] if len(atl_history) >= 7 else [],
-                )
-                ctl_trend = self._calculate_trend(
-                    ctl_history[-14:-7] if len(ctl_history) >= 14 else [],
-                    ctl_history[-7:] if len(ctl_history) >= 7 else [],
-                )
-
-                if atl_trend == "rising" and ctl_trend != "rising":
-                    tsb_trend = "falling"
-                elif atl_trend == "falling" and ctl_trend != "falling":
-                    tsb_trend = "rising"
-                else:
-                    tsb_trend = "stable"
-
-                training_phase = self._determine_training_phase(
-                    current_atl, current_ctl, current_tsb, atl_trend, ctl_trend
-                )
-                recommendation = self._generate_recommendation(
-                    current_atl, current_ctl, current_tsb, training_phase
-                )
-
-                results[current_date] = LoadSummary(
-                    current_atl=round(current_atl, 1),
-                    current_ctl=round(current_ctl, 1),
-                    current_tsb=round(current_tsb, 1),
-                    atl_trend=atl_trend,
-                    ctl_trend=ctl_trend,
-                    tsb_trend=tsb_trend,
-                    training_phase=training_phase,
-                    recommendation=recommendation,
-                )
+            training_phase = self._determine_training_phase(
+                current_atl, current_ctl, current_tsb, atl_trend, ctl_trend
+            )
+            recommendation = self._generate_recommendation(
+                current_atl, current_ctl, current_tsb, training_phase
+            )
+
+            results[current_date] = LoadSummary(
+                current_atl=round(current_atl, 1),
+                current_ctl=round(current_ctl, 1),
+                current_tsb=round(current_tsb, 1),
+                atl_trend=atl_trend,
+                ctl_trend=ctl_trend,
+                tsb_trend=tsb_trend,
+                training_phase=training_phase,
+                recommendation=recommendation,
+            )
 
         return results
 
@@ -674,8 +743,10 @@ class TrainingLoadCalculator:
     ) -> List[DailyLoad]:
         """
         Get daily training load history for charting.
-        Delegates to compute_training_state_history (full-history EMA).
+        Reads the window from the materialized daily series.
         """
+        from services.daily_load import load_series
+
         athlete = self.db.query(Athlete).filter(Athlete.id == athlete_id).first()
         if not athlete:
             return []
@@ -684,35 +755,20 @@ class TrainingLoadCalculator:
         start_date = end_date - timedelta(days=days)
 
         target_dates = [start_date + timedelta(days=i) for i in range(days)]
-        state = self.compute_training_state_history(athlete_id, target_dates=target_dates)
-
-        activities = self.db.query(Activity).filter(
-            Activity.athlete_id == athlete_id,
-            Activity.is_duplicate == False,  # noqa: E712
-            Activity.sport.in_(["run", "cycling", "walking", "hiking", "strength", "flexibility"]),
-            Activity.start_time >= datetime.combine(start_date, datetime.min.time()),
-            Activity.start_time < datetime.combine(end_date + timedelta(days=1), datetime.min.time()),
-        ).order_by(Activity.start_time).all()
-
-        daily_counts: Dict[date, int] = {}
-        daily_tss_sums: Dict[date, float] = {}
-        for act in activities:
-            stress = self.calculate_workout_tss(act, athlete)
-            d = stress.date
-            daily_counts[d] = daily_counts.get(d, 0) + 1
-            daily_tss_sums[d] = daily_tss_sums.get(d, 0) + stress.tss
+        _, series = load_series(self, athlete, start_date, end_date)
+        by_date = {d.date: d for d in series}
 
         history: List[DailyLoad] = []
         for d in target_dates:
-            load = state.get(d)
+            load = by_date.get(d)
             if load:
                 history.append(DailyLoad(
                     date=d,
-                    total_tss=round(daily_tss_sums.get(d, 0), 1),
-                    workout_count=daily_counts.get(d, 0),
-                    atl=load.current_atl,
-                    ctl=load.current_ctl,
-                    tsb=load.current_tsb,
+                    total_tss=round(load.total_tss, 1),
+                    workout_count=load.workout_count,
+                    atl=round(load.atl, 1),
+                    ctl=round(load.ctl, 1),
+                    tsb=round(load.tsb, 1),
                 ))
             else:
                 history.append(DailyLoad(
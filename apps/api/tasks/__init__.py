@@ -30,9 +30,15 @@ celery_app.conf.update(
     task_default_queue="default",
     task_routes={
         "tasks.home_briefing_tasks.generate_home_briefing_task": {"queue": "briefing"},
+        "tasks.run_correlation_sweep_athlete": {"queue": "correlation"},
     },
 )
 
+# Session flush listeners: stored TSS invalidation and daily-load dirty days
+from services import activity_tss, daily_load  # noqa: E402
+activity_tss.register_listeners()
+daily_load.register_listeners()
+
 # Import tasks to register them with Celery
 from . import strava_tasks  # noqa: E402, F401
 from . import digest_tasks  # noqa: E402, F401
@@ -83,6 +89,11 @@ from . import experience_guardrail_task  # noqa: E402  # daily experience audit
 from . import fact_extraction_task  # noqa: E402  # coach memory layer 1
 from . import timezone_tasks  # noqa: E402  # GPS-based timezone inference + backfill
 from . import route_fingerprint_tasks  # noqa: E402  # Phase 2 — route fingerprint backfill
+from . import stream_columnar_tasks  # noqa: E402  # columnar stream blob backfill
+from . import stream_reanalysis_tasks  # noqa: E402  # analysis version bump backfill
+from . import pace_curve_tasks  # noqa: E402  # mean-max pace curve backfill
+from . import daily_load_tasks  # noqa: E402  # materialized daily training load
+from . import model_recalibration_tasks  # noqa: E402  # nightly Banister recalibration
 from . import block_detection_tasks  # noqa: E402  # Phase 4 — training block detection
 from . import workout_classification_tasks  # noqa: E402  # backfill / safety-net for Garmin path
 from . import plan_lifecycle_tasks  # noqa: E402
@@ -59,6 +59,11 @@ DAILY_TASKS = [
         "redis_key": "beat:last_run:daily_correlation_sweep",
         "description": "Daily correlation sweep",
     },
+    {
+        "name": "tasks.recalibrate_models_nightly",
+        "redis_key": "beat:last_run:model_recalibration",
+        "description": "Banister model recalibration",
+    },
 ]
 
 REDIS_TTL_SECONDS = 25 * 60 * 60  # 25 hours
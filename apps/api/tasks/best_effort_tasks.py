@@ -2,9 +2,10 @@
 Celery tasks for best effort backfilling.
 
 These tasks run in the background to populate the BestEffort table
-from existing Strava activities.
+from existing Strava activities (Strava API) and from the stored streams
+of non-Strava runs.
 """
-from typing import Dict
+from typing import Dict, Optional
 from celery import Task
 from sqlalchemy.orm import Session
 from core.database import get_db_sync
@@ -120,3 +121,108 @@ def regenerate_personal_bests_task(self: Task, athlete_id: str) -> Dict:
         return {"status": "error", "error": str(e)}
     finally:
         db.close()
+
+
+@celery_app.task(name="tasks.backfill_stream_best_efforts", bind=True)
+def backfill_stream_best_efforts_task(
+    self: Task,
+    athlete_id: Optional[str] = None,
+    batch_size: int = 200,
+    max_batches: int = 0,
+) -> Dict:
+    """
+    Background task to derive best efforts from stored streams.
+
+    Covers non-Strava runs (Garmin, file imports, Strava-fallback repairs)
+    that have a stream but no best efforts extracted yet. Idempotent:
+    each processed activity gets best_efforts_extracted_at, so re-runs
+    resume where the last one stopped. PersonalBest is regenerated once
+    per touched athlete at the end.
+
+    Args:
+        athlete_id: UUID string to limit to one athlete (None = everyone)
+        batch_size: Activities processed per commit
+        max_batches: Stop after this many batches (0 = run until done)
+
+    Returns:
+        Dictionary with backfill results
+    """
+    from models import Activity, ActivityStream
+    from services.best_effort_service import (
+        extract_best_efforts_from_stream,
+        regenerate_personal_bests,
+    )
+
+    db: Session = get_db_sync()
+
+    processed = 0
+    efforts_stored = 0
+    errors = 0
+    failed_ids = set()
+    touched_athletes = set()
+    batches = 0
+    try:
+        while not max_batches or batches < max_batches:
+            q = (
+                db.query(Activity, ActivityStream)
+                .join(ActivityStream, ActivityStream.activity_id == Activity.id)
+                .filter(
+                    Activity.provider != "strava",
+                    Activity.sport == "run",
+                    Activity.best_efforts_extracted_at.is_(None),
+                )
+            )
+            if athlete_id:
+                q = q.filter(Activity.athlete_id == athlete_id)
+            if failed_ids:
+                q = q.filter(Activity.id.notin_(failed_ids))
+            rows = q.order_by(Activity.athlete_id, Activity.start_time).limit(batch_size).all()
+            if not rows:
+                break
+
+            athletes = {}
+            for activity, stream_row in rows:
+                try:
+                    athlete = athletes.get(activity.athlete_id)
+                    if athlete is None:
+                        athlete = athletes[activity.athlete_id] = db.get(Athlete, activity.athlete_id)
+                    stream_data = (
+                        stream_row.get_channels(["time", "distance"])
+                        if stream_row.has_data else {}
+                    )
+                    with db.begin_nested():
+                        efforts_stored += extract_best_efforts_from_stream(
+                            activity, athlete, db, stream_data=stream_data,
+                        )
+                    touched_athletes.add(activity.athlete_id)
+                    processed += 1
+                except Exception:
+                    errors += 1
+                    failed_ids.add(activity.id)
+                    traceback.print_exc()
+            db.commit()
+            db.expunge_all()
+            batches += 1
+
+        pbs_created = 0
+        for touched_id in touched_athletes:
+            athlete = db.get(Athlete, touched_id)
+            if athlete is not None:
+                pbs_created += regenerate_personal_bests(athlete, db).get("created", 0)
+
+        return {
+            "status": "success",
+            "athlete_id": athlete_id,
+            "activities_processed": processed,
+            "efforts_stored": efforts_stored,
+            "athletes_updated": len(touched_athletes),
+            "pbs_created": pbs_created,
+            "errors": errors,
+        }
+
+    except Exception as e:
+        db.rollback()
+        traceback.print_exc()
+        return {"status": "error", "error": str(e)}
+    finally:
+        db.close()
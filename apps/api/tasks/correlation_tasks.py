@@ -1,20 +1,32 @@
 """
 Daily Correlation Sweep
 
-Runs analyze_correlations() for every output metric for athletes with
-recent activity.  Populates CorrelationFinding rows that the Progress
-page reads.  Respects existing confounder + direction quality gates.
+Runs analyze_correlations_for_metrics() over every output metric for
+athletes with recent activity — inputs are aggregated once per athlete.
+Populates CorrelationFinding rows that the Progress page reads.  Respects
+existing confounder + direction quality gates.
 
 After the first pass (correlation discovery + persistence), a second
 pass runs Layers 1–4 on all confirmed findings (times_confirmed >= 3).
 
+The dispatcher fans out one subtask per athlete on the ``correlation``
+queue and a chord callback writes the run summary (durations, failed
+and skipped athletes) to Redis under correlation_sweep:{date}:summary.
+If a subtask dies outright (hard time limit, lost worker) the chord
+errback rebuilds the summary from the per-athlete sweep markers.
+
 Schedule: daily at 08:00 UTC (after morning intelligence).
 """
 
 import logging
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Tuple
 
+import numpy as np
+from celery import chord
+from celery.exceptions import SoftTimeLimitExceeded
+
 from tasks import celery_app
 from core.cache import get_redis_client
 from core.database import SessionLocal
@@ -23,6 +35,12 @@ from models import Athlete, Activity, CorrelationFinding
 logger = logging.getLogger(__name__)
 _BACKFILL_PROGRESS_TTL_S = 24 * 60 * 60
 
+# Per-athlete sweep markers: a claim outlives the subtask's hard time
+# limit; "done" outlives a same-date retry window.
+_SWEEP_CLAIM_TTL_S = 15 * 60
+_SWEEP_DONE_TTL_S = 48 * 60 * 60
+_SWEEP_SUMMARY_TTL_S = 7 * 24 * 60 * 60
+
 ALL_OUTPUT_METRICS = [
     "efficiency",
     "pace_easy",
@@ -153,6 +171,8 @@ def _run_layer_pass(athlete_id: str, db) -> int:
         try:
             run_layer_analysis(finding, input_data, output_data, all_inputs, db)
             processed += 1
+        except SoftTimeLimitExceeded:
+            raise
         except Exception as exc:
             logger.warning(
                 "Layer analysis failed for finding %s (%s→%s): %s",
@@ -162,20 +182,162 @@ def _run_layer_pass(athlete_id: str, db) -> int:
     return processed
 
 
+def _sweep_athlete(athlete_id: str, db, committed: List[str] | None = None) -> List[str]:
+    """
+    One athlete's nightly sweep: discovery, lifecycle, transitions, layers.
+
+    Each stage commits on its own and failures are contained per stage;
+    SoftTimeLimitExceeded is not contained and aborts the sweep.  Stages
+    that committed are appended to ``committed`` as they finish.
+    Returns the names of the stages that failed.
+    """
+    errors: List[str] = []
+    committed = [] if committed is None else committed
+
+    # First pass: discover and persist correlations — inputs are
+    # aggregated once and shared by every output metric.
+    try:
+        from services.correlation_engine import analyze_correlations_for_metrics
+
+        analyze_correlations_for_metrics(
+            athlete_id, ALL_OUTPUT_METRICS, days=90, db=db,
+        )
+        db.commit()
+        committed.append("discovery")
+    except SoftTimeLimitExceeded:
+        raise
+    except Exception as exc:
+        logger.warning("Correlation sweep failed for %s: %s", athlete_id, exc)
+        db.rollback()
+        errors.append("discovery")
+
+    # Lifecycle classification pass (Phase 3)
+    try:
+        from services.plan_framework.limiter_classifier import classify_lifecycle_states
+        lc_results = classify_lifecycle_states(athlete_id, db)
+        if lc_results:
+            db.commit()
+            logger.info("Lifecycle classification: %d findings classified for %s", len(lc_results), athlete_id)
+    except SoftTimeLimitExceeded:
+        raise
+    except Exception as exc:
+        logger.warning("Lifecycle classification failed for %s: %s", athlete_id, exc)
+        db.rollback()
+        errors.append("lifecycle")
+
+    # Phase 5: Transition detection (active→resolving→closed)
+    try:
+        from services.plan_framework.limiter_classifier import check_transitions
+        tr = check_transitions(athlete_id, db)
+        any_transitions = sum(len(v) for v in tr.values())
+        if any_transitions > 0:
+            db.commit()
+            logger.info(
+                "Transition check: %d transitions for %s "
+                "(a→r=%d, r→c=%d, r→a=%d, frontier=%d)",
+                any_transitions, athlete_id,
+                len(tr["active_to_resolving"]),
+                len(tr["resolving_to_closed"]),
+                len(tr["resolving_to_active"]),
+                len(tr["next_frontier"]),
+            )
+    except SoftTimeLimitExceeded:
+        raise
+    except Exception as exc:
+        logger.warning("Transition check failed for %s: %s", athlete_id, exc)
+        db.rollback()
+        errors.append("transitions")
+
+    # Second pass: Layers 1–4 on confirmed findings
+    try:
+        n = _run_layer_pass(athlete_id, db)
+        if n > 0:
+            db.commit()
+            logger.info("Layer analysis: %d confirmed findings processed for %s", n, athlete_id)
+    except SoftTimeLimitExceeded:
+        raise
+    except Exception as exc:
+        logger.warning("Layer analysis pass failed for %s: %s", athlete_id, exc)
+        db.rollback()
+        errors.append("layers")
+
+    return errors
+
+
+def _sweep_marker_key(run_date: str, athlete_id: str) -> str:
+    return f"correlation_sweep:{run_date}:{athlete_id}"
+
+
+def _claim_sweep(run_date: str, athlete_id: str) -> bool:
+    """
+    Claim the athlete for this run date. False when it already ran (or is
+    running) for the date — persisting findings twice would double-count
+    CorrelationFinding.times_confirmed. Without Redis every claim succeeds.
+    """
+    r = get_redis_client()
+    if not r:
+        return True
+    return bool(r.set(_sweep_marker_key(run_date, athlete_id), "running", nx=True, ex=_SWEEP_CLAIM_TTL_S))
+
+
+def _release_sweep(run_date: str, athlete_id: str, done: bool) -> None:
+    r = get_redis_client()
+    if not r:
+        return
+    key = _sweep_marker_key(run_date, athlete_id)
+    if done:
+        r.set(key, "done", ex=_SWEEP_DONE_TTL_S)
+    else:
+        r.delete(key)
+
+
+def _sweep_summary(results: List[Dict], run_date: str, dispatched_at: float) -> Dict:
+    """Run summary: counts, failed/skipped athletes and duration percentiles."""
+    ran = [r for r in results if r.get("status") != "skipped"]
+    durations = [r["duration_s"] for r in ran if r.get("duration_s") is not None]
+    percentiles = {}
+    if durations:
+        for label, q in (("p50", 50), ("p90", 90), ("p99", 99)):
+            percentiles[label] = round(float(np.percentile(durations, q)), 3)
+        percentiles["max"] = round(max(durations), 3)
+    return {
+        "run_date": run_date,
+        "athletes": len(results),
+        "ok": sum(1 for r in results if r.get("status") == "ok"),
+        "failed": [r.get("athlete_id") for r in results if r.get("status") == "failed"],
+        "skipped": [r.get("athlete_id") for r in results if r.get("status") == "skipped"],
+        "stage_errors": {r["athlete_id"]: r["errors"] for r in ran if r.get("errors")},
+        "duration_s": percentiles,
+        "wall_clock_s": round(max(0.0, time.time() - dispatched_at), 3),
+    }
+
+
 @celery_app.task(name="tasks.run_daily_correlation_sweep", bind=True, max_retries=0)
-def run_daily_correlation_sweep(self, athlete_ids: List[str] | None = None):
+def run_daily_correlation_sweep(
+    self, athlete_ids: List[str] | None = None, run_date: str | None = None,
+):
     """
-    Sweep all output metrics for athletes with activity in the last 24h.
+    Dispatch the nightly sweep for athletes with activity in the last 24h.
 
     If ``athlete_ids`` is provided, runs only for those athletes (used
     for manual backfills).  Otherwise discovers eligible athletes.
 
-    After the first pass, runs Layers 1–4 on confirmed findings.
+    Each athlete is a run_correlation_sweep_athlete subtask on the
+    ``correlation`` queue, whose worker concurrency bounds the load, so
+    one slow athlete no longer holds up the rest.  A chord gathers the
+    subtask results into summarize_correlation_sweep; its errback,
+    recover_correlation_sweep, summarizes from the sweep markers when a
+    subtask dies without returning.  ``run_date``
+    (UTC date, default today) keys per-athlete idempotency: re-running
+    the dispatcher for the same date skips athletes already swept.
     """
+    run_date = run_date or datetime.now(timezone.utc).date().isoformat()
+    dispatched_at = time.time()
+
     db = SessionLocal()
     try:
         if athlete_ids:
-            ids = athlete_ids
+            ids = list(athlete_ids)
         else:
             cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
             rows = (
@@ -185,71 +347,126 @@ def run_daily_correlation_sweep(self, athlete_ids: List[str] | None = None):
                 .all()
             )
             ids = [str(r[0]) for r in rows]
+    finally:
+        db.close()
 
-        logger.info("Correlation sweep: %d athletes, %d metrics", len(ids), len(ALL_OUTPUT_METRICS))
+    logger.info(
+        "Correlation sweep %s: dispatching %d athletes, %d metrics",
+        run_date, len(ids), len(ALL_OUTPUT_METRICS),
+    )
 
-        from services.correlation_engine import analyze_correlations
+    if not ids:
+        return summarize_correlation_sweep.run([], run_date, dispatched_at)
 
-        for athlete_id in ids:
-            # First pass: discover and persist correlations
-            for metric in ALL_OUTPUT_METRICS:
-                try:
-                    analyze_correlations(athlete_id, days=90, db=db, output_metric=metric)
-                except Exception as exc:
-                    logger.warning(
-                        "Correlation sweep failed for %s/%s: %s",
-                        athlete_id, metric, exc,
-                    )
-            db.commit()
+    callback = summarize_correlation_sweep.s(run_date, dispatched_at)
+    callback.link_error(recover_correlation_sweep.s(run_date, dispatched_at, ids))
+    chord(
+        run_correlation_sweep_athlete.s(athlete_id, run_date) for athlete_id in ids
+    )(callback)
+    return {"run_date": run_date, "dispatched": len(ids)}
 
-            # Lifecycle classification pass (Phase 3)
-            try:
-                from services.plan_framework.limiter_classifier import classify_lifecycle_states
-                lc_results = classify_lifecycle_states(athlete_id, db)
-                if lc_results:
-                    db.commit()
-                    logger.info("Lifecycle classification: %d findings classified for %s", len(lc_results), athlete_id)
-            except Exception as exc:
-                logger.warning("Lifecycle classification failed for %s: %s", athlete_id, exc)
-                db.rollback()
 
-            # Phase 5: Transition detection (active→resolving→closed)
-            try:
-                from services.plan_framework.limiter_classifier import check_transitions
-                tr = check_transitions(athlete_id, db)
-                any_transitions = sum(len(v) for v in tr.values())
-                if any_transitions > 0:
-                    db.commit()
-                    logger.info(
-                        "Transition check: %d transitions for %s "
-                        "(a→r=%d, r→c=%d, r→a=%d, frontier=%d)",
-                        any_transitions, athlete_id,
-                        len(tr["active_to_resolving"]),
-                        len(tr["resolving_to_closed"]),
-                        len(tr["resolving_to_active"]),
-                        len(tr["next_frontier"]),
-                    )
-            except Exception as exc:
-                logger.warning("Transition check failed for %s: %s", athlete_id, exc)
-                db.rollback()
-
-            # Second pass: Layers 1–4 on confirmed findings
-            try:
-                n = _run_layer_pass(athlete_id, db)
-                if n > 0:
-                    db.commit()
-                    logger.info("Layer analysis: %d confirmed findings processed for %s", n, athlete_id)
-            except Exception as exc:
-                logger.warning("Layer analysis pass failed for %s: %s", athlete_id, exc)
-                db.rollback()
-
-        logger.info("Correlation sweep complete for %d athletes", len(ids))
+@celery_app.task(
+    name="tasks.run_correlation_sweep_athlete",
+    bind=True,
+    max_retries=0,
+    soft_time_limit=10 * 60,
+    time_limit=12 * 60,
+)
+def run_correlation_sweep_athlete(self, athlete_id: str, run_date: str) -> Dict:
+    """
+    Sweep one athlete for ``run_date``; never raises, so the chord
+    callback always runs.  Returns status ok / failed / skipped and the
+    athlete's wall time.  Hitting the soft time limit fails the athlete
+    at once with error "timeout" instead of running the remaining stages
+    into the hard limit.
+    """
+    t0 = time.monotonic()
+    if not _claim_sweep(run_date, athlete_id):
+        logger.info("Correlation sweep %s: %s already swept; skipping", run_date, athlete_id)
+        return {"athlete_id": athlete_id, "status": "skipped", "duration_s": 0.0, "errors": []}
 
-        from tasks.beat_startup_dispatch import record_task_run
-        record_task_run("beat:last_run:daily_correlation_sweep")
+    committed: List[str] = []
+    db = SessionLocal()
+    try:
+        errors = _sweep_athlete(athlete_id, db, committed)
+        status = "failed" if "discovery" in errors else "ok"
+    except SoftTimeLimitExceeded:
+        logger.error("Correlation sweep for %s hit the soft time limit", athlete_id)
+        db.rollback()
+        errors, status = ["timeout"], "failed"
+    except Exception as exc:
+        logger.exception("Correlation sweep crashed for %s: %s", athlete_id, exc)
+        db.rollback()
+        errors, status = ["discovery"], "failed"
     finally:
         db.close()
 
+    # Discovery committed → mark done so a retry cannot persist twice;
+    # a failed discovery was rolled back and may run again.
+    try:
+        _release_sweep(run_date, athlete_id, done=status == "ok" or "discovery" in committed)
+    except Exception as exc:
+        logger.warning("Correlation sweep marker update failed for %s: %s", athlete_id, exc)
+
+    return {
+        "athlete_id": athlete_id,
+        "status": status,
+        "duration_s": round(time.monotonic() - t0, 3),
+        "errors": errors,
+    }
+
+
+@celery_app.task(name="tasks.summarize_correlation_sweep", bind=True, max_retries=0)
+def summarize_correlation_sweep(self, results: List[Dict], run_date: str, dispatched_at: float) -> Dict:
+    """Chord callback: log and store the run summary, record the beat run."""
+    summary = _sweep_summary(results or [], run_date, dispatched_at)
+    logger.info(
+        "Correlation sweep %s complete: %d athletes, ok=%d failed=%d skipped=%d "
+        "p50=%ss p90=%ss max=%ss wall=%ss",
+        run_date, summary["athletes"], summary["ok"], len(summary["failed"]),
+        len(summary["skipped"]), summary["duration_s"].get("p50"),
+        summary["duration_s"].get("p90"), summary["duration_s"].get("max"),
+        summary["wall_clock_s"],
+    )
+    if summary["failed"]:
+        logger.warning("Correlation sweep %s failed for: %s", run_date, ", ".join(summary["failed"]))
+
+    try:
+        from core.cache import set_cache
+        set_cache(f"correlation_sweep:{run_date}:summary", summary, ttl=_SWEEP_SUMMARY_TTL_S)
+    except Exception as exc:
+        logger.warning("Correlation sweep summary not stored: %s", exc)
+
+    from tasks.beat_startup_dispatch import record_task_run
+    record_task_run("beat:last_run:daily_correlation_sweep")
+    return summary
+
+
+@celery_app.task(name="tasks.recover_correlation_sweep", bind=True, max_retries=0)
+def recover_correlation_sweep(
+    self, failed_task_id: str, run_date: str, dispatched_at: float, athlete_ids: List[str],
+) -> Dict:
+    """
+    Chord errback: a subtask died without returning (hard time limit,
+    lost worker), so the chord callback never ran.  Rebuilds per-athlete
+    results from the sweep markers — "done" counts as ok, anything else
+    as failed with error "lost" — and summarizes them as usual.
+    Durations are unknown and left out of the percentiles.
+    """
+    logger.warning("Correlation sweep %s chord failed (%s); summarizing from markers", run_date, failed_task_id)
+    r = get_redis_client()
+    results = []
+    for athlete_id in athlete_ids:
+        marker = r.get(_sweep_marker_key(run_date, athlete_id)) if r else None
+        if isinstance(marker, bytes):
+            marker = marker.decode()
+        if marker == "done":
+            results.append({"athlete_id": athlete_id, "status": "ok", "duration_s": None, "errors": []})
+        else:
+            results.append({"athlete_id": athlete_id, "status": "failed", "duration_s": None, "errors": ["lost"]})
+    return summarize_correlation_sweep.run(results, run_date, dispatched_at)
+
 
 @celery_app.task(
     name="tasks.run_athlete_first_session_sweep",
@@ -0,0 +1,78 @@
+"""Materialized daily training load tasks.
+
+``tasks.refresh_daily_load`` — single-athlete refresh enqueued when a read
+is served from a stale series (dirty activity days, or days since the last
+refresh). Rewrites AthleteDailyLoad from the earliest dirty day forward.
+
+``tasks.backfill_daily_load`` — materializes the series for every athlete
+(or one). Run once after deploying migration daily_load_001; safe to
+re-run — athletes that are already current are a no-op tail refresh.
+
+See services/daily_load.py.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional
+from uuid import UUID
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="tasks.refresh_daily_load", bind=True, max_retries=0)
+def refresh_daily_load(self, athlete_id: str):
+    """Bring one athlete's AthleteDailyLoad rows up to date.
+
+    Returns:
+        refresh_athlete() summary dict.
+    """
+    from core.database import SessionLocal
+    from services.daily_load import refresh_athlete
+
+    db = SessionLocal()
+    try:
+        return refresh_athlete(db, UUID(str(athlete_id)))
+    except Exception as exc:
+        db.rollback()
+        logger.error("daily_load_refresh_error athlete_id=%s err=%s", athlete_id, exc)
+        return {"status": "error", "error": str(exc)}
+    finally:
+        db.close()
+
+
+@shared_task(name="tasks.backfill_daily_load", bind=True, max_retries=0)
+def backfill_daily_load(self, athlete_id: Optional[str] = None):
+    """Materialize the daily load series for all athletes (or one).
+
+    Returns:
+        ``{"status": "ok", "athletes": int, "errors": int}``
+    """
+    from core.database import SessionLocal
+    from models import Athlete
+    from services.daily_load import refresh_athlete
+
+    db = SessionLocal()
+    athletes = 0
+    errors = 0
+    try:
+        athlete_q = db.query(Athlete.id)
+        if athlete_id:
+            athlete_q = athlete_q.filter(Athlete.id == UUID(str(athlete_id)))
+        athlete_ids = [row[0] for row in athlete_q.all()]
+
+        for aid in athlete_ids:
+            try:
+                refresh_athlete(db, aid)
+                athletes += 1
+            except Exception as exc:  # pragma: no cover — logged
+                errors += 1
+                logger.warning("daily_load_backfill_failed athlete_id=%s err=%s", aid, exc)
+                db.rollback()
+
+        logger.info("daily_load_backfill_complete athletes=%d errors=%d", athletes, errors)
+        return {"status": "ok", "athletes": athletes, "errors": errors}
+    finally:
+        db.close()
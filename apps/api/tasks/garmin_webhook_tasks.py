@@ -34,6 +34,7 @@ from core.cache import get_redis_client
 from core.database import get_db_sync
 from models import Activity, ActivitySplit, ActivityStream, Athlete, CorrelationFinding, GarminDay
 from services.garmin_adapter import (
+    DetailSamples,
     adapt_activity_summary,
     adapt_activity_detail_envelope,
     adapt_activity_detail_laps,
@@ -716,7 +717,8 @@ def _ingest_activity_detail_item_full(
         )
         return activity, True
 
-    samples = envelope.get("samples") or []
+    # One pass over the samples; laps and channel arrays both slice it.
+    samples = DetailSamples(envelope.get("samples") or [])
 
     # Determine early whether laps exist — both samples and laps are optional,
     # but at least one must be present to do useful work.
@@ -781,6 +783,26 @@ def _ingest_activity_detail_item_full(
             )
             db.add(new_stream)
 
+        # Stream-derived best efforts (Garmin sends no best-effort list).
+        # Savepoint so a failure here never loses the stream upsert.
+        try:
+            from services.best_effort_service import extract_best_efforts_from_stream
+
+            with db.begin_nested():
+                stored = extract_best_efforts_from_stream(
+                    activity, activity.athlete, db, stream_data=stream_data,
+                )
+            if stored:
+                logger.info(
+                    "Stored %d stream best efforts for garmin_activity_id=%s",
+                    stored, garmin_activity_id_int,
+                )
+        except Exception:
+            logger.warning(
+                "Stream best-effort extraction failed for garmin_activity_id=%s — non-fatal",
+                garmin_activity_id_int, exc_info=True,
+            )
+
     activity.stream_fetch_status = "success"
 
     # Living Fingerprint: extract shape + generate sentence
@@ -1109,6 +1131,32 @@ def process_garmin_activity_detail_task(
                 if activity_row is not None:
                     processed_activity_ids.append(activity_row.id)
 
+        # --- PERSONAL BESTS from stream-derived best efforts ---
+        if processed_activity_ids:
+            from core.cache import invalidate_correlation_cache
+            invalidate_correlation_cache(str(athlete_id))
+            try:
+                from services.best_effort_service import regenerate_personal_bests
+
+                athlete = _find_athlete_in_db(athlete_id, db)
+                if athlete is not None:
+                    regenerate_personal_bests(athlete, db)
+            except Exception as exc:  # pragma: no cover — defensive
+                logger.warning("pb_regeneration_failed athlete=%s err=%s", athlete_id, exc)
+                db.rollback()
+
+        # --- PERFORMANCE MODEL (closed-form recalibration, services/model_cache) ---
+        if processed_activity_ids:
+            try:
+                from services.model_cache import on_activity_sync
+
+                athlete = _find_athlete_in_db(athlete_id, db)
+                if athlete is not None:
+                    on_activity_sync(athlete.id, db)
+            except Exception as exc:  # pragma: no cover — defensive
+                logger.warning("model_recalibration_failed athlete=%s err=%s", athlete_id, exc)
+                db.rollback()
+
         # --- ROUTE FINGERPRINT (Phase 2 of comparison family) ---
         for act_id in processed_activity_ids:
             try:
@@ -1118,6 +1166,15 @@ def process_garmin_activity_detail_task(
                 logger.warning("route_fingerprint_failed activity_id=%s err=%s", act_id, exc)
                 db.rollback()
 
+        # --- PACE CURVE (mean-max envelope, services/pace_curve) ---
+        for act_id in processed_activity_ids:
+            try:
+                from services.pace_curve import update_for_activity
+                update_for_activity(db, act_id)
+            except Exception as exc:  # pragma: no cover — defensive
+                logger.warning("pace_curve_failed activity_id=%s err=%s", act_id, exc)
+                db.rollback()
+
         logger.info(
             "process_garmin_activity_detail_task: athlete=%s processed=%d",
             athlete_id,
@@ -1330,6 +1387,8 @@ def process_garmin_health_task(
         # Health data can materially change home coaching context (sleep/HRV/stress).
         # Trigger a briefing refresh when new health records were processed.
         if processed > 0:
+            from core.cache import invalidate_correlation_cache
+            invalidate_correlation_cache(str(athlete_id))
             # Progress contract for first-session UX.
             try:
                 _progress_hincr(str(athlete_id), "health_records_ingested", processed)
@@ -665,6 +665,7 @@ def refresh_living_fingerprint(self: Task) -> Dict:
         from models import Athlete, Activity
         from services.race_input_analysis import mine_race_inputs
         from services.finding_persistence import store_all_findings
+        from services.stream_reanalysis import default_workers
 
         cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
         active_ids = (
@@ -679,7 +680,7 @@ def refresh_living_fingerprint(self: Task) -> Dict:
         results = []
         for aid in active_ids:
             try:
-                findings, gaps = mine_race_inputs(aid, db)
+                findings, gaps = mine_race_inputs(aid, db, workers=default_workers())
                 if findings:
                     store_all_findings(aid, findings, db)
                     db.commit()
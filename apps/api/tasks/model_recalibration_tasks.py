@@ -0,0 +1,56 @@
+"""Nightly Banister model recalibration.
+
+``tasks.recalibrate_models_nightly`` — finds every athlete whose
+calibration inputs changed since their cached model was fitted (one
+set-based query), refits them in a process pool and bulk-writes the
+models, so request paths read a warm model instead of calibrating.
+Athletes with unchanged training are skipped; safe to re-run.
+
+See services/model_recalibration.py.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="tasks.recalibrate_models_nightly", bind=True, max_retries=0)
+def recalibrate_models_nightly(
+    self,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+):
+    """Recalibrate the Banister model of every athlete with changed inputs.
+
+    Args:
+        workers: Process pool size (None = default_workers(), 0 = in-process).
+        batch_size: Athletes per batch (None = DEFAULT_BATCH_SIZE).
+
+    Returns:
+        run_recalibration() stats dict.
+    """
+    from core.database import SessionLocal
+    from services import model_recalibration as mr
+
+    db = SessionLocal()
+    try:
+        result = mr.run_recalibration(
+            db,
+            workers=workers,
+            batch_size=batch_size or mr.DEFAULT_BATCH_SIZE,
+        )
+
+        from tasks.beat_startup_dispatch import record_task_run
+        record_task_run("beat:last_run:model_recalibration")
+        return result
+    except Exception as exc:
+        db.rollback()
+        logger.error("model_recalibration_error err=%s", exc)
+        return {"status": "error", "error": str(exc)}
+    finally:
+        db.close()
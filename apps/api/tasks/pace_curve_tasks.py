@@ -0,0 +1,135 @@
+"""Mean-max pace curve backfill task.
+
+For every run with a stored ``ActivityStream`` but no current-version
+``ActivityPaceCurve``, compute the curve and merge it into the athlete's
+``AthletePaceCurve`` envelope (services/pace_curve). Safe to re-run —
+idempotent, and also picks up rows left behind by a PACE_CURVE_VERSION
+bump.
+
+Operates per-athlete, committing per batch. Triggered manually or by a
+one-off boot job after deploying migration pace_curve_001.
+
+``tasks.rebuild_pace_curve`` — stores a rebuilt envelope for one athlete;
+enqueued by get_pace_curve when a window has aged out or lost an activity.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional
+from uuid import UUID
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="tasks.backfill_pace_curves", bind=True, max_retries=0)
+def backfill_pace_curves(self, athlete_id: Optional[str] = None, batch_size: int = 200):
+    """Backfill mean-max pace curves for runs lacking a current one.
+
+    Args:
+        athlete_id: If provided, only backfill this athlete. Otherwise
+            walk all athletes.
+        batch_size: Activities per commit.
+
+    Returns:
+        ``{"status": "ok", "processed": int, "athletes": int, "errors": int}``
+    """
+    from sqlalchemy import and_
+
+    from core.database import SessionLocal
+    from models import Activity, ActivityPaceCurve, ActivityStream, Athlete
+    from services.pace_curve import PACE_CURVE_VERSION, rebuild_athlete_curve, update_for_activity
+
+    db = SessionLocal()
+    processed = 0
+    athletes = 0
+    errors = 0
+    try:
+        athlete_q = db.query(Athlete.id)
+        if athlete_id:
+            athlete_q = athlete_q.filter(Athlete.id == UUID(str(athlete_id)))
+        athlete_ids = [row[0] for row in athlete_q.all()]
+
+        for aid in athlete_ids:
+            failed = set()
+            touched = False
+            while True:
+                ids_q = (
+                    db.query(Activity.id)
+                    .join(ActivityStream, ActivityStream.activity_id == Activity.id)
+                    .outerjoin(
+                        ActivityPaceCurve,
+                        and_(
+                            ActivityPaceCurve.activity_id == Activity.id,
+                            ActivityPaceCurve.curve_version == PACE_CURVE_VERSION,
+                        ),
+                    )
+                    .filter(
+                        Activity.athlete_id == aid,
+                        Activity.sport == "run",
+                        Activity.is_duplicate.is_(False),
+                        ActivityPaceCurve.id.is_(None),
+                    )
+                )
+                if failed:
+                    ids_q = ids_q.filter(Activity.id.notin_(failed))
+                ids = [r[0] for r in ids_q.order_by(Activity.start_time.asc()).limit(batch_size).all()]
+                if not ids:
+                    break
+
+                for act_id in ids:
+                    try:
+                        if update_for_activity(db, act_id, commit=False) is None:
+                            # No usable time/distance stream; don't revisit this run
+                            failed.add(act_id)
+                        else:
+                            processed += 1
+                            touched = True
+                    except Exception as exc:  # pragma: no cover — logged
+                        errors += 1
+                        failed.add(act_id)
+                        logger.warning(
+                            "pace_curve_backfill_failed activity_id=%s err=%s",
+                            act_id,
+                            exc,
+                        )
+                        db.rollback()
+                db.commit()
+
+            if touched:
+                # One clean rebuild per athlete: windows reflect today's cutoffs
+                rebuild_athlete_curve(db, aid)
+                athletes += 1
+
+        logger.info(
+            "pace_curve_backfill_complete processed=%d athletes=%d errors=%d",
+            processed,
+            athletes,
+            errors,
+        )
+        return {"status": "ok", "processed": processed, "athletes": athletes, "errors": errors}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@shared_task(name="tasks.rebuild_pace_curve", bind=True, max_retries=0)
+def rebuild_pace_curve(self, athlete_id: str):
+    """Rebuild and store one athlete's AthletePaceCurve envelope."""
+    from core.database import SessionLocal
+    from services.pace_curve import rebuild_athlete_curve
+
+    db = SessionLocal()
+    try:
+        rebuild_athlete_curve(db, UUID(str(athlete_id)))
+        return {"status": "ok", "athlete_id": athlete_id}
+    except Exception as exc:
+        db.rollback()
+        logger.warning("pace_curve_rebuild_failed athlete_id=%s err=%s", athlete_id, exc)
+        return {"status": "error", "athlete_id": athlete_id, "error": str(exc)}
+    finally:
+        db.close()
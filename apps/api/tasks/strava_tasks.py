@@ -448,6 +448,14 @@ def _fetch_and_store_stream(activity_id: str, athlete, db: Session) -> str:
         logger.warning("route_fingerprint_failed activity_id=%s err=%s", activity_id, exc)
         db.rollback()
 
+    # --- PACE CURVE (mean-max envelope, services/pace_curve) ---
+    try:
+        from services.pace_curve import update_for_activity
+        update_for_activity(db, activity_id)
+    except Exception as exc:  # pragma: no cover — defensive
+        logger.warning("pace_curve_failed activity_id=%s err=%s", activity_id, exc)
+        db.rollback()
+
     logger.info(
         "stream_fetch_success activity_id=%s channels=%s points=%s",
         activity_id,
@@ -1270,6 +1278,10 @@ def sync_strava_activities_task(self: Task, athlete_id: str) -> Dict:
                 first_session_exc,
             )
 
+        if synced_new or updated_existing:
+            from core.cache import invalidate_athlete_cache
+            invalidate_athlete_cache(str(athlete.id))
+
         # Return SUCCESS now so the frontend clears the spinner.
         # Heavy post-processing (PB sync, insights, derived signals) runs
         # in a separate fire-and-forget task so the UI isn't blocked.
@@ -1409,6 +1421,18 @@ def post_sync_processing_task(self: Task, athlete_id: str) -> Dict:
         except Exception as e:
             print(f"WARNING [post-sync] Could not calculate derived signals: {e}")
 
+        # 1b. Recalibrate the performance model (closed-form, milliseconds)
+        try:
+            from services.model_cache import on_activity_sync
+
+            on_activity_sync(athlete.id, db)
+        except Exception as e:
+            print(f"Warning [post-sync] Model recalibration failed: {e}")
+            try:
+                db.rollback()
+            except Exception:
+                pass
+
         # 2. Sync Strava best efforts (the expensive part — checks up to 200 activities)
         strava_pb_result = {}
         try:
@@ -1499,7 +1523,8 @@ def post_sync_processing_task(self: Task, athlete_id: str) -> Dict:
                         )
                         .first()
                     )
-                    if not stream or not stream.stream_data:
+                    stream_data = stream.stream_data if stream else None
+                    if not stream_data:
                         continue
                     heat_adj = (
                         float(act.heat_adjustment_pct)
@@ -1507,7 +1532,7 @@ def post_sync_processing_task(self: Task, athlete_id: str) -> Dict:
                         else None
                     )
                     shape = extract_shape(
-                        stream.stream_data,
+                        stream_data,
                         pace_profile=pace_prof,
                         heat_adjustment_pct=heat_adj,
                         median_duration_s=median_dur,
@@ -0,0 +1,87 @@
+"""Columnar stream backfill task.
+
+Converts ``ActivityStream`` rows still holding the legacy JSONB
+``stream_data`` column into the columnar ``stream_blob`` format
+(services/stream_codec). Safe to re-run — idempotent: rows that already
+have a blob are never touched, and each converted row drops its JSONB.
+
+Commits per batch to keep transaction scope small. Triggered manually or
+by a one-off boot job after deploying migration activity_stream_002.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="tasks.backfill_stream_columnar", bind=True, max_retries=0)
+def backfill_stream_columnar(self, batch_size: int = 200, max_batches: int = 0):
+    """Re-encode legacy JSONB stream rows into the columnar format.
+
+    Args:
+        batch_size: Rows converted per commit.
+        max_batches: Stop after this many batches (0 = run until done).
+
+    Returns:
+        ``{"status": "ok", "converted": int, "errors": int}``
+    """
+    from sqlalchemy.orm import undefer
+
+    from core.database import SessionLocal
+    from models import ActivityStream
+
+    db = SessionLocal()
+    converted = 0
+    errors = 0
+    failed_ids = set()
+    batches = 0
+    try:
+        while not max_batches or batches < max_batches:
+            q = (
+                db.query(ActivityStream)
+                .options(undefer(ActivityStream.stream_data_json))
+                .filter(
+                    ActivityStream.stream_blob.is_(None),
+                    ActivityStream.stream_data_json.isnot(None),
+                )
+            )
+            if failed_ids:
+                q = q.filter(ActivityStream.id.notin_(failed_ids))
+            rows = q.order_by(ActivityStream.id).limit(batch_size).all()
+            if not rows:
+                break
+
+            for row in rows:
+                try:
+                    # Same payload re-encoded: keep the original fetch time
+                    fetched_at = row.fetched_at
+                    row.stream_data = row.stream_data_json
+                    row.fetched_at = fetched_at
+                    converted += 1
+                except Exception as exc:  # pragma: no cover — logged
+                    errors += 1
+                    failed_ids.add(row.id)
+                    logger.warning(
+                        "stream_columnar_backfill_failed stream_id=%s err=%s",
+                        row.id,
+                        exc,
+                    )
+            db.commit()
+            db.expunge_all()
+            batches += 1
+
+        logger.info(
+            "stream_columnar_backfill_complete converted=%d errors=%d",
+            converted,
+            errors,
+        )
+        return {"status": "ok", "converted": converted, "errors": errors}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,106 @@
+"""Stream re-analysis tasks (CURRENT_ANALYSIS_VERSION bumps).
+
+``tasks.reanalyze_stale_streams`` — beat-driven backfill: recomputes
+cached stream analyses left stale by a version bump, most recent
+activities and most active athletes first, under a per-run time budget.
+Resumes from the Redis checkpoint on the next beat; safe to re-run.
+
+``tasks.refresh_stream_analysis`` — single-activity refresh enqueued when
+a request is served a stale cached analysis (serve-stale-while-recomputing).
+
+``tasks.fill_stream_pyramid`` — stores the chart pyramid for a cached
+analysis whose pyramid is missing or predates PYRAMID_VERSION; chart reads
+build it in memory and enqueue this instead of writing.
+
+See services/stream_reanalysis.py.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="tasks.reanalyze_stale_streams", bind=True, max_retries=0)
+def reanalyze_stale_streams(
+    self,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_run_s: Optional[float] = None,
+):
+    """Recompute stale CachedStreamAnalysis rows for the current version.
+
+    Args:
+        workers: Process pool size (None = default_workers(), 0 = in-process).
+        batch_size: Activities per batch (None = DEFAULT_BATCH_SIZE).
+        max_run_s: Per-run time budget (None = DEFAULT_MAX_RUN_S).
+
+    Returns:
+        run_reanalysis() summary dict.
+    """
+    from core.cache import get_redis_client
+    from core.database import SessionLocal
+    from services import stream_reanalysis as sr
+
+    db = SessionLocal()
+    try:
+        return sr.run_reanalysis(
+            db,
+            get_redis_client(),
+            workers=workers,
+            batch_size=batch_size or sr.DEFAULT_BATCH_SIZE,
+            max_run_s=max_run_s or sr.DEFAULT_MAX_RUN_S,
+        )
+    except Exception as exc:
+        db.rollback()
+        logger.error("stream_reanalysis_error err=%s", exc)
+        return {"status": "error", "error": str(exc)}
+    finally:
+        db.close()
+
+
+@shared_task(name="tasks.refresh_stream_analysis", bind=True, max_retries=0)
+def refresh_stream_analysis_task(self, activity_id: str):
+    """Recompute one stale cached analysis (enqueued by serve-stale reads)."""
+    from core.database import SessionLocal
+    from services.stream_reanalysis import refresh_one
+
+    gemini_client = None
+    try:
+        from tasks.intelligence_tasks import _get_gemini_client
+        gemini_client = _get_gemini_client()
+    except Exception:
+        pass
+
+    db = SessionLocal()
+    try:
+        refreshed = refresh_one(db, activity_id, gemini_client=gemini_client)
+        return {"status": "ok", "activity_id": activity_id, "refreshed": refreshed}
+    except Exception as exc:
+        db.rollback()
+        logger.warning("stream_refresh_failed activity_id=%s err=%s", activity_id, exc)
+        return {"status": "error", "activity_id": activity_id, "error": str(exc)}
+    finally:
+        db.close()
+
+
+@shared_task(name="tasks.fill_stream_pyramid", bind=True, max_retries=0)
+def fill_stream_pyramid_task(self, activity_id: str):
+    """Store the chart pyramid for one cached analysis (enqueued by chart reads)."""
+    from core.database import SessionLocal
+    from services.stream_reanalysis import fill_pyramid
+
+    db = SessionLocal()
+    try:
+        filled = fill_pyramid(db, activity_id)
+        return {"status": "ok", "activity_id": activity_id, "filled": filled}
+    except Exception as exc:
+        db.rollback()
+        logger.warning("stream_pyramid_fill_failed activity_id=%s err=%s", activity_id, exc)
+        return {"status": "error", "activity_id": activity_id, "error": str(exc)}
+    finally:
+        db.close()
@@ -0,0 +1,146 @@
+"""Stream corpus for the shape_extractor golden parity suite.
+
+Deterministic: the clean generators in stream_fixtures plus seeded
+"field" variants that carry what real watch data does — GPS velocity
+noise, strides, auto-pause gaps, sensor dropouts (None), velocity
+glitches above the clamp, uneven sampling and missing channels.
+
+shape_golden.json holds RunShape.to_dict() for every case, produced by
+the reference (pre-vectorization) extractor. Regenerate only when the
+extractor's output is meant to change:
+
+    python tests/test_shape_extractor_parity.py --regenerate
+"""
+import random
+from typing import Dict, List, Tuple
+
+from fixtures.stream_fixtures import (
+    make_easy_run_stream,
+    make_hill_repeat_stream,
+    make_interval_stream,
+    make_long_run_with_drift_stream,
+    make_progressive_run_stream,
+)
+
+# (easy, marathon, threshold, interval, repetition) sec/mile
+PROFILES = {
+    "founder": (540, 465, 391, 345, 321),
+    "slow": (780, 660, 600, 540, 500),
+    "fast": (450, 380, 350, 320, 300),
+}
+
+
+def _field_stream(
+    seed: int,
+    duration_s: int,
+    base_v: float,
+    *,
+    work_v: float = 0.0,
+    reps: int = 0,
+    work_s: int = 0,
+    strides: int = 0,
+    pauses: int = 0,
+    dropout: float = 0.0,
+    glitches: int = 0,
+    step_choices: Tuple[int, ...] = (1,),
+    hills: bool = False,
+) -> Dict[str, List]:
+    rng = random.Random(seed)
+    target = [base_v] * duration_s
+    if reps:
+        warmup = min(600, duration_s // 5)
+        block = (duration_s - 2 * warmup) // reps
+        for r in range(reps):
+            s = warmup + r * block
+            for i in range(s, min(s + work_s, duration_s)):
+                target[i] = work_v
+    for k in range(strides):
+        s = duration_s - 420 + k * 90 if duration_s > 600 else rng.randrange(duration_s - 30)
+        for i in range(max(0, s), min(duration_s, s + rng.randint(12, 22))):
+            target[i] = base_v * 1.45
+
+    time_s, vel, hr, cad, alt, grade, dist = [], [], [], [], [], [], []
+    t, d, a, h = 0, 0.0, 100.0, 120.0
+    pause_at = set(rng.sample(range(300, max(301, duration_s - 300)), pauses)) if pauses else set()
+    i = 0
+    while i < duration_s:
+        if i in pause_at:
+            t += rng.randint(35, 200)
+        step = rng.choice(step_choices)
+        v = max(0.0, target[i] + rng.gauss(0, 0.18))
+        d += v * step
+        slope = 0.0
+        if hills:
+            slope = 5.0 * (1 if (i // 240) % 2 == 0 else -1)
+            a += slope / 100.0 * v
+        h += (110 + 18 * target[i] - h) * 0.05 + rng.gauss(0, 0.8)
+        c = 160 + 9 * target[i] + rng.gauss(0, 2.0)
+        time_s.append(t)
+        vel.append(None if rng.random() < dropout else round(v, 3))
+        hr.append(None if rng.random() < dropout else round(h))
+        cad.append(None if rng.random() < dropout else round(c))
+        alt.append(None if rng.random() < dropout else round(a, 1))
+        grade.append(round(slope + rng.gauss(0, 0.4), 1))
+        dist.append(round(d, 1))
+        t += step
+        i += step
+    for _ in range(glitches):
+        vel[rng.randrange(len(vel))] = round(rng.uniform(12.0, 30.0), 2)
+    return {
+        "time": time_s,
+        "velocity_smooth": vel,
+        "heartrate": hr,
+        "cadence": cad,
+        "altitude": alt,
+        "grade_smooth": grade,
+        "distance": dist,
+    }
+
+
+def golden_cases() -> List[Tuple[str, Dict[str, List], Dict]]:
+    """(case name, stream_data, extract_shape kwargs besides pace_profile)."""
+    cases = []
+
+    clean = {
+        "easy_60": make_easy_run_stream(),
+        "easy_180": make_easy_run_stream(duration_s=10800, warmup_s=900, cooldown_s=600),
+        "intervals_6x90": make_interval_stream(),
+        "intervals_10x60": make_interval_stream(reps=10, work_duration_s=60, rest_duration_s=60),
+        "progressive": make_progressive_run_stream(),
+        "long_drift": make_long_run_with_drift_stream(),
+        "hill_repeats": make_hill_repeat_stream(),
+    }
+    for name, stream in clean.items():
+        for profile in ("founder", "slow"):
+            cases.append((f"{name}/{profile}", stream, {"profile": profile}))
+
+    field = [
+        ("easy_noisy", dict(seed=1, duration_s=3000, base_v=2.9)),
+        ("easy_strides", dict(seed=2, duration_s=2700, base_v=2.8, strides=4)),
+        ("slow_strides", dict(seed=3, duration_s=2400, base_v=2.06, strides=5)),
+        ("tempo_3x10", dict(seed=4, duration_s=4200, base_v=2.9, work_v=4.1, reps=3, work_s=600)),
+        ("vo2_8x400", dict(seed=5, duration_s=3600, base_v=2.7, work_v=5.3, reps=8, work_s=75)),
+        ("paused_dropouts", dict(seed=6, duration_s=3300, base_v=3.0, pauses=3, dropout=0.03)),
+        ("glitchy", dict(seed=7, duration_s=2000, base_v=3.1, glitches=4, strides=3)),
+        ("uneven_sampling", dict(seed=8, duration_s=5400, base_v=3.2, step_choices=(1, 1, 2, 3))),
+        ("hilly", dict(seed=9, duration_s=3600, base_v=2.8, hills=True, strides=2)),
+        ("marathon_long", dict(seed=10, duration_s=12000, base_v=3.6, work_v=4.0, reps=2, work_s=2400)),
+        ("short", dict(seed=11, duration_s=240, base_v=3.0)),
+    ]
+    for name, kwargs in field:
+        stream = _field_stream(**kwargs)
+        for profile in ("founder", "fast"):
+            cases.append((f"{name}/{profile}", stream, {"profile": profile}))
+
+    heat = _field_stream(seed=12, duration_s=3600, base_v=2.8, strides=4)
+    cases.append(("heat_median/founder", heat, {
+        "profile": "founder", "heat_adjustment_pct": 0.04, "median_duration_s": 2400.0,
+    }))
+    cases.append(("unzoned", heat, {"profile": None}))
+
+    sparse = _field_stream(seed=13, duration_s=2400, base_v=3.0, strides=3)
+    for channel in ("heartrate", "cadence", "altitude", "grade_smooth", "distance"):
+        sparse.pop(channel)
+    cases.append(("velocity_only/founder", sparse, {"profile": "founder"}))
+
+    return cases
@@ -0,0 +1,218 @@
+"""Persisted per-activity TSS (services/activity_tss).
+
+The vectorized batch must reproduce calculate_workout_tss for every branch,
+group versions must move only with the inputs their group reads, stored
+values must be served only while current, and editing an activity's TSS
+inputs must invalidate its stored value.
+"""
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models import Activity
+from services import activity_tss
+from services.training_load import TrainingLoadCalculator
+
+HRR = {"tier": "hrr", "observed_peak_hr": 186, "resting_hr": 48}
+NO_HRR = {"tier": "percentile", "observed_peak_hr": None, "resting_hr": None}
+
+
+def _athlete(max_hr=190, resting_hr=50, threshold_pace_per_km=255.0):
+    return SimpleNamespace(
+        id=uuid.uuid4(), max_hr=max_hr, resting_hr=resting_hr,
+        threshold_pace_per_km=threshold_pace_per_km,
+    )
+
+
+def _calc(thresholds):
+    calc = TrainingLoadCalculator(None)
+    calc.effort_thresholds = lambda athlete: thresholds
+    return calc
+
+
+def _act(sport="run", duration_s=3600, distance_m=10000, avg_hr=150, name="Morning Run", **kw):
+    return SimpleNamespace(
+        id=uuid.uuid4(), sport=sport, duration_s=duration_s, distance_m=distance_m,
+        avg_hr=avg_hr, name=name, workout_type=None,
+        start_time=datetime(2026, 5, 1, 7), **kw,
+    )
+
+
+def _mixed_activities():
+    return [
+        _act(),
+        _act(avg_hr=172, duration_s=1500, distance_m=6000),
+        _act(avg_hr=40),                                   # below resting → reserve clipped to 0
+        _act(avg_hr=None),                                 # rTSS
+        _act(avg_hr=None, distance_m=3000),                # rTSS clipped low
+        _act(avg_hr=None, distance_m=None, name="Tempo"),  # name estimate
+        _act(avg_hr=None, distance_m=0, name="Easy jog"),
+        _act(duration_s=200),                              # too short
+        _act(duration_s=None),
+        _act(sport="cycling", avg_hr=135, duration_s=5400),
+        _act(sport="cycling", avg_hr=None, duration_s=5400),
+        _act(sport="strength", avg_hr=None, duration_s=2700),
+        _act(sport="swimming", avg_hr=None, duration_s=1800),
+        _act(sport=None, avg_hr=None, name="Long run"),
+    ]
+
+
+ATHLETES = {
+    "hrr_tier": (HRR, dict()),
+    "athlete_hr_only": (NO_HRR, dict()),
+    "pace_only": (NO_HRR, dict(max_hr=None, resting_hr=None)),
+    "nothing": (NO_HRR, dict(max_hr=None, resting_hr=None, threshold_pace_per_km=None)),
+}
+
+
+class TestBatchParity:
+
+    @pytest.mark.parametrize("name", sorted(ATHLETES))
+    def test_matches_scalar(self, name):
+        thresholds, athlete_kw = ATHLETES[name]
+        calc = _calc(thresholds)
+        athlete = _athlete(**athlete_kw)
+        acts = _mixed_activities()
+
+        tss, methods = activity_tss.compute_batch(calc, acts, athlete)
+
+        for act, got_tss, got_method in zip(acts, tss, methods):
+            want = calc.calculate_workout_tss(act, athlete)
+            assert got_method == want.calculation_method
+            assert got_tss == pytest.approx(want.tss, abs=0.05)
+
+    def test_zero_width_hr_reserve_left_unstored(self):
+        calc = _calc(NO_HRR)
+        athlete = _athlete(max_hr=60, resting_hr=60)
+        acts = [_act(), _act(avg_hr=None)]
+        tss, methods = activity_tss.compute_batch(calc, acts, athlete)
+        assert tss[0] is None and methods[0] is None
+        with pytest.raises(ZeroDivisionError):
+            calc.calculate_workout_tss(acts[0], athlete)
+        assert methods[1] == "rTSS"
+
+    def test_empty(self):
+        assert activity_tss.compute_batch(_calc(HRR), [], _athlete()) == ([], [])
+
+
+class TestVersions:
+
+    def _changed_groups(self, before, after):
+        a = activity_tss.current_versions(_calc(before[0]), before[1])
+        b = activity_tss.current_versions(_calc(after[0]), after[1])
+        return {g for g in a if a[g] != b[g]}
+
+    def test_max_hr_change_touches_hr_groups_only(self):
+        athlete = _athlete()
+        changed = SimpleNamespace(**{**vars(athlete), "max_hr": 194})
+        assert self._changed_groups((HRR, athlete), (HRR, changed)) == {"xt_hr", "run_hr"}
+
+    def test_threshold_pace_change_touches_runs_only(self):
+        athlete = _athlete()
+        changed = SimpleNamespace(**{**vars(athlete), "threshold_pace_per_km": 240.0})
+        assert self._changed_groups((HRR, athlete), (HRR, changed)) == {"run_nohr", "run_hr"}
+
+    def test_effort_tier_change_touches_hr_runs_only(self):
+        athlete = _athlete()
+        assert self._changed_groups((HRR, athlete), (NO_HRR, athlete)) == {"run_hr"}
+
+    def test_group_follows_activity(self):
+        assert activity_tss.tss_group(_act(duration_s=120)) == "short"
+        assert activity_tss.tss_group(_act()) == "run_hr"
+        assert activity_tss.tss_group(_act(avg_hr=None)) == "run_nohr"
+        assert activity_tss.tss_group(_act(sport="cycling")) == "xt_hr"
+        assert activity_tss.tss_group(_act(sport="hiking", avg_hr=0)) == "xt_nohr"
+
+    def test_thresholds_unavailable(self):
+        calc = TrainingLoadCalculator(None)
+
+        def boom(athlete):
+            raise RuntimeError("no db")
+
+        calc.effort_thresholds = boom
+        assert activity_tss.current_versions(calc, _athlete()) is None
+
+
+class TestStoredRead:
+
+    def _stored(self, calc, athlete, act, tss=999.0):
+        versions = activity_tss.current_versions(calc, athlete)
+        act.tss = tss
+        act.tss_inputs_version = versions[activity_tss.tss_group(act)]
+        return act
+
+    def test_current_version_served_without_scoring(self):
+        calc, athlete = _calc(HRR), _athlete()
+        act = self._stored(calc, athlete, _act())
+        calc.calculate_workout_tss = lambda *a: pytest.fail("stored TSS should be read")
+        assert calc.workout_tss(act, athlete) == 999.0
+
+    def test_stale_version_recomputed(self):
+        calc, athlete = _calc(HRR), _athlete()
+        act = self._stored(calc, athlete, _act())
+        athlete.max_hr = 195
+        fresh = _calc(HRR)
+        assert fresh.workout_tss(act, athlete) == fresh.calculate_workout_tss(act, athlete).tss
+
+    def test_version_of_other_group_not_accepted(self):
+        calc, athlete = _calc(HRR), _athlete()
+        act = self._stored(calc, athlete, _act())
+        act.avg_hr = None  # now run_nohr; stored run_hr version no longer applies
+        assert calc.workout_tss(act, athlete) == calc.calculate_workout_tss(act, athlete).tss
+
+    def test_unstored(self):
+        calc, athlete = _calc(HRR), _athlete()
+        act = _act(tss=None, tss_inputs_version=None)
+        assert calc.workout_tss(act, athlete) == calc.calculate_workout_tss(act, athlete).tss
+
+
+def _persistent_activity(session, **kw):
+    act = Activity(
+        id=uuid.uuid4(), athlete_id=uuid.uuid4(), start_time=datetime(2026, 5, 10, 7),
+        sport="run", is_duplicate=False, duration_s=3600, avg_hr=150,
+        tss=62.3, tss_method="hrTSS", tss_inputs_version="run_hr:abc", **kw,
+    )
+    make_transient_to_detached(act)
+    session.add(act)
+    return act
+
+
+class TestInvalidation:
+
+    def test_edited_tss_input_clears_version(self):
+        session = Session()
+        act = _persistent_activity(session)
+        act.avg_hr = 158
+        activity_tss._clear_edited_tss(session, None, None)
+        assert act.tss_inputs_version is None
+
+    def test_moved_activity_keeps_version(self):
+        session = Session()
+        act = _persistent_activity(session)
+        act.start_time = act.start_time + timedelta(hours=2)
+        activity_tss._clear_edited_tss(session, None, None)
+        assert act.tss_inputs_version == "run_hr:abc"
+
+    def test_register_listeners_is_idempotent(self):
+        from sqlalchemy import event
+
+        activity_tss.register_listeners()
+        activity_tss.register_listeners()
+        assert event.contains(Session, "before_flush", activity_tss._clear_edited_tss)
+        event.remove(Session, "before_flush", activity_tss._clear_edited_tss)
+        assert not event.contains(Session, "before_flush", activity_tss._clear_edited_tss)
+        activity_tss.register_listeners()
+
+    def test_unrelated_column_change_ignored(self):
+        session = Session()
+        act = _persistent_activity(session)
+        act.temperature_f = 71.0
+        activity_tss._clear_edited_tss(session, None, None)
+        assert act.tss_inputs_version == "run_hr:abc"
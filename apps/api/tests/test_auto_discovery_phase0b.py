@@ -96,9 +96,10 @@ class TestLagFieldPreservation:
             "time_lag_days": 3,  # correct field name from CorrelationResult.to_dict()
             "strength": "moderate",
         }
-        fake_result = {"correlations": [fake_correlation]}
+        fake_result = {"efficiency": {"correlations": [fake_correlation]}}
 
-        with patch("services.correlation_engine.analyze_correlations", return_value=fake_result):
+        with patch("services.correlation_engine.load_correlation_history"), \
+             patch("services.correlation_engine.analyze_correlation_window", return_value=fake_result):
             from services.auto_discovery.rescan_loop import run_multiwindow_rescan
             db = MagicMock()
             results = run_multiwindow_rescan(athlete_id=uuid.uuid4(), db=db)
@@ -0,0 +1,176 @@
+"""Closed-form Banister calibration (services/banister_calibration).
+
+Filter values must match the day-by-day EMA, the gain solve must be the
+exact box-constrained optimum, and the full fit must recover known
+parameters and never do worse than the grid the old optimizer searched.
+"""
+import inspect
+import math
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from services.banister_calibration import filter_at, fit_banister, solve_gains
+from services.individual_performance_model import (
+    IndividualPerformanceModel,
+    PerformanceMarker,
+    TrainingDay,
+    K1_BOUNDS,
+    K2_BOUNDS,
+    TAU1_BOUNDS,
+    TAU2_BOUNDS,
+)
+
+BOUNDS = dict(tau1_bounds=TAU1_BOUNDS, tau2_bounds=TAU2_BOUNDS, k1_bounds=K1_BOUNDS, k2_bounds=K2_BOUNDS)
+
+
+def _tss(n=365, seed=1):
+    rng = np.random.default_rng(seed)
+    tss = rng.uniform(0, 120, n)
+    tss[::7] = 0
+    return tss
+
+
+def _ema(tss, tau):
+    d = math.exp(-1.0 / tau)
+    y, out = 0.0, []
+    for x in tss:
+        y = y * d + x * (1 - d)
+        out.append(y)
+    return np.array(out)
+
+
+def _markers(n=365, count=12, seed=2):
+    rng = np.random.default_rng(seed)
+    idx = np.sort(rng.choice(np.arange(60, n), count, replace=False))
+    return idx, rng.uniform(0.5, 2.0, count)
+
+
+def _sse(tss, idx, values, weights, tau1, tau2, k1, k2, p0):
+    pred = p0 + k1 * _ema(tss, tau1)[idx] - k2 * _ema(tss, tau2)[idx]
+    return float(np.sum(weights * (pred - values) ** 2))
+
+
+class TestFilter:
+
+    def test_matches_daily_recursion(self):
+        tss = _tss()
+        idx, _ = _markers()
+        got = filter_at(tss, idx, np.array([4.0, 9.5, 42.0, 70.0]))
+        for row, tau in zip(got, (4.0, 9.5, 42.0, 70.0)):
+            assert row == pytest.approx(_ema(tss, tau)[idx], rel=1e-12)
+
+
+class TestGains:
+
+    def test_interior_matches_least_squares(self):
+        tss = _tss()
+        idx, w = _markers()
+        c, a = _ema(tss, 40)[idx], _ema(tss, 8)[idx]
+        values = 45 + 1.1 * c - 2.2 * a + np.random.default_rng(3).normal(0, 0.2, len(idx))
+
+        k1, k2, p0, err = solve_gains(c[None], a[None], values, w, K1_BOUNDS, K2_BOUNDS)
+
+        X = np.column_stack([np.ones_like(c), c, -a]) * np.sqrt(w)[:, None]
+        (want_p0, want_k1, want_k2), *_ = np.linalg.lstsq(X, values * np.sqrt(w), rcond=None)
+        assert (k1[0, 0], k2[0, 0], p0[0, 0]) == pytest.approx((want_k1, want_k2, want_p0), rel=1e-8)
+        assert err[0, 0] == pytest.approx(_sse(tss, idx, values, w, 40, 8, k1[0, 0], k2[0, 0], p0[0, 0]), abs=1e-8)
+
+    def test_bounded_optimum_beats_brute_force(self):
+        tss = _tss()
+        idx, w = _markers()
+        c, a = _ema(tss, 33)[idx], _ema(tss, 6)[idx]
+        values = np.random.default_rng(4).normal(50, 3, len(idx))  # unconstrained fit leaves the box
+
+        k1, k2, p0, err = solve_gains(c[None], a[None], values, w, K1_BOUNDS, K2_BOUNDS)
+        assert K1_BOUNDS[0] <= k1[0, 0] <= K1_BOUNDS[1]
+        assert K2_BOUNDS[0] <= k2[0, 0] <= K2_BOUNDS[1]
+
+        best = np.inf
+        for g1 in np.linspace(*K1_BOUNDS, 120):
+            for g2 in np.linspace(*K2_BOUNDS, 120):
+                r = g1 * c - g2 * a
+                base = np.sum(w * (values - r)) / w.sum()  # optimal p0 for these gains
+                best = min(best, np.sum(w * (base + r - values) ** 2))
+        assert err[0, 0] <= best + 1e-9
+
+
+class TestFit:
+
+    def test_recovers_known_parameters(self):
+        tss = _tss()
+        idx, w = _markers(count=15)
+        values = 40 + 1.2 * _ema(tss, 45)[idx] - 2.4 * _ema(tss, 9)[idx]
+
+        fit = fit_banister(tss, idx, values, w, **BOUNDS)
+
+        assert fit.tau1 == pytest.approx(45, abs=0.05)
+        assert fit.tau2 == pytest.approx(9, abs=0.05)
+        assert fit.k1 == pytest.approx(1.2, rel=1e-3)
+        assert fit.k2 == pytest.approx(2.4, rel=1e-3)
+        assert fit.fit_error == pytest.approx(0, abs=1e-6)
+
+    def test_no_worse_than_previous_grid(self):
+        tss = _tss(seed=7)
+        idx, w = _markers(seed=8)
+        values = np.linspace(47, 50, len(idx)) + np.random.default_rng(9).normal(0, 0.4, len(idx))
+
+        fit = fit_banister(tss, idx, values, w, **BOUNDS)
+
+        p0 = float(np.mean(values))
+        grid_best = min(
+            _sse(tss, idx, values, w, t1, t2, k1, k2, p0)
+            for t1 in (30, 35, 40, 45, 50, 55, 60)
+            for t2 in (5, 6, 7, 8, 9, 10, 12)
+            for k1 in (0.5, 0.8, 1.0, 1.2, 1.5)
+            for k2 in (1.0, 1.5, 2.0, 2.5, 3.0)
+        )
+        assert fit.fit_error <= grid_best
+        assert TAU1_BOUNDS[0] <= fit.tau1 <= TAU1_BOUNDS[1]
+        assert TAU2_BOUNDS[0] <= fit.tau2 <= TAU2_BOUNDS[1]
+
+
+class TestFitModel:
+
+    def test_banister_model_reports_fit_on_its_parameters(self):
+        start = date(2026, 1, 1)
+        tss = _tss(n=200, seed=5)
+        days = [TrainingDay(date=start + timedelta(days=i), tss=float(x)) for i, x in enumerate(tss)]
+        markers = [
+            PerformanceMarker(date=start + timedelta(days=d), performance_value=48 + i * 0.4, source="race", weight=1.5)
+            for i, d in enumerate((40, 75, 110, 150, 190))
+        ]
+        markers.append(PerformanceMarker(date=start - timedelta(days=5), performance_value=60, source="race"))
+
+        model = IndividualPerformanceModel(None)._fit_model("athlete", days, markers)
+
+        idx = np.array([40, 75, 110, 150, 190])
+        values = np.array([m.performance_value for m in markers[:5]])
+        weights = np.full(5, 1.5)
+        assert model.fit_error == pytest.approx(
+            _sse(tss, idx, values, weights, model.tau1, model.tau2, model.k1, model.k2, model.p0), abs=1e-8,
+        )
+        assert model.n_performance_markers == 6
+        assert model.n_training_days == 200
+
+
+class TestSyncHook:
+
+    def test_on_activity_sync_forces_recalibration(self):
+        from services import model_cache
+
+        with patch.object(model_cache, "ModelCache") as cache_cls:
+            model_cache.on_activity_sync("athlete", MagicMock())
+        cache_cls.return_value.get_or_calibrate.assert_called_once_with("athlete", force_recalibrate=True)
+
+    @pytest.mark.parametrize("module, func", [
+        ("tasks.strava_tasks", "post_sync_processing_task"),
+        ("tasks.garmin_webhook_tasks", "process_garmin_activity_detail_task"),
+    ])
+    def test_sync_paths_call_hook(self, module, func):
+        import importlib
+
+        task = getattr(importlib.import_module(module), func)
+        assert "on_activity_sync(" in inspect.getsource(task.run)
@@ -0,0 +1,177 @@
+"""
+Query-count regression for the correlation input aggregation.
+
+aggregate_daily_inputs, aggregate_activity_level_inputs and
+aggregate_feedback_inputs read each source table once per call — the
+number of queries must not grow with the number of inputs or runs.
+The session is a fake that serves rows per table and counts queries.
+"""
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+from models import (
+    Activity, ActivityFeedback, ActivityReflection, BodyComposition,
+    DailyCheckin, GarminDay, NutritionEntry, WorkPattern,
+)
+from services.correlation_engine import (
+    aggregate_activity_level_inputs,
+    aggregate_daily_inputs,
+    aggregate_feedback_inputs,
+)
+
+START = datetime(2026, 3, 1, tzinfo=timezone.utc)
+END = datetime(2026, 3, 31, tzinfo=timezone.utc)
+
+
+class _Query:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def filter(self, *args):
+        return self
+
+    order_by = group_by = filter
+
+    def all(self):
+        return list(self._rows)
+
+
+class FakeSession:
+    """Serves rows by the queried table; one entry in ``tables`` per query."""
+
+    def __init__(self, rows_by_table):
+        self._rows = rows_by_table
+        self.tables = []
+
+    def query(self, *entities):
+        first = entities[0]
+        table = getattr(first, "class_", first)
+        self.tables.append(table)
+        rows = self._rows.get(table, [])
+        if callable(rows):
+            rows = rows(len([t for t in self.tables if t is table]))
+        return _Query(rows)
+
+
+def _row(**kw):
+    return SimpleNamespace(**kw)
+
+
+def _checkin(d, **kw):
+    cols = ("sleep_h", "sleep_quality_1_5", "hrv_rmssd", "resting_hr", "stress_1_5",
+            "soreness_1_5", "rpe_1_10", "enjoyment_1_5", "confidence_1_5",
+            "readiness_1_5", "overnight_avg_hr", "hrv_sdnn")
+    return _row(date=d, **{c: kw.get(c) for c in cols})
+
+
+class TestDailyInputs:
+
+    def test_one_query_per_table(self):
+        db = FakeSession({})
+        inputs = aggregate_daily_inputs("a", START, END, db)
+        assert db.tables == [DailyCheckin, WorkPattern, NutritionEntry, BodyComposition, GarminDay]
+        assert list(inputs)[:6] == [
+            "sleep_hours", "sleep_quality_1_5", "hrv_rmssd", "resting_hr", "work_stress", "work_hours",
+        ]
+        assert all(v == [] for v in inputs.values())
+
+    def test_columns_split_per_input(self):
+        d1, d2 = date(2026, 3, 2), date(2026, 3, 3)
+        db = FakeSession({
+            DailyCheckin: [_checkin(d1, sleep_h=7.5, rpe_1_10=6), _checkin(d2, sleep_h=6)],
+            NutritionEntry: [
+                _row(date=d1, protein_g=120, carbs_g=300, fat_g=None, fiber_g=None, calories=2600, caffeine_mg=None),
+            ],
+            BodyComposition: [_row(date=d2, weight_kg=70.2, bmi=None, body_fat_pct=12.0, muscle_mass_kg=None)],
+            GarminDay: [_row(calendar_date=d1, hrv_5min_high=60, min_hr=40, **{
+                a: None for a in ("sleep_score", "sleep_deep_s", "sleep_rem_s", "sleep_awake_s", "steps",
+                                  "active_time_s", "moderate_intensity_s", "vigorous_intensity_s",
+                                  "hrv_overnight_avg", "resting_hr", "vo2max")
+            })],
+        })
+
+        inputs = aggregate_daily_inputs("a", START, END, db)
+
+        assert inputs["sleep_hours"] == [(d1, 7.5), (d2, 6.0)]
+        assert inputs["rpe_1_10"] == [(d1, 6.0)]
+        assert inputs["hrv_rmssd"] == []
+        assert inputs["daily_protein_g"] == [(d1, 120.0)]
+        assert inputs["daily_fat_g"] == []
+        assert inputs["weight_kg"] == [(d2, 70.2)]
+        assert inputs["bmi"] == []
+        assert inputs["garmin_hrv_5min_high"] == [(d1, 60.0)]
+        assert inputs["hrv_rhr_ratio"] == [(d1, 1.5)]
+
+
+def _run(day, hours=7, distance=10000, **kw):
+    return SimpleNamespace(
+        id=uuid4(), start_time=datetime(2026, 3, day, hours, tzinfo=timezone.utc),
+        distance_m=distance, duration_s=3600, **kw,
+    )
+
+
+class TestActivityLevelInputs:
+
+    def test_query_count_independent_of_runs(self):
+        for n in (1, 20):
+            runs = [_run(day, avg_cadence=170 + day) for day in range(1, n + 1)]
+            db = FakeSession({Activity: runs})
+            inputs = aggregate_activity_level_inputs("a", START, END, db)
+            assert db.tables == [Activity, NutritionEntry, NutritionEntry]
+            assert len(inputs["avg_cadence"]) == n
+
+    def test_fueling_and_meal_gap(self):
+        run = _run(5, hours=8, heat_adjustment_pct=0.0, dew_point_f=55)
+        short = _run(5, hours=18, distance=3000)
+        d = run.start_time.date()
+        breakfast = run.start_time - timedelta(minutes=90)
+        snack = run.start_time - timedelta(minutes=20)
+        dinner = run.start_time + timedelta(hours=11)
+
+        def nutrition(nth):
+            if nth == 1:  # entries linked to the day's runs
+                return [
+                    _row(activity_id=run.id, entry_type="pre_activity", caffeine_mg=100, carbs_g=30, fluid_ml=None),
+                    _row(activity_id=run.id, entry_type="during_activity", caffeine_mg=None, carbs_g=45, fluid_ml=500),
+                ]
+            return [_row(date=d, timing=t) for t in (breakfast, snack, dinner)]
+
+        db = FakeSession({Activity: [run, short], NutritionEntry: nutrition})
+        inputs = aggregate_activity_level_inputs("a", START, END, db)
+
+        assert inputs["dew_point_f"] == [(d, 55.0)]
+        assert "heat_adjustment_pct" not in inputs
+        assert inputs["pre_run_caffeine_mg"] == [(d, 100.0)]
+        assert inputs["during_run_carbs_g"] == [(d, 45.0)]
+        assert inputs["during_run_carbs_g_per_hour"] == [(d, 45.0)]
+        assert inputs["during_run_fluid_ml"] == [(d, 500.0)]
+        assert inputs["pre_run_meal_gap_minutes"] == [(d, 20.0)]
+
+    def test_no_runs(self):
+        db = FakeSession({})
+        assert aggregate_activity_level_inputs("a", START, END, db) == {}
+        assert db.tables == [Activity]
+
+
+class TestFeedbackInputs:
+
+    def test_one_query_per_table(self):
+        at = datetime(2026, 3, 4, 9, tzinfo=timezone.utc)
+        db = FakeSession({
+            ActivityFeedback: [
+                _row(submitted_at=at, perceived_effort=7, energy_pre=None, energy_post=3, leg_feel=2),
+                _row(submitted_at=None, perceived_effort=5, energy_pre=4, energy_post=4, leg_feel=5),
+            ],
+            ActivityReflection: [_row(created_at=at, response=-1), _row(created_at=at, response=None)],
+        })
+
+        inputs = aggregate_feedback_inputs("a", START, END, db)
+
+        assert db.tables == [ActivityFeedback, ActivityReflection]
+        assert inputs == {
+            "feedback_perceived_effort": [(at.date(), 7.0)],
+            "feedback_energy_post": [(at.date(), 3.0)],
+            "feedback_leg_feel": [(at.date(), 2.0)],
+            "reflection_vs_expected": [(at.date(), -1.0)],
+        }
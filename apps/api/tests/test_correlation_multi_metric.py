@@ -0,0 +1,125 @@
+"""
+analyze_correlations_for_metrics — one aggregation pass for many metrics.
+
+Inputs must be aggregated once per call, every metric must get the same
+result analyze_correlations gives it alone, and each metric must be
+persisted and cached under analyze_correlations' key.
+"""
+from contextlib import ExitStack
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from services import correlation_engine as ce
+
+_TODAY = date.today()
+ATH = "5b0c7a3e-6a38-4d2e-9d67-1f0f3f6c2a10"
+
+
+def _series(seed, n=80, follow=None):
+    rng = np.random.default_rng(seed)
+    days = [_TODAY - timedelta(days=n - i) for i in range(n)]
+    if follow is None:
+        return [(d, float(rng.normal())) for d in days]
+    return [(d, 0.8 * v + float(rng.normal(0, 0.4))) for d, v in follow]
+
+
+SLEEP = _series(1)
+STEPS = _series(2)
+OUTPUTS = {
+    "efficiency": _series(3, follow=SLEEP),
+    "pace_easy": _series(4, follow=STEPS),
+    "completion": _series(5, n=6),  # too few
+}
+
+
+@pytest.fixture
+def engine():
+    """Aggregators stubbed and counted; persistence and cache captured."""
+    calls = {"daily": 0, "persisted": [], "cached": {}}
+
+    def daily(*a, **k):
+        calls["daily"] += 1
+        return {"sleep_hours": list(SLEEP), "garmin_steps": list(STEPS)}
+
+    def outputs_for(metric):
+        return lambda *a, **k: list(OUTPUTS[metric])
+
+    with ExitStack() as stack:
+        enter = stack.enter_context
+        enter(patch.object(ce, "aggregate_daily_inputs", side_effect=daily))
+        for name in ("aggregate_training_load_inputs", "aggregate_activity_level_inputs",
+                     "aggregate_feedback_inputs", "aggregate_training_pattern_inputs",
+                     "aggregate_cross_training_inputs"):
+            enter(patch.object(ce, name, return_value={}))
+        enter(patch.object(ce, "aggregate_daily_session_stress", return_value=[]))
+        enter(patch.object(ce, "aggregate_efficiency_outputs", side_effect=outputs_for("efficiency")))
+        enter(patch.object(ce, "aggregate_pace_at_effort", side_effect=outputs_for("pace_easy")))
+        enter(patch.object(ce, "aggregate_workout_completion", side_effect=outputs_for("completion")))
+        enter(patch(
+            "services.correlation_persistence.persist_correlation_findings",
+            side_effect=lambda **kw: calls["persisted"].append(kw["output_metric"]),
+        ))
+        enter(patch("core.cache.get_cache", side_effect=lambda key: calls["cached"].get(key)))
+        enter(patch("core.cache.set_cache", side_effect=lambda key, value, ttl=None: calls["cached"].__setitem__(key, value)))
+        yield calls
+
+
+METRICS = ["efficiency", "pace_easy", "completion"]
+
+
+def test_inputs_aggregated_once(engine):
+    results = ce.analyze_correlations_for_metrics(ATH, METRICS, days=90, db=MagicMock())
+
+    assert engine["daily"] == 1
+    assert list(results) == METRICS
+    assert results["completion"]["error"] == "Insufficient data"
+    assert engine["persisted"] == ["efficiency", "pace_easy"]
+    metric_keys = {k for k in engine["cached"] if k.rsplit(":", 1)[-1] in METRICS}
+    assert metric_keys == {f"correlations:{ATH}:90:efficiency", f"correlations:{ATH}:90:pace_easy"}
+
+
+def test_matches_single_metric_analysis(engine):
+    multi = ce.analyze_correlations_for_metrics(ATH, METRICS, days=90, db=MagicMock(), shadow_mode=True)
+
+    for metric in METRICS:
+        single = ce.analyze_correlations(ATH, days=90, db=MagicMock(), output_metric=metric, shadow_mode=True)
+        got = multi[metric].get("correlations")
+        want = single.get("correlations")
+        assert got == want, metric
+    assert {c["input_name"] for c in multi["efficiency"]["correlations"]} == {"sleep_hours"}
+    assert {c["input_name"] for c in multi["pace_easy"]["correlations"]} == {"garmin_steps"}
+
+
+def test_cached_metrics_not_recomputed(engine):
+    engine["cached"][f"correlations:{ATH}:90:efficiency"] = {"from_cache": True}
+    engine["cached"][f"correlations:{ATH}:90:pace_easy"] = {"from_cache": True}
+    engine["cached"][f"correlations:{ATH}:90:completion"] = {"from_cache": True}
+
+    results = ce.analyze_correlations_for_metrics(ATH, METRICS, days=90, db=MagicMock())
+
+    assert all(r == {"from_cache": True} for r in results.values())
+    assert engine["daily"] == 0
+
+
+def test_daily_sweep_uses_one_pass_per_athlete():
+    from tasks.correlation_tasks import ALL_OUTPUT_METRICS, run_correlation_sweep_athlete
+
+    db = MagicMock()
+    with patch("tasks.correlation_tasks.SessionLocal", return_value=db), \
+         patch("services.correlation_engine.analyze_correlations_for_metrics") as multi, \
+         patch("services.correlation_engine.analyze_correlations") as single, \
+         patch("services.plan_framework.limiter_classifier.classify_lifecycle_states", return_value=[]), \
+         patch("services.plan_framework.limiter_classifier.check_transitions",
+               return_value={"active_to_resolving": [], "resolving_to_closed": [],
+                             "resolving_to_active": [], "next_frontier": []}), \
+         patch("tasks.correlation_tasks._run_layer_pass", return_value=0), \
+         patch("tasks.correlation_tasks.get_redis_client", return_value=None):
+        for athlete_id in ("a1", "a2"):
+            run_correlation_sweep_athlete.run(athlete_id, "2026-06-30")
+
+    assert multi.call_count == 2
+    assert multi.call_args.args[1] == ALL_OUTPUT_METRICS
+    single.assert_not_called()
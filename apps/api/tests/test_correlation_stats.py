@@ -0,0 +1,265 @@
+"""
+Sufficient-statistics store (services/intelligence/correlation_stats.py).
+
+1. A built store answers exactly what the lag-correlation kernel computes
+2. Incremental updates (new, dropped and revised days, bucket crossings)
+   land on the same sums as a fresh build
+3. Series (duplicate days included) and payload round-trip
+4. analyze_correlations answers from today's store without re-reading the
+   window, and the sweep's consistency check rebuilds a drifted store
+5. Input writes clear the freshness marker with the result cache
+"""
+from contextlib import ExitStack
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from services import correlation_engine as ce
+from services.intelligence.correlation_stats import (
+    CorrelationStats,
+    _fresh_key,
+    fresh_correlation_stats,
+    load_correlation_stats,
+)
+from services.intelligence.lag_correlation import lag_correlations
+
+REF = datetime(2026, 6, 30, 9)
+
+
+def _series(rng, ref, n_days=90, density=0.7, scale=1.0, offset=0.0):
+    return [
+        (ref.date() - timedelta(days=n_days - i), float(offset + scale * rng.normal()))
+        for i in range(n_days + 1) if rng.random() < density
+    ]
+
+
+def _snapshot(seed, ref=REF):
+    rng = np.random.default_rng(seed)
+    inputs = {f"in{k}": _series(rng, ref) for k in range(12)}
+    inputs["steps"] = _series(rng, ref, scale=3000, offset=9000)
+    inputs["sparse"] = _series(rng, ref, density=0.04)
+    outputs = {"efficiency": _series(rng, ref, density=0.5), "pace_easy": _series(rng, ref, density=0.4)}
+    return inputs, outputs
+
+
+def _next_day(inputs, outputs, days, seed):
+    """Slide the window forward ``days``, revise a few values, drop one."""
+    rng = np.random.default_rng(seed)
+    ref = REF + timedelta(days=days)
+    start = ref.date() - timedelta(days=90)
+
+    def move(series):
+        kept = [(d, v + 1.0 if rng.random() < 0.05 else v) for d, v in series if d >= start]
+        if kept and rng.random() < 0.3:
+            kept.pop(len(kept) // 2)
+        return kept + [(ref.date() - timedelta(days=j), float(rng.normal())) for j in range(days)]
+
+    return {k: move(v) for k, v in inputs.items()}, {k: move(v) for k, v in outputs.items()}, ref
+
+
+def _assert_matches_kernel(stats, inputs, outputs, ref):
+    want = lag_correlations(inputs, outputs, max_lag_days=7, reference_date=ref)
+    got = stats.lag_correlations(list(inputs), list(outputs))
+    np.testing.assert_array_equal(got.n, want.n)
+    np.testing.assert_allclose(got.r, want.r, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(got.p, want.p, rtol=1e-6, atol=1e-12)
+    assert stats.agrees_with(want)
+
+
+class TestStore:
+
+    def test_build_matches_kernel(self):
+        inputs, outputs = _snapshot(1)
+        _assert_matches_kernel(CorrelationStats.build(inputs, outputs, REF), inputs, outputs, REF)
+
+    @pytest.mark.parametrize("days", [1, 3, 40])
+    def test_update_matches_fresh_build(self, days):
+        inputs, outputs = _snapshot(2)
+        stats = CorrelationStats.build(inputs, outputs, REF)
+
+        inputs2, outputs2, ref2 = _next_day(inputs, outputs, days, seed=days)
+        changed = stats.update(inputs2, outputs2, ref2)
+
+        assert changed > 0
+        _assert_matches_kernel(stats, inputs2, outputs2, ref2)
+        rebuilt = CorrelationStats.build(inputs2, outputs2, ref2)
+        assert stats.lag_correlations().r == pytest.approx(rebuilt.lag_correlations().r, abs=1e-9)
+
+    def test_unchanged_snapshot_touches_nothing(self):
+        inputs, outputs = _snapshot(3)
+        stats = CorrelationStats.build(inputs, outputs, REF)
+        before = stats.sums.copy()
+        assert stats.update(inputs, outputs, REF) == 0
+        np.testing.assert_array_equal(stats.sums, before)
+
+    def test_series_and_payload_round_trip(self):
+        inputs, outputs = _snapshot(4)
+        d = outputs["efficiency"][0][0]
+        outputs["efficiency"].insert(1, (d, 7.0))  # two activities on one day
+        stats = CorrelationStats.build(inputs, outputs, REF)
+
+        restored = CorrelationStats.from_payload(stats.to_payload())
+        got_inputs, got_outputs = restored.series()
+
+        assert got_inputs == inputs
+        assert got_outputs == outputs  # both same-day points, with their own values
+        _assert_matches_kernel(restored, inputs, outputs, REF)
+
+    def test_series_follow_update(self):
+        inputs, outputs = _snapshot(5)
+        stats = CorrelationStats.build(inputs, outputs, REF)
+        inputs2, outputs2, ref2 = _next_day(inputs, outputs, 2, seed=5)
+        d = outputs2["efficiency"][-1][0]
+        outputs2["efficiency"].append((d, -3.0))
+
+        stats.update(inputs2, outputs2, ref2)
+
+        assert stats.series() == (inputs2, outputs2)
+
+    def test_old_payload_loads_as_missing(self):
+        stats = CorrelationStats.build(*_snapshot(6), REF)
+        payload = stats.to_payload()
+        payload.pop("version")
+        with patch("core.cache.get_cache", return_value=payload):
+            assert load_correlation_stats(ATH, 90) is None
+
+
+_TODAY = date.today()
+ATH = "7d3c2b1a-0f9e-4d8c-b7a6-5e4d3c2b1a09"
+
+
+def _recent(seed, n=80, follow=None):
+    rng = np.random.default_rng(seed)
+    days = [_TODAY - timedelta(days=n - i) for i in range(n)]
+    if follow is None:
+        return [(d, float(rng.normal())) for d in days]
+    return [(d, 0.8 * v + float(rng.normal(0, 0.4))) for d, v in follow]
+
+
+SLEEP = _recent(1)
+OUTPUTS = {"efficiency": _recent(3, follow=SLEEP), "completion": _recent(5, n=6)}
+METRICS = list(OUTPUTS)
+
+
+@pytest.fixture
+def engine():
+    """Aggregators stubbed and counted; Redis replaced by a dict."""
+    calls = {"daily": 0, "cache": {}}
+
+    def daily(*a, **k):
+        calls["daily"] += 1
+        return {"sleep_hours": list(SLEEP), "empty_signal": []}
+
+    with ExitStack() as stack:
+        enter = stack.enter_context
+        enter(patch.object(ce, "aggregate_daily_inputs", side_effect=daily))
+        for name in ("aggregate_training_load_inputs", "aggregate_activity_level_inputs",
+                     "aggregate_feedback_inputs", "aggregate_training_pattern_inputs",
+                     "aggregate_cross_training_inputs"):
+            enter(patch.object(ce, name, return_value={}))
+        enter(patch.object(ce, "aggregate_daily_session_stress", return_value=[]))
+        enter(patch.object(ce, "aggregate_efficiency_outputs", side_effect=lambda *a: list(OUTPUTS["efficiency"])))
+        enter(patch.object(ce, "aggregate_workout_completion", side_effect=lambda *a: list(OUTPUTS["completion"])))
+        enter(patch("services.correlation_persistence.persist_correlation_findings"))
+        enter(patch("core.cache.get_cache", side_effect=lambda key: calls["cache"].get(key)))
+        enter(patch("core.cache.set_cache", side_effect=lambda key, value, ttl=None: calls["cache"].__setitem__(key, value) or True))
+        yield calls
+
+
+def _drop_results(cache):
+    for metric in METRICS:
+        cache.pop(f"correlations:{ATH}:90:{metric}", None)
+
+
+class TestAnalyzeFromStore:
+
+    def test_sweep_refreshes_store_and_single_metric_reads_it(self, engine):
+        swept = ce.analyze_correlations_for_metrics(ATH, METRICS, days=90, db=MagicMock())
+        assert fresh_correlation_stats(ATH, 90, datetime.now()) is not None
+        _drop_results(engine["cache"])
+
+        answered = {m: ce.analyze_correlations(ATH, days=90, db=MagicMock(), output_metric=m) for m in METRICS}
+
+        assert engine["daily"] == 1  # answered without re-reading the window
+        assert answered["completion"] == swept["completion"]
+        for key in ("correlations", "sample_sizes", "total_correlations_found"):
+            assert answered["efficiency"][key] == swept["efficiency"][key]
+
+    def test_duplicate_days_answer_like_full_path(self, engine):
+        doubled = list(OUTPUTS["efficiency"])
+        for i in range(0, len(doubled), 9):
+            doubled.insert(i + 1, (doubled[i][0], doubled[i][1] - 1.5))
+        with patch.object(ce, "aggregate_efficiency_outputs", side_effect=lambda *a: list(doubled)):
+            ce.analyze_correlations_for_metrics(ATH, METRICS, days=90, db=MagicMock())
+            _drop_results(engine["cache"])
+            from_store = ce.analyze_correlations(ATH, days=90, db=MagicMock(), output_metric="efficiency")
+            _drop_results(engine["cache"])
+            del engine["cache"][_fresh_key(ATH, 90)]
+            full = ce.analyze_correlations(ATH, days=90, db=MagicMock(), output_metric="efficiency")
+
+        assert engine["daily"] == 2
+        for key in ("correlations", "sample_sizes", "total_correlations_found"):
+            assert from_store[key] == full[key]
+
+    def test_invalidated_store_falls_back_to_recompute(self, engine):
+        ce.analyze_correlations_for_metrics(ATH, METRICS, days=90, db=MagicMock())
+        _drop_results(engine["cache"])
+        del engine["cache"][f"correlations:{ATH}:90:stats_fresh"]  # athlete wrote data
+
+        ce.analyze_correlations(ATH, days=90, db=MagicMock(), output_metric="efficiency")
+
+        assert engine["daily"] == 2
+
+    def test_consistency_check_rebuilds_drifted_store(self, engine):
+        ce.analyze_correlations_for_metrics(ATH, METRICS, days=90, db=MagicMock())
+        key = f"correlation_stats:{ATH}:90"
+        drifted = CorrelationStats.from_payload(engine["cache"][key])
+        drifted.sums[5] += 3.0
+        engine["cache"][key] = drifted.to_payload()
+        _drop_results(engine["cache"])
+
+        with patch.object(CorrelationStats, "build", wraps=CorrelationStats.build) as build:
+            ce.analyze_correlations_for_metrics(ATH, METRICS, days=90, db=MagicMock())
+
+        assert build.call_count == 1
+        healed = CorrelationStats.from_payload(engine["cache"][key])
+        inputs, outputs = healed.series()
+        lagged = lag_correlations(
+            ce._testable_inputs(inputs), {"efficiency": outputs["efficiency"]},
+            max_lag_days=7, reference_date=datetime.now(),
+        )
+        assert healed.agrees_with(lagged)
+
+
+class TestInvalidation:
+
+    def test_correlation_invalidation_covers_fresh_marker(self):
+        from fnmatch import fnmatch
+
+        deleted = []
+        redis = MagicMock()
+        redis.keys.side_effect = lambda pattern: [k for k in (_fresh_key(ATH, 90), f"correlation_stats:{ATH}:90") if fnmatch(k, pattern)]
+        redis.delete.side_effect = lambda *keys: deleted.extend(keys) or len(keys)
+        with patch("core.cache.get_redis_client", return_value=redis):
+            from core.cache import invalidate_correlation_cache
+            invalidate_correlation_cache(ATH)
+
+        assert deleted == [_fresh_key(ATH, 90)]
+
+    @pytest.mark.parametrize("existing", [True, False])
+    def test_checkin_write_clears_marker(self, existing):
+        import asyncio
+
+        from routers import daily_checkin
+
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = MagicMock() if existing else None
+        user = MagicMock(id=ATH)
+        body = daily_checkin.DailyCheckinCreate(date=_TODAY, sleep_h=7.5)
+        with patch.object(daily_checkin, "invalidate_correlation_cache") as invalidate, \
+                patch.object(daily_checkin, "_trigger_briefing_refresh"):
+            asyncio.run(daily_checkin.create_or_update_checkin(body, db=db, current_user=user))
+
+        invalidate.assert_called_once_with(ATH)
@@ -0,0 +1,174 @@
+"""
+Nightly correlation sweep fan-out (tasks/correlation_tasks.py).
+
+1. The dispatcher enqueues one subtask per athlete behind a summary chord
+2. Subtasks are idempotent per run date: a retry skips swept athletes,
+   a failed discovery releases its claim
+3. The summary reports duration percentiles, failures and skips
+4. Subtasks route to the dedicated ``correlation`` queue
+5. A soft time limit fails the athlete at once; a subtask that dies
+   still gets a summary through the chord errback
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+
+from tasks import celery_app
+from tasks import correlation_tasks as ct
+
+RUN_DATE = "2026-06-30"
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+    with patch.object(ct, "get_redis_client", return_value=fake), \
+         patch.object(ct, "SessionLocal", return_value=MagicMock()):
+        yield fake
+
+
+def test_dispatcher_fans_out_behind_summary_chord():
+    with patch.object(ct, "chord") as chord, \
+         patch.object(ct, "SessionLocal", return_value=MagicMock()):
+        out = ct.run_daily_correlation_sweep.run(athlete_ids=["a1", "a2", "a3"], run_date=RUN_DATE)
+
+    header = list(chord.call_args.args[0])
+    assert [sig.args for sig in header] == [("a1", RUN_DATE), ("a2", RUN_DATE), ("a3", RUN_DATE)]
+    assert {sig.task for sig in header} == {"tasks.run_correlation_sweep_athlete"}
+    callback = chord.return_value.call_args.args[0]
+    assert callback.task == "tasks.summarize_correlation_sweep"
+    assert callback.args[0] == RUN_DATE
+    [errback] = callback.options["link_error"]
+    assert errback.task == "tasks.recover_correlation_sweep"
+    assert errback.args[0] == RUN_DATE and errback.args[2] == ["a1", "a2", "a3"]
+    assert out == {"run_date": RUN_DATE, "dispatched": 3}
+
+
+def test_dispatcher_with_no_athletes_still_records_run():
+    with patch.object(ct, "chord") as chord, \
+         patch.object(ct, "SessionLocal", return_value=MagicMock()), \
+         patch("core.cache.set_cache"), \
+         patch("tasks.beat_startup_dispatch.record_task_run") as record:
+        ct.SessionLocal.return_value.query.return_value.filter.return_value.distinct.return_value.all.return_value = []
+        summary = ct.run_daily_correlation_sweep.run(run_date=RUN_DATE)
+
+    chord.assert_not_called()
+    record.assert_called_once_with("beat:last_run:daily_correlation_sweep")
+    assert summary["athletes"] == 0
+
+
+def test_rerun_for_same_date_skips_swept_athlete(redis):
+    with patch.object(ct, "_sweep_athlete", return_value=[]) as sweep:
+        first = ct.run_correlation_sweep_athlete.run("a1", RUN_DATE)
+        again = ct.run_correlation_sweep_athlete.run("a1", RUN_DATE)
+        next_day = ct.run_correlation_sweep_athlete.run("a1", "2026-07-01")
+
+    assert sweep.call_count == 2
+    assert first["status"] == "ok"
+    assert again["status"] == "skipped"
+    assert next_day["status"] == "ok"
+    assert redis.store[f"correlation_sweep:{RUN_DATE}:a1"] == "done"
+
+
+def test_failed_discovery_releases_claim(redis):
+    with patch.object(ct, "_sweep_athlete", side_effect=[["discovery"], []]) as sweep:
+        failed = ct.run_correlation_sweep_athlete.run("a1", RUN_DATE)
+        retried = ct.run_correlation_sweep_athlete.run("a1", RUN_DATE)
+
+    assert failed == {"athlete_id": "a1", "status": "failed", "duration_s": failed["duration_s"],
+                      "errors": ["discovery"]}
+    assert retried["status"] == "ok"
+    assert sweep.call_count == 2
+
+
+def test_crash_is_contained(redis):
+    with patch.object(ct, "_sweep_athlete", side_effect=RuntimeError("boom")):
+        out = ct.run_correlation_sweep_athlete.run("a1", RUN_DATE)
+
+    assert out["status"] == "failed"
+    assert f"correlation_sweep:{RUN_DATE}:a1" not in redis.store
+
+
+@pytest.mark.parametrize("timeout_in, done", [("discovery", False), ("lifecycle", True)])
+def test_soft_time_limit_fails_athlete_immediately(redis, timeout_in, done):
+    stages = {
+        "discovery": patch("services.correlation_engine.analyze_correlations_for_metrics"),
+        "lifecycle": patch("services.plan_framework.limiter_classifier.classify_lifecycle_states"),
+    }
+    with stages["discovery"] as discovery, stages["lifecycle"] as lifecycle, \
+         patch("services.plan_framework.limiter_classifier.check_transitions") as transitions, \
+         patch.object(ct, "_run_layer_pass") as layers:
+        {"discovery": discovery, "lifecycle": lifecycle}[timeout_in].side_effect = SoftTimeLimitExceeded()
+        out = ct.run_correlation_sweep_athlete.run("a1", RUN_DATE)
+
+    assert out["status"] == "failed"
+    assert out["errors"] == ["timeout"]
+    transitions.assert_not_called()
+    layers.assert_not_called()
+    # Committed discovery stays marked done so a retry cannot persist twice
+    assert (redis.store.get(f"correlation_sweep:{RUN_DATE}:a1") == "done") is done
+
+
+def test_errback_summarizes_from_markers(redis):
+    redis.store[f"correlation_sweep:{RUN_DATE}:a1"] = "done"
+    redis.store[f"correlation_sweep:{RUN_DATE}:a2"] = "running"  # killed mid-sweep
+
+    stored = {}
+    with patch("core.cache.set_cache", side_effect=lambda k, v, ttl=None: stored.setdefault(k, v)), \
+         patch("tasks.beat_startup_dispatch.record_task_run") as record:
+        summary = ct.recover_correlation_sweep.run("task-id", RUN_DATE, 0.0, ["a1", "a2", "a3"])
+
+    assert summary["ok"] == 1
+    assert summary["failed"] == ["a2", "a3"]
+    assert summary["stage_errors"] == {"a2": ["lost"], "a3": ["lost"]}
+    assert summary["duration_s"] == {}
+    assert stored[f"correlation_sweep:{RUN_DATE}:summary"] == summary
+    record.assert_called_once()
+
+
+def test_summary_percentiles_failures_and_skips():
+    results = [
+        {"athlete_id": f"a{i}", "status": "ok", "duration_s": float(i), "errors": []}
+        for i in range(1, 11)
+    ]
+    results[3] = {"athlete_id": "a4", "status": "failed", "duration_s": 4.0, "errors": ["discovery"]}
+    results.append({"athlete_id": "a11", "status": "skipped", "duration_s": 0.0, "errors": []})
+    results[5]["errors"] = ["layers"]
+
+    stored = {}
+    with patch("core.cache.set_cache", side_effect=lambda k, v, ttl=None: stored.setdefault(k, v)), \
+         patch("tasks.beat_startup_dispatch.record_task_run") as record:
+        summary = ct.summarize_correlation_sweep.run(results, RUN_DATE, 0.0)
+
+    assert summary["athletes"] == 11
+    assert summary["ok"] == 9
+    assert summary["failed"] == ["a4"]
+    assert summary["skipped"] == ["a11"]
+    assert summary["stage_errors"] == {"a4": ["discovery"], "a6": ["layers"]}
+    assert summary["duration_s"] == {"p50": 5.5, "p90": 9.1, "p99": 9.91, "max": 10.0}
+    assert stored[f"correlation_sweep:{RUN_DATE}:summary"] == summary
+    record.assert_called_once()
+
+
+def test_subtasks_route_to_correlation_queue():
+    routes = celery_app.conf.task_routes
+    assert routes["tasks.run_correlation_sweep_athlete"] == {"queue": "correlation"}
+    assert "tasks.run_daily_correlation_sweep" not in routes
@@ -0,0 +1,103 @@
+"""
+Window-sliced multi-window rescan.
+
+run_multiwindow_rescan aggregates the deepest window once and evaluates
+every window as a date slice of it. Each slice must give the result
+analyze_correlations gives when it re-queries that window itself, and the
+experiment rows must carry per-window timing.
+"""
+from contextlib import ExitStack
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+from uuid import UUID
+
+import numpy as np
+import pytest
+
+from services import correlation_engine as ce
+from services.auto_discovery import rescan_loop
+
+_TODAY = date.today()
+ATH = "0f6e3b9a-2c1d-4a7e-8b5f-3d2c1b0a9e87"
+
+
+def _series(seed, n=400, follow=None):
+    rng = np.random.default_rng(seed)
+    days = [_TODAY - timedelta(days=n - i) for i in range(n)]
+    if follow is None:
+        return [(d, float(rng.normal())) for d in days]
+    return [(d, 0.7 * v + float(rng.normal(0, 0.5))) for d, v in follow]
+
+
+SLEEP = _series(1)
+STEPS = _series(2)
+OUTPUTS = {
+    "efficiency": _series(3, follow=SLEEP),
+    "pace_easy": _series(4, follow=STEPS),
+}
+
+
+def _within(series, start):
+    return [(d, v) for d, v in series if d >= start.date()]
+
+
+@pytest.fixture
+def engine():
+    """Aggregators that honour the window start, counted; persistence off."""
+    calls = {"daily": 0}
+
+    def daily(athlete_id, start, end, db):
+        calls["daily"] += 1
+        return {"sleep_hours": _within(SLEEP, start), "garmin_steps": _within(STEPS, start)}
+
+    def outputs_for(metric):
+        return lambda athlete_id, start, end, db, *a: _within(OUTPUTS[metric], start)
+
+    with ExitStack() as stack:
+        enter = stack.enter_context
+        enter(patch.object(ce, "aggregate_daily_inputs", side_effect=daily))
+        for name in ("aggregate_training_load_inputs", "aggregate_activity_level_inputs",
+                     "aggregate_feedback_inputs", "aggregate_training_pattern_inputs",
+                     "aggregate_cross_training_inputs"):
+            enter(patch.object(ce, name, return_value={}))
+        enter(patch.object(ce, "aggregate_daily_session_stress", return_value=[]))
+        enter(patch.object(ce, "aggregate_efficiency_outputs", side_effect=outputs_for("efficiency")))
+        enter(patch.object(ce, "aggregate_pace_at_effort", side_effect=outputs_for("pace_easy")))
+        enter(patch("services.correlation_persistence.persist_correlation_findings"))
+        yield calls
+
+
+@pytest.mark.parametrize("days", [30, 90, 365])
+def test_slice_matches_requeried_window(engine, days):
+    history = ce.load_correlation_history(ATH, list(OUTPUTS), 99999, MagicMock())
+    sliced = ce.analyze_correlation_window(history, days, MagicMock())
+
+    for metric in OUTPUTS:
+        direct = ce.analyze_correlations(ATH, days=days, db=MagicMock(), output_metric=metric, shadow_mode=True)
+        assert sliced[metric]["correlations"] == direct["correlations"], metric
+        assert sliced[metric]["sample_sizes"] == direct["sample_sizes"], metric
+
+
+def test_rescan_aggregates_once(engine, monkeypatch):
+    monkeypatch.setattr(rescan_loop, "ALL_OUTPUT_METRICS", list(OUTPUTS))
+
+    results = rescan_loop.run_multiwindow_rescan(UUID(ATH), MagicMock())
+
+    assert engine["daily"] == 1
+    assert [r["baseline_config"]["window_days"] for r in results] == rescan_loop.RESCAN_WINDOWS_DAYS
+    for row in results:
+        summary = row["result_summary"]
+        assert row["failure_reason"] is None
+        assert set(summary["timing_ms"]) == {"shared_load", "window"}
+        assert summary["timing_ms"]["window"] == row["runtime_ms"]
+    deep = results[-1]["result_summary"]["findings_by_metric"]
+    assert {f["input_name"] for f in deep["efficiency"]} == {"sleep_hours"}
+
+
+def test_load_failure_marks_every_window(monkeypatch):
+    monkeypatch.setattr(ce, "load_correlation_history", MagicMock(side_effect=RuntimeError("db down")))
+
+    results = rescan_loop.run_multiwindow_rescan(UUID(ATH), MagicMock())
+
+    assert len(results) == len(rescan_loop.RESCAN_WINDOWS_DAYS)
+    assert all(r["failure_reason"] == "db down" for r in results)
@@ -0,0 +1,337 @@
+"""Materialized daily training load (services/daily_load).
+
+Reads served from stored AthleteDailyLoad rows plus an in-memory tail must
+equal the full-history single-pass EMA for every stored/dirty/stale state,
+and must only score the tail's activities. The flush listener must record
+the earliest day an activity change touches.
+"""
+import sys
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models import Activity, Athlete, AthleteDailyLoad, AthleteLoadState
+from services import daily_load
+from services.training_load import TrainingLoadCalculator, WorkoutStress
+
+TODAY = date.today()
+
+
+# ---------------------------------------------------------------------------
+# In-memory stand-in for the three tables the read path queries
+# ---------------------------------------------------------------------------
+
+class _Query:
+    def __init__(self, rows):
+        self.rows = list(rows)
+
+    def filter(self, *criteria):
+        rows = self.rows
+        for c in criteria:
+            op, key, value = c.operator, c.left.key, c.right.value
+            rows = [r for r in rows if op(getattr(r, key), value)]
+        return _Query(rows)
+
+    def order_by(self, *_):
+        return _Query(sorted(self.rows, key=lambda r: r.date))
+
+    def all(self):
+        return self.rows
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+
+class _FakeDB:
+    def __init__(self, athlete, state=None, rows=()):
+        self.tables = {Athlete: [athlete], AthleteLoadState: [state] if state else [], AthleteDailyLoad: list(rows)}
+
+    def query(self, model):
+        return _Query(self.tables[model])
+
+
+def _athlete():
+    return SimpleNamespace(id=uuid.uuid4(), max_hr=190, resting_hr=50, threshold_pace_per_km=None)
+
+
+def _activities(athlete_id, first_day, n_days, seed=3):
+    import random
+
+    rng = random.Random(seed)
+    acts = []
+    for i in range(n_days):
+        for k in range(rng.choice([0, 1, 1, 2])):
+            acts.append(SimpleNamespace(
+                id=uuid.uuid4(),
+                athlete_id=athlete_id,
+                start_time=datetime.combine(first_day + timedelta(days=i), datetime.min.time()) + timedelta(hours=6 + k * 6),
+                tss=round(rng.uniform(20, 160), 1),
+            ))
+    return acts
+
+
+class _Harness:
+    """Calculator over fixed activities with stored rows through `stored_through`."""
+
+    def __init__(self, n_days=200, stored_through=None, dirty_from=None, inputs="h1"):
+        self.athlete = _athlete()
+        self.first_day = TODAY - timedelta(days=n_days - 1)
+        self.acts = _activities(self.athlete.id, self.first_day, n_days)
+        self.first_day = self.acts[0].start_time.date()
+        self.scored = []
+
+        calc = TrainingLoadCalculator(None)
+        calc.calculate_workout_tss = self._tss
+        calc._load_activities = self._load
+        full = calc._ema_series(self.first_day, TODAY, *calc._daily_stress(self.acts, self.athlete))
+        self.scored.clear()
+
+        rows, state = [], None
+        if stored_through is not None:
+            rows = [
+                SimpleNamespace(athlete_id=self.athlete.id, **vars(d))
+                for d in full if d.date <= stored_through
+            ]
+            state = SimpleNamespace(
+                athlete_id=self.athlete.id, first_date=self.first_day,
+                computed_through=stored_through, dirty_from=dirty_from, inputs_hash=inputs,
+            )
+        calc.db = _FakeDB(self.athlete, state, rows)
+        self.calc = calc
+
+    def _tss(self, act, athlete):
+        self.scored.append(act.id)
+        return WorkoutStress(
+            activity_id=act.id, date=act.start_time.date(), tss=act.tss,
+            duration_minutes=60, intensity_factor=0.8, calculation_method="estimated",
+        )
+
+    def _load(self, athlete_id, since=None):
+        if since is None:
+            return list(self.acts)
+        return [a for a in self.acts if a.start_time.date() >= since]
+
+    def reference(self):
+        """Full in-memory computation (no materialized state)."""
+        ref = _Harness.__new__(_Harness)
+        ref.__dict__.update(self.__dict__)
+        ref.scored = []
+        calc = TrainingLoadCalculator(_FakeDB(self.athlete))
+        calc.calculate_workout_tss = ref._tss
+        calc._load_activities = ref._load
+        return calc
+
+
+@pytest.fixture(autouse=True)
+def _no_side_effects():
+    with patch.object(daily_load, "inputs_hash", return_value="h1"), \
+         patch.object(daily_load, "enqueue_refresh", return_value=False) as enq:
+        yield enq
+
+
+STATES = {
+    "current": dict(stored_through=TODAY),
+    "stale_10_days": dict(stored_through=TODAY - timedelta(days=10)),
+    "dirty_mid_history": dict(stored_through=TODAY, dirty_from=TODAY - timedelta(days=60)),
+    "dirty_before_window": dict(stored_through=TODAY - timedelta(days=3), dirty_from=TODAY - timedelta(days=150)),
+}
+
+
+class TestMaterializedParity:
+
+    @pytest.mark.parametrize("name", sorted(STATES))
+    def test_target_dates_match_full_history(self, name):
+        h = _Harness(**STATES[name])
+        targets = [TODAY, TODAY - timedelta(days=1), TODAY - timedelta(days=45), h.first_day + timedelta(days=5)]
+        got = h.calc.compute_training_state_history(h.athlete.id, target_dates=targets)
+        want = h.reference().compute_training_state_history(h.athlete.id, target_dates=targets)
+        assert got == want
+
+    @pytest.mark.parametrize("name", sorted(STATES))
+    def test_full_history_matches(self, name):
+        h = _Harness(**STATES[name])
+        got = h.calc.compute_training_state_history(h.athlete.id)
+        assert got == h.reference().compute_training_state_history(h.athlete.id)
+
+    @pytest.mark.parametrize("name", sorted(STATES))
+    def test_load_history_matches(self, name):
+        h = _Harness(**STATES[name])
+        got = h.calc.get_load_history(h.athlete.id, days=90)
+        assert got == h.reference().get_load_history(h.athlete.id, days=90)
+        assert any(d.workout_count for d in got)
+
+    def test_future_target_decays_from_stored_rows(self):
+        h = _Harness(stored_through=TODAY)
+        target = TODAY + timedelta(days=20)
+        got = h.calc.compute_training_state_history(h.athlete.id, target_dates=[target])
+        assert got == h.reference().compute_training_state_history(h.athlete.id, target_dates=[target])
+
+
+class TestReadCost:
+
+    def test_current_series_scores_no_activities(self):
+        h = _Harness(stored_through=TODAY)
+        h.calc.compute_training_state_history(h.athlete.id, target_dates=[TODAY])
+        assert h.scored == []
+
+    def test_only_tail_activities_are_scored(self):
+        dirty = TODAY - timedelta(days=20)
+        h = _Harness(stored_through=TODAY, dirty_from=dirty)
+        h.calc.compute_training_state_history(h.athlete.id, target_dates=[TODAY])
+        tail = [a.id for a in h.acts if a.start_time.date() >= dirty]
+        assert h.scored == tail
+        assert len(tail) < len(h.acts) / 4
+
+    def test_dirty_state_enqueues_refresh(self, _no_side_effects):
+        h = _Harness(stored_through=TODAY, dirty_from=TODAY - timedelta(days=2))
+        h.calc.get_load_history(h.athlete.id, days=30)
+        _no_side_effects.assert_called_with(h.athlete.id)
+
+    def test_current_state_does_not_enqueue(self, _no_side_effects):
+        h = _Harness(stored_through=TODAY)
+        h.calc.get_load_history(h.athlete.id, days=30)
+        _no_side_effects.assert_not_called()
+
+
+class TestFallback:
+
+    def _assert_full_recompute(self, h):
+        got = h.calc.compute_training_state_history(h.athlete.id, target_dates=[TODAY])
+        assert got == h.reference().compute_training_state_history(h.athlete.id, target_dates=[TODAY])
+        assert len(h.scored) == len(h.acts)
+
+    def test_inputs_changed(self):
+        self._assert_full_recompute(_Harness(stored_through=TODAY, inputs="old"))
+
+    def test_dirty_before_first_activity(self):
+        h = _Harness(stored_through=TODAY)
+        h.calc.db.tables[AthleteLoadState][0].dirty_from = date.min
+        self._assert_full_recompute(h)
+
+    def test_missing_rows(self):
+        h = _Harness(stored_through=TODAY)
+        del h.calc.db.tables[AthleteDailyLoad][-5]  # inside the trend window
+        self._assert_full_recompute(h)
+
+    def test_never_materialized(self):
+        self._assert_full_recompute(_Harness())
+
+    def test_refreshed_without_activities(self):
+        athlete = _athlete()
+        state = SimpleNamespace(
+            athlete_id=athlete.id, first_date=None, computed_through=TODAY,
+            dirty_from=None, inputs_hash="h1",
+        )
+        calc = TrainingLoadCalculator(_FakeDB(athlete, state))
+        calc._load_activities = lambda *a, **k: pytest.fail("no activity query expected")
+        assert calc.compute_training_state_history(athlete.id) == {}
+
+
+# ---------------------------------------------------------------------------
+# Dirty tracking
+# ---------------------------------------------------------------------------
+
+def _persistent_activity(session, start_time, **kw):
+    act = Activity(
+        id=uuid.uuid4(), athlete_id=kw.pop("athlete_id", uuid.uuid4()),
+        start_time=start_time, sport="run", is_duplicate=False, duration_s=3600, **kw,
+    )
+    make_transient_to_detached(act)
+    session.add(act)
+    return act
+
+
+class TestTouchedDays:
+
+    def test_new_activity(self):
+        session = Session()
+        t = datetime(2026, 5, 3, 7, tzinfo=timezone.utc)
+        act = Activity(athlete_id=uuid.uuid4(), start_time=t, sport="run")
+        session.add(act)
+        assert daily_load._touched_days(session) == {act.athlete_id: date(2026, 5, 3)}
+
+    def test_moved_activity_marks_earlier_of_old_and_new(self):
+        session = Session()
+        act = _persistent_activity(session, datetime(2026, 5, 10, 7))
+        act.start_time = datetime(2026, 5, 12, 7)
+        assert daily_load._touched_days(session) == {act.athlete_id: date(2026, 5, 10)}
+
+    def test_flagged_duplicate(self):
+        session = Session()
+        act = _persistent_activity(session, datetime(2026, 5, 10, 7))
+        act.is_duplicate = True
+        assert daily_load._touched_days(session) == {act.athlete_id: date(2026, 5, 10)}
+
+    def test_unrelated_column_change_ignored(self):
+        session = Session()
+        act = _persistent_activity(session, datetime(2026, 5, 10, 7))
+        act.temperature_f = 71.0
+        assert daily_load._touched_days(session) == {}
+
+    def test_earliest_day_per_athlete(self):
+        session = Session()
+        aid = uuid.uuid4()
+        for d in (14, 9, 11):
+            session.add(Activity(athlete_id=aid, start_time=datetime(2026, 5, d, 7), sport="run"))
+        assert daily_load._touched_days(session) == {aid: date(2026, 5, 9)}
+
+
+# ---------------------------------------------------------------------------
+# Refresh against the database
+# ---------------------------------------------------------------------------
+
+class TestRefresh:
+
+    def _athlete_with_runs(self, db_session, n_days=60):
+        athlete = Athlete(
+            email=f"daily_load_{uuid.uuid4()}@example.com",
+            display_name="Daily Load",
+            subscription_tier="free",
+            max_hr=188,
+            resting_hr=52,
+        )
+        db_session.add(athlete)
+        db_session.commit()
+        start = datetime.now(timezone.utc) - timedelta(days=n_days)
+        for i in range(0, n_days, 2):
+            db_session.add(Activity(
+                athlete_id=athlete.id, name="Run", start_time=start + timedelta(days=i),
+                sport="run", source="manual", duration_s=3000 + 60 * (i % 7),
+                distance_m=9000, avg_hr=140 + i % 15,
+            ))
+        db_session.commit()
+        return athlete
+
+    def _reference(self, db_session, athlete_id):
+        calc = TrainingLoadCalculator(db_session)
+        with patch.object(daily_load, "load_series", side_effect=lambda c, a, s, e: daily_load._full_series(c, a, s, e)):
+            return calc.compute_training_state_history(athlete_id)
+
+    def test_refresh_then_incremental_edit(self, db_session, _no_side_effects):
+        daily_load.register_listeners()
+        athlete = self._athlete_with_runs(db_session)
+        with patch.object(daily_load, "inputs_hash", return_value="h1"):
+            daily_load.refresh_athlete(db_session, athlete.id)
+            state = db_session.query(AthleteLoadState).filter_by(athlete_id=athlete.id).one()
+            assert state.dirty_from is None and state.computed_through >= TODAY
+
+            calc = TrainingLoadCalculator(db_session)
+            assert calc.compute_training_state_history(athlete.id) == self._reference(db_session, athlete.id)
+
+            act = db_session.query(Activity).filter_by(athlete_id=athlete.id).order_by(Activity.start_time).all()[10]
+            act.is_duplicate = True
+            db_session.flush()
+            db_session.refresh(state)
+            assert state.dirty_from == act.start_time.date()
+            assert calc.compute_training_state_history(athlete.id) == self._reference(db_session, athlete.id)
+
+            result = daily_load.refresh_athlete(db_session, athlete.id)
+            assert result["full"] is False
+            assert calc.compute_training_state_history(athlete.id) == self._reference(db_session, athlete.id)
@@ -103,7 +103,7 @@ def test_refresh_living_fingerprint_runs_campaign_detection(monkeypatch):
     store_mock = MagicMock(return_value=1)
 
     monkeypatch.setattr(intelligence_tasks, "get_db_sync", _fake_get_db_sync)
-    monkeypatch.setattr("services.race_input_analysis.mine_race_inputs", lambda aid, db: ([], []))
+    monkeypatch.setattr("services.race_input_analysis.mine_race_inputs", lambda aid, db, **k: ([], []))
     monkeypatch.setattr("services.campaign_detection.detect_inflection_points", detect_mock)
     monkeypatch.setattr("services.campaign_detection.build_campaigns", build_mock)
     monkeypatch.setattr("services.campaign_detection.store_campaign_data_on_events", store_mock)
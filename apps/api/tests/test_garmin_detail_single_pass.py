@@ -0,0 +1,174 @@
+"""Single-pass Garmin detail adapter — parity and scaling.
+
+adapt_activity_detail_samples / adapt_activity_detail_laps now read the
+samples list once (DetailSamples) and slice laps and split windows by
+binary search over the sorted time offsets. Output must be identical to
+the previous per-lap rescan, which produced fixtures/garmin_detail_golden.json
+from the seeded payloads below (regenerate with
+`python tests/test_garmin_detail_single_pass.py --regenerate` only when the
+adapter's output is meant to change).
+"""
+import hashlib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services.sync.garmin_adapter import (
+    DetailSamples,
+    adapt_activity_detail_laps,
+    adapt_activity_detail_samples,
+)
+
+GOLDEN_PATH = Path(__file__).resolve().parent / "fixtures" / "garmin_detail_golden.json"
+START_UNIX = 1_760_000_000
+
+
+def _payload(seed, n_samples, n_laps, *, shuffle=False, dup_every=0, sparse=0.0,
+             lap_aggregates=False, float_ts=False, no_laps=False, pause_at=None):
+    rng = random.Random(seed)
+    samples, ts, dist, elev = [], START_UNIX, 0.0, 200.0
+    for i in range(n_samples):
+        if pause_at and i in pause_at:
+            ts += rng.randint(20, 300)
+        speed = max(0.0, rng.gauss(3.2, 0.4))
+        dist += speed
+        elev += rng.gauss(0, 0.6)
+        s = {
+            "startTimeInSeconds": ts + (0.4 if float_ts and i % 7 == 0 else 0),
+            "heartRate": rng.randint(120, 185),
+            "stepsPerMinute": rng.choice([rng.randint(150, 190), float(rng.randint(150, 190)) + 0.5]),
+            "speedMetersPerSecond": round(speed, 3),
+            "elevationInMeters": round(elev, 1),
+            "totalDistanceInMeters": round(dist, 1),
+            "latitudeInDegree": 45.0 + i * 1e-5,
+            "longitudeInDegree": -122.0 - i * 1e-5,
+            "powerInWatts": rng.randint(200, 320),
+        }
+        for key in list(s):
+            if key != "startTimeInSeconds" and rng.random() < sparse:
+                del s[key]
+        if sparse and rng.random() < sparse / 4:
+            s.pop("startTimeInSeconds")
+        samples.append(s)
+        if dup_every and i % dup_every == 0:
+            samples.append(dict(s))
+        ts += rng.choice([1, 1, 1, 2, 5])
+    if shuffle:
+        rng.shuffle(samples)
+
+    laps = None
+    if not no_laps:
+        span = ts - START_UNIX
+        starts = sorted(rng.sample(range(START_UNIX + 1, ts), n_laps - 1)) if n_laps > 1 else []
+        laps = [{"startTimeInSeconds": START_UNIX}] + [{"startTimeInSeconds": t} for t in starts]
+        if lap_aggregates:
+            for k, lap in enumerate(laps):
+                if k % 2 == 0:
+                    lap["totalDistanceInMeters"] = 1000.0
+                    lap["timerDurationInSeconds"] = 300
+                    lap["averageHeartRateInBeatsPerMinute"] = 150
+        laps.append({"totalDistanceInMeters": 5.0})  # no start time: dropped
+        rng.shuffle(laps)
+        assert span > 0
+    return {"activityId": seed, "summaryId": f"s-{seed}", "laps": laps, "samples": samples}
+
+
+CASES = {
+    "easy_10k": dict(seed=1, n_samples=3000, n_laps=7),
+    "ultra_400_laps": dict(seed=2, n_samples=40000, n_laps=400),
+    "unsorted_samples": dict(seed=3, n_samples=2000, n_laps=12, shuffle=True),
+    "duplicate_timestamps": dict(seed=4, n_samples=1500, n_laps=5, dup_every=9),
+    "sparse_fields": dict(seed=5, n_samples=2500, n_laps=8, sparse=0.1),
+    "lap_aggregates": dict(seed=6, n_samples=2000, n_laps=6, lap_aggregates=True),
+    "float_timestamps": dict(seed=7, n_samples=1800, n_laps=6, float_ts=True),
+    "no_laps_mile_splits": dict(seed=8, n_samples=6000, n_laps=0, no_laps=True, pause_at={1000, 4000}),
+    "no_laps_unsorted": dict(seed=9, n_samples=2500, n_laps=0, no_laps=True, shuffle=True, sparse=0.05),
+    "single_lap": dict(seed=10, n_samples=900, n_laps=1),
+}
+
+
+def _adapt(payload, start_unix=START_UNIX):
+    stream = adapt_activity_detail_samples(payload["samples"], start_unix)
+    return {
+        # Channel arrays of a 40k-sample ultra are too large to store
+        "stream_sha256": hashlib.sha256(json.dumps(stream, sort_keys=True).encode()).hexdigest(),
+        "laps": adapt_activity_detail_laps(payload, payload["samples"]),
+    }
+
+
+@pytest.fixture(scope="module")
+def golden():
+    with open(GOLDEN_PATH) as f:
+        return json.load(f)
+
+
+class TestGoldenParity:
+
+    def test_every_case_has_a_golden(self, golden):
+        assert set(golden) == set(CASES)
+
+    @pytest.mark.parametrize("name", sorted(CASES))
+    def test_output_matches_golden(self, golden, name):
+        # Round-trip through JSON so tuples/ints compare like the stored file
+        assert json.loads(json.dumps(_adapt(_payload(**CASES[name])))) == golden[name]
+
+    @pytest.mark.parametrize("name", sorted(CASES))
+    def test_shared_index_matches_raw_list(self, name):
+        payload = _payload(**CASES[name])
+        detail = DetailSamples(payload["samples"])
+        assert adapt_activity_detail_samples(detail, START_UNIX) == adapt_activity_detail_samples(payload["samples"], START_UNIX)
+        assert adapt_activity_detail_laps(payload, detail) == adapt_activity_detail_laps(payload, payload["samples"])
+
+
+class TestDetailSamples:
+
+    def test_window_keeps_sample_order(self):
+        samples = [{"startTimeInSeconds": t} for t in (5, 1, 3, 2, 4)]
+        detail = DetailSamples(samples)
+        assert detail.window(2, 5) == [2, 3, 4]
+        assert detail.window(2, None) == [0, 2, 3, 4]
+
+    def test_window_sorted_input(self):
+        detail = DetailSamples([{"startTimeInSeconds": t} for t in range(10)])
+        assert detail.window(3, 6) == [3, 4, 5]
+        assert detail.window(20, None) == []
+
+    def test_samples_without_timestamp_never_in_windows(self):
+        detail = DetailSamples([{"heartRate": 150}, {"startTimeInSeconds": 1}])
+        assert detail.window(0, None) == [1]
+
+    def test_empty(self):
+        detail = DetailSamples([])
+        assert len(detail) == 0
+        assert adapt_activity_detail_samples(detail) == {}
+
+
+class TestScaling:
+
+    def test_ultra_lap_slicing_is_not_quadratic(self):
+        payload = _payload(**CASES["ultra_400_laps"])
+        start = time.perf_counter()
+        laps = adapt_activity_detail_laps(payload, payload["samples"])
+        elapsed = time.perf_counter() - start
+        assert len(laps) == 400
+        # The per-lap rescan took over a second here (400 laps × 40k
+        # samples); one pass + bisect is a few tens of milliseconds.
+        assert elapsed < 1.0
+
+
+def _regenerate():
+    golden = {name: json.loads(json.dumps(_adapt(_payload(**kw)))) for name, kw in CASES.items()}
+    with open(GOLDEN_PATH, "w") as f:
+        json.dump(golden, f, sort_keys=True, separators=(",", ":"))
+        f.write("\n")
+    print(f"wrote {len(golden)} cases to {GOLDEN_PATH}")
+
+
+if __name__ == "__main__" and "--regenerate" in sys.argv:
+    _regenerate()
@@ -0,0 +1,170 @@
+"""
+OLS Granger causality (services/intelligence/causal_attribution.py).
+
+1. F-statistic and p-value match an explicit least-squares fit of the
+   restricted and unrestricted lag models
+2. A true leading input is detected, an independent one is not
+3. A batch over many inputs equals testing each input alone
+4. Degenerate inputs (lag 0, constant series, short series) are not
+   significant and do not raise
+5. Benchmark (``-m perf``): faster than the approximate RSS it replaced
+   at lag 7 over 365 days
+"""
+import time
+
+import numpy as np
+import pytest
+from scipy.stats import f as f_dist
+
+from services.intelligence.causal_attribution import (
+    CausalAttributionEngine,
+    READINESS_INPUTS,
+    TimeSeries,
+    granger_causality_batch,
+    granger_causality_test,
+)
+
+
+def _lstsq_reference(cause, effect, lag):
+    y_all, x_all = np.asarray(effect, float), np.asarray(cause, float)
+    n = len(y_all)
+    y = y_all[lag:]
+    own = [y_all[lag - i: n - i] for i in range(1, lag + 1)]
+    other = [x_all[lag - i: n - i] for i in range(1, lag + 1)]
+
+    def rss(cols):
+        X = np.column_stack([np.ones(len(y))] + cols)
+        beta = np.linalg.lstsq(X, y, rcond=None)[0]
+        return float(((y - X @ beta) ** 2).sum())
+
+    df2 = len(y) - (2 * lag + 1)
+    f_stat = ((rss(own) - rss(own + other)) / lag) / (rss(own + other) / df2)
+    return f_stat, float(f_dist.sf(f_stat, lag, df2))
+
+
+def _leading_pair(n=365, lead=2, strength=0.6, seed=0):
+    rng = np.random.default_rng(seed)
+    cause = rng.normal(size=n)
+    effect = np.zeros(n)
+    for t in range(n):
+        effect[t] = 0.3 * effect[t - 1] if t else 0.0
+        effect[t] += (strength * cause[t - lead] if t >= lead else 0.0) + rng.normal(0, 0.5)
+    return cause.tolist(), effect.tolist()
+
+
+@pytest.mark.parametrize("lag", [1, 3, 7])
+def test_matches_explicit_least_squares(lag):
+    cause, effect = _leading_pair(n=120, seed=lag)
+    f_stat, p_value, is_sig = granger_causality_test(cause, effect, lag)
+    want_f, want_p = _lstsq_reference(cause, effect, lag)
+    assert f_stat == pytest.approx(want_f, rel=1e-8)
+    assert p_value == pytest.approx(want_p, rel=1e-6, abs=1e-300)
+    assert is_sig == (want_p < 0.05)
+
+
+def test_detects_leading_input_only():
+    cause, effect = _leading_pair(seed=1)
+    noise = np.random.default_rng(2).normal(size=len(effect)).tolist()
+
+    results = granger_causality_batch({"lead": cause, "noise": noise}, effect, 3)
+
+    assert results["lead"][2] is True
+    assert results["lead"][1] < 1e-6
+    assert results["noise"][1] > 0.01
+
+
+def test_batch_equals_individual_tests():
+    _, effect = _leading_pair(seed=3)
+    rng = np.random.default_rng(4)
+    causes = {f"in{k}": rng.normal(size=len(effect)).tolist() for k in range(20)}
+
+    batch = granger_causality_batch(causes, effect, 7)
+
+    for name, cause in causes.items():
+        single = granger_causality_test(cause, effect, 7)
+        assert batch[name][0] == pytest.approx(single[0], rel=1e-9)
+        assert batch[name][1] == pytest.approx(single[1], rel=1e-9)
+
+
+@pytest.mark.parametrize("cause, effect, lag", [
+    ([1.0, 2.0, 3.0, 4.0, 5.0, 6.0], [2.0, 1.0, 4.0, 3.0, 6.0, 5.0], 0),
+    ([1.0] * 40, list(np.random.default_rng(5).normal(size=40)), 3),
+    (list(np.random.default_rng(6).normal(size=40)), [2.0] * 40, 3),
+    ([1.0, 2.0, 3.0, 4.0, 5.0, 6.0], [2.0, 1.0, 4.0, 3.0, 6.0, 5.0], 3),
+])
+def test_degenerate_inputs_are_not_significant(cause, effect, lag):
+    f_stat, p_value, is_sig = granger_causality_test(cause, effect, lag)
+    assert not is_sig
+    assert p_value == 1.0 or f_stat == 0.0 or p_value > 0.05
+
+
+def test_engine_lag_scan_covers_true_lead():
+    from datetime import date, timedelta
+
+    rng = np.random.default_rng(8)
+    sleep = rng.normal(size=130)
+    days = [date(2026, 1, 1) + timedelta(days=i) for i in range(130)]
+    output = TimeSeries("efficiency", days[10:], [
+        float(1.5 * sleep[i - 4] + rng.normal(0, 0.3)) for i in range(10, 130)
+    ])
+    inputs = {
+        "sleep_hours": TimeSeries("sleep_hours", days, sleep.tolist()),
+        "stress": TimeSeries("stress", days, rng.normal(size=130).tolist()),
+    }
+
+    best = CausalAttributionEngine._best_granger_lags(inputs, output, READINESS_INPUTS)
+
+    (f_stat, p_value, is_sig), lag = best["sleep_hours"]
+    assert is_sig
+    assert lag + 1 <= 4 <= lag + min(lag, 3)  # cause lags tested at this alignment
+    assert best["stress"][0][1] > p_value
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def _approximate_granger(cause, effect, lag):
+    """The approximate-RSS test this module used before the OLS rewrite."""
+    def rss(y, features):
+        n = len(y)
+        mean_y = sum(y) / n
+        predictions = [mean_y] * n
+        for feature in features:
+            mean_f = sum(feature) / n
+            var_f = sum((f - mean_f) ** 2 for f in feature)
+            if var_f == 0:
+                continue
+            beta = sum((f - mean_f) * (yi - mean_y) for f, yi in zip(feature, y)) / var_f
+            for i in range(n):
+                predictions[i] += beta * (feature[i] - mean_f) / len(features)
+        return sum((yi - p) ** 2 for yi, p in zip(y, predictions))
+
+    n = len(effect)
+    y = effect[lag:]
+    effect_lags = [effect[lag - i: n - i] for i in range(1, lag + 1)]
+    cause_lags = [cause[lag - i: n - i] for i in range(1, lag + 1)]
+    rss_r, rss_u = rss(y, effect_lags), rss(y, effect_lags + cause_lags)
+    df2 = len(y) - (2 * lag + 1)
+    return max(0.0, ((rss_r - rss_u) / lag) / (rss_u / df2))
+
+
+@pytest.mark.perf
+def test_ols_batch_faster_than_approximate_rss_at_lag_7_over_365_days():
+    """20 inputs, lag 7, 365 days → batched OLS median at least 2x faster."""
+    _, effect = _leading_pair(seed=9)
+    rng = np.random.default_rng(10)
+    causes = {f"in{k}": rng.normal(size=365).tolist() for k in range(20)}
+
+    def timed(fn, runs=5):
+        fn()  # warm-up (discarded)
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return float(np.median(timings))
+
+    approx = timed(lambda: [_approximate_granger(c, effect, 7) for c in causes.values()])
+    ols = timed(lambda: granger_causality_batch(causes, effect, 7))
+    assert ols * 2 <= approx, f"ols={ols * 1000:.1f}ms approximate={approx * 1000:.1f}ms"
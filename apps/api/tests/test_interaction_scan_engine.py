@@ -0,0 +1,127 @@
+"""
+Matrix engine for the AutoDiscovery interaction scan.
+
+_find_interactions must reproduce the set-intersection scan it replaced:
+same tested pairs in the same order, same ranked top-N with the same
+effect sizes, means and group sizes. Triples are checked against the same
+reference extended to three factors.
+"""
+import math
+import time
+from datetime import date, timedelta
+from itertools import combinations
+from statistics import mean, stdev
+
+import numpy as np
+import pytest
+
+from services.auto_discovery.interaction_loop import (
+    _find_interactions,
+    _find_pairwise_interactions,
+)
+
+START = date(2025, 1, 1)
+
+
+def _reference(all_inputs, output_dict, output_metric, min_group, min_effect, top_n, order=2):
+    """The original per-pair set loop, generalised to ``order`` factors."""
+    splits = {}
+    for name, data in all_inputs.items():
+        if len(data) < min_group * 2:
+            continue
+        values = [v for _, v in data]
+        median_val = sorted(values)[len(values) // 2]
+        splits[name] = {
+            "high": {d for d, v in data if v >= median_val},
+            "low": {d for d, v in data if v < median_val},
+        }
+
+    results, tested = [], []
+    for factors in combinations(list(splits), order):
+        all_high = set.intersection(*(splits[f]["high"] for f in factors))
+        all_low = set.intersection(*(splits[f]["low"] for f in factors))
+        eff_high = [output_dict[d] for d in all_high if d in output_dict]
+        eff_low = [output_dict[d] for d in all_low if d in output_dict]
+        if len(eff_high) < min_group or len(eff_low) < min_group:
+            continue
+        tested.append(factors)
+        pooled = math.sqrt((stdev(eff_high) ** 2 + stdev(eff_low) ** 2) / 2)
+        effect = (mean(eff_high) - mean(eff_low)) / pooled if pooled > 0 else 0.0
+        if abs(effect) < min_effect:
+            continue
+        results.append({
+            "factors": list(factors),
+            "effect_size": round(effect, 3),
+            "mean_high": round(mean(eff_high), 4),
+            "mean_low": round(mean(eff_low), 4),
+            "n_high": len(eff_high),
+            "n_low": len(eff_low),
+        })
+    results.sort(key=lambda x: abs(x["effect_size"]), reverse=True)
+    return results[:top_n], tested
+
+
+def _data(n_inputs, n_days=180, seed=0):
+    rng = np.random.default_rng(seed)
+    days = [START + timedelta(days=i) for i in range(n_days)]
+    inputs = {}
+    for k in range(n_inputs):
+        density = rng.uniform(0.3, 1.0)
+        inputs[f"in{k}"] = [(d, float(rng.normal())) for d in days if rng.random() < density]
+    drivers = [dict(inputs["in0"]), dict(inputs["in1"])]
+    output = {
+        d: float(rng.normal()) + sum(0.8 * (drv.get(d, 0.0) > 0) for drv in drivers)
+        for d in days if rng.random() < 0.7
+    }
+    return inputs, output
+
+
+_KEYS = ("factors", "effect_size", "mean_high", "mean_low", "n_high", "n_low")
+
+
+@pytest.mark.parametrize("metric", ["efficiency", "pace_easy"])
+def test_pairwise_matches_set_scan(metric):
+    inputs, output = _data(25)
+    want, want_tested = _reference(inputs, output, metric, 5, 0.2, 10_000)
+
+    got = _find_pairwise_interactions(inputs, output, metric, 5, 0.2, 10_000)
+
+    assert got["tested_pairs"] == want_tested
+    assert [{k: r[k] for k in _KEYS} for r in got["top_interactions"]] == want
+    assert got["top_interactions"][0]["condition"] == "both_high"
+
+
+def test_top_n_and_constant_groups():
+    days = [START + timedelta(days=i) for i in range(40)]
+    inputs = {
+        "a": [(d, float(i % 2)) for i, d in enumerate(days)],
+        "b": [(d, float(i % 2)) for i, d in enumerate(days)],
+        "c": [(d, float(i % 3)) for i, d in enumerate(days)],
+    }
+    output = {d: 1.0 for d in days}  # constant: every pooled SD is zero
+
+    got = _find_pairwise_interactions(inputs, output, "efficiency", 3, 0.0, 2)
+    want, want_tested = _reference(inputs, output, "efficiency", 3, 0.0, 2)
+
+    assert got["tested_pairs"] == want_tested
+    assert [{k: r[k] for k in _KEYS} for r in got["top_interactions"]] == want
+    assert all(r["effect_size"] == 0.0 for r in got["top_interactions"])
+
+
+def test_triples_match_set_scan():
+    inputs, output = _data(12, seed=3)
+    want, want_tested = _reference(inputs, output, "efficiency", 4, 0.3, 10_000, order=3)
+
+    got = _find_interactions(inputs, output, "efficiency", 4, 0.3, 10_000, order=3)
+
+    assert got["tested_pairs"] == want_tested
+    assert [{k: r[k] for k in _KEYS} for r in got["top_interactions"]] == want
+    assert got["top_interactions"][0]["condition"] == "all_high"
+
+
+def test_triple_scan_over_many_inputs_is_fast():
+    inputs, output = _data(80, n_days=365, seed=4)
+    t = time.perf_counter()
+    got = _find_interactions(inputs, output, "efficiency", 5, 0.5, 10, order=3)
+    assert time.perf_counter() - t < 10.0
+    assert len(got["top_interactions"]) == 10
@@ -0,0 +1,237 @@
+"""
+Data-version-keyed investigation cache (services/investigation_cache.py).
+
+1. A repeat run with unchanged data versions serves every investigation
+   from the cache without loading the athlete's data
+2. A changed source recomputes only the investigations that declare it,
+   and every investigation declares the sources its code reads; data
+   versions hash every column the investigations read
+3. A changed param override recomputes only that investigation
+4. Failed runs are not cached; no versions or no Redis means no caching
+"""
+import ast
+import inspect
+import json
+import textwrap
+from collections import defaultdict
+from dataclasses import asdict
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services import investigation_cache as ic
+from services import race_input_analysis as ria
+from tests.test_investigation_snapshot import ATH, ZONES, _athlete, _Db
+
+VERSIONS = ("a1", "s1", "e1", "c1", "0")
+
+
+class FakeRedis:
+    """Hashes only, with a pipeline that replays calls on execute()."""
+
+    def __init__(self):
+        self.hashes = defaultdict(dict)
+
+    def pipeline(self):
+        redis, calls = self, []
+
+        class _Pipe:
+            def __getattr__(self, name):
+                return lambda *a, **k: calls.append((name, a, k))
+
+            def execute(self):
+                return [getattr(redis, name)(*a, **k) for name, a, k in calls]
+
+        return _Pipe()
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hset(self, key, mapping):
+        self.hashes[key].update(mapping)
+
+    def expire(self, key, ttl):
+        return True
+
+
+@pytest.fixture(scope="module")
+def data():
+    return _athlete()
+
+
+@pytest.fixture
+def mine(data):
+    redis = FakeRedis()
+    overrides = {}
+
+    def run(versions=VERSIONS, **kwargs):
+        db = _Db(*data)
+        db.versions = versions
+        with patch.object(ria, "load_training_zones", return_value=ZONES), \
+             patch("core.cache.get_redis_client", return_value=redis), \
+             patch("services.auto_discovery.tuning_loop.get_active_param_overrides_by_investigation",
+                   return_value=dict(overrides)):
+            return ria.mine_race_inputs_report(ATH, db, **kwargs), db
+
+    run.redis, run.overrides = redis, overrides
+    return run
+
+
+def _normalised(findings):
+    return json.loads(json.dumps([asdict(f) for f in findings], default=str))
+
+
+def _statuses(report):
+    return {r.name: r.status for r in report.runs}
+
+
+def test_repeat_run_is_served_from_cache(mine):
+    first, _ = mine()
+    again, db = mine()
+
+    assert set(_statuses(first).values()) == {"ok"}
+    assert set(_statuses(again).values()) == {"cached"}
+    assert db.queried["Activity"] == 0 and db.queried["ActivitySplit"] == 0
+    assert _normalised(again.findings) == _normalised(first.findings)
+    assert again.honest_gaps == first.honest_gaps
+    assert again.timing_summary()["cached"] == [r.name for r in first.runs]
+
+
+def test_changed_source_recomputes_only_its_readers(mine):
+    first, _ = mine()
+    changed, db = mine(versions=("a1", "s2", "e1", "c1", "0"))
+
+    statuses = _statuses(changed)
+    specs = {s.name: s for s in ria.INVESTIGATION_REGISTRY}
+    for name, status in statuses.items():
+        reads_splits = name not in specs or "activity_split" in specs[name].sources
+        assert status == ("ok" if reads_splits else "cached"), name
+    assert "cached" in statuses.values() and "ok" in statuses.values()
+    assert db.queried["Activity"] == 1  # plan depends on every source
+    assert _normalised(changed.findings) == _normalised(first.findings)
+
+
+def test_changed_races_recompute_race_readers(mine):
+    mine()
+    changed, _ = mine(versions=("a1", "s1", "e2", "c1", "0"))
+
+    specs = {s.name: s for s in ria.INVESTIGATION_REGISTRY}
+    for name, status in _statuses(changed).items():
+        reads_races = name not in specs or "performance_event" in specs[name].sources
+        assert status == ("ok" if reads_races else "cached"), name
+    assert _statuses(changed)["investigate_race_execution"] == "ok"
+
+
+# Names and attributes in an investigation's code that read each source.
+_SOURCE_READS = {
+    "performance_event": ({"races", "events", "PerformanceEvent"}, {"races"}),
+    "activity_split": ({"ActivitySplit"}, {"splits"}),
+    "daily_checkin": ({"DailyCheckin"}, {"checkin_dates", "checkin_hrv", "checkin_rpe"}),
+    "activity_stream": ({"ActivityStream"}, set()),
+}
+_MODULE_FUNCS = {
+    node.name: node for node in ast.parse(inspect.getsource(ria)).body
+    if isinstance(node, ast.FunctionDef)
+}
+
+
+def _read_sources(fn_node, seen=None):
+    """Sources read by a function body (annotations excluded), following module helpers."""
+    seen = set() if seen is None else seen
+    names, attrs = set(), set()
+    for node in ast.walk(ast.Module(body=fn_node.body, type_ignores=[])):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            names.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            attrs.add(node.attr)
+    read = {
+        source for source, (by_name, by_attr) in _SOURCE_READS.items()
+        if names & by_name or attrs & by_attr
+    }
+    for helper in names & set(_MODULE_FUNCS) - seen:
+        if not helper.startswith(("investigate_", "detect_")):
+            seen.add(helper)
+            read |= _read_sources(_MODULE_FUNCS[helper], seen)
+    return read
+
+
+@pytest.mark.parametrize("spec", ria.INVESTIGATION_REGISTRY, ids=lambda s: s.name)
+def test_declared_sources_cover_what_each_investigation_reads(spec):
+    fn_node = ast.parse(textwrap.dedent(inspect.getsource(spec.fn))).body[0]
+    assert _read_sources(fn_node) <= set(spec.sources), spec.name
+    assert set(spec.sources) <= set(ic.DATA_VERSION_SOURCES), spec.name
+
+
+@pytest.mark.parametrize("table", sorted(ic.INVESTIGATED_COLUMNS))
+def test_data_versions_hash_every_investigated_column(table):
+    from models import Activity, ActivitySplit, DailyCheckin
+
+    model = {"activity": Activity, "activity_split": ActivitySplit, "daily_checkin": DailyCheckin}[table]
+    columns = {column.key for column in model.__table__.columns}
+    tree = ast.parse(inspect.getsource(ria))
+    read = {node.attr for node in ast.walk(tree) if isinstance(node, ast.Attribute)}
+    if table == "activity":
+        read |= set(ria._ACTIVITY_COLUMNS)
+    read.discard("athlete_id")  # query filter, fixed per athlete
+
+    hashed = set(ic.INVESTIGATED_COLUMNS[table])
+    assert hashed <= columns
+    assert read & columns <= hashed
+
+
+def test_source_check_catches_undeclared_race_reader():
+    reader = ast.parse(textwrap.dedent("""
+        def investigate_x(athlete_id, db, zones, races: List[PerformanceEvent], snapshot=None):
+            return [r.distance_m for r in races]
+    """)).body[0]
+    annotated_only = ast.parse(textwrap.dedent("""
+        def investigate_y(athlete_id, db, zones, events: List[PerformanceEvent], snapshot=None):
+            return snapshot.activities()
+    """)).body[0]
+    assert _read_sources(reader) == {"performance_event"}
+    assert _read_sources(annotated_only) == set()
+
+
+def test_changed_override_recomputes_only_that_investigation(mine):
+    mine()
+    mine.overrides["investigate_race_execution"] = {"min_activities": 5}
+
+    report, _ = mine()
+
+    assert [n for n, s in _statuses(report).items() if s != "cached"] == ["investigate_race_execution"]
+
+
+def test_failed_runs_are_not_cached(mine):
+    with patch.object(ria, "detect_weekly_patterns", side_effect=RuntimeError("boom")):
+        failed, _ = mine()
+    assert _statuses(failed)["detect_weekly_patterns"] == "error"
+    assert "Weekly pattern detection: encountered an error" in failed.honest_gaps
+
+    retried, _ = mine()
+    assert _statuses(retried)["detect_weekly_patterns"] == "ok"
+    assert "Weekly pattern detection: encountered an error" not in retried.honest_gaps
+
+
+def test_use_cache_false_always_recomputes(mine):
+    mine()
+    report, db = mine(use_cache=False)
+    assert set(_statuses(report).values()) == {"ok"}
+    assert db.queried["data_versions"] == 0
+
+
+def test_result_key_depends_only_on_declared_sources():
+    versions = dict(zip(ic.DATA_VERSION_SOURCES, VERSIONS))
+    key = ic.result_key(versions, ["activity"], {"z": 1}, None)
+
+    assert key == ic.result_key({**versions, "activity_split": "other"}, ["activity"], {"z": 1}, None)
+    assert key != ic.result_key({**versions, "activity": "other"}, ["activity"], {"z": 1}, None)
+    assert key != ic.result_key(versions, ["activity"], {"z": 2}, None)
+    assert key != ic.result_key(versions, ["activity"], {"z": 1}, {"min_activities": 5})
+
+
+def test_versions_unavailable_disables_caching():
+    db = MagicMock()
+    db.execute.side_effect = RuntimeError("no such table")
+    assert ic.load_data_versions(ATH, db) is None
+    db.rollback.assert_called_once()
+    assert ic.InvestigationResultCache.load(None, ATH) is None
@@ -0,0 +1,206 @@
+"""
+Investigation executor (services/investigation_executor.py).
+
+1. run_investigations records ok / error / timeout per investigation,
+   in-process and through a forked pool, in submission order
+2. Budgets interrupt investigations that swallow ``Exception``: by timer
+   on the main thread, at the next snapshot read off it
+3. A pool that cannot start falls back to in-process; pool workers refuse
+   DB queries
+4. mine_race_inputs_report gives the same findings serially and in
+   parallel, with one run per investigation
+5. Population timing report ranks investigations by p95
+"""
+import time
+from collections import defaultdict
+from unittest.mock import patch
+
+import pytest
+
+from services import investigation_executor as ie
+from services import race_input_analysis as ria
+from tests.test_investigation_snapshot import ATH, ZONES, _athlete, _Db
+
+
+def _job(name):
+    if name == "boom":
+        raise ValueError("bad data")
+    if name == "stuck":
+        while True:
+            try:
+                time.sleep(0.01)
+                ie.check_deadline()  # as the snapshot accessors do
+            except Exception:  # investigations guard with except Exception
+                pass
+    return [f"{name}-finding"]
+
+
+NAMES = ["a", "boom", "stuck", "b"]
+BUDGETS = {"a": 5.0, "boom": 5.0, "stuck": 0.3, "b": None}
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_statuses_and_order(workers):
+    runs = ie.run_investigations(NAMES, lambda name: _job(name), BUDGETS, workers=workers)
+
+    assert [r.name for r in runs] == NAMES
+    assert [r.status for r in runs] == ["ok", "error", "timeout", "ok"]
+    assert runs[0].findings == ["a-finding"] and runs[3].findings == ["b-finding"]
+    assert runs[1].error == "ValueError: bad data" and runs[1].findings == []
+    assert runs[2].over_budget and 300 <= runs[2].elapsed_ms < 3000
+    assert runs[2].to_dict()["findings"] == 0
+
+
+def test_budgets_enforced_off_main_thread():
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(1) as pool:  # request handlers run in worker threads
+        runs = pool.submit(ie.run_investigations, NAMES, _job, BUDGETS).result()
+
+    assert [r.status for r in runs] == ["ok", "error", "timeout", "ok"]
+    assert runs[0].findings == ["a-finding"] and runs[3].findings == ["b-finding"]
+    assert runs[1].error == "ValueError: bad data"
+    assert runs[2].over_budget and 300 <= runs[2].elapsed_ms < 1000
+
+
+def test_snapshot_reads_stop_past_the_deadline():
+    from concurrent.futures import ThreadPoolExecutor
+
+    snapshot = ria.AthleteInvestigationSnapshot.load(ATH, _Db(*_athlete()), zones=ZONES)
+    reads = []
+
+    def run_one(name):
+        while True:
+            try:
+                snapshot.activities(min_distance_m=5000)
+                reads.append(name)
+            except Exception:
+                pass
+
+    with ThreadPoolExecutor(1) as pool:
+        run = pool.submit(ie.run_budgeted, run_one, "spin", 0.2).result()
+
+    assert run.status == "timeout" and reads
+    # The deadline is cleared: later reads on that thread are unbounded
+    assert ie.check_deadline() is None
+
+
+def test_pool_workers_refuse_db_queries():
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import Session
+
+    snapshot = ria.AthleteInvestigationSnapshot.load(ATH, _Db(*_athlete()), zones=ZONES)
+    session = Session(create_engine("sqlite://"))
+
+    def run_one(name):
+        if name == "garmin":
+            return [len(snapshot.garmin_days)]
+        if name == "session":
+            return [session.execute(text("SELECT 1")).scalar()]
+        return [len(snapshot.activities())]
+
+    runs = ie.run_investigations(["garmin", "session", "plain"], run_one, {}, workers=2)
+
+    assert [r.status for r in runs] == ["error", "error", "ok"]
+    assert runs[0].error.startswith("InvestigationDbAccess: AthleteInvestigationSnapshot.garmin_days")
+    assert runs[1].error.startswith("InvestigationDbAccess: ORM execution")
+    # In-process the same reads are allowed
+    assert session.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_pool_unavailable_runs_in_process():
+    with patch.object(ie, "ProcessPoolExecutor", side_effect=OSError("no fork")):
+        runs = ie.run_investigations(["a", "b"], _job, {}, workers=4)
+    assert [r.findings for r in runs] == [["a-finding"], ["b-finding"]]
+
+
+def test_mining_report_parallel_matches_serial():
+    db_args = _athlete()
+    reports = {}
+    with patch.object(ria, "load_training_zones", return_value=ZONES), \
+         patch("services.auto_discovery.tuning_loop.get_active_param_overrides_by_investigation",
+               return_value={}):
+        for workers in (0, 3):
+            reports[workers] = ria.mine_race_inputs_report(
+                ATH, _Db(*db_args), workers=workers, use_cache=False,
+            )
+
+    serial, parallel = reports[0], reports[3]
+    assert [f.finding_type for f in parallel.findings] == [f.finding_type for f in serial.findings]
+    assert [f.sentence for f in parallel.findings] == [f.sentence for f in serial.findings]
+    assert parallel.honest_gaps == serial.honest_gaps
+    assert [r.name for r in parallel.runs] == [r.name for r in serial.runs]
+    assert {"detect_adaptation_curves", "detect_weekly_patterns"} <= {r.name for r in serial.runs}
+
+    summary = serial.timing_summary()
+    assert len(summary["investigations"]) == len(serial.runs)
+    assert summary["timeouts"] == [] and summary["errors"] == []
+
+
+class FakeRedis:
+    """Lists, hashes and sets, with a pipeline that replays calls on execute()."""
+
+    def __init__(self):
+        self.lists = defaultdict(list)
+        self.hashes = defaultdict(dict)
+        self.sets = defaultdict(set)
+
+    def pipeline(self):
+        redis, calls = self, []
+
+        class _Pipe:
+            def __getattr__(self, name):
+                return lambda *a: calls.append((name, a))
+
+            def execute(self):
+                return [getattr(redis, name)(*a) for name, a in calls]
+
+        return _Pipe()
+
+    def sadd(self, key, *values):
+        self.sets[key].update(values)
+
+    def smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    def lpush(self, key, value):
+        self.lists[key].insert(0, str(value))
+
+    def ltrim(self, key, start, end):
+        self.lists[key] = self.lists[key][start:end + 1]
+
+    def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+
+    def hincrby(self, key, field, amount):
+        self.hashes[key][field] = str(int(self.hashes[key].get(field, 0)) + amount)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def expire(self, key, ttl):
+        return True
+
+
+def _run(name, ms, status="ok", budget=10.0):
+    return ie.InvestigationRun(name=name, status=status, elapsed_ms=ms, budget_s=budget,
+                               over_budget=ms > budget * 1000)
+
+
+def test_population_report_ranks_by_p95():
+    redis = FakeRedis()
+    for i in range(20):
+        ie.record_investigation_runs(redis, [
+            _run("fast", 5.0 + i),
+            _run("spiky", 20.0 if i < 18 else 900.0),
+            _run("slow", 400.0 + i, status="timeout" if i == 0 else "ok", budget=0.4),
+        ])
+
+    report = ie.slowest_investigations(redis, limit=2)
+
+    assert report["available"]
+    assert [r["name"] for r in report["investigations"]] == ["spiky", "slow"]
+    slow = report["investigations"][1]
+    assert slow["runs"] == 20 and slow["timeout"] == 1 and slow["ok"] == 19
+    assert slow["over_budget"] == 19 and slow["max_ms"] == 419.0
+    assert ie.slowest_investigations(None) == {"available": False, "investigations": []}
@@ -0,0 +1,208 @@
+"""
+AthleteInvestigationSnapshot (services/race_input_analysis.py).
+
+1. activities() filters reproduce the SQL filters they replaced
+2. splits() come back per activity in split order
+3. coverage and minimum checks read the snapshot counts
+4. mine_race_inputs loads the snapshot once and every investigation reads
+   from it instead of querying
+"""
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from models import Activity, ActivitySplit, DailyCheckin, PerformanceEvent
+from services import race_input_analysis as ria
+from services.race_input_analysis import (
+    AthleteInvestigationSnapshot,
+    TrainingZones,
+    get_athlete_signal_coverage,
+)
+
+ATH = uuid.UUID("2b9c4e1d-6a7f-4c3b-9e8d-1f0a2b3c4d5e")
+START = datetime(2025, 1, 6, 7)
+ZONES = TrainingZones(easy_sec=486, marathon_sec=417, threshold_sec=393,
+                      interval_sec=345, repetition_sec=321)
+
+
+class _Query:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def filter(self, *a, **k):
+        return self
+
+    join = order_by = filter
+
+    def all(self):
+        return list(self._rows)
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+    def scalar(self):
+        return len(self._rows)
+
+
+class _Db:
+    """Answers the snapshot's queries by entity and counts every query."""
+
+    def __init__(self, activities, splits, races, checkins, streams=0):
+        self.rows = {Activity: activities, ActivitySplit: splits,
+                     PerformanceEvent: races, DailyCheckin: checkins}
+        self.streams = [None] * streams
+        self.versions = ("1", "1", "1", "1", "1")
+        self.queried = Counter()
+
+    def query(self, entity, *a):
+        self.queried[getattr(entity, "__name__", "count")] += 1
+        if entity in self.rows:
+            return _Query(self.rows[entity])
+        return _Query(self.streams if not isinstance(entity, type) else [])
+
+    def execute(self, statement, params=None):
+        self.queried["data_versions"] += 1
+        return _Query([self.versions])
+
+    def rollback(self):
+        pass
+
+
+def _athlete(n_days=300, seed=0):
+    rng = np.random.default_rng(seed)
+    activities, splits, checkins = [], [], []
+    for i in range(n_days):
+        day = START + timedelta(days=i)
+        checkins.append(DailyCheckin(
+            athlete_id=ATH, date=day.date(),
+            hrv_rmssd=None if i % 4 == 0 else float(rng.normal(60, 8)),
+            rpe_1_10=None if i % 3 else int(rng.integers(2, 9)),
+        ))
+        if i % 7 == 6:
+            continue
+        long_run = i % 7 == 5
+        distance = int(rng.uniform(18000, 32000) if long_run else rng.uniform(3000, 14000))
+        pace = rng.uniform(300, 380) if i % 7 in (1, 3) else rng.uniform(380, 430)
+        act = Activity(
+            id=uuid.uuid4(), athlete_id=ATH, start_time=day, sport="run",
+            distance_m=distance, duration_s=int(distance / 1609.344 * pace),
+            avg_hr=None if i % 11 == 0 else int(rng.integers(125, 175)),
+            temperature_f=None if i % 5 else float(rng.uniform(40, 90)),
+            heat_adjustment_pct=None, is_duplicate=i % 29 == 0,
+            workout_type="long_run" if long_run else ("threshold_run" if i % 7 == 1 else "easy_run"),
+        )
+        activities.append(act)
+        for k in range(1, max(2, distance // 1609) + 1):
+            splits.append(ActivitySplit(
+                activity_id=act.id, split_number=k, distance=1609.344,
+                elapsed_time=int(pace + rng.normal(0, 8)),
+                average_heartrate=None if k == 2 else int(rng.integers(125, 180)),
+            ))
+    races = []
+    for week in (10, 22, 38):
+        act = activities[week * 6]
+        races.append(PerformanceEvent(
+            athlete_id=ATH, activity_id=act.id, event_date=act.start_time.date(),
+            distance_category="10k", event_type="race", time_seconds=2400,
+            user_confirmed=True,
+        ))
+    kept_ids = {a.id for a in activities if not a.is_duplicate}
+    splits = [s for s in splits if s.activity_id in kept_ids]
+    return activities, splits, races, checkins
+
+
+@pytest.fixture(scope="module")
+def data():
+    return _athlete()
+
+
+@pytest.fixture
+def snapshot(data):
+    return AthleteInvestigationSnapshot.load(ATH, _Db(*data, streams=4), zones=ZONES)
+
+
+class TestFilters:
+
+    def test_default_excludes_duplicates_in_start_order(self, data, snapshot):
+        activities = data[0]
+        got = snapshot.activities()
+        assert got == [a for a in activities if not a.is_duplicate]
+        assert len(snapshot.activities(include_duplicates=True)) == len(activities)
+
+    def test_filters_match_sql_predicates(self, data, snapshot):
+        activities = data[0]
+        first = START.date() + timedelta(days=40)
+        got = snapshot.activities(
+            min_distance_m=5000, present=("avg_hr",), hr_range=(130, 160),
+            min_duration_s=1800, start=first, end=first + timedelta(days=90),
+        )
+        want = [
+            a for a in activities
+            if not a.is_duplicate and a.avg_hr is not None and 130 <= a.avg_hr <= 160
+            and a.distance_m > 5000 and a.duration_s > 1800
+            and first <= a.start_time.date() < first + timedelta(days=90)
+        ]
+        assert want and got == want
+
+    def test_present_and_on_date(self, data, snapshot):
+        activities = data[0]
+        with_temp = snapshot.activities(present=("temperature_f",))
+        assert with_temp == [a for a in activities if not a.is_duplicate and a.temperature_f is not None]
+
+        day = activities[3].start_time.date()
+        assert snapshot.activities(on_date=day) == [activities[3]]
+        assert snapshot.activities(present=("run_shape",)) == []
+
+    def test_splits_in_order_with_present_columns(self, data, snapshot):
+        act = snapshot.activities(min_distance_m=20000)[0]
+        rows = snapshot.splits(act.id)
+        assert [s.split_number for s in rows] == list(range(1, len(rows) + 1))
+        assert 2 not in [s.split_number for s in snapshot.splits(act.id, present=("average_heartrate",))]
+        assert snapshot.splits(uuid.uuid4()) == []
+
+
+class TestCounts:
+
+    def test_coverage_reads_counts(self, data, snapshot):
+        activities, splits, races, checkins = data
+        kept = [a for a in activities if not a.is_duplicate]
+        assert snapshot.counts == {
+            "activities": len(kept),
+            "splits": len(splits),
+            "streams": 4,
+            "run_shape": 0,
+            "environment": sum(a.temperature_f is not None for a in kept),
+            "races": len(races),
+            "daily_health": sum(c.hrv_rmssd is not None for c in checkins),
+            "subjective": sum(c.rpe_1_10 is not None for c in checkins),
+        }
+        coverage = get_athlete_signal_coverage(ATH, db=None, snapshot=snapshot)
+        assert coverage["activity_stream"] and not coverage["run_shape"]
+        assert (snapshot.first_start, snapshot.last_start) == (kept[0].start_time, kept[-1].start_time)
+
+        spec = next(s for s in ria.INVESTIGATION_REGISTRY if s.min_activities > 0)
+        assert ria.meets_minimums(spec, ATH, db=None, snapshot=snapshot) == (len(kept) >= spec.min_activities)
+
+
+def test_mining_run_loads_once_and_investigations_do_not_query(data):
+    db = _Db(*data, streams=4)
+    snapshot_loads = []
+    load = AthleteInvestigationSnapshot.load.__func__
+
+    def counted_load(cls, *a, **k):
+        snapshot_loads.append(1)
+        return load(cls, *a, **k)
+
+    with patch.object(ria, "load_training_zones", return_value=ZONES), \
+         patch.object(AthleteInvestigationSnapshot, "load", classmethod(counted_load)), \
+         patch("services.auto_discovery.tuning_loop.get_active_param_overrides_by_investigation", return_value={}):
+        findings, gaps = ria.mine_race_inputs(ATH, db)
+
+    assert len(snapshot_loads) == 1
+    for model in ("Activity", "ActivitySplit", "PerformanceEvent", "DailyCheckin"):
+        assert db.queried[model] == 1, model
+    assert isinstance(findings, list) and isinstance(gaps, list)
@@ -0,0 +1,119 @@
+"""
+Lag-correlation kernel (services/intelligence/lag_correlation.py).
+
+Every (input, output, lag) cell must match the per-pair path it replaces:
+shift the input, align by date, weight by the aligned date's recency and
+run calculate_(weighted_)pearson_correlation.
+"""
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from services.correlation_engine import (
+    _align_time_series_with_dates,
+    _recency_weight,
+    calculate_pearson_correlation,
+    calculate_weighted_pearson_correlation,
+    find_time_shifted_correlations,
+)
+from services.intelligence.lag_correlation import lag_correlations
+
+REF = datetime(2026, 6, 30)
+
+
+def _series(seed, n_days=400, density=0.7, scale=1.0, offset=0.0):
+    rng = np.random.default_rng(seed)
+    start = REF.date() - timedelta(days=n_days)
+    return [
+        (start + timedelta(days=i), float(offset + scale * rng.normal()))
+        for i in range(n_days) if rng.random() < density
+    ]
+
+
+def _reference(input_data, output_data, lag, weighted):
+    shifted = [(d + timedelta(days=lag), v) for d, v in input_data]
+    aligned = _align_time_series_with_dates(shifted, output_data)
+    xs = [row[1] for row in aligned]
+    ys = [row[2] for row in aligned]
+    if weighted:
+        ws = [_recency_weight(row[0], REF) for row in aligned]
+        r, p = calculate_weighted_pearson_correlation(xs, ys, ws)
+    else:
+        r, p = calculate_pearson_correlation(xs, ys)
+    return r, p, len(aligned)
+
+
+def _correlated(seed, lag, n_days=400):
+    """Output that follows the input `lag` days later, plus noise."""
+    x = _series(seed, n_days, density=0.8)
+    rng = np.random.default_rng(seed + 100)
+    y = [(d + timedelta(days=lag), 0.6 * v + rng.normal(0, 0.8)) for d, v in x if rng.random() < 0.6]
+    return x, y
+
+
+class TestParity:
+
+    @pytest.mark.parametrize("weighted", [True, False])
+    def test_every_cell_matches_pairwise_path(self, weighted):
+        inputs = {
+            "noise": _series(1),
+            "steps": _series(2, scale=3000, offset=9000),  # large values
+            "lagged": _correlated(3, lag=2)[0],
+            "sparse": _series(4, density=0.05),
+        }
+        outputs = {"efficiency": _correlated(3, lag=2)[1], "pace": _series(5, density=0.4)}
+
+        got = lag_correlations(inputs, outputs, max_lag_days=7, temporal_weighting=weighted, reference_date=REF)
+
+        for i, (iname, x) in enumerate(inputs.items()):
+            for o, (oname, y) in enumerate(outputs.items()):
+                for lag in range(8):
+                    r, p, n = _reference(x, y, lag, weighted)
+                    assert got.n[i, o, lag] == n, (iname, oname, lag)
+                    assert got.r[i, o, lag] == pytest.approx(r, abs=1e-9), (iname, oname, lag)
+                    assert got.p[i, o, lag] == pytest.approx(p, rel=1e-6, abs=1e-12), (iname, oname, lag)
+
+    def test_constant_and_short_series_report_no_correlation(self):
+        x = [(date(2026, 6, 1) + timedelta(days=i), 5.0) for i in range(30)]
+        y = _series(6, n_days=40, density=1.0)
+        got = lag_correlations({"flat": x, "short": x[:4]}, {"y": y}, max_lag_days=2, reference_date=REF)
+        assert np.all(got.r == 0) and np.all(got.p == 1)
+
+    def test_repeated_day_keeps_last_value(self):
+        base = _series(7, n_days=60, density=1.0)
+        y = _series(8, n_days=60, density=1.0)
+        dup = [(base[0][0], 999.0)] + base
+        a = lag_correlations({"x": base}, {"y": y}, max_lag_days=0, reference_date=REF)
+        b = lag_correlations({"x": dup}, {"y": y}, max_lag_days=0, reference_date=REF)
+        assert a.r[0, 0, 0] == pytest.approx(b.r[0, 0, 0])
+
+    def test_empty(self):
+        got = lag_correlations({"x": []}, {"y": []}, max_lag_days=3)
+        assert got.r.shape == (1, 1, 4) and np.all(got.p == 1)
+
+
+class TestFindTimeShifted:
+
+    def test_finds_true_lag(self):
+        x, y = _correlated(9, lag=3)
+        results = find_time_shifted_correlations(x, y, max_lag_days=7, reference_date=REF)
+        best = max(results, key=lambda r: abs(r.correlation_coefficient))
+        assert best.time_lag_days == 3
+        assert best.direction == "positive"
+        assert best.is_significant
+
+    def test_threshold_and_min_samples(self):
+        x, y = _correlated(10, lag=0)
+        results = find_time_shifted_correlations(x, y, max_lag_days=7, min_samples=10_000, reference_date=REF)
+        assert results == []
+
+
+def test_two_year_sweep_is_fast():
+    inputs = {f"in{k}": _series(k, n_days=730, density=0.8) for k in range(120)}
+    outputs = {f"out{k}": _series(1000 + k, n_days=730, density=0.5) for k in range(5)}
+    lag_correlations(inputs, outputs, max_lag_days=7, reference_date=REF)  # warm-up
+    t = time.perf_counter()
+    lag_correlations(inputs, outputs, max_lag_days=7, reference_date=REF)
+    assert time.perf_counter() - t < 1.0
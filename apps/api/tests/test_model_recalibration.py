@@ -0,0 +1,143 @@
+"""
+Tests for the nightly Banister recalibration (services/model_recalibration.py).
+
+Unit tests — the DB is a MagicMock, change detection and bulk writes are
+patched:
+1. run_recalibration fits every candidate, in-process and through a real
+   process pool, and writes each batch once to both model tables
+2. Load and fit failures are counted and do not stop the run
+3. Bulk upsert parameters match the upsert statement
+4. Task registered under its beat name, and in the startup dispatch
+"""
+import os
+import sys
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services import model_recalibration as mr
+from services.individual_performance_model import (
+    IndividualPerformanceModel,
+    ModelConfidence,
+    PerformanceMarker,
+    TrainingDay,
+)
+from services.model_cache import ModelCache, _UPSERT_SQL, _upsert_params
+
+
+def _inputs(n_days=200, n_markers=5, seed=0):
+    rng = np.random.default_rng(seed)
+    start = date.today() - timedelta(days=n_days)
+    days = [TrainingDay(date=start + timedelta(days=i), tss=float(x)) for i, x in enumerate(rng.uniform(0, 100, n_days))]
+    markers = [
+        PerformanceMarker(date=start + timedelta(days=int(d)), performance_value=48 + i * 0.5, source="race", weight=1.5)
+        for i, d in enumerate(np.linspace(40, n_days - 5, n_markers).astype(int))
+    ]
+    return days, markers
+
+
+@pytest.fixture
+def run(monkeypatch):
+    """run_recalibration with candidates/inputs supplied and writes captured."""
+    written = {"cache": [], "models": []}
+
+    def go(candidates, inputs, **kw):
+        monkeypatch.setattr(ModelCache, "stale_athletes", lambda self, hours: candidates)
+        monkeypatch.setattr(
+            IndividualPerformanceModel, "calibration_inputs",
+            lambda self, athlete_id, lookback_days=365: inputs(athlete_id),
+        )
+        monkeypatch.setattr(ModelCache, "set_many", lambda self, entries: written["cache"].append(list(entries)))
+        monkeypatch.setattr(mr, "save_calibrated_models", lambda db, models: written["models"].append(list(models)))
+        db = MagicMock()
+        return mr.run_recalibration(db, **kw), written, db
+
+    return go
+
+
+class TestRun:
+
+    def test_fits_and_writes_each_batch(self, run):
+        ids = [uuid4() for _ in range(5)]
+        candidates = [(aid, f"h{i}", date.today()) for i, aid in enumerate(ids)]
+        inputs = {aid: _inputs(seed=i) for i, aid in enumerate(ids[:3])}
+        inputs.update({aid: _inputs(n_days=20) for aid in ids[3:]})  # too little history
+
+        stats, written, db = run(candidates, inputs.__getitem__, workers=0, batch_size=2)
+
+        assert stats["candidates"] == 5
+        assert stats["calibrated"] + stats["uncalibrated"] == 5
+        assert stats["uncalibrated"] >= 2
+        assert stats["failed"] == 0
+        assert set(stats["timing_s"]) == {"detect", "load", "fit", "write"}
+        assert len(written["cache"]) == 3  # one write per batch
+        cached = [e for batch in written["cache"] for e in batch]
+        assert [(e[0], e[2]) for e in cached] == [(str(aid), f"h{i}") for i, aid in enumerate(ids)]
+        assert db.commit.call_count >= 3
+
+    def test_pool_matches_in_process(self, run):
+        ids = [uuid4() for _ in range(3)]
+        candidates = [(aid, "h", date.today()) for aid in ids]
+        inputs = {aid: _inputs(seed=i) for i, aid in enumerate(ids)}
+
+        _, local, _ = run(candidates, inputs.__getitem__, workers=0)
+        _, pooled, _ = run(candidates, inputs.__getitem__, workers=2)
+
+        for a, b in zip(local["models"][0], pooled["models"][0]):
+            assert (a.tau1, a.tau2, a.k1, a.k2, a.p0) == pytest.approx((b.tau1, b.tau2, b.k1, b.k2, b.p0))
+
+    def test_failures_counted(self, run, monkeypatch):
+        ids = [uuid4() for _ in range(3)]
+        candidates = [(aid, "h", date.today()) for aid in ids]
+
+        def inputs(aid):
+            if aid == ids[0]:
+                raise RuntimeError("load failed")
+            return _inputs()
+
+        real = mr.calibrate_payload
+        monkeypatch.setattr(
+            mr, "calibrate_payload",
+            lambda p: (_ for _ in ()).throw(ValueError("fit")) if p["athlete_id"] == str(ids[1]) else real(p),
+        )
+
+        stats, written, _ = run(candidates, inputs, workers=0)
+
+        assert stats["failed"] == 2
+        assert stats["calibrated"] + stats["uncalibrated"] == 1
+        assert [e[0] for e in written["cache"][0]] == [str(ids[2])]
+
+    def test_nothing_stale(self, run):
+        stats, written, _ = run([], lambda aid: pytest.fail("no inputs should load"))
+        assert stats["candidates"] == 0
+        assert written["cache"] == []
+
+
+class TestUpsert:
+
+    def test_params_cover_statement(self):
+        days, markers = _inputs()
+        model = IndividualPerformanceModel(None).calibrate_from_inputs("a", days, markers)
+        params = _upsert_params("a", model, "hash", date.today(), None)
+        assert set(params) == set(_UPSERT_SQL.compile().params)
+        assert model.confidence != ModelConfidence.UNCALIBRATED
+
+
+class TestTaskRegistration:
+
+    def test_task_name(self):
+        from tasks.model_recalibration_tasks import recalibrate_models_nightly
+        assert recalibrate_models_nightly.name == "tasks.recalibrate_models_nightly"
+
+    def test_beat_schedule_entry(self):
+        from celerybeat_schedule import beat_schedule
+        assert beat_schedule["model-recalibration-nightly"]["task"] == "tasks.recalibrate_models_nightly"
+
+    def test_startup_dispatch_entry(self):
+        from tasks.beat_startup_dispatch import DAILY_TASKS
+        assert "tasks.recalibrate_models_nightly" in {t["name"] for t in DAILY_TASKS}
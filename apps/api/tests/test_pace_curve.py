@@ -0,0 +1,238 @@
+"""Tests for mean-max pace curves (services/pace_curve.py).
+
+Covers:
+    1. compute_mean_max matches a brute-force window scan on 1 Hz streams,
+       handles sparse sampling and collapses long recording gaps
+    2. envelope merge / rebuild over rolling windows
+    3. get_pace_curve: one-row read that never writes; an expired window or
+       one that lost an activity is evaluated from activity curves and a
+       rebuild is enqueued
+    4. speed_at interpolation and RacePredictor's curve-based RPI estimate
+DB access is stubbed.
+"""
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services import pace_curve as pc
+from services.pace_curve import (
+    DURATION_GRID_S,
+    PACE_CURVE_VERSION,
+    build_envelope,
+    compute_mean_max,
+    merge_curve,
+    speed_at,
+)
+
+
+def _brute_force(distance_1hz, duration):
+    best = 0.0
+    for i in range(len(distance_1hz) - duration):
+        best = max(best, distance_1hz[i + duration] - distance_1hz[i])
+    return round(best / duration, 4)
+
+
+def _random_1hz_run(seed, n=2400):
+    rng = random.Random(seed)
+    d, dist = 0.0, []
+    for _ in range(n):
+        dist.append(d)
+        d += rng.uniform(2.0, 6.0)
+    return {"time": list(range(n)), "distance": dist}
+
+
+class TestComputeMeanMax:
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_matches_brute_force(self, seed):
+        stream = _random_1hz_run(seed)
+        curve = compute_mean_max(stream)
+        for duration in (10, 60, 300, 1200):
+            assert curve[duration] == _brute_force(stream["distance"], duration)
+
+    def test_only_durations_the_stream_covers(self):
+        curve = compute_mean_max(_random_1hz_run(0, n=700))
+        assert set(curve) == {d for d in DURATION_GRID_S if d < 700}
+
+    def test_curve_is_non_increasing(self):
+        curve = compute_mean_max(_random_1hz_run(1, n=4000))
+        speeds = [curve[d] for d in sorted(curve)]
+        assert speeds == sorted(speeds, reverse=True)
+
+    def test_sparse_samples_interpolated(self):
+        # 5 s sampling at a steady 4 m/s
+        time_s = list(range(0, 1800, 5))
+        stream = {"time": time_s, "distance": [4.0 * t for t in time_s]}
+        curve = compute_mean_max(stream)
+        assert curve[60] == pytest.approx(4.0)
+        assert curve[1200] == pytest.approx(4.0)
+
+    def test_long_gap_collapsed(self):
+        # 10 min at 4 m/s, watch left running 20 min, 10 min more at 4 m/s
+        time_s = list(range(600)) + list(range(1800, 2400))
+        dist = [4.0 * t for t in range(600)] + [2400.0 + 4.0 * (t - 1800) for t in range(1800, 2400)]
+        curve = compute_mean_max({"time": time_s, "distance": dist})
+        # 20 min window spans both halves with the stop cut to 30 s
+        # (which carries the one 4 m sample step across the gap)
+        assert curve[1200] == pytest.approx((4.0 * 1170 + 4.0) / 1200, abs=1e-4)
+
+    def test_missing_channels(self):
+        assert compute_mean_max({"time": [0, 1, 2]}) == {}
+        assert compute_mean_max({}) == {}
+
+
+class TestEnvelope:
+
+    def test_merge_keeps_pointwise_max(self):
+        a, b = uuid4(), uuid4()
+        env = merge_curve({}, {60: 5.0, 600: 4.0}, a, date(2026, 9, 1))
+        env = merge_curve(env, {60: 4.5, 600: 4.2, 1200: 4.1}, b, date(2026, 9, 8))
+        assert env["60"] == {"speed": 5.0, "activity_id": str(a), "date": "2026-09-01"}
+        assert env["600"]["activity_id"] == str(b)
+        assert env["1200"]["speed"] == 4.1
+
+    def test_tie_prefers_recent(self):
+        a, b = uuid4(), uuid4()
+        env = build_envelope([(a, date(2026, 1, 1), {"60": 5.0}), (b, date(2026, 6, 1), {"60": 5.0})])
+        assert env["60"]["activity_id"] == str(b)
+
+    def test_merge_is_idempotent(self):
+        env = merge_curve({}, {60: 5.0}, uuid4(), date(2026, 9, 1))
+        assert merge_curve(env, {60: 5.0}, env["60"]["activity_id"], date(2026, 9, 1)) == env
+
+    def test_speed_at_interpolates_on_log_duration(self):
+        env = build_envelope([(uuid4(), date(2026, 9, 1), {"600": 4.0, "6000": 3.0})])
+        assert speed_at(env, 600) == 4.0
+        assert speed_at(env, 1897.37) == pytest.approx(3.5, abs=1e-4)  # geometric midpoint
+        assert speed_at(env, 300) is None
+        assert speed_at(env, 7200) is None
+        assert speed_at({}, 600) is None
+
+
+def _db_with_row(curves, live_sources=None):
+    """Stub session: the AthletePaceCurve row, and how many envelope
+    source activities still exist (default: all of them)."""
+    row = SimpleNamespace(curves=curves, curve_version=PACE_CURVE_VERSION)
+    if live_sources is None:
+        live_sources = len({p.get("activity_id") for env in curves.values() for p in env.values()})
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = row
+    db.query.return_value.filter.return_value.scalar.return_value = live_sources
+    return db, row
+
+
+class TestGetPaceCurve:
+
+    def test_fresh_window_is_a_single_read(self):
+        today = pc._today()
+        env = build_envelope([(uuid4(), today - timedelta(days=10), {"600": 4.0})])
+        db, _ = _db_with_row({"90d": env, "365d": env, "all": env})
+        with patch.object(pc, "_window_rows") as rows, \
+             patch.object(pc, "enqueue_rebuild") as enqueue:
+            assert pc.get_pace_curve(db, uuid4(), "90d") == env
+            rows.assert_not_called()
+            enqueue.assert_not_called()
+        db.commit.assert_not_called()
+
+    def test_expired_window_evaluated_without_writing(self):
+        today = pc._today()
+        old, recent = uuid4(), uuid4()
+        stale_env = build_envelope([
+            (old, today - timedelta(days=120), {"600": 4.5}),
+            (recent, today - timedelta(days=5), {"600": 4.0, "1200": 3.9}),
+        ])
+        db, row = _db_with_row({"90d": stale_env, "all": stale_env})
+        window_rows = [(recent, today - timedelta(days=5), {"600": 4.0, "1200": 3.9})]
+        athlete_id = uuid4()
+        with patch.object(pc, "_window_rows", return_value=iter(window_rows)), \
+             patch.object(pc, "enqueue_rebuild") as enqueue:
+            env = pc.get_pace_curve(db, athlete_id, "90d")
+            enqueue.assert_called_once_with(athlete_id)
+        assert env["600"] == {"speed": 4.0, "activity_id": str(recent),
+                              "date": (today - timedelta(days=5)).isoformat()}
+        assert row.curves["90d"] == stale_env
+        db.commit.assert_not_called()
+        db.rollback.assert_not_called()
+
+    def test_deleted_or_duplicate_source_dropped(self):
+        today = pc._today()
+        gone, kept = uuid4(), uuid4()
+        env = build_envelope([
+            (gone, today - timedelta(days=3), {"600": 4.8}),
+            (kept, today - timedelta(days=5), {"600": 4.0, "1200": 3.9}),
+        ])
+        db, _ = _db_with_row({"365d": env}, live_sources=1)
+        window_rows = [(kept, today - timedelta(days=5), {"600": 4.0, "1200": 3.9})]
+        with patch.object(pc, "_window_rows", return_value=iter(window_rows)), \
+             patch.object(pc, "enqueue_rebuild"):
+            served = pc.get_pace_curve(db, uuid4(), "365d")
+        assert {p["activity_id"] for p in served.values()} == {str(kept)}
+        db.commit.assert_not_called()
+
+    def test_all_time_never_expires(self):
+        today = pc._today()
+        env = build_envelope([(uuid4(), today - timedelta(days=2000), {"600": 4.5})])
+        db, _ = _db_with_row({"all": env})
+        assert pc.get_pace_curve(db, uuid4(), "all") == env
+
+    def test_missing_or_old_version_row(self):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = None
+        assert pc.get_pace_curve(db, uuid4()) == {}
+        db, row = _db_with_row({"365d": {"600": {}}})
+        row.curve_version = PACE_CURVE_VERSION - 1
+        assert pc.get_pace_curve(db, uuid4()) == {}
+
+    def test_unknown_window(self):
+        with pytest.raises(ValueError):
+            pc.get_pace_curve(MagicMock(), uuid4(), "30d")
+
+
+class TestRacePredictorIntegration:
+
+    def test_rpi_estimated_from_curve(self):
+        from services.race_predictor import RacePredictor
+        from services.rpi_calculator import calculate_rpi_from_race_time
+
+        env = build_envelope([(uuid4(), pc._today(), {"1200": 4.6, "1800": 4.4, "3600": 4.1})])
+        predictor = RacePredictor(MagicMock())
+        with patch("services.pace_curve.get_pace_curve", return_value=env):
+            rpi = predictor._estimate_rpi_from_training(uuid4())
+        expected = max(
+            calculate_rpi_from_race_time(speed * d, d)
+            for d, speed in ((1200, 4.6), (1800, 4.4), (3600, 4.1))
+        )
+        assert rpi == pytest.approx(expected)
+
+    def test_empty_curve_falls_back(self):
+        from services.race_predictor import RacePredictor
+
+        predictor = RacePredictor(MagicMock())
+        with patch("services.pace_curve.get_pace_curve", return_value={}):
+            assert predictor._estimate_rpi_from_pace_curve(uuid4()) is None
+
+
+class TestTaskRegistration:
+
+    def test_task_name(self):
+        from tasks.pace_curve_tasks import backfill_pace_curves, rebuild_pace_curve
+        assert backfill_pace_curves.name == "tasks.backfill_pace_curves"
+        assert rebuild_pace_curve.name == "tasks.rebuild_pace_curve"
+
+    def test_enqueue_rebuild_dedupes_per_athlete(self):
+        redis = MagicMock()
+        redis.set.side_effect = [True, False]
+        athlete_id = uuid4()
+        with patch("core.cache.get_redis_client", return_value=redis), \
+             patch("tasks.pace_curve_tasks.rebuild_pace_curve") as task:
+            assert pc.enqueue_rebuild(athlete_id) is True
+            assert pc.enqueue_rebuild(athlete_id) is False
+            task.delay.assert_called_once_with(str(athlete_id))
@@ -0,0 +1,168 @@
+"""
+Batched rank-test engine for pre-race fingerprinting.
+
+1. On tie-free fixtures, analyze_features reproduces the per-feature
+   ranking loop it replaced (p, d, means, significance, insight)
+2. With ties, U and p match scipy's tie-corrected asymptotic test
+3. q-values are Benjamini-Hochberg across the batch
+4. extract_pre_race_states loads check-ins and hard workouts once for all
+   races and rebuilds each race's state
+"""
+import math
+import statistics
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from scipy.stats import mannwhitneyu, norm
+
+from services.intelligence.correlation_engine import benjamini_hochberg_filter
+from services.pre_race_fingerprinting import (
+    analyze_features,
+    extract_pre_race_states,
+    mann_whitney_u_test,
+    rank_test_features,
+)
+
+
+def _loop_mann_whitney(x, y):
+    """The positional-rank loop analyze_feature used before the batch kernel."""
+    n1, n2 = len(x), len(y)
+    combined = sorted([(v, "x") for v in x] + [(v, "y") for v in y], key=lambda item: item[0])
+    rank_sum_x = sum(i + 1 for i, (_, g) in enumerate(combined) if g == "x")
+    u1 = rank_sum_x - n1 * (n1 + 1) / 2
+    u = min(u1, n1 * n2 - u1)
+    z = (u - n1 * n2 / 2) / math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    return u, float(2 * norm.sf(abs(z)))
+
+
+def _loop_cohens_d(x, y):
+    pooled = ((len(x) - 1) * statistics.variance(x) + (len(y) - 1) * statistics.variance(y)) / (len(x) + len(y) - 2)
+    return (statistics.mean(x) - statistics.mean(y)) / math.sqrt(pooled)
+
+
+def _fixture(seed, n_features=8, tied=False):
+    rng = np.random.default_rng(seed)
+    out = []
+    for k in range(n_features):
+        nb, nw = int(rng.integers(2, 12)), int(rng.integers(2, 12))
+        shift = rng.choice([0.0, 0.5, 1.5])
+        best = rng.normal(shift, 1.0, nb)
+        worst = rng.normal(0.0, 1.0, nw)
+        if tied:
+            best, worst = np.round(best * 2) / 2 + 3, np.round(worst * 2) / 2 + 3
+        out.append((f"Feature {k}", best.tolist(), worst.tolist(), "higher" if k % 2 else "lower"))
+    return out
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_matches_per_feature_loop_without_ties(seed):
+    samples = _fixture(seed)
+
+    features = analyze_features(samples)
+
+    for f, (name, best, worst, _) in zip(features, samples):
+        p = _loop_mann_whitney(best, worst)[1]
+        d = _loop_cohens_d(best, worst)
+        assert f.feature_name == name
+        assert f.p_value == (round(p, 4) if p else None)
+        assert f.cohens_d == round(d, 2)
+        assert f.best_mean == round(statistics.mean(best), 2)
+        assert f.is_significant == (p < 0.05 and abs(d) > 0.5)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_ties_match_scipy_asymptotic(seed):
+    samples = _fixture(seed, tied=True)
+
+    results = rank_test_features({name: (best, worst) for name, best, worst, _ in samples})
+
+    for name, best, worst, _ in samples:
+        want = mannwhitneyu(best, worst, alternative="two-sided", method="asymptotic", use_continuity=False)
+        got = results[name]
+        assert got.u_stat == pytest.approx(min(want.statistic, len(best) * len(worst) - want.statistic))
+        assert got.p_value == pytest.approx(min(1.0, want.pvalue), rel=1e-9, abs=1e-12)
+
+
+def test_q_values_are_benjamini_hochberg():
+    samples = _fixture(11, n_features=30)
+    results = rank_test_features({name: (best, worst) for name, best, worst, _ in samples})
+    p = [results[name].p_value for name, *_ in samples]
+    q = [results[name].q_value for name, *_ in samples]
+
+    assert all(qi >= pi for pi, qi in zip(p, q))
+    for level in (0.05, 0.2):
+        assert [qi <= level for qi in q] == benjamini_hochberg_filter(p, fdr_level=level)
+
+
+def test_untestable_features_do_not_count_toward_correction():
+    results = rank_test_features({
+        "one_value": ([1.0], [2.0, 3.0]),
+        "constant": ([5.0, 5.0, 5.0], [5.0, 5.0]),
+        "clear": ([10.0, 11.0, 12.0, 13.0, 14.0, 15.0, 16.0, 17.0], [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0]),
+    })
+
+    assert (results["one_value"].p_value, results["one_value"].q_value, results["one_value"].cohens_d) == (1.0, 1.0, None)
+    assert results["constant"].p_value == 1.0
+    assert results["clear"].q_value == pytest.approx(min(1.0, results["clear"].p_value * 2))
+    assert mann_whitney_u_test([1.0], [2.0]) == (0.0, 1.0)
+
+
+class _Query:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def filter(self, *args):
+        return self
+
+    def order_by(self, *args):
+        return self
+
+    def all(self):
+        return list(self.rows)
+
+
+def test_extract_states_with_one_query_per_table():
+    from models import Activity, DailyCheckin
+
+    ath = "athlete-1"
+    race_days = [date(2026, 5, 10), date(2026, 6, 14)]
+
+    def race(d, pct):
+        return SimpleNamespace(
+            id=f"race-{d}", athlete_id=ath, performance_percentage=pct, performance_percentage_national=None,
+            start_time=datetime(d.year, d.month, d.day, 8, tzinfo=timezone.utc),
+        )
+
+    def checkin(d, hrv, rhr, sleep=None):
+        return SimpleNamespace(
+            date=d, hrv_rmssd=hrv, resting_hr=rhr, sleep_h=sleep, stress_1_5=2, soreness_1_5=1,
+            readiness_1_5=4, confidence_1_5=5,
+        )
+
+    checkins = [checkin(race_days[0] - timedelta(days=k), 50.0 + k, 50) for k in range(7, 38)]
+    checkins.append(checkin(race_days[0] - timedelta(days=2), 40.0, 55, 7.5))  # no race-eve check-in
+    checkins.append(checkin(race_days[1] - timedelta(days=1), 70.0, 45, 8.0))
+    hard = [SimpleNamespace(start_time=datetime(2026, 5, 6, 7, tzinfo=timezone.utc)),
+            SimpleNamespace(start_time=datetime(2026, 6, 10, 7, tzinfo=timezone.utc))]
+
+    db = MagicMock()
+    db.query.side_effect = lambda entity: _Query({DailyCheckin: checkins, Activity.start_time: hard}[entity])
+    races = [race(race_days[1], 70.0), race(race_days[0], 65.0), race(race_days[0], None)]
+
+    states = extract_pre_race_states(races, db)
+
+    assert db.query.call_count == 2
+    assert states[2] is None
+    latest, earlier = states[0], states[1]
+    baseline = statistics.mean(50.0 + k for k in range(7, 38))
+    assert earlier.hrv_rmssd == 40.0 and earlier.sleep_hours == 7.5
+    assert earlier.hrv_deviation_pct == pytest.approx((40.0 - baseline) / baseline * 100)
+    assert earlier.resting_hr_deviation_pct == pytest.approx(10.0)
+    assert earlier.days_since_hard_workout == 4
+    # Second race: only the first race's pre-race check-in is in its baseline
+    assert latest.hrv_rmssd == 70.0
+    assert latest.hrv_deviation_pct == pytest.approx(75.0)
+    assert latest.days_since_hard_workout == 4
@@ -16,6 +16,11 @@ Budgets (local / dedicated hardware):
 CI budgets (shared GitHub Actions runners — 2x headroom):
     - p95 <= 400ms at 3.6k points
     - p99 <= 600ms at 3.6k points
+
+Marathon / ultra scale (vectorized engine):
+    - Engine stages (segments, drift, moments, effort) at 30k points stay
+      inside the 3.6k-point p95 budget.
+    - Vectorized engine stages beat the pure-Python reference at 30k points.
 """
 import sys
 import time
@@ -106,3 +111,80 @@ class TestAnalysisLatency:
         result = analyze_stream(stream, channels)
         assert result is not None
         assert result.point_count == 7200
+
+
+class TestVectorizedEngineAt30k:
+    """Long runs and marathons: 30k points through the vectorized engine."""
+
+    @staticmethod
+    def _engine_stages(stream, impl):
+        """Run the stages the engine selection swaps, as analyze_stream does."""
+        from services.run_stream_analysis import SegmentType
+
+        t = stream["time"]
+        v = stream["velocity_smooth"]
+        hr = stream["heartrate"]
+        cad = stream["cadence"]
+        grade = stream["grade_smooth"]
+        segments = impl["segments"](t, v, hr, grade, cadence=cad)
+        work_steady = [s for s in segments if s.type in (
+            SegmentType.work.value, SegmentType.steady.value)]
+        impl["drift"](t, hr, v, cad, work_steady)
+        impl["moments"](t, hr, v, cad, grade, segments)
+        impl["effort"](stream, len(t), "tier4_stream_relative", None)
+
+    @staticmethod
+    def _impls():
+        import services.run_stream_analysis as ref
+        import services.run_stream_vectorized as vec
+
+        return (
+            {"segments": ref.detect_segments, "drift": ref.compute_drift,
+             "moments": ref.detect_moments, "effort": ref._compute_effort_array},
+            {"segments": vec.detect_segments, "drift": vec.compute_drift,
+             "moments": vec.detect_moments, "effort": vec.compute_effort_array},
+        )
+
+    def _time_stages(self, stream, impl, n_runs):
+        self._engine_stages(stream, impl)  # warm-up (discarded)
+        timings = []
+        for _ in range(n_runs):
+            start = time.perf_counter()
+            self._engine_stages(stream, impl)
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def test_30000_points_engine_within_3600_point_budget(self):
+        """30k points → vectorized engine stages p95 <= 250ms local / 400ms CI."""
+        import numpy as np
+        import os
+
+        stream = make_easy_run_stream(duration_s=30000)
+        _, vectorized = self._impls()
+        timings = self._time_stages(stream, vectorized, n_runs=30)
+
+        p95 = np.percentile(timings, 95)
+        p95_budget = 400.0 if bool(os.environ.get("CI")) else 250.0
+        assert p95 <= p95_budget, f"p95={p95:.1f}ms exceeds {p95_budget:.0f}ms budget"
+
+    def test_vectorized_faster_than_reference_at_30000_points(self):
+        """30k points → vectorized median at least 2x faster than reference."""
+        import numpy as np
+
+        stream = make_easy_run_stream(duration_s=30000)
+        reference, vectorized = self._impls()
+        ref_median = np.median(self._time_stages(stream, reference, n_runs=5))
+        vec_median = np.median(self._time_stages(stream, vectorized, n_runs=5))
+        assert vec_median * 2 <= ref_median, (
+            f"vectorized={vec_median:.1f}ms reference={ref_median:.1f}ms"
+        )
+
+    def test_30000_points_full_analysis_completes(self):
+        """30k points through analyze_stream → complete result, no crash."""
+        from services.run_stream_analysis import analyze_stream
+
+        stream = make_easy_run_stream(duration_s=30000)
+        result = analyze_stream(stream, list(stream.keys()))
+        assert result.point_count == 30000
+        assert len(result.effort_intensity) == 30000
+        assert result.segments
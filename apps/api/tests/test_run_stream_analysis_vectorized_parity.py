@@ -0,0 +1,202 @@
+"""Parity tests — vectorized vs reference run stream analysis engine.
+
+services/run_stream_vectorized.py must produce byte-identical
+StreamAnalysisResult output to the pure-Python reference engine in
+services/run_stream_analysis.py for every stream in the parity corpus:
+
+    - All deterministic Phase 2 stream fixtures (easy, interval,
+      progressive, long-run drift, hill repeats, partial channels)
+    - All HR sanity fixtures (unreliable HR → tier4 fallback path)
+    - Seeded noisy streams: surges, fades, dropouts, sustained grade,
+      cadence dips, int and float channels
+
+× every athlete-context tier (1-4) and the pace-anchor effort paths.
+No DB, no mocks, no IO.
+"""
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fixtures import hr_sanity_fixtures
+from fixtures.stream_fixtures import (
+    make_easy_run_stream,
+    make_interval_stream,
+    make_progressive_run_stream,
+    make_long_run_with_drift_stream,
+    make_hill_repeat_stream,
+    make_partial_stream,
+)
+from services.run_stream_analysis import (
+    AthleteContext,
+    ENGINE_PYTHON,
+    ENGINE_VECTORIZED,
+    _is_grade_sustained,
+    _sliding_avg,
+    analyze_stream,
+)
+from services import run_stream_vectorized as vec
+
+
+def make_noisy_stream(seed: int, duration_s: int) -> dict:
+    """Seeded stream with alternating efforts, noise, dropouts and hills."""
+    rng = random.Random(seed)
+    base_v = rng.uniform(2.2, 4.5)
+    block_s = rng.choice([60, 120, 300])
+    int_hr = seed % 2 == 1
+    hr = 120.0
+    cum = 0.0
+    stream = {k: [] for k in (
+        "time", "heartrate", "velocity_smooth", "cadence",
+        "distance", "altitude", "grade_smooth")}
+    for t in range(duration_s):
+        hard = (t // block_s) % 2 == 1
+        v = max(0.0, base_v * (1.35 if hard else 0.9) + rng.gauss(0, 0.3))
+        if rng.random() < 0.01:
+            v = 0.0
+        hr += (150 + 25 * hard - hr) * 0.02 + rng.gauss(0, 1.5)
+        grade = 6.0 * ((t // 400) % 3 == 1) + rng.gauss(0, 0.8)
+        cadence = 172
+        if (t // 250) % 5 == 3:
+            cadence = 160 if seed % 3 else 184
+        if rng.random() < 0.03:
+            cadence = rng.choice([0, 150, 190])
+        cum += v
+        stream["time"].append(t)
+        stream["heartrate"].append(int(hr) if int_hr else round(hr, 1))
+        stream["velocity_smooth"].append(round(v, 3))
+        stream["cadence"].append(cadence)
+        stream["distance"].append(round(cum, 1))
+        stream["altitude"].append(100.0)
+        stream["grade_smooth"].append(round(grade, 1))
+    return stream
+
+
+def _corpus():
+    streams = [
+        ("easy", make_easy_run_stream()),
+        ("interval", make_interval_stream()),
+        ("progressive", make_progressive_run_stream()),
+        ("long_drift", make_long_run_with_drift_stream()),
+        ("hills", make_hill_repeat_stream()),
+        ("partial_vel", make_partial_stream(["time", "velocity_smooth"])),
+        ("partial_hr", make_partial_stream(["time", "heartrate"])),
+        ("partial_vel_hr", make_partial_stream(["time", "velocity_smooth", "heartrate"])),
+    ]
+    for name in sorted(dir(hr_sanity_fixtures)):
+        if name.startswith("make_"):
+            streams.append((name, getattr(hr_sanity_fixtures, name)()))
+    for seed in range(16):
+        duration = random.Random(seed).randint(90, 6000)
+        streams.append((f"noisy_{seed}", make_noisy_stream(seed, duration)))
+    return streams
+
+
+CONTEXTS = [
+    ("tier4", None),
+    ("tier1", AthleteContext(threshold_hr=165)),
+    ("tier2", AthleteContext(max_hr=190, resting_hr=50)),
+    ("tier3", AthleteContext(max_hr=185)),
+    ("pace_anchor", AthleteContext(threshold_pace_per_km=270.0)),
+    ("pace_anchor_min_km", AthleteContext(threshold_pace_per_km=4.5)),
+    ("rpi_tier3", AthleteContext(rpi=50.0, max_hr=185)),
+    ("rpi_tier1", AthleteContext(rpi=45.0, threshold_hr=160)),
+]
+
+CORPUS = _corpus()
+
+
+def _serialize(result) -> str:
+    return json.dumps(result.to_dict())
+
+
+@pytest.mark.parametrize("ctx_name,ctx", CONTEXTS, ids=[c[0] for c in CONTEXTS])
+@pytest.mark.parametrize("stream_name,stream", CORPUS, ids=[s[0] for s in CORPUS])
+def test_vectorized_matches_reference(stream_name, stream, ctx_name, ctx):
+    channels = list(stream.keys())
+    reference = analyze_stream(stream, channels, athlete_context=ctx, engine=ENGINE_PYTHON)
+    vectorized = analyze_stream(stream, channels, athlete_context=ctx, engine=ENGINE_VECTORIZED)
+    assert _serialize(vectorized) == _serialize(reference)
+
+
+class TestCorpusCoverage:
+    """The corpus must exercise every moment detector, or parity proves little."""
+
+    def test_corpus_produces_every_detector_output(self):
+        seen = set()
+        for _, stream in CORPUS:
+            for _, ctx in CONTEXTS[:4]:
+                result = analyze_stream(stream, list(stream.keys()), athlete_context=ctx)
+                seen.update(m.type for m in result.moments)
+                seen.update(s.type for s in result.segments)
+        for expected in ("cardiac_drift_onset", "pace_surge", "pace_fade",
+                         "cadence_drop", "cadence_surge", "grade_adjusted_anomaly",
+                         "warmup", "work", "recovery", "steady", "cooldown"):
+            assert expected in seen
+
+
+class TestPrimitives:
+    """Array primitives reproduce the reference helpers bit for bit."""
+
+    @pytest.mark.parametrize("window", [1, 2, 30, 31, 301])
+    def test_sliding_avg_matches_reference(self, window):
+        data = make_noisy_stream(7, 2000)["velocity_smooth"]
+        assert vec.sliding_avg(data, window).tolist() == _sliding_avg(data, window)
+
+    def test_sliding_avg_int_channel(self):
+        data = make_noisy_stream(1, 1500)["heartrate"]
+        assert vec.sliding_avg(data, 30).tolist() == _sliding_avg(data, 30)
+
+    def test_sliding_avg_short_series(self):
+        assert vec.sliding_avg([3.0, 4.0], 30).tolist() == _sliding_avg([3.0, 4.0], 30)
+        assert vec.sliding_avg([], 30).tolist() == []
+
+    def test_grade_sustained_mask_matches_reference(self):
+        grade = make_noisy_stream(4, 3000)["grade_smooth"]
+        mask = vec.grade_sustained_mask(vec._as_array(grade), 30, 3.0)
+        expected = [_is_grade_sustained(grade, i, 30, 3.0) for i in range(len(grade))]
+        assert mask.tolist() == expected
+
+    def test_seq_sum_matches_builtin_sum(self):
+        data = make_noisy_stream(9, 5000)["velocity_smooth"]
+        assert vec._seq_sum(vec._as_array(data)) == sum(data)
+        assert vec._seq_sum(vec._as_array([-0.0, -0.0])) == sum([-0.0, -0.0])
+
+
+class TestEngineSelection:
+
+    def test_default_engine_is_vectorized(self):
+        import inspect
+        sig = inspect.signature(analyze_stream)
+        assert sig.parameters["engine"].default == ENGINE_VECTORIZED
+
+    def test_unknown_engine_raises(self):
+        stream = make_easy_run_stream(duration_s=600)
+        with pytest.raises(ValueError, match="Unknown analysis engine"):
+            analyze_stream(stream, list(stream.keys()), engine="fortran")
+
+    @pytest.mark.parametrize("engine", [ENGINE_PYTHON, ENGINE_VECTORIZED])
+    def test_every_stage_goes_through_module_seam(self, engine):
+        from unittest.mock import patch
+        import services.run_stream_analysis as rsa
+
+        stream = make_easy_run_stream(duration_s=600)
+        seams = ("detect_segments", "compute_drift", "detect_moments", "_compute_effort_array")
+        originals = {name: getattr(rsa, name) for name in seams}
+        engines = {}
+
+        def spy(name):
+            def wrapped(*args, **kwargs):
+                engines[name] = kwargs.get("engine")
+                return originals[name](*args, **kwargs)
+            return wrapped
+
+        with patch.multiple(rsa, **{name: spy(name) for name in seams}):
+            analyze_stream(stream, list(stream.keys()), engine=engine)
+
+        assert engines == {name: engine for name in seams}
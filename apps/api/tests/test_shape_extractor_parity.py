@@ -0,0 +1,161 @@
+"""Golden parity suite for the array-based shape_extractor pipeline.
+
+RunShape.to_dict() for every stream in fixtures/shape_golden_streams.py
+must equal fixtures/shape_golden.json, which was produced by the
+reference per-point implementation. The vectorized helpers are also
+checked point-for-point against scalar references on random input
+(ties, None, glitches, short streams).
+"""
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fixtures.shape_golden_streams import PROFILES, golden_cases
+from services.shape_extractor import (
+    MAX_VELOCITY_MPS,
+    PaceProfile,
+    _clamp_velocity,
+    _classify_paces,
+    _detect_zone_transitions,
+    _rolling_mean,
+    _stabilize_zones,
+    extract_shape,
+)
+
+GOLDEN_PATH = Path(__file__).resolve().parent / "fixtures" / "shape_golden.json"
+
+CASES = golden_cases()
+
+
+def _extract(stream, kwargs):
+    kwargs = dict(kwargs)
+    profile = kwargs.pop("profile")
+    pace_profile = PaceProfile(*PROFILES[profile]) if profile else None
+    shape = extract_shape(stream, pace_profile=pace_profile, **kwargs)
+    return shape.to_dict() if shape else None
+
+
+@pytest.fixture(scope="module")
+def golden():
+    with open(GOLDEN_PATH) as f:
+        return json.load(f)
+
+
+class TestGoldenParity:
+
+    def test_every_case_has_a_golden(self, golden):
+        assert set(golden) == {name for name, _, _ in CASES}
+
+    @pytest.mark.parametrize("name,stream,kwargs", CASES, ids=[c[0] for c in CASES])
+    def test_run_shape_matches_golden(self, golden, name, stream, kwargs):
+        assert _extract(stream, kwargs) == golden[name]
+
+
+# ---------------------------------------------------------------------------
+# Scalar references for the vectorized helpers
+# ---------------------------------------------------------------------------
+
+def _ref_rolling_mean(values, window):
+    half, n, out = window // 2, len(values), []
+    for i in range(n):
+        valid = [v for v in values[max(0, i - half):min(n, i + half + 1)] if v is not None and v >= 0]
+        out.append(sum(valid) / len(valid) if valid else 0.0)
+    return out
+
+
+def _ref_clamp(velocities):
+    out, prev = [], 0.0
+    for v in velocities:
+        if v > MAX_VELOCITY_MPS:
+            out.append(prev)
+        else:
+            out.append(v)
+            if v > 0:
+                prev = v
+    return out
+
+
+def _ref_stabilize(zones, window):
+    n = len(zones)
+    if n < window:
+        return zones
+    half, out = window // 2, []
+    for i in range(n):
+        counts = {}
+        for z in zones[max(0, i - half):min(n, i + half + 1)]:
+            counts[z] = counts.get(z, 0) + 1
+        out.append(max(counts, key=counts.get))
+    return out
+
+
+class TestHelperParity:
+
+    @pytest.mark.parametrize("seed", range(5))
+    @pytest.mark.parametrize("window", [7, 30])
+    def test_rolling_mean(self, seed, window):
+        rng = random.Random(seed)
+        values = [None if rng.random() < 0.05 else rng.choice([-1.0, rng.uniform(0, 6)]) for _ in range(500)]
+        assert _rolling_mean(values, window) == pytest.approx(_ref_rolling_mean(values, window), abs=1e-9)
+
+    def test_rolling_mean_short_and_empty(self):
+        assert _rolling_mean([], 30) == []
+        assert _rolling_mean([None, None], 30) == [0.0, 0.0]
+        assert _rolling_mean([2.0, 4.0], 30) == [3.0, 3.0]
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_clamp_velocity(self, seed):
+        rng = random.Random(seed)
+        values = [rng.choice([0.0, 15.0, rng.uniform(0, 6)]) for _ in range(300)]
+        values[0] = 20.0   # glitch before any valid sample
+        assert _clamp_velocity(values) == _ref_clamp(values)
+
+    @pytest.mark.parametrize("seed", range(8))
+    @pytest.mark.parametrize("window", [31, 61])
+    def test_stabilize_zones_including_ties(self, seed, window):
+        # Few symbols and short runs make exact count ties common; the
+        # mode must break them the way the reference does (first zone
+        # seen in the window).
+        rng = random.Random(seed)
+        symbols = ["easy", "gray", "marathon", "stopped"][: 2 + seed % 3]
+        zones = []
+        while len(zones) < 400:
+            zones.extend([rng.choice(symbols)] * rng.randint(1, 12))
+        zones = zones[:400]
+        assert _stabilize_zones(zones, window) == _ref_stabilize(zones, window)
+
+    def test_stabilize_short_stream_unchanged(self):
+        zones = ["easy", "gray"] * 5
+        assert _stabilize_zones(zones, 31) == zones
+
+    def test_classify_paces_matches_scalar(self):
+        for profile in PROFILES.values():
+            pp = PaceProfile(*profile)
+            paces = [0.0] + [p / 4.0 for p in range(4 * 250, 4 * 1300)]
+            assert _classify_paces(paces, pp) == [
+                pp.classify_pace(p) if p > 0 else "stopped" for p in paces
+            ]
+
+    def test_zone_transitions(self):
+        zones = ["easy"] * 3 + ["gray"] * 2 + ["easy"]
+        assert _detect_zone_transitions(list(range(6)), zones) == [
+            (0, 2, "easy"), (3, 4, "gray"), (5, 5, "easy"),
+        ]
+        assert _detect_zone_transitions([], []) == []
+
+
+def _regenerate():
+    golden = {name: _extract(stream, kwargs) for name, stream, kwargs in CASES}
+    with open(GOLDEN_PATH, "w") as f:
+        json.dump(golden, f, indent=1, sort_keys=True)
+        f.write("\n")
+    print(f"wrote {len(golden)} cases to {GOLDEN_PATH}")
+
+
+if __name__ == "__main__" and "--regenerate" in sys.argv:
+    _regenerate()
@@ -0,0 +1,91 @@
+"""Performance tests for shape extraction.
+
+Marker-gated: run with `pytest -m perf`.
+
+extract_shape runs for every synced activity (post-sync processing) and
+for every stored stream in scripts/backfill_shapes.py. Budgets:
+
+    - 1 h run (3.6k points): p95 <= 25ms local / 50ms CI
+    - 4 h run (14.4k points): p95 <= 80ms local / 160ms CI
+    - Backfill projection: 5,000 activities drawn from the golden corpus
+      (easy, intervals, long runs, noisy field data) extract in under
+      2 minutes local / 4 minutes CI, excluding DB time.
+
+Reference point: the per-point implementation took ~190ms for a 3 h run,
+dominated by the 61-wide zone mode filter and the rolling means.
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fixtures.shape_golden_streams import PROFILES, golden_cases
+from fixtures.stream_fixtures import make_easy_run_stream
+
+pytestmark = pytest.mark.perf
+
+CI = bool(os.environ.get("CI"))
+
+
+def _timings_ms(stream, n_runs):
+    from services.shape_extractor import PaceProfile, extract_shape
+
+    profile = PaceProfile(*PROFILES["founder"])
+    extract_shape(stream, pace_profile=profile)  # warm-up (discarded)
+    timings = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        extract_shape(stream, pace_profile=profile)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+class TestExtractShapeLatency:
+
+    def test_one_hour_run_p95(self):
+        import numpy as np
+
+        p95 = np.percentile(_timings_ms(make_easy_run_stream(duration_s=3600), 100), 95)
+        budget = 50.0 if CI else 25.0
+        assert p95 <= budget, f"p95={p95:.1f}ms exceeds {budget:.0f}ms budget"
+
+    def test_four_hour_run_p95(self):
+        import numpy as np
+
+        stream = make_easy_run_stream(duration_s=14400, warmup_s=900, cooldown_s=600)
+        p95 = np.percentile(_timings_ms(stream, 30), 95)
+        budget = 160.0 if CI else 80.0
+        assert p95 <= budget, f"p95={p95:.1f}ms exceeds {budget:.0f}ms budget"
+
+
+class TestBackfillThroughput:
+
+    def test_five_thousand_activities_in_minutes(self):
+        from services.shape_extractor import PaceProfile, extract_shape
+
+        cases = golden_cases()
+        for _, stream, _ in cases:  # warm-up
+            extract_shape(stream, pace_profile=PaceProfile(*PROFILES["founder"]))
+
+        start = time.perf_counter()
+        for _, stream, kwargs in cases:
+            kwargs = dict(kwargs)
+            profile = kwargs.pop("profile")
+            extract_shape(
+                stream,
+                pace_profile=PaceProfile(*PROFILES[profile]) if profile else None,
+                **kwargs,
+            )
+        per_activity_s = (time.perf_counter() - start) / len(cases)
+
+        projected_min = per_activity_s * 5000 / 60
+        budget_min = 4.0 if CI else 2.0
+        assert projected_min <= budget_min, (
+            f"5k-activity backfill projected at {projected_min:.1f} min "
+            f"({per_activity_s * 1000:.1f}ms/activity), budget {budget_min:.0f} min"
+        )
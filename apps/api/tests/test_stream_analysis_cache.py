@@ -18,7 +18,7 @@ import pytest
 from datetime import datetime, date, timedelta, timezone
 from pathlib import Path
 from uuid import uuid4
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 sys.path.insert(0, str(Path(__file__).resolve().parent))
@@ -334,6 +334,148 @@ class TestCacheVersionInvalidation:
         assert updated.analysis_version == CURRENT_ANALYSIS_VERSION
 
 
+class TestServeStale:
+    """serve_stale=True: stale rows are served while a refresh is enqueued."""
+
+    def _make_stale(self, db_session, activity_id):
+        row = db_session.query(CachedStreamAnalysis).filter(
+            CachedStreamAnalysis.activity_id == activity_id
+        ).first()
+        row.analysis_version = CURRENT_ANALYSIS_VERSION - 1
+        db_session.commit()
+
+    def test_stale_row_served_without_recompute(
+        self, db_session, test_athlete, activity_with_stream
+    ):
+        from services.run_stream_analysis import AthleteContext
+
+        stream_row = db_session.query(ActivityStream).filter(
+            ActivityStream.activity_id == activity_with_stream.id
+        ).first()
+        ctx = AthleteContext(max_hr=186, resting_hr=48, threshold_hr=165)
+
+        first = get_or_compute_analysis(
+            activity_id=activity_with_stream.id,
+            stream_row=stream_row,
+            athlete_ctx=ctx,
+            db=db_session,
+        )
+        self._make_stale(db_session, activity_with_stream.id)
+
+        with patch("services.stream_analysis_cache.analyze_stream") as mock_analyze, \
+             patch("services.stream_reanalysis.enqueue_refresh") as mock_enqueue:
+            served = get_or_compute_analysis(
+                activity_id=activity_with_stream.id,
+                stream_row=stream_row,
+                athlete_ctx=ctx,
+                db=db_session,
+                serve_stale=True,
+            )
+            mock_analyze.assert_not_called()
+            mock_enqueue.assert_called_once_with(activity_with_stream.id)
+
+        assert served["confidence"] == first["confidence"]
+
+    def test_pending_narratives_enqueue_refresh_only_with_gemini(
+        self, db_session, test_athlete, activity_with_stream
+    ):
+        from services.run_stream_analysis import AthleteContext
+        from services.stream_analysis_cache import NARRATIVES_PENDING
+
+        stream_row = db_session.query(ActivityStream).filter(
+            ActivityStream.activity_id == activity_with_stream.id
+        ).first()
+        kwargs = dict(
+            activity_id=activity_with_stream.id,
+            stream_row=stream_row,
+            athlete_ctx=AthleteContext(max_hr=186, resting_hr=48, threshold_hr=165),
+            db=db_session,
+            serve_stale=True,
+        )
+        get_or_compute_analysis(**kwargs)
+        row = db_session.query(CachedStreamAnalysis).filter(
+            CachedStreamAnalysis.activity_id == activity_with_stream.id
+        ).first()
+        row.result_json = {**row.result_json, NARRATIVES_PENDING: True}
+        db_session.commit()
+
+        with patch("services.stream_reanalysis.enqueue_refresh") as mock_enqueue:
+            get_or_compute_analysis(**kwargs)
+            mock_enqueue.assert_not_called()
+            get_or_compute_analysis(**kwargs, gemini_client=MagicMock())
+            mock_enqueue.assert_called_once_with(activity_with_stream.id)
+
+    def test_refresh_one_brings_row_current(
+        self, db_session, test_athlete, activity_with_stream
+    ):
+        from services.run_stream_analysis import AthleteContext
+        from services.stream_reanalysis import refresh_one
+
+        stream_row = db_session.query(ActivityStream).filter(
+            ActivityStream.activity_id == activity_with_stream.id
+        ).first()
+        get_or_compute_analysis(
+            activity_id=activity_with_stream.id,
+            stream_row=stream_row,
+            athlete_ctx=AthleteContext(max_hr=186, resting_hr=48, threshold_hr=165),
+            db=db_session,
+        )
+        self._make_stale(db_session, activity_with_stream.id)
+
+        assert refresh_one(db_session, activity_with_stream.id) is True
+        row = db_session.query(CachedStreamAnalysis).filter(
+            CachedStreamAnalysis.activity_id == activity_with_stream.id
+        ).first()
+        assert row.analysis_version == CURRENT_ANALYSIS_VERSION
+        assert row.stream_pyramid is not None
+        # Already current → no-op
+        assert refresh_one(db_session, activity_with_stream.id) is False
+
+
+class TestPyramidFill:
+    """Chart reads never write; a background fill stores missing pyramids."""
+
+    def test_outdated_pyramid_built_in_memory_and_filled_by_task(
+        self, db_session, test_athlete, activity_with_stream
+    ):
+        from services.run_stream_analysis import AthleteContext
+        from services.stream_analysis_cache import get_or_compute_pyramid
+        from services.stream_pyramid import PYRAMID_VERSION
+        from services.stream_reanalysis import fill_pyramid
+
+        stream_row = db_session.query(ActivityStream).filter(
+            ActivityStream.activity_id == activity_with_stream.id
+        ).first()
+        result = get_or_compute_analysis(
+            activity_id=activity_with_stream.id,
+            stream_row=stream_row,
+            athlete_ctx=AthleteContext(max_hr=186, resting_hr=48, threshold_hr=165),
+            db=db_session,
+        )
+        row = db_session.query(CachedStreamAnalysis).filter(
+            CachedStreamAnalysis.activity_id == activity_with_stream.id
+        ).first()
+        row.stream_pyramid = None
+        db_session.commit()
+
+        with patch("services.stream_reanalysis.enqueue_pyramid_fill") as mock_fill, \
+             patch.object(db_session, "commit") as mock_commit:
+            pyramid = get_or_compute_pyramid(
+                activity_id=activity_with_stream.id,
+                stream_row=stream_row,
+                result_dict=result,
+                db=db_session,
+            )
+            mock_fill.assert_called_once_with(activity_with_stream.id)
+            mock_commit.assert_not_called()
+        assert pyramid["version"] == PYRAMID_VERSION
+
+        assert fill_pyramid(db_session, activity_with_stream.id) is True
+        db_session.refresh(row)
+        assert row.stream_pyramid == pyramid
+        assert fill_pyramid(db_session, activity_with_stream.id) is False
+
+
 # ---------------------------------------------------------------------------
 # Endpoint integration: both endpoints use cache
 # ---------------------------------------------------------------------------
@@ -0,0 +1,225 @@
+"""Tests for stream-derived best efforts (services/stream_best_efforts.py).
+
+Covers:
+    1. fastest_window matches a straightforward two-pointer reference sweep
+       on random streams with pauses, surges and GPS jitter
+    2. interpolation at window edges (exact on constant-pace streams)
+    3. pauses excluded, short / malformed streams
+    4. extract_best_efforts_from_stream: skips Strava, stores standard
+       distances, wall-clock achieved_at, plausibility filter
+No DB.
+"""
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services.best_effort_service import STANDARD_DISTANCES, extract_best_efforts_from_stream
+from services.stream_best_efforts import (
+    STREAM_EFFORT_DISTANCES,
+    fastest_window,
+    find_best_efforts,
+)
+
+
+def _reference_fastest(time_s, distance_m, target):
+    """Two-pointer sweep with per-edge interpolation (pure Python)."""
+    pts = [(t, d) for t, d in zip(time_s, distance_m) if t is not None and d is not None]
+    t = []
+    d = []
+    for ti, di in pts:
+        if t and ti <= t[-1]:
+            continue
+        t.append(ti)
+        d.append(max(di, d[-1]) if d else di)
+    n = len(t)
+    best = None
+
+    def consider(elapsed, start):
+        nonlocal best
+        if best is None or elapsed < best[0]:
+            best = (elapsed, start)
+
+    # Window ends on sample j
+    i = 0
+    for j in range(n):
+        s = d[j] - target
+        if s < d[0]:
+            continue
+        while i + 1 < n and d[i + 1] <= s:
+            i += 1
+        start = t[i] + (s - d[i]) / (d[i + 1] - d[i]) * (t[i + 1] - t[i])
+        consider(t[j] - start, start)
+
+    # Window starts on sample i
+    k = 0
+    for i in range(n):
+        e = d[i] + target
+        if e > d[-1]:
+            break
+        k = max(k, i + 1)
+        while d[k] < e:
+            k += 1
+        end = t[k - 1] + (e - d[k - 1]) / (d[k] - d[k - 1]) * (t[k] - t[k - 1])
+        consider(end - t[i], t[i])
+    return best
+
+
+def _random_run(seed, n=2400):
+    rng = random.Random(seed)
+    time_s, distance_m = [], []
+    t, d = 0, 0.0
+    for _ in range(n):
+        time_s.append(t)
+        distance_m.append(round(d, 1))
+        t += rng.choice([1, 1, 1, 2, 3])
+        if rng.random() < 0.03:
+            continue  # paused: time advances, distance doesn't
+        speed = rng.uniform(2.5, 5.5)
+        d += speed * 1.0 + rng.uniform(-0.3, 0.3)
+    return time_s, distance_m
+
+
+class TestFastestWindow:
+
+    @pytest.mark.parametrize("seed", range(6))
+    @pytest.mark.parametrize("target", [400.0, 1000.0, 1609.344, 5000.0])
+    def test_matches_reference_sweep(self, seed, target):
+        time_s, distance_m = _random_run(seed)
+        got = fastest_window(time_s, distance_m, target)
+        ref = _reference_fastest(time_s, distance_m, target)
+        assert got is not None and ref is not None
+        assert got[0] == pytest.approx(ref[0], abs=1e-6)
+
+    def test_constant_pace_is_exact(self):
+        # 4 m/s for an hour: every window of D meters takes D/4 seconds
+        time_s = list(range(3601))
+        distance_m = [4.0 * t for t in time_s]
+        for target in (400.0, 1609.344, 10000.0):
+            elapsed, _ = fastest_window(time_s, distance_m, target)
+            assert elapsed == pytest.approx(target / 4.0)
+
+    def test_interpolates_between_sparse_samples(self):
+        # 10 s sampling at 5 m/s; 1 km = 200 s though no sample pair spans it exactly
+        time_s = list(range(0, 1000, 10))
+        distance_m = [5.0 * t + 3.0 for t in time_s]
+        elapsed, _ = fastest_window(time_s, distance_m, 1000.0)
+        assert elapsed == pytest.approx(200.0)
+
+    def test_finds_the_fast_segment(self):
+        # 3 m/s, then 600 s at 5 m/s, then 3 m/s again
+        time_s = list(range(2400))
+        distance_m, d = [], 0.0
+        for t in time_s:
+            distance_m.append(d)
+            d += 5.0 if 900 <= t < 1500 else 3.0
+        elapsed, start = fastest_window(time_s, distance_m, 1000.0)
+        assert elapsed == pytest.approx(200.0)
+        assert 900 <= start <= 1300
+
+    def test_pause_not_counted(self):
+        # 200 m, a 120 s stop, then 200 m — all at 4 m/s while moving
+        time_s = list(range(51)) + list(range(171, 221))
+        distance_m = [4.0 * t for t in range(51)] + [200.0 + 4.0 * (t - 171) for t in range(171, 221)]
+        elapsed, _ = fastest_window(time_s, distance_m, 150.0)
+        assert elapsed == pytest.approx(37.5)
+
+    def test_too_short_returns_none(self):
+        assert fastest_window([0, 1, 2], [0.0, 3.0, 6.0], 400.0) is None
+        assert fastest_window([], [], 400.0) is None
+        assert fastest_window([0], [0.0], 400.0) is None
+
+    def test_nones_and_non_advancing_time_dropped(self):
+        time_s = [0, 1, None, 2, 2, 3, 4]
+        distance_m = [0.0, 4.0, 8.0, 8.0, 100.0, None, 16.0]
+        elapsed, _ = fastest_window(time_s, distance_m, 8.0)
+        assert elapsed == pytest.approx(2.0)
+
+    def test_distance_regression_flattened(self):
+        time_s = list(range(6))
+        distance_m = [0.0, 10.0, 20.0, 15.0, 30.0, 40.0]
+        ref = _reference_fastest(time_s, distance_m, 20.0)
+        assert fastest_window(time_s, distance_m, 20.0)[0] == pytest.approx(ref[0])
+
+
+class TestFindBestEfforts:
+
+    def test_only_categories_covered_by_stream(self):
+        time_s = list(range(1800))
+        stream = {"time": time_s, "distance": [3.2 * t for t in time_s]}
+        efforts = find_best_efforts(stream)
+        assert set(efforts) == {"400m", "1k", "mile", "5k"}
+        assert efforts["5k"].elapsed_s == pytest.approx(5000 / 3.2)
+
+    def test_missing_channels(self):
+        assert find_best_efforts({"time": list(range(100))}) == {}
+        assert find_best_efforts({}) == {}
+
+    def test_every_category_has_a_standard_distance(self):
+        assert set(STREAM_EFFORT_DISTANCES) <= set(STANDARD_DISTANCES)
+
+
+def _activity(provider="garmin", sport="run"):
+    return SimpleNamespace(
+        id=uuid4(),
+        provider=provider,
+        sport=sport,
+        start_time=datetime(2026, 5, 2, 7, 0, tzinfo=timezone.utc),
+        best_efforts_extracted_at=None,
+    )
+
+
+class TestExtractFromStream:
+
+    def _stream(self, speed=3.5, duration_s=3600):
+        time_s = list(range(duration_s))
+        return {"time": time_s, "distance": [speed * t for t in time_s]}
+
+    def test_stores_stream_efforts(self):
+        db = MagicMock()
+        activity = _activity()
+        athlete = SimpleNamespace(id=uuid4())
+        stored = extract_best_efforts_from_stream(activity, athlete, db, stream_data=self._stream())
+        rows = [call.args[0] for call in db.add.call_args_list]
+        assert stored == len(rows) == 5  # 400m .. 10k
+        by_cat = {r.distance_category: r for r in rows}
+        assert by_cat["mile"].distance_meters == STANDARD_DISTANCES["mile"]
+        assert by_cat["mile"].elapsed_time == round(1609.344 / 3.5)
+        assert all(r.strava_effort_id is None for r in rows)
+        assert all(
+            activity.start_time <= r.achieved_at <= activity.start_time + timedelta(hours=1)
+            for r in rows
+        )
+        assert activity.best_efforts_extracted_at is not None
+        db.query.return_value.filter.return_value.delete.assert_called_once()
+
+    def test_strava_activities_skipped(self):
+        db = MagicMock()
+        activity = _activity(provider="strava")
+        assert extract_best_efforts_from_stream(
+            activity, SimpleNamespace(id=uuid4()), db, stream_data=self._stream(),
+        ) == 0
+        db.add.assert_not_called()
+        assert activity.best_efforts_extracted_at is None
+
+    def test_non_runs_skipped(self):
+        db = MagicMock()
+        assert extract_best_efforts_from_stream(
+            _activity(sport="cycling"), SimpleNamespace(id=uuid4()), db, stream_data=self._stream(),
+        ) == 0
+
+    def test_implausible_efforts_rejected(self):
+        db = MagicMock()
+        # 15 m/s "run" — GPS corruption; only the 400m floor lets it through
+        stored = extract_best_efforts_from_stream(
+            _activity(), SimpleNamespace(id=uuid4()), db, stream_data=self._stream(speed=15.0),
+        )
+        assert stored == 1
+        assert db.add.call_args.args[0].distance_category == "400m"
@@ -0,0 +1,180 @@
+"""Tests for the decoded-stream LRU (services/stream_cache.py).
+
+Covers:
+    1. hits / misses, partial decode of only the missing channels
+    2. byte-budget LRU eviction and counters
+    3. results are copies — mutating one never corrupts the cache
+    4. ActivityStream.get_channels routes through the cache, and a new
+       payload gets a new (activity_id, fetched_at) key
+    5. importing models loads no services (the cache is imported on use)
+No DB.
+"""
+import sys
+from pathlib import Path
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fixtures.stream_fixtures import make_easy_run_stream
+from services import stream_cache
+from services.stream_cache import DecodedStreamCache, estimate_nbytes
+
+
+class CountingDecoder:
+    def __init__(self, data):
+        self.data = data
+        self.calls = []
+
+    def __call__(self, names):
+        self.calls.append(None if names is None else list(names))
+        if names is None:
+            return {k: list(v) for k, v in self.data.items()}
+        return {k: list(self.data[k]) for k in names if k in self.data}
+
+
+STREAM = {"time": [0, 1, 2, 3], "heartrate": [140, 141, 142, 143], "distance": [0.0, 3.0, 6.1, 9.0]}
+
+
+class TestGetOrDecode:
+
+    def test_second_read_is_a_hit(self):
+        cache = DecodedStreamCache()
+        dec = CountingDecoder(STREAM)
+        first = cache.get_or_decode("a", ["time", "heartrate"], dec)
+        second = cache.get_or_decode("a", ["heartrate", "time"], dec)
+        assert first == second == {"time": STREAM["time"], "heartrate": STREAM["heartrate"]}
+        assert dec.calls == [["time", "heartrate"]]
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    def test_only_missing_channels_decoded(self):
+        cache = DecodedStreamCache()
+        dec = CountingDecoder(STREAM)
+        cache.get_or_decode("a", ["time"], dec)
+        out = cache.get_or_decode("a", ["time", "distance"], dec)
+        assert set(out) == {"time", "distance"}
+        assert dec.calls == [["time"], ["distance"]]
+
+    def test_absent_channels_remembered(self):
+        cache = DecodedStreamCache()
+        dec = CountingDecoder(STREAM)
+        assert cache.get_or_decode("a", ["time", "latlng"], dec) == {"time": STREAM["time"]}
+        assert cache.get_or_decode("a", ["latlng"], dec) == {}
+        assert len(dec.calls) == 1
+
+    def test_full_decode_serves_any_subset(self):
+        cache = DecodedStreamCache()
+        dec = CountingDecoder(STREAM)
+        assert cache.get_or_decode("a", None, dec) == STREAM
+        assert cache.get_or_decode("a", ["distance", "cadence"], dec) == {"distance": STREAM["distance"]}
+        assert cache.get_or_decode("a", None, dec) == STREAM
+        assert dec.calls == [None]
+
+    def test_partial_entry_needs_full_decode_for_all_channels(self):
+        cache = DecodedStreamCache()
+        dec = CountingDecoder(STREAM)
+        cache.get_or_decode("a", ["time"], dec)
+        assert cache.get_or_decode("a", None, dec) == STREAM
+        assert dec.calls == [["time"], None]
+
+    def test_no_data_not_cached(self):
+        cache = DecodedStreamCache()
+        calls = []
+        assert cache.get_or_decode("a", None, lambda names: calls.append(1)) is None
+        assert cache.get_or_decode("a", None, lambda names: calls.append(1)) is None
+        assert len(calls) == 2
+        assert cache.stats()["entries"] == 0
+
+    def test_results_are_copies(self):
+        cache = DecodedStreamCache()
+        dec = CountingDecoder(STREAM)
+        out = cache.get_or_decode("a", ["time"], dec)
+        out["time"].append(99)
+        out["extra"] = []
+        assert cache.get_or_decode("a", ["time"], dec) == {"time": STREAM["time"]}
+
+
+class TestEviction:
+
+    def test_lru_evicts_by_bytes(self):
+        one = estimate_nbytes({k: STREAM[k] for k in ("time",)})
+        cache = DecodedStreamCache(max_bytes=2 * one)
+        dec = CountingDecoder(STREAM)
+        cache.get_or_decode("a", ["time"], dec)
+        cache.get_or_decode("b", ["time"], dec)
+        cache.get_or_decode("a", ["time"], dec)      # a is now most recent
+        cache.get_or_decode("c", ["time"], dec)      # evicts b
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["entries"] == 2
+        assert stats["bytes"] <= stats["max_bytes"]
+        calls = len(dec.calls)
+        cache.get_or_decode("a", ["time"], dec)
+        assert len(dec.calls) == calls
+        cache.get_or_decode("b", ["time"], dec)
+        assert len(dec.calls) == calls + 1
+
+    def test_oversized_entry_returned_but_not_kept(self):
+        cache = DecodedStreamCache(max_bytes=10)
+        dec = CountingDecoder(STREAM)
+        assert cache.get_or_decode("a", None, dec) == STREAM
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["bytes"] == 0
+
+    def test_estimate_counts_pairs_larger(self):
+        scalars = estimate_nbytes({"x": [1.0] * 100})
+        pairs = estimate_nbytes({"latlng": [[1.0, 2.0]] * 100})
+        assert pairs > scalars > 100
+
+
+@pytest.fixture
+def fresh_cache():
+    cache = DecodedStreamCache()
+    with patch.object(stream_cache, "_cache", cache):
+        yield cache
+
+
+class TestActivityStreamIntegration:
+
+    def test_get_channels_decodes_blob_once(self, fresh_cache):
+        from models import ActivityStream
+        from services import stream_codec
+
+        data = make_easy_run_stream(duration_s=600)
+        row = ActivityStream(activity_id=uuid4(), stream_data=data, point_count=600)
+        with patch.object(stream_codec, "decode_stream", wraps=stream_codec.decode_stream) as decode:
+            assert row.get_channels(["time", "heartrate"]) == {
+                "time": data["time"], "heartrate": data["heartrate"],
+            }
+            assert row.get_channels(["heartrate"]) == {"heartrate": data["heartrate"]}
+            assert decode.call_count == 1
+        assert fresh_cache.stats()["hits"] == 1
+
+    def test_new_payload_gets_new_key(self, fresh_cache):
+        from models import ActivityStream
+
+        row = ActivityStream(activity_id=uuid4(), stream_data={"time": [0, 1]}, point_count=2)
+        assert row.get_channels(["time"]) == {"time": [0, 1]}
+        row.stream_data = {"time": [0, 1, 2]}
+        assert row.get_channels(["time"]) == {"time": [0, 1, 2]}
+
+    def test_unkeyed_row_bypasses_cache(self, fresh_cache):
+        from models import ActivityStream
+
+        row = ActivityStream(stream_data={"time": [0, 1]}, point_count=2)
+        assert row.get_channels() == {"time": [0, 1]}
+        assert fresh_cache.stats()["misses"] == 0
+
+
+def test_models_import_without_services():
+    import subprocess
+
+    out = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, models; print(sorted(m for m in sys.modules if m.startswith('services')))"],
+        cwd=Path(__file__).resolve().parents[1], capture_output=True, text=True, check=True,
+    )
+    assert out.stdout.strip() == "[]"
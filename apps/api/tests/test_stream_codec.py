@@ -0,0 +1,144 @@
+"""Tests for the columnar activity stream codec (services/stream_codec.py).
+
+Round-trip must be lossless for every channel shape the ingestion paths
+produce (Strava + Garmin adapter), partial decode must touch only the
+requested channels, and malformed blobs must fail loudly. No DB.
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fixtures.stream_fixtures import make_easy_run_stream, make_interval_stream
+from services import stream_codec
+from services.stream_codec import (
+    FORMAT_VERSION,
+    StreamCodecError,
+    channel_names,
+    decode_stream,
+    encode_stream,
+    is_encoded,
+)
+
+
+def _roundtrip(data):
+    return decode_stream(encode_stream(data))
+
+
+def _strava_like_stream(n=3600):
+    return {
+        "time": list(range(n)),
+        "heartrate": [120 + (i % 40) for i in range(n)],
+        "velocity_smooth": [round(3.0 + (i % 17) * 0.013, 3) for i in range(n)],
+        "distance": [round(i * 3.1, 1) for i in range(n)],
+        "altitude": [round(100.0 + (i % 300) * 0.2, 1) for i in range(n)],
+        "cadence": [86 + (i % 3) for i in range(n)],
+        "grade_smooth": [round(((i % 50) - 25) * 0.1, 1) for i in range(n)],
+        "latlng": [[round(51.05 + i * 1e-5, 6), round(-114.07 - i * 1e-5, 6)] for i in range(n)],
+        "moving": [i % 100 != 0 for i in range(n)],
+    }
+
+
+class TestRoundTrip:
+
+    @pytest.mark.parametrize("factory", [make_easy_run_stream, make_interval_stream])
+    def test_fixture_streams_roundtrip(self, factory):
+        data = factory()
+        assert _roundtrip(data) == data
+
+    def test_all_strava_channels_roundtrip(self):
+        data = _strava_like_stream()
+        assert _roundtrip(data) == data
+
+    def test_int_and_float_types_preserved(self):
+        data = {"hr": [140, 141, 142], "v": [3.0, 3.5, 4.25]}
+        out = _roundtrip(data)
+        assert [type(v) for v in out["hr"]] == [int, int, int]
+        assert [type(v) for v in out["v"]] == [float, float, float]
+
+    def test_nulls_preserved(self):
+        data = {
+            "heartrate": [None, 140, None, None, 150, None],
+            "altitude": [None, 12.5, 13.0, None, 13.25, None],
+            "latlng": [None, [51.05, -114.07], None, [51.06, -114.08]],
+        }
+        assert _roundtrip(data) == data
+
+    def test_full_precision_floats_roundtrip(self):
+        data = {"v": [0.1 + 0.2, 1 / 3, 2.718281828459045, -1e-300, 1e300]}
+        assert _roundtrip(data) == data
+
+    def test_negative_zero_roundtrips(self):
+        out = _roundtrip({"grade": [0.5, -0.0, 0.0]})
+        assert str(out["grade"][1]) == "-0.0"
+
+    def test_mixed_channel_falls_back_to_json(self):
+        data = {"weird": [1, 2.5, "x", None], "nested": {"a": 1}, "empty": []}
+        assert _roundtrip(data) == data
+
+    def test_huge_ints_fall_back_losslessly(self):
+        data = {"big": [2 ** 63, -(2 ** 63), 5]}
+        assert _roundtrip(data) == data
+
+    def test_empty_stream(self):
+        assert _roundtrip({}) == {}
+
+
+class TestPartialDecode:
+
+    def test_decodes_only_requested_channels(self):
+        blob = encode_stream(_strava_like_stream(600))
+        out = decode_stream(blob, ["time", "heartrate"])
+        assert set(out) == {"time", "heartrate"}
+
+    def test_missing_channels_are_omitted(self):
+        blob = encode_stream({"time": [0, 1]})
+        assert decode_stream(blob, ["time", "latlng"]) == {"time": [0, 1]}
+
+    def test_channel_names_in_insertion_order(self):
+        data = _strava_like_stream(10)
+        assert channel_names(encode_stream(data)) == list(data)
+
+
+class TestFormat:
+
+    def test_blob_is_versioned(self):
+        blob = encode_stream({"time": [0, 1, 2]})
+        assert is_encoded(blob)
+        assert blob[4] == FORMAT_VERSION
+
+    def test_is_encoded_rejects_other_bytes(self):
+        assert not is_encoded(None)
+        assert not is_encoded(b'{"time": [0]}')
+
+    def test_bad_magic_raises(self):
+        with pytest.raises(StreamCodecError, match="bad magic"):
+            decode_stream(b"JSON" + b"\x00" * 8)
+
+    def test_newer_version_raises(self):
+        blob = bytearray(encode_stream({"time": [0]}))
+        blob[4] = FORMAT_VERSION + 1
+        with pytest.raises(StreamCodecError, match="version"):
+            decode_stream(bytes(blob))
+
+    def test_truncated_blob_raises(self):
+        with pytest.raises(StreamCodecError):
+            decode_stream(b"SI")
+
+    def test_numeric_channels_use_typed_columns(self):
+        blob = encode_stream(_strava_like_stream(100))
+        directory, _ = stream_codec._read_directory(blob)
+        kinds = {name: kind for name, kind, *_ in directory}
+        assert kinds["time"] == stream_codec.KIND_INT
+        assert kinds["velocity_smooth"] == stream_codec.KIND_DECIMAL
+        assert kinds["latlng"] == stream_codec.KIND_PAIR
+        assert kinds["moving"] == stream_codec.KIND_BOOL
+
+    def test_much_smaller_than_json(self):
+        data = _strava_like_stream()
+        json_bytes = len(json.dumps(data).encode())
+        assert len(encode_stream(data)) * 4 < json_bytes
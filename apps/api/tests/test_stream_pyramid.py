@@ -0,0 +1,202 @@
+"""Tests for precomputed stream chart pyramids (services/stream_pyramid.py).
+
+Covers:
+    1. lttb_indices selects the same points as the per-request LTTB loops
+       it replaced (1-D Home series and time/hr canvas points)
+    2. build_pyramid stores every level, capped at stream length (no
+       full-resolution level)
+    3. points_at serves levels, in-between resolutions and zoom windows;
+       narrow zooms are cut from the raw stream via load_stream
+    4. series_at serves Home series
+No DB.
+"""
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fixtures.stream_fixtures import (
+    make_easy_run_stream,
+    make_interval_stream,
+    make_long_run_with_drift_stream,
+)
+from services.run_stream_analysis import analyze_stream
+from services.stream_pyramid import (
+    POINT_KEYS,
+    PYRAMID_LEVELS,
+    PYRAMID_VERSION,
+    build_pyramid,
+    lttb_1d,
+    lttb_indices,
+    points_at,
+    prepare_stream_points,
+    series_at,
+)
+
+
+def _reference_lttb_1d(values, target):
+    """The per-request loop previously in routers/home.py."""
+    n = len(values)
+    if n <= target:
+        return values
+    sampled = [values[0]]
+    bucket_size = (n - 2) / (target - 2)
+    a_idx = 0
+    for i in range(1, target - 1):
+        bucket_start = int((i - 1) * bucket_size) + 1
+        bucket_end = min(int(i * bucket_size) + 1, n - 1)
+        next_start = int(i * bucket_size) + 1
+        next_end = min(int((i + 1) * bucket_size) + 1, n)
+        avg_x = sum(range(next_start, next_end)) / max(1, next_end - next_start)
+        avg_y = sum(values[j] for j in range(next_start, next_end)) / max(1, next_end - next_start)
+        max_area = -1
+        best_idx = bucket_start
+        a_x = a_idx
+        a_y = values[a_idx]
+        for j in range(bucket_start, bucket_end):
+            area = abs((a_x - avg_x) * (values[j] - a_y) - (a_x - j) * (avg_y - a_y))
+            if area > max_area:
+                max_area = area
+                best_idx = j
+        sampled.append(values[best_idx])
+        a_idx = best_idx
+    sampled.append(values[-1])
+    return sampled
+
+
+def _analyzed(stream):
+    result = analyze_stream(stream, list(stream.keys()))
+    return result.effort_intensity
+
+
+class TestLttb:
+
+    @pytest.mark.parametrize("seed", range(5))
+    @pytest.mark.parametrize("target", [250, 500, 1000])
+    def test_1d_matches_reference_loop(self, seed, target):
+        rng = random.Random(seed)
+        values = [round(rng.uniform(0, 1), 4) for _ in range(rng.randint(1200, 6000))]
+        assert lttb_1d(values, target) == _reference_lttb_1d(values, target)
+
+    def test_noop_when_below_target(self):
+        assert lttb_1d([1.0, 2.0], 500) == [1.0, 2.0]
+        assert lttb_indices([0, 1, 2], [None, 1, None], 10) == [0, 1, 2]
+
+    def test_none_hr_treated_as_zero(self):
+        x = list(range(1000))
+        y = [None if i % 7 == 0 else 140 + (i % 13) for i in x]
+        idx = lttb_indices(x, y, 100)
+        assert len(idx) == 100
+        assert idx[0] == 0 and idx[-1] == 999
+        assert idx == sorted(idx)
+
+
+class TestBuildPyramid:
+
+    def test_levels_cover_every_resolution(self):
+        stream = make_easy_run_stream(duration_s=3600)
+        pyramid = build_pyramid(stream, _analyzed(stream))
+        assert pyramid["version"] == PYRAMID_VERSION
+        assert pyramid["point_count"] == 3600
+        assert sorted(int(k) for k in pyramid["levels"]) == list(PYRAMID_LEVELS)
+        for key, columns in pyramid["levels"].items():
+            assert tuple(columns) == POINT_KEYS
+            assert all(len(v) == int(key) for v in columns.values())
+
+    def test_level_matches_per_request_downsample(self):
+        stream = make_interval_stream()
+        effort = _analyzed(stream)
+        pyramid = build_pyramid(stream, effort)
+        assert points_at(pyramid, 500) == prepare_stream_points(stream, effort, max_points=500)
+
+    def test_short_stream_stored_once_at_full_length(self):
+        stream = make_easy_run_stream(duration_s=600)
+        pyramid = build_pyramid(stream, _analyzed(stream))
+        assert sorted(int(k) for k in pyramid["levels"]) == [250, 500, 600]
+        assert points_at(pyramid, 2000) == prepare_stream_points(stream, _analyzed(stream))
+
+    def test_home_series_present(self):
+        stream = make_easy_run_stream(duration_s=3600)
+        pyramid = build_pyramid(stream, _analyzed(stream))
+        assert set(pyramid["series"]) == {"effort", "pace", "elevation"}
+
+    def test_empty_stream(self):
+        pyramid = build_pyramid({}, [])
+        assert pyramid["levels"] == {}
+        assert points_at(pyramid, 500) == []
+        assert series_at(pyramid, "effort", 500) == []
+
+
+class TestServing:
+
+    @pytest.fixture(scope="class")
+    def pyramid(self):
+        stream = make_long_run_with_drift_stream()
+        return build_pyramid(stream, _analyzed(stream))
+
+    def test_in_between_resolution_downsamples_next_level(self, pyramid):
+        assert len(points_at(pyramid, 700)) == 700
+
+    def test_resolution_above_finest_returns_finest(self, pyramid):
+        assert len(points_at(pyramid, 5000)) == max(PYRAMID_LEVELS)
+
+    def test_zoom_window_slices_finest_level(self, pyramid):
+        points = points_at(pyramid, 500, start_s=1800, end_s=2400)
+        assert points
+        assert all(1800 <= p["time"] <= 2400 for p in points)
+        # Finer than the same window cut from the 500-point overview
+        overview = [p for p in points_at(pyramid, 500) if 1800 <= p["time"] <= 2400]
+        assert len(points) > len(overview)
+
+    def test_narrow_zoom_reads_raw_stream(self, pyramid):
+        stream = make_long_run_with_drift_stream()
+        effort = _analyzed(stream)
+        calls = []
+
+        def load_stream():
+            calls.append(1)
+            return stream, effort
+
+        # 10 minutes of a long run: fewer than 500 samples in every level
+        points = points_at(pyramid, 500, start_s=1800, end_s=2400, load_stream=load_stream)
+        assert len(points) == 500
+        assert calls == [1]
+        # Narrower than max_points raw samples → every raw sample in the window
+        raw = points_at(pyramid, 500, start_s=1800, end_s=1899, load_stream=load_stream)
+        assert [p["time"] for p in raw] == list(range(1800, 1900))
+        full = prepare_stream_points(stream, effort)
+        assert raw == [p for p in full if 1800 <= p["time"] <= 1899]
+
+    def test_narrow_zoom_without_loader_serves_finest_level(self, pyramid):
+        points = points_at(pyramid, 500, start_s=1800, end_s=2400)
+        finest = pyramid["levels"][str(max(PYRAMID_LEVELS))]["time"]
+        assert points
+        assert {p["time"] for p in points} <= set(finest)
+
+    def test_sufficient_level_does_not_read_raw_stream(self, pyramid):
+        def load_stream():
+            raise AssertionError("raw stream read")
+
+        n = pyramid["point_count"]
+        assert len(points_at(pyramid, 250, start_s=0, end_s=n // 2, load_stream=load_stream)) == 250
+        assert len(points_at(pyramid, 500, load_stream=load_stream)) == 500
+
+    def test_wide_zoom_uses_coarsest_sufficient_level(self, pyramid):
+        n = pyramid["point_count"]
+        half = points_at(pyramid, 250, start_s=0, end_s=n // 2)
+        assert len(half) == 250
+        times = {p["time"] for p in half}
+        assert any(times <= set(level["time"]) for level in pyramid["levels"].values())
+
+    def test_zoom_window_outside_stream(self, pyramid):
+        assert points_at(pyramid, 500, start_s=10 ** 6) == []
+
+    def test_series_at_levels(self, pyramid):
+        effort = series_at(pyramid, "effort", 500)
+        assert len(effort) == 500
+        assert all(round(e, 4) == e for e in effort)
+        assert series_at(pyramid, "missing", 500) == []
@@ -0,0 +1,291 @@
+"""
+Tests for the stream re-analysis backfill (services/stream_reanalysis.py).
+
+Unit tests — DB access is patched out, Redis is an in-memory fake:
+1. compute_analysis matches analyze_stream + build_pyramid, in-process and
+   through a real process pool
+2. run_reanalysis: completes, records failures and skips them on resume,
+   honours pause / lock / time budget, checkpoints progress
+3. enqueue_refresh and enqueue_pyramid_fill deduplicate per activity
+4. Backfilled rows keep existing narratives and stay eligible for
+   enrichment while moments lack them
+5. Tasks registered under their beat names
+"""
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fixtures.stream_fixtures import (
+    make_easy_run_stream,
+    make_interval_stream,
+    make_progressive_run_stream,
+)
+from services import stream_reanalysis as sr
+from services.run_stream_analysis import AthleteContext, analyze_stream
+from services.stream_analysis_cache import CURRENT_ANALYSIS_VERSION
+from services.stream_pyramid import build_pyramid
+
+
+class FakeRedis:
+    """Minimal in-memory Redis substitute (strings + sets)."""
+
+    def __init__(self):
+        self._store: dict = {}
+        self._sets: dict = {}
+
+    def get(self, key):
+        return self._store.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self._store:
+            return False
+        self._store[key] = value
+        return True
+
+    def delete(self, *keys):
+        for k in keys:
+            self._store.pop(k, None)
+
+    def sadd(self, key, *values):
+        self._sets.setdefault(key, set()).update(str(v) for v in values)
+
+    def smembers(self, key):
+        return set(self._sets.get(key, set()))
+
+
+def _payload(stream, activity_id=None):
+    return {
+        "activity_id": str(activity_id or uuid4()),
+        "stream_data": stream,
+        "channels_available": list(stream.keys()),
+        "planned_workout": None,
+        "athlete_context": {f: None for f in sr.ATHLETE_CONTEXT_FIELDS} | {"max_hr": 186},
+    }
+
+
+class TestComputeAnalysis:
+
+    def test_matches_direct_analysis(self):
+        stream = make_interval_stream()
+        aid, result, pyramid = sr.compute_analysis(_payload(stream))
+        expected = asdict(analyze_stream(
+            stream, list(stream.keys()), athlete_context=AthleteContext(max_hr=186),
+        ))
+        result.pop(sr.NARRATIVES_PENDING, None)
+        assert result == expected
+        assert pyramid == build_pyramid(stream, expected["effort_intensity"])
+
+    def test_runs_in_process_pool(self):
+        payloads = [_payload(make_easy_run_stream(duration_s=900)) for _ in range(2)]
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = sr._compute_batch(pool, payloads)
+        assert [aid for aid, _ in results] == [p["activity_id"] for p in payloads]
+        for (_, outcome), p in zip(results, payloads):
+            assert outcome == sr.compute_analysis(p)
+
+    def test_batch_captures_per_activity_errors(self):
+        bad = _payload({"time": [0, 1]})
+        bad["athlete_context"] = {"not_a_field": 1}
+        results = sr._compute_batch(None, [bad])
+        assert isinstance(results[0][1], Exception)
+
+
+@pytest.fixture
+def runner():
+    """run_reanalysis with the DB layer replaced by an in-memory stale set."""
+    stale = [uuid4() for _ in range(5)]
+    stored = []
+    bad_ids = set()
+
+    def _next_batch(db, limit, exclude=None):
+        exclude = exclude or set()
+        done = {a for a, _ in stored}
+        return [a for a in stale if str(a) not in exclude and str(a) not in done][:limit]
+
+    def _load(db, aid):
+        return None if aid in bad_ids else {"activity_id": str(aid)}
+
+    def _compute(payload, gemini_client=None):
+        return payload["activity_id"], {"ok": True}, {"version": 1}
+
+    def _store(db, aid, result, pyramid):
+        stored.append((aid, result))
+        return True
+
+    with patch.object(sr, "next_stale_batch", side_effect=_next_batch), \
+         patch.object(sr, "load_payload", side_effect=_load), \
+         patch.object(sr, "compute_analysis", side_effect=_compute), \
+         patch.object(sr, "store_if_stale", side_effect=_store), \
+         patch.object(sr, "count_stale", side_effect=lambda db: len(stale) - len(stored)):
+        yield {"stale": stale, "stored": stored, "bad": bad_ids}
+
+
+def _run(redis, **kw):
+    kw.setdefault("workers", 0)
+    kw.setdefault("batch_size", 2)
+    kw.setdefault("throttle_s", 0)
+    return sr.run_reanalysis(MagicMock(), redis, **kw)
+
+
+class TestRunReanalysis:
+
+    def test_processes_every_stale_row(self, runner):
+        redis = FakeRedis()
+        out = _run(redis)
+        assert out["status"] == "complete"
+        assert out["processed"] == 5
+        assert out["remaining"] == 0
+        state = json.loads(redis.get(sr._state_key(CURRENT_ANALYSIS_VERSION)))
+        assert state["status"] == "complete"
+        assert state["processed"] == 5
+        assert state["stale_at_start"] == 5
+        assert redis.get(sr.LOCK_KEY) is None
+
+    def test_failures_recorded_and_skipped_on_resume(self, runner):
+        redis = FakeRedis()
+        runner["bad"].add(runner["stale"][0])
+        out = _run(redis)
+        assert out["failed"] == 1
+        assert out["processed"] == 4
+        assert sr.failed_ids(redis) == {str(runner["stale"][0])}
+
+        again = _run(redis)
+        assert again["processed"] == 0
+        assert again["failed"] == 0
+        state = sr.load_state(redis)
+        assert state["runs"] == 2
+        assert state["processed"] == 4
+
+    def test_time_budget_checkpoints_and_resumes(self, runner):
+        redis = FakeRedis()
+        first = _run(redis, max_run_s=0)
+        assert first["status"] == "time_budget"
+        assert first["processed"] == 0
+        assert sr.load_state(redis)["status"] == "time_budget"
+
+        second = _run(redis)
+        assert second["status"] == "complete"
+        assert sr.load_state(redis)["processed"] == 5
+
+    def test_paused_does_not_run(self, runner):
+        redis = FakeRedis()
+        sr.set_paused(redis, True)
+        assert _run(redis)["status"] == "paused"
+        assert runner["stored"] == []
+        sr.set_paused(redis, False)
+        assert _run(redis)["status"] == "complete"
+
+    def test_lock_prevents_concurrent_runs(self, runner):
+        redis = FakeRedis()
+        redis.set(sr.LOCK_KEY, "1")
+        out = _run(redis)
+        assert out == {"status": "skipped", "reason": "already_running",
+                       "version": CURRENT_ANALYSIS_VERSION}
+
+    def test_no_redis_skips(self, runner):
+        assert _run(None)["reason"] == "redis_unavailable"
+
+
+class TestEnqueueRefresh:
+
+    def test_dedupes_per_activity(self):
+        redis = FakeRedis()
+        aid = uuid4()
+        with patch("core.cache.get_redis_client", return_value=redis), \
+             patch("tasks.stream_reanalysis_tasks.refresh_stream_analysis_task") as task:
+            assert sr.enqueue_refresh(aid) is True
+            assert sr.enqueue_refresh(aid) is False
+            task.delay.assert_called_once_with(str(aid))
+
+    def test_no_redis_never_raises(self):
+        with patch("core.cache.get_redis_client", return_value=None):
+            assert sr.enqueue_refresh(uuid4()) is False
+
+    def test_pyramid_fill_dedupes_per_activity(self):
+        redis = FakeRedis()
+        aid = uuid4()
+        with patch("core.cache.get_redis_client", return_value=redis), \
+             patch("tasks.stream_reanalysis_tasks.fill_stream_pyramid_task") as task:
+            assert sr.enqueue_pyramid_fill(aid) is True
+            assert sr.enqueue_pyramid_fill(aid) is False
+            task.delay.assert_called_once_with(str(aid))
+
+
+def _moment(time_s, narrative=None):
+    return {"type": "pace_surge", "index": time_s, "time_s": time_s, "narrative": narrative}
+
+
+def _row_db(row):
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = row
+    return db
+
+
+class TestNarratives:
+
+    def test_backfill_carries_narratives_and_flags_the_rest(self):
+        row = MagicMock(analysis_version=CURRENT_ANALYSIS_VERSION - 1,
+                        result_json={"moments": [_moment(60, "Strong surge."), _moment(90, "Gone.")]})
+        result = {"moments": [_moment(60), _moment(300)]}
+
+        assert sr.store_if_stale(_row_db(row), uuid4(), result, {}) is True
+        assert [m["narrative"] for m in row.result_json["moments"]] == ["Strong surge.", None]
+        assert row.result_json[sr.NARRATIVES_PENDING] is True
+
+    def test_fully_carried_result_is_not_pending(self):
+        row = MagicMock(analysis_version=CURRENT_ANALYSIS_VERSION - 1,
+                        result_json={"moments": [_moment(60, "Strong surge.")]})
+        result = {"moments": [_moment(60)], sr.NARRATIVES_PENDING: True}
+
+        sr.store_if_stale(_row_db(row), uuid4(), result, {})
+        assert sr.NARRATIVES_PENDING not in row.result_json
+
+    def test_current_pending_row_replaced_only_by_narrated_result(self):
+        pending = {"moments": [_moment(60)], sr.NARRATIVES_PENDING: True}
+        row = MagicMock(analysis_version=CURRENT_ANALYSIS_VERSION, result_json=pending)
+
+        still_pending = {"moments": [_moment(60)], sr.NARRATIVES_PENDING: True}
+        assert sr.store_if_stale(_row_db(row), uuid4(), still_pending, {}) is False
+        assert sr.store_if_stale(_row_db(row), uuid4(), {"moments": [_moment(60, "Nice.")]}, {}) is True
+        assert row.result_json["moments"][0]["narrative"] == "Nice."
+
+    def test_compute_without_gemini_flags_moments(self):
+        stream = make_progressive_run_stream()
+        _, result, _ = sr.compute_analysis(_payload(stream))
+        assert result["moments"]
+        assert result[sr.NARRATIVES_PENDING] is True
+
+    def test_refresh_one_enriches_current_pending_row_only_with_gemini(self):
+        db = _row_db((CURRENT_ANALYSIS_VERSION, {sr.NARRATIVES_PENDING: True}))
+        with patch.object(sr, "load_payload", return_value={"activity_id": "x"}) as load, \
+             patch.object(sr, "compute_analysis", return_value=("x", {}, {})), \
+             patch.object(sr, "store_if_stale", return_value=True):
+            assert sr.refresh_one(db, uuid4()) is False
+            load.assert_not_called()
+            assert sr.refresh_one(db, uuid4(), gemini_client=object()) is True
+
+
+class TestTaskRegistration:
+
+    def test_task_names(self):
+        from tasks.stream_reanalysis_tasks import (
+            fill_stream_pyramid_task,
+            reanalyze_stale_streams,
+            refresh_stream_analysis_task,
+        )
+        assert reanalyze_stale_streams.name == "tasks.reanalyze_stale_streams"
+        assert refresh_stream_analysis_task.name == "tasks.refresh_stream_analysis"
+        assert fill_stream_pyramid_task.name == "tasks.fill_stream_pyramid"
+
+    def test_beat_schedule_entry(self):
+        from celerybeat_schedule import beat_schedule
+        assert beat_schedule["stream-reanalysis-backfill"]["task"] == "tasks.reanalyze_stale_streams"